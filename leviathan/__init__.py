@@ -1,3 +1,6 @@
 from .future import Future, ThreadSafeFuture
-from .task import Task, ThreadSafeTask
+from .task import Task, ThreadSafeTask, TaskGroup, gather, wait
 from .loop import Loop, ThreadSafeLoop
+from .resolver import Resolver
+from .runtime import Runtime
+from .multiprocess import serve_multiprocess
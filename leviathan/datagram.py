@@ -0,0 +1,289 @@
+from typing import Any, TYPE_CHECKING
+from logging import getLogger
+
+import asyncio, collections, socket
+
+if TYPE_CHECKING:
+    from .loop import Loop, ThreadSafeLoop
+
+logger = getLogger(__package__)
+
+DEFAULT_HIGH_WATER_MARK = 64 * 1024
+
+# Bigger datagrams are dropped and reported to error_received() with EMSGSIZE
+DEFAULT_MAX_DATAGRAM_SIZE = 8 * 1024
+
+# sendto() calls after the transport is closed are only logged from this point on
+LOG_THRESHOLD_FOR_CONNLOST_WRITES = 5
+
+
+class DatagramTransport(asyncio.DatagramTransport):
+    def __init__(
+        self,
+        loop: "Loop | ThreadSafeLoop",
+        sock: socket.socket,
+        protocol: asyncio.DatagramProtocol,
+        address: Any = None,
+        extra: dict[str, Any] | None = None,
+        max_datagram_size: int = DEFAULT_MAX_DATAGRAM_SIZE,
+    ) -> None:
+        super().__init__(extra)
+        self._loop = loop
+        self._sock: socket.socket | None = sock
+        self._protocol = protocol
+        self._address = address
+        self._max_datagram_size = max_datagram_size
+
+        # Datagrams sent during the same loop iteration are flushed together with a single sendmmsg
+        self._buffer: collections.deque[tuple[bytes, Any]] = collections.deque()
+        self._buffer_size = 0
+        self._flush_scheduled = False
+        self._waiting_writable = False
+
+        self._high_water = DEFAULT_HIGH_WATER_MARK
+        self._low_water = DEFAULT_HIGH_WATER_MARK // 4
+        self._protocol_paused = False
+
+        self._receive_task: asyncio.Task[None] | None = None
+        self._closing = False
+        self._conn_lost = 0
+
+    def __repr__(self) -> str:
+        info = [self.__class__.__name__]
+        if self._sock is None:
+            info.append("closed")
+        elif self._closing:
+            info.append("closing")
+        if self._sock is not None:
+            info.append(f"fd={self._sock.fileno()}")
+        return "<{}>".format(" ".join(info))
+
+    def _start(self) -> None:
+        self._protocol.connection_made(self)
+        self._receive_task = self._loop.create_task(self._receive_datagrams())
+
+    async def _receive_datagrams(self) -> None:
+        sock = self._sock
+        assert sock is not None
+        try:
+            # A single operation hands over every batch of datagrams, it only finishes on errors
+            await self._loop._sock_recvmmsg(  # type: ignore
+                sock, self._datagrams_received, self._max_datagram_size
+            )
+        except asyncio.CancelledError:
+            if not self._closing:
+                raise
+        except (SystemExit, KeyboardInterrupt):
+            raise
+        except BaseException as exc:
+            self._fatal_error(exc, "Fatal read error on datagram transport")
+
+    def _datagrams_received(
+        self, datagrams: list[tuple[bytes, Any]] | None, exception: OSError | None
+    ) -> None:
+        protocol = self._protocol
+        if datagrams is None:
+            protocol.error_received(exception)  # type: ignore
+            return
+
+        for data, address in datagrams:
+            if self._closing:
+                return
+
+            try:
+                protocol.datagram_received(data, address)
+            except (SystemExit, KeyboardInterrupt):
+                raise
+            except BaseException as exc:
+                self._loop.call_exception_handler({
+                    "message": "Exception in datagram_received()",
+                    "exception": exc,  # type: ignore
+                    "transport": self,  # type: ignore
+                    "protocol": protocol,  # type: ignore
+                })
+
+    def get_write_buffer_size(self) -> int:
+        return self._buffer_size
+
+    def get_write_buffer_limits(self) -> tuple[int, int]:
+        return self._low_water, self._high_water
+
+    def set_write_buffer_limits(self, high: int | None = None, low: int | None = None) -> None:
+        if high is None:
+            high = DEFAULT_HIGH_WATER_MARK if low is None else 4 * low
+        if low is None:
+            low = high // 4
+        if not high >= low >= 0:
+            raise ValueError(f"high ({high!r}) must be >= low ({low!r}) must be >= 0")
+
+        self._high_water = high
+        self._low_water = low
+        self._maybe_pause_protocol()
+
+    def _maybe_pause_protocol(self) -> None:
+        if self._protocol_paused or self._buffer_size <= self._high_water:
+            return
+
+        self._protocol_paused = True
+        try:
+            self._protocol.pause_writing()  # type: ignore
+        except (SystemExit, KeyboardInterrupt):
+            raise
+        except BaseException as exc:
+            self._loop.call_exception_handler({
+                "message": "protocol.pause_writing() failed",
+                "exception": exc,  # type: ignore
+                "transport": self,  # type: ignore
+                "protocol": self._protocol,  # type: ignore
+            })
+
+    def _maybe_resume_protocol(self) -> None:
+        if not self._protocol_paused or self._buffer_size > self._low_water:
+            return
+
+        self._protocol_paused = False
+        try:
+            self._protocol.resume_writing()  # type: ignore
+        except (SystemExit, KeyboardInterrupt):
+            raise
+        except BaseException as exc:
+            self._loop.call_exception_handler({
+                "message": "protocol.resume_writing() failed",
+                "exception": exc,  # type: ignore
+                "transport": self,  # type: ignore
+                "protocol": self._protocol,  # type: ignore
+            })
+
+    def sendto(self, data: bytes | bytearray | memoryview, addr: Any = None) -> None:
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            raise TypeError(f"data argument must be a bytes-like object, not {type(data).__name__!r}")
+
+        if self._address is not None:
+            if addr not in (None, self._address):
+                raise ValueError(f"Invalid address: must be None or {self._address}")
+            addr = None
+
+        if self._conn_lost:
+            if self._conn_lost >= LOG_THRESHOLD_FOR_CONNLOST_WRITES:
+                logger.warning("socket.sendto() raised exception.")
+            self._conn_lost += 1
+            return
+
+        # The data is only sent later, so it can't be a view on a buffer that could still change
+        if type(data) is not bytes:
+            data = bytes(data)
+
+        self._buffer.append((data, addr))
+        self._buffer_size += len(data)
+        if not self._flush_scheduled and not self._waiting_writable:
+            self._flush_scheduled = True
+            self._loop.call_soon(self._flush)
+        self._maybe_pause_protocol()
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        sock = self._sock
+        if sock is None:
+            return
+
+        buffer = self._buffer
+        sendmmsg = self._loop._sock_sendmmsg  # type: ignore
+        while buffer:
+            try:
+                sent: int = sendmmsg(sock, buffer)
+            except (BlockingIOError, InterruptedError):
+                if not self._waiting_writable:
+                    self._waiting_writable = True
+                    self._loop.add_writer(sock, self._writable)
+                return
+            except OSError as exc:
+                # Like sendto() errors, they are reported and the datagram is dropped
+                data, _ = buffer.popleft()
+                self._buffer_size -= len(data)
+                self._protocol.error_received(exc)
+                continue
+            except (SystemExit, KeyboardInterrupt):
+                raise
+            except BaseException as exc:
+                self._fatal_error(exc, "Fatal write error on datagram transport")
+                return
+
+            for _ in range(sent):
+                data, _ = buffer.popleft()
+                self._buffer_size -= len(data)
+
+        self._maybe_resume_protocol()
+        if self._closing:
+            self._call_connection_lost(None)
+
+    def _writable(self) -> None:
+        self._waiting_writable = False
+        self._loop.remove_writer(self._sock)  # type: ignore
+        self._flush()
+
+    def set_protocol(self, protocol: asyncio.BaseProtocol) -> None:
+        self._protocol = protocol  # type: ignore
+
+    def get_protocol(self) -> asyncio.BaseProtocol:
+        return self._protocol
+
+    def is_closing(self) -> bool:
+        return self._closing
+
+    def _stop_receiving(self) -> None:
+        receive_task = self._receive_task
+        self._receive_task = None
+        if receive_task is not None:
+            receive_task.cancel()
+
+    def close(self) -> None:
+        if self._closing:
+            return
+
+        self._closing = True
+        self._stop_receiving()
+        if not self._buffer:
+            self._conn_lost += 1
+            self._call_connection_lost(None)
+
+    def abort(self) -> None:
+        self._force_close(None)
+
+    def _fatal_error(self, exc: BaseException, message: str) -> None:
+        if not isinstance(exc, OSError):
+            self._loop.call_exception_handler({
+                "message": message,
+                "exception": exc,  # type: ignore
+                "transport": self,  # type: ignore
+                "protocol": self._protocol,  # type: ignore
+            })
+        self._force_close(exc)
+
+    def _force_close(self, exc: BaseException | None) -> None:
+        if self._conn_lost:
+            return
+
+        self._closing = True
+        self._stop_receiving()
+        self._buffer.clear()
+        self._buffer_size = 0
+        self._conn_lost += 1
+        self._call_connection_lost(exc)
+
+    def _call_connection_lost(self, exc: BaseException | None) -> None:
+        sock = self._sock
+        if sock is None:
+            return
+
+        self._sock = None
+        if self._waiting_writable:
+            self._waiting_writable = False
+            self._loop.remove_writer(sock)
+
+        self._loop.call_soon(self._connection_lost, sock, exc)
+
+    def _connection_lost(self, sock: socket.socket, exc: BaseException | None) -> None:
+        try:
+            self._protocol.connection_lost(exc)  # type: ignore
+        finally:
+            sock.close()
@@ -9,10 +9,12 @@ from typing import (
     Any,
     TextIO,
     AsyncGenerator,
+    Protocol,
 )
+from collections.abc import Buffer, Iterable, Sequence
 from types import FrameType
 from contextvars import Context
-import asyncio, weakref
+import asyncio, weakref, socket
 
 _T = TypeVar("_T")
 
@@ -39,6 +41,7 @@ class Task(asyncio.Task[_T]):
         *,
         name: Optional[str] = None,
         context: Optional[Context] = None,
+        eager_start: bool = False,
     ) -> None: ...
     def uncancel(self) -> int: ...
     def cancelling(self) -> bool: ...
@@ -53,6 +56,9 @@ class Task(asyncio.Task[_T]):
 
 _Tcs = TypeVarTuple("_Tcs")
 
+class _HasFileno(Protocol):
+    def fileno(self) -> int: ...
+
 class Loop(asyncio.AbstractEventLoop):
     _asyncgens: weakref.WeakSet[AsyncGenerator[Any]]
 
@@ -60,6 +66,8 @@ class Loop(asyncio.AbstractEventLoop):
         self,
         ready_tasks_queue_min_bytes_capacity: int,
         exception_handler: Callable[[Exception], None],
+        busy_poll_us: int = ...,
+        freelist_size: int = ...,
     ) -> None: ...
     def run_forever(self) -> None: ...
     def stop(self) -> None: ...
@@ -72,7 +80,10 @@ class Loop(asyncio.AbstractEventLoop):
         *,
         name: str | None = ...,
         context: Context | None = ...,
+        eager_start: bool = ...,
     ) -> Task[_T]: ...
+    def set_task_factory(self, factory: asyncio.events._TaskFactory | None) -> None: ...
+    def get_task_factory(self) -> asyncio.events._TaskFactory | None: ...
     def create_future(self) -> Future[Any]: ...
     def time(self) -> float: ...
     def call_soon(
@@ -101,3 +112,85 @@ class Loop(asyncio.AbstractEventLoop):
         *args: Unpack[_Tcs],
         context: Context | None = ...,
     ) -> asyncio.TimerHandle: ...
+    def add_reader(
+        self,
+        fd: int | _HasFileno,
+        callback: Callable[[Unpack[_Tcs]], object],
+        *args: Unpack[_Tcs],
+    ) -> None: ...
+    def remove_reader(self, fd: int | _HasFileno) -> bool: ...
+    def add_writer(
+        self,
+        fd: int | _HasFileno,
+        callback: Callable[[Unpack[_Tcs]], object],
+        *args: Unpack[_Tcs],
+    ) -> None: ...
+    def remove_writer(self, fd: int | _HasFileno) -> bool: ...
+    async def sock_recv(self, sock: socket.socket, nbytes: int) -> bytes: ...
+    async def sock_recv_into(self, sock: socket.socket, buf: Buffer) -> int: ...
+    async def sock_sendall(self, sock: socket.socket, data: Buffer) -> None: ...
+    async def sock_accept(self, sock: socket.socket) -> tuple[socket.socket, Any]: ...
+    def _sock_accept_multishot(
+        self, sock: socket.socket, callback: Callable[[socket.socket], None]
+    ) -> asyncio.Future[None]: ...
+    def _sock_recvmmsg(
+        self,
+        sock: socket.socket,
+        callback: Callable[[list[tuple[bytes, Any]] | None, OSError | None], None],
+        max_size: int = ...,
+    ) -> asyncio.Future[None]: ...
+    def _sock_sendmmsg(self, sock: socket.socket, datagrams: Sequence[tuple[Buffer, Any]]) -> int: ...
+    async def sock_connect(self, sock: socket.socket, address: Any) -> None: ...
+    def _sock_sendfile(
+        self, sock: socket.socket, file: int | _HasFileno, offset: int, count: int | None
+    ) -> asyncio.Future[int]: ...
+    async def file_read(
+        self, fd: int | _HasFileno, size: int, offset: int = -1
+    ) -> bytes: ...
+    async def file_readinto(
+        self, fd: int | _HasFileno, buf: Buffer, offset: int = -1
+    ) -> int: ...
+    async def file_write(
+        self, fd: int | _HasFileno, data: Buffer, offset: int = -1
+    ) -> int: ...
+    def _run_in_thread_pool(
+        self, func: Callable[[Unpack[_Tcs]], _T], *args: Unpack[_Tcs]
+    ) -> asyncio.Future[_T]: ...
+    def get_freelist_stats(self) -> dict[str, dict[str, int]]: ...
+    def _gather(
+        self, futures: tuple[asyncio.Future[Any], ...], return_exceptions: bool, /
+    ) -> asyncio.Future[list[Any]] | None: ...
+    def _wait(
+        self, futures: tuple[asyncio.Future[Any], ...], return_when: int, /
+    ) -> asyncio.Future[None] | None: ...
+    def _task_group_add(self, group: asyncio.TaskGroup, task: asyncio.Task[Any], /) -> bool: ...
+
+class StreamTransport(asyncio.Transport):
+    def __init__(
+        self,
+        sock: socket.socket,
+        protocol: asyncio.BaseProtocol,
+        loop: asyncio.AbstractEventLoop,
+        extra: Optional[dict[str, Any]] = None,
+        server: Optional[asyncio.AbstractServer] = None,
+    ) -> None: ...
+    def close(self) -> None: ...
+    def abort(self) -> None: ...
+    def is_closing(self) -> bool: ...
+    def get_extra_info(self, name: str, default: Any = None) -> Any: ...
+    def get_protocol(self) -> asyncio.BaseProtocol: ...
+    def set_protocol(self, protocol: asyncio.BaseProtocol) -> None: ...
+    def is_reading(self) -> bool: ...
+    def pause_reading(self) -> None: ...
+    def resume_reading(self) -> None: ...
+    def write(self, data: Buffer) -> None: ...
+    def writelines(self, list_of_data: Iterable[Buffer]) -> None: ...
+    def write_eof(self) -> None: ...
+    def can_write_eof(self) -> bool: ...
+    def get_write_buffer_size(self) -> int: ...
+    def get_write_buffer_limits(self) -> tuple[int, int]: ...
+    def set_write_buffer_limits(
+        self, high: Optional[int] = None, low: Optional[int] = None
+    ) -> None: ...
+    def _make_empty_waiter(self) -> asyncio.Future[None]: ...
+    def _reset_empty_waiter(self) -> None: ...
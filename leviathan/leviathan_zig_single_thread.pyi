@@ -3,3 +3,4 @@ import leviathan_zig_def
 Loop = leviathan_zig_def.Loop
 Future = leviathan_zig_def.Future
 Task = leviathan_zig_def.Task
+StreamTransport = leviathan_zig_def.StreamTransport
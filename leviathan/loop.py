@@ -1,14 +1,36 @@
-from .leviathan_zig_single_thread import Loop as _LoopSingleThread
-from .leviathan_zig import Loop as _Loop
-
-from typing import Any, Callable, TypedDict, NotRequired, AsyncGenerator, Awaitable, TypeVar
+from .leviathan_zig_single_thread import (
+    Loop as _LoopSingleThread,
+    StreamTransport as _StreamTransportSingleThread,
+)
+from .leviathan_zig import Loop as _Loop, StreamTransport as _StreamTransport
+from .server import Server
+from .resolver import Resolver
+from .process import SubprocessTransport
+from .datagram import DatagramTransport, DEFAULT_MAX_DATAGRAM_SIZE
+
+from typing import (
+    Any,
+    Callable,
+    TypedDict,
+    NotRequired,
+    AsyncGenerator,
+    Awaitable,
+    TypeVar,
+    TypeVarTuple,
+    Iterable,
+    Unpack,
+)
 from logging import getLogger
 
-import asyncio, socket, weakref
+import asyncio, concurrent.futures, errno, inspect, io, itertools, os, socket, stat, subprocess, warnings, weakref
 
 logger = getLogger(__package__)
 
+# Chunk size used when the file can't be spliced and has to be read
+SENDFILE_FALLBACK_READBUFFER_SIZE = 256 * 1024
+
 _T = TypeVar("_T")
+_Ts = TypeVarTuple("_Ts")
 
 
 class ExceptionContext(TypedDict):
@@ -19,6 +41,7 @@ class ExceptionContext(TypedDict):
     task: NotRequired[asyncio.Task[Any]]
     handle: NotRequired[asyncio.Handle]
     protocol: NotRequired[asyncio.Protocol]
+    transport: NotRequired[asyncio.Transport]
     socket: NotRequired[socket.socket]
     asyncgen: NotRequired[AsyncGenerator[Any]]
 
@@ -28,6 +51,7 @@ class _LoopHelpers:
         self._exception_handler: Callable[[ExceptionContext], None] = (
             self.default_exception_handler
         )
+        self._resolver: Resolver | None = None
 
     def _call_exception_handler(
         self,
@@ -39,6 +63,7 @@ class _LoopHelpers:
         task: asyncio.Task[Any] | None = None,
         handle: asyncio.Handle | None = None,
         protocol: asyncio.Protocol | None = None,
+        transport: asyncio.Transport | None = None,
         socket: socket.socket | None = None,
         asyncgenerator: AsyncGenerator[Any] | None = None,
     ) -> None:
@@ -55,6 +80,8 @@ class _LoopHelpers:
             context["handle"] = handle
         if protocol is not None:
             context["protocol"] = protocol
+        if transport is not None:
+            context["transport"] = transport
         if socket is not None:
             context["socket"] = socket
         if asyncgenerator is not None:
@@ -136,12 +163,786 @@ class _LoopHelpers:
 
         return new_future.result()
 
+    # --------------------------------------------------------------------------------------------------------
+    # DNS
+
+    def get_resolver(self) -> Resolver:
+        resolver = self._resolver
+        if resolver is None:
+            resolver = self._resolver = Resolver(self)  # type: ignore
+        return resolver
+
+    def set_resolver(self, resolver: Resolver) -> None:
+        if resolver._loop is not self:
+            raise ValueError("The resolver belongs to another loop")
+        self._resolver = resolver
+
+    async def getaddrinfo(
+        self,
+        host: bytes | str | None,
+        port: bytes | str | int | None,
+        *,
+        family: int = 0,
+        type: int = 0,
+        proto: int = 0,
+        flags: int = 0,
+    ) -> list[tuple[Any, ...]]:
+        return await self.get_resolver().getaddrinfo(
+            host, port, family=family, type=type, proto=proto, flags=flags
+        )
+
+    async def getnameinfo(self, sockaddr: tuple[Any, ...], flags: int = 0) -> tuple[str, str]:
+        return await self.get_resolver().getnameinfo(sockaddr, flags)
+
+    # --------------------------------------------------------------------------------------------------------
+    # Sendfile
+
+    @staticmethod
+    def _check_sendfile_params(
+        sock: socket.socket, file: io.BufferedReader, offset: int, count: int | None
+    ) -> None:
+        if "b" not in getattr(file, "mode", "b"):
+            raise ValueError("file should be opened in binary mode")
+        if not sock.type == socket.SOCK_STREAM:
+            raise ValueError("only SOCK_STREAM type sockets are supported")
+        if count is not None:
+            if not isinstance(count, int):
+                raise TypeError(f"count must be a positive integer (got {count!r})")
+            if count <= 0:
+                raise ValueError(f"count must be a positive integer (got {count!r})")
+        if not isinstance(offset, int):
+            raise TypeError(f"offset must be a non-negative integer (got {offset!r})")
+        if offset < 0:
+            raise ValueError(f"offset must be a non-negative integer (got {offset!r})")
+
+    @staticmethod
+    def _get_sendfile_fileno(file: io.BufferedReader) -> int:
+        try:
+            fileno = file.fileno()
+        except (AttributeError, io.UnsupportedOperation) as err:
+            raise asyncio.SendfileNotAvailableError("not a regular file") from err
+
+        if not stat.S_ISREG(os.fstat(fileno).st_mode):
+            raise asyncio.SendfileNotAvailableError("not a regular file")
+        return fileno
+
+    async def _sock_sendfile_native(
+        self, sock: socket.socket, file: io.BufferedReader, offset: int, count: int | None
+    ) -> int:
+        fileno = self._get_sendfile_fileno(file)
+        try:
+            sent: int = await self._sock_sendfile(sock, fileno, offset, count)  # type: ignore
+        except OSError as exc:
+            # The file system doesn't support splicing, nothing has been sent yet
+            if exc.errno in (errno.EINVAL, errno.ENOSYS):
+                raise asyncio.SendfileNotAvailableError("splice is not supported for this file") from exc
+            raise
+
+        if sent > 0:
+            file.seek(offset + sent)
+        return sent
+
+    async def _sock_sendfile_fallback(
+        self, sock: socket.socket, file: io.BufferedReader, offset: int, count: int | None
+    ) -> int:
+        if offset:
+            file.seek(offset)
+
+        total_sent = 0
+        try:
+            while count is None or total_sent < count:
+                blocksize = SENDFILE_FALLBACK_READBUFFER_SIZE
+                if count is not None:
+                    blocksize = min(count - total_sent, blocksize)
+
+                data = file.read(blocksize)
+                if not data:
+                    break
+
+                await self.sock_sendall(sock, data)  # type: ignore
+                total_sent += len(data)
+            return total_sent
+        finally:
+            if total_sent > 0 and hasattr(file, "seek"):
+                file.seek(offset + total_sent)
+
+    async def sock_sendfile(
+        self,
+        sock: socket.socket,
+        file: io.BufferedReader,
+        offset: int = 0,
+        count: int | None = None,
+        *,
+        fallback: bool = True,
+    ) -> int:
+        if sock.gettimeout() != 0:
+            raise ValueError("the socket must be non-blocking")
+
+        self._check_sendfile_params(sock, file, offset, count)
+        try:
+            return await self._sock_sendfile_native(sock, file, offset, count)
+        except asyncio.SendfileNotAvailableError:
+            if not fallback:
+                raise
+
+        return await self._sock_sendfile_fallback(sock, file, offset, count)
+
+    async def sendfile(
+        self,
+        transport: asyncio.WriteTransport,
+        file: io.BufferedReader,
+        offset: int = 0,
+        count: int | None = None,
+        *,
+        fallback: bool = True,
+    ) -> int:
+        if transport.is_closing():
+            raise RuntimeError("Transport is closing")
+        if not isinstance(transport, self._stream_transport_cls):
+            raise RuntimeError(f"sendfile is not supported for transport {transport!r}")
+
+        sock: socket.socket = transport.get_extra_info("socket")
+        self._check_sendfile_params(sock, file, offset, count)
+
+        # Everything already written has to go out before the file
+        await transport._make_empty_waiter()  # type: ignore
+        try:
+            try:
+                return await self._sock_sendfile_native(sock, file, offset, count)
+            except asyncio.SendfileNotAvailableError:
+                if not fallback:
+                    raise
+
+            return await self._sock_sendfile_fallback(sock, file, offset, count)
+        finally:
+            transport._reset_empty_waiter()  # type: ignore
+
+    # --------------------------------------------------------------------------------------------------------
+    # Subprocesses
+
+    def _make_subprocess_transport(
+        self,
+        protocol_factory: Callable[[], asyncio.SubprocessProtocol],
+        args: Any,
+        shell: bool,
+        stdin: Any,
+        stdout: Any,
+        stderr: Any,
+        bufsize: int,
+        **kwargs: Any,
+    ) -> tuple[SubprocessTransport, asyncio.SubprocessProtocol]:
+        protocol = protocol_factory()
+        transport = SubprocessTransport(
+            self, protocol, args, shell, stdin, stdout, stderr, bufsize, **kwargs  # type: ignore
+        )
+        try:
+            transport._start()
+        except:
+            transport.close()
+            raise
+        return transport, protocol
+
+    @staticmethod
+    def _check_subprocess_params(
+        universal_newlines: bool, bufsize: int, encoding: Any, errors: Any, text: Any
+    ) -> None:
+        if universal_newlines:
+            raise ValueError("universal_newlines must be False")
+        if bufsize != 0:
+            raise ValueError("bufsize must be 0")
+        if text:
+            raise ValueError("text must be False")
+        if encoding is not None:
+            raise ValueError("encoding must be None")
+        if errors is not None:
+            raise ValueError("errors must be None")
+
+    async def subprocess_shell(
+        self,
+        protocol_factory: Callable[[], asyncio.SubprocessProtocol],
+        cmd: bytes | str,
+        *,
+        stdin: Any = subprocess.PIPE,
+        stdout: Any = subprocess.PIPE,
+        stderr: Any = subprocess.PIPE,
+        universal_newlines: bool = False,
+        shell: bool = True,
+        bufsize: int = 0,
+        encoding: Any = None,
+        errors: Any = None,
+        text: Any = None,
+        **kwargs: Any,
+    ) -> tuple[SubprocessTransport, asyncio.SubprocessProtocol]:
+        if not isinstance(cmd, (bytes, str)):
+            raise ValueError("cmd must be a string")
+        if not shell:
+            raise ValueError("shell must be True")
+        self._check_subprocess_params(universal_newlines, bufsize, encoding, errors, text)
+
+        return self._make_subprocess_transport(
+            protocol_factory, cmd, True, stdin, stdout, stderr, bufsize, **kwargs
+        )
+
+    async def subprocess_exec(
+        self,
+        protocol_factory: Callable[[], asyncio.SubprocessProtocol],
+        program: Any,
+        *args: Any,
+        stdin: Any = subprocess.PIPE,
+        stdout: Any = subprocess.PIPE,
+        stderr: Any = subprocess.PIPE,
+        universal_newlines: bool = False,
+        shell: bool = False,
+        bufsize: int = 0,
+        encoding: Any = None,
+        errors: Any = None,
+        text: Any = None,
+        **kwargs: Any,
+    ) -> tuple[SubprocessTransport, asyncio.SubprocessProtocol]:
+        if shell:
+            raise ValueError("shell must be False")
+        self._check_subprocess_params(universal_newlines, bufsize, encoding, errors, text)
+
+        return self._make_subprocess_transport(
+            protocol_factory, (program, *args), False, stdin, stdout, stderr, bufsize, **kwargs
+        )
+
+    # --------------------------------------------------------------------------------------------------------
+    # Streams
+
+    _stream_transport_cls: type[asyncio.Transport]
+
+    def _make_stream_transport(
+        self,
+        sock: socket.socket,
+        protocol: asyncio.BaseProtocol,
+        *,
+        server: Server | None = None,
+    ) -> asyncio.Transport:
+        extra: dict[str, Any] = {"socket": sock}
+        try:
+            extra["sockname"] = sock.getsockname()
+        except OSError:
+            extra["sockname"] = None
+        try:
+            extra["peername"] = sock.getpeername()
+        except OSError:
+            extra["peername"] = None
+
+        return self._stream_transport_cls(sock, protocol, self, extra, server)  # type: ignore
+
+    async def _create_connection_transport(
+        self,
+        sock: socket.socket,
+        protocol_factory: Callable[[], asyncio.BaseProtocol],
+    ) -> tuple[asyncio.Transport, asyncio.BaseProtocol]:
+        sock.setblocking(False)
+
+        protocol = protocol_factory()
+        transport = self._make_stream_transport(sock, protocol)
+        try:
+            protocol.connection_made(transport)
+        except:
+            transport.close()
+            raise
+
+        return transport, protocol
+
+    async def _resolve_stream_addresses(
+        self,
+        host: str | bytes | None,
+        port: str | int | None,
+        *,
+        family: int = 0,
+        proto: int = 0,
+        flags: int = 0,
+    ) -> list[tuple[Any, ...]]:
+        infos = await self.getaddrinfo(
+            host, port, family=family, type=socket.SOCK_STREAM, proto=proto, flags=flags
+        )
+        if not infos:
+            raise OSError(f"getaddrinfo({host!r}) returned empty list")
+        return infos
+
+    async def _connect_sock(
+        self,
+        exceptions: list[OSError],
+        addr_info: tuple[Any, ...],
+        local_addr_infos: list[tuple[Any, ...]] | None = None,
+    ) -> socket.socket:
+        family, type_, proto, _, address = addr_info
+        sock = socket.socket(family=family, type=type_, proto=proto)
+        try:
+            sock.setblocking(False)
+            if local_addr_infos is not None:
+                for lfamily, _, _, _, laddr in local_addr_infos:
+                    if lfamily != family:
+                        continue
+                    try:
+                        sock.bind(laddr)
+                        break
+                    except OSError as exc:
+                        exceptions.append(
+                            OSError(
+                                exc.errno,
+                                f"error while attempting to bind on address {laddr!r}: "
+                                f"{str(exc.strerror).lower()}",
+                            )
+                        )
+                else:
+                    raise OSError(f"no matching local address with {family=} found")
+
+            await self.sock_connect(sock, address)  # type: ignore
+            return sock
+        except OSError as exc:
+            exceptions.append(exc)
+            sock.close()
+            raise
+        except:
+            sock.close()
+            raise
+
+    @staticmethod
+    def _check_no_ssl(ssl: Any, *ssl_args: Any) -> None:
+        if ssl or any(arg is not None for arg in ssl_args):
+            raise NotImplementedError("SSL is not supported by Leviathan's transports")
+
+    async def create_connection(
+        self,
+        protocol_factory: Callable[[], asyncio.BaseProtocol],
+        host: str | None = None,
+        port: int | None = None,
+        *,
+        ssl: Any = None,
+        family: int = 0,
+        proto: int = 0,
+        flags: int = 0,
+        sock: socket.socket | None = None,
+        local_addr: tuple[str, int] | None = None,
+        server_hostname: str | None = None,
+        ssl_handshake_timeout: float | None = None,
+        ssl_shutdown_timeout: float | None = None,
+        happy_eyeballs_delay: float | None = None,
+        interleave: int | None = None,
+        all_errors: bool = False,
+    ) -> tuple[asyncio.Transport, asyncio.BaseProtocol]:
+        self._check_no_ssl(ssl, server_hostname, ssl_handshake_timeout, ssl_shutdown_timeout)
+
+        if host is not None or port is not None:
+            if sock is not None:
+                raise ValueError("host/port and sock can not be specified at the same time")
+
+            infos = await self._resolve_stream_addresses(
+                host, port, family=family, proto=proto, flags=flags
+            )
+            local_addr_infos = None
+            if local_addr is not None:
+                local_addr_infos = await self._resolve_stream_addresses(
+                    *local_addr, family=family, proto=proto, flags=flags
+                )
+
+            # Addresses are tried one after the other, happy eyeballs isn't implemented
+            exceptions: list[OSError] = []
+            for addr_info in infos:
+                try:
+                    sock = await self._connect_sock(exceptions, addr_info, local_addr_infos)
+                    break
+                except OSError:
+                    continue
+            else:
+                if all_errors:
+                    raise ExceptionGroup("create_connection failed", exceptions)
+                if len(exceptions) == 1:
+                    raise exceptions[0]
+
+                model = str(exceptions[0])
+                if all(str(exc) == model for exc in exceptions):
+                    raise exceptions[0]
+                raise OSError(
+                    "Multiple exceptions: {}".format(", ".join(str(exc) for exc in exceptions))
+                )
+        else:
+            if sock is None:
+                raise ValueError("host and port was not specified and no sock specified")
+            if sock.type != socket.SOCK_STREAM:
+                raise ValueError(f"A Stream Socket was expected, got {sock!r}")
+
+        return await self._create_connection_transport(sock, protocol_factory)
+
+    async def create_server(
+        self,
+        protocol_factory: Callable[[], asyncio.BaseProtocol],
+        host: str | Iterable[str] | None = None,
+        port: int | None = None,
+        *,
+        family: int = socket.AF_UNSPEC,
+        flags: int = socket.AI_PASSIVE,
+        sock: socket.socket | None = None,
+        backlog: int = 100,
+        ssl: Any = None,
+        reuse_address: bool | None = None,
+        reuse_port: bool | None = None,
+        keep_alive: bool | None = None,
+        ssl_handshake_timeout: float | None = None,
+        ssl_shutdown_timeout: float | None = None,
+        start_serving: bool = True,
+    ) -> Server:
+        self._check_no_ssl(ssl, ssl_handshake_timeout, ssl_shutdown_timeout)
+
+        if host is not None or port is not None:
+            if sock is not None:
+                raise ValueError("host/port and sock can not be specified at the same time")
+
+            if reuse_address is None:
+                reuse_address = os.name == "posix"
+
+            hosts: Iterable[str | None]
+            if host == "" or host is None:
+                hosts = [None]
+            elif isinstance(host, str):
+                hosts = [host]
+            else:
+                hosts = host
+
+            infos = set(
+                itertools.chain.from_iterable(
+                    [
+                        await self._resolve_stream_addresses(
+                            h, port, family=family, flags=flags
+                        )
+                        for h in hosts
+                    ]
+                )
+            )
+
+            sockets: list[socket.socket] = []
+            completed = False
+            try:
+                for af, socktype, proto, _, address in infos:
+                    try:
+                        sock = socket.socket(af, socktype, proto)
+                    except OSError:
+                        # Assume it's a bad family/type/protocol combination
+                        continue
+                    sockets.append(sock)
+
+                    if reuse_address:
+                        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, True)
+                    if reuse_port:
+                        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, True)
+                    if keep_alive:
+                        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, True)
+                    if af == socket.AF_INET6:
+                        # Otherwise binding both families to the same port fails
+                        sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, True)
+
+                    try:
+                        sock.bind(address)
+                    except OSError as err:
+                        raise OSError(
+                            err.errno,
+                            f"error while attempting to bind on address {address!r}: "
+                            f"{str(err.strerror).lower()}",
+                        ) from None
+                completed = True
+            finally:
+                if not completed:
+                    for sock in sockets:
+                        sock.close()
+        else:
+            if sock is None:
+                raise ValueError("Neither host/port nor sock were specified")
+            if sock.type != socket.SOCK_STREAM:
+                raise ValueError(f"A Stream Socket was expected, got {sock!r}")
+            sockets = [sock]
+
+        for sock in sockets:
+            sock.setblocking(False)
+
+        server = Server(self, sockets, protocol_factory, backlog)  # type: ignore
+        if start_serving:
+            await server.start_serving()
+
+        return server
+
+    async def create_unix_connection(
+        self,
+        protocol_factory: Callable[[], asyncio.BaseProtocol],
+        path: str | None = None,
+        *,
+        ssl: Any = None,
+        sock: socket.socket | None = None,
+        server_hostname: str | None = None,
+        ssl_handshake_timeout: float | None = None,
+        ssl_shutdown_timeout: float | None = None,
+    ) -> tuple[asyncio.Transport, asyncio.BaseProtocol]:
+        self._check_no_ssl(ssl, server_hostname, ssl_handshake_timeout, ssl_shutdown_timeout)
+
+        if path is not None:
+            if sock is not None:
+                raise ValueError("path and sock can not be specified at the same time")
+
+            path = os.fspath(path)
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM, 0)
+            try:
+                sock.setblocking(False)
+                await self.sock_connect(sock, path)  # type: ignore
+            except:
+                sock.close()
+                raise
+        else:
+            if sock is None:
+                raise ValueError("no path and sock were specified")
+            if sock.family != socket.AF_UNIX or sock.type != socket.SOCK_STREAM:
+                raise ValueError(f"A UNIX Domain Stream Socket was expected, got {sock!r}")
+
+        return await self._create_connection_transport(sock, protocol_factory)
+
+    async def create_unix_server(
+        self,
+        protocol_factory: Callable[[], asyncio.BaseProtocol],
+        path: str | None = None,
+        *,
+        sock: socket.socket | None = None,
+        backlog: int = 100,
+        ssl: Any = None,
+        ssl_handshake_timeout: float | None = None,
+        ssl_shutdown_timeout: float | None = None,
+        start_serving: bool = True,
+        cleanup_socket: bool = True,
+    ) -> Server:
+        self._check_no_ssl(ssl, ssl_handshake_timeout, ssl_shutdown_timeout)
+
+        if path is not None:
+            if sock is not None:
+                raise ValueError("path and sock can not be specified at the same time")
+
+            path = os.fspath(path)
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+            # Stale sockets are removed, abstract ones don't live in the filesystem
+            if path[0] not in (0, "\x00"):
+                try:
+                    if stat.S_ISSOCK(os.stat(path).st_mode):
+                        os.remove(path)
+                except FileNotFoundError:
+                    pass
+                except OSError as err:
+                    logger.error("Unable to check or remove stale UNIX socket %r: %r", path, err)
+
+            try:
+                sock.bind(path)
+            except OSError as exc:
+                sock.close()
+                if exc.errno == errno.EADDRINUSE:
+                    raise OSError(errno.EADDRINUSE, f"Address {path!r} is already in use") from None
+                raise
+            except:
+                sock.close()
+                raise
+        else:
+            if sock is None:
+                raise ValueError("path was not specified, and no sock specified")
+            if sock.family != socket.AF_UNIX or sock.type != socket.SOCK_STREAM:
+                raise ValueError(f"A UNIX Domain Stream Socket was expected, got {sock!r}")
+
+        unix_path = None
+        if cleanup_socket:
+            address = sock.getsockname()
+            if isinstance(address, str) and address and address[0] != "\x00":
+                unix_path = address
+
+        sock.setblocking(False)
+        server = Server(self, [sock], protocol_factory, backlog, unix_path)  # type: ignore
+        if start_serving:
+            await server.start_serving()
+
+        return server
+
+    # --------------------------------------------------------------------------------------------------------
+    # Datagrams
+
+    def _make_datagram_transport(
+        self,
+        sock: socket.socket,
+        protocol: asyncio.DatagramProtocol,
+        address: Any = None,
+        max_datagram_size: int = DEFAULT_MAX_DATAGRAM_SIZE,
+    ) -> DatagramTransport:
+        extra: dict[str, Any] = {"socket": sock}
+        try:
+            extra["sockname"] = sock.getsockname()
+        except OSError:
+            extra["sockname"] = None
+        try:
+            extra["peername"] = sock.getpeername()
+        except OSError:
+            extra["peername"] = None
+
+        return DatagramTransport(self, sock, protocol, address, extra, max_datagram_size)  # type: ignore
+
+    async def _resolve_datagram_addresses(
+        self,
+        local_addr: tuple[str, int] | None,
+        remote_addr: tuple[str, int] | None,
+        *,
+        family: int,
+        proto: int,
+        flags: int,
+    ) -> list[tuple[tuple[int, int], list[Any]]]:
+        # Local and remote addresses are paired by their family and protocol
+        addr_infos: dict[tuple[int, int], list[Any]] = {}
+        for index, addr in ((0, local_addr), (1, remote_addr)):
+            if addr is None:
+                continue
+            if not (isinstance(addr, tuple) and len(addr) == 2):
+                raise TypeError("2-tuple is expected")
+
+            infos = await self.getaddrinfo(
+                *addr, family=family, type=socket.SOCK_DGRAM, proto=proto, flags=flags
+            )
+            if not infos:
+                raise OSError("getaddrinfo() returned empty list")
+
+            for info_family, _, info_proto, _, address in infos:
+                addr_infos.setdefault((info_family, info_proto), [None, None])[index] = address
+
+        addr_pairs_info = [
+            (key, addr_pair)
+            for key, addr_pair in addr_infos.items()
+            if not (
+                (local_addr is not None and addr_pair[0] is None)
+                or (remote_addr is not None and addr_pair[1] is None)
+            )
+        ]
+        if not addr_pairs_info:
+            raise ValueError("can not get address information")
+        return addr_pairs_info
+
+    async def create_datagram_endpoint(
+        self,
+        protocol_factory: Callable[[], asyncio.DatagramProtocol],
+        local_addr: tuple[str, int] | str | None = None,
+        remote_addr: tuple[str, int] | str | None = None,
+        *,
+        family: int = 0,
+        proto: int = 0,
+        flags: int = 0,
+        reuse_port: bool | None = None,
+        allow_broadcast: bool | None = None,
+        sock: socket.socket | None = None,
+        max_datagram_size: int = DEFAULT_MAX_DATAGRAM_SIZE,
+    ) -> tuple[DatagramTransport, asyncio.DatagramProtocol]:
+        if max_datagram_size <= 0:
+            raise ValueError(f"max_datagram_size must be positive, got {max_datagram_size!r}")
+
+        remote_address: Any = None
+        if sock is not None:
+            if sock.type != socket.SOCK_DGRAM:
+                raise ValueError(f"A datagram socket was expected, got {sock!r}")
+
+            options = {
+                "local_addr": local_addr,
+                "remote_addr": remote_addr,
+                "family": family,
+                "proto": proto,
+                "flags": flags,
+                "reuse_port": reuse_port,
+                "allow_broadcast": allow_broadcast,
+            }
+            if any(options.values()):
+                problems = ", ".join(f"{key}={value}" for key, value in options.items() if value)
+                raise ValueError(
+                    "socket modifier keyword arguments can not be used when sock is specified. "
+                    f"({problems})"
+                )
+            sock.setblocking(False)
+        else:
+            addr_pairs_info: list[tuple[tuple[int, int], list[Any]]]
+            if not (local_addr or remote_addr):
+                if family == 0:
+                    raise ValueError("unexpected address family")
+                addr_pairs_info = [((family, proto), [None, None])]
+            elif family == socket.AF_UNIX:
+                for addr in (local_addr, remote_addr):
+                    if addr is not None and not isinstance(addr, str):
+                        raise TypeError("string is expected")
+
+                # Stale sockets are removed, abstract ones don't live in the filesystem
+                if local_addr and local_addr[0] not in (0, "\x00"):
+                    try:
+                        if stat.S_ISSOCK(os.stat(local_addr).st_mode):  # type: ignore
+                            os.remove(local_addr)  # type: ignore
+                    except FileNotFoundError:
+                        pass
+                    except OSError as err:
+                        logger.error(
+                            "Unable to check or remove stale UNIX socket %r: %r", local_addr, err
+                        )
+                addr_pairs_info = [((family, proto), [local_addr, remote_addr])]
+            else:
+                addr_pairs_info = await self._resolve_datagram_addresses(
+                    local_addr, remote_addr, family=family, proto=proto, flags=flags  # type: ignore
+                )
+
+            exceptions: list[OSError] = []
+            for (pair_family, pair_proto), (local_address, pair_remote_address) in addr_pairs_info:
+                sock = None
+                remote_address = None
+                try:
+                    sock = socket.socket(family=pair_family, type=socket.SOCK_DGRAM, proto=pair_proto)
+                    if reuse_port:
+                        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, True)
+                    if allow_broadcast:
+                        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, True)
+                    sock.setblocking(False)
+
+                    if local_addr:
+                        sock.bind(local_address)
+                    if remote_addr:
+                        if not allow_broadcast:
+                            await self.sock_connect(sock, pair_remote_address)  # type: ignore
+                        remote_address = pair_remote_address
+                except OSError as exc:
+                    if sock is not None:
+                        sock.close()
+                    exceptions.append(exc)
+                except:
+                    if sock is not None:
+                        sock.close()
+                    raise
+                else:
+                    break
+            else:
+                raise exceptions[0]
+
+        protocol = protocol_factory()
+        transport = self._make_datagram_transport(sock, protocol, remote_address, max_datagram_size)
+        try:
+            transport._start()
+        except:
+            transport.close()
+            raise
+
+        return transport, protocol
+
 
 class Loop(_LoopSingleThread, _LoopHelpers):
-    def __init__(self, ready_tasks_queue_min_bytes_capacity: int = 10**6) -> None:
+    _stream_transport_cls = _StreamTransportSingleThread
+
+    def __init__(
+        self,
+        ready_tasks_queue_min_bytes_capacity: int = 10**6,
+        busy_poll_us: int = 0,
+        freelist_size: int = 256,
+    ) -> None:
         _LoopHelpers.__init__(self)
         _LoopSingleThread.__init__(
-            self, ready_tasks_queue_min_bytes_capacity, self._call_exception_handler
+            self,
+            ready_tasks_queue_min_bytes_capacity,
+            self._call_exception_handler,
+            busy_poll_us=busy_poll_us,
+            freelist_size=freelist_size,
         )
 
     async def shutdown_asyncgens(self) -> None:
@@ -152,11 +953,65 @@ class Loop(_LoopSingleThread, _LoopHelpers):
 
 
 class ThreadSafeLoop(_Loop, _LoopHelpers):
-    def __init__(self, ready_tasks_queue_min_bytes_capacity: int = 10**6) -> None:
+    _stream_transport_cls = _StreamTransport
+
+    def __init__(
+        self,
+        ready_tasks_queue_min_bytes_capacity: int = 10**6,
+        busy_poll_us: int = 0,
+        freelist_size: int = 256,
+    ) -> None:
         _LoopHelpers.__init__(self)
         _Loop.__init__(
-            self, ready_tasks_queue_min_bytes_capacity, self._call_exception_handler
+            self,
+            ready_tasks_queue_min_bytes_capacity,
+            self._call_exception_handler,
+            busy_poll_us=busy_poll_us,
+            freelist_size=freelist_size,
         )
+        self._default_executor: concurrent.futures.ThreadPoolExecutor | None = None
+
+    def run_in_executor(
+        self,
+        executor: concurrent.futures.Executor | None,
+        func: Callable[[Unpack[_Ts]], _T],
+        *args: Unpack[_Ts],
+    ) -> asyncio.Future[_T]:
+        if asyncio.iscoroutine(func) or inspect.iscoroutinefunction(func):
+            raise TypeError("coroutines cannot be used with run_in_executor()")
+        if self.is_closed():
+            raise RuntimeError("Event loop is closed")
+
+        if executor is None:
+            executor = self._default_executor
+            if executor is None:
+                # The loop's own worker threads, without going through call_soon_threadsafe
+                return self._run_in_thread_pool(func, *args)
+
+        return asyncio.wrap_future(executor.submit(func, *args), loop=self)
+
+    def set_default_executor(self, executor: concurrent.futures.ThreadPoolExecutor) -> None:
+        if not isinstance(executor, concurrent.futures.ThreadPoolExecutor):
+            raise TypeError("executor must be ThreadPoolExecutor")
+        self._default_executor = executor
+
+    async def shutdown_default_executor(self, timeout: float | None = None) -> None:
+        # The worker threads of the loop are joined when it's closed
+        executor = self._default_executor
+        if executor is None:
+            return
+
+        self._default_executor = None
+        try:
+            await asyncio.wait_for(self._run_in_thread_pool(executor.shutdown), timeout)
+        except TimeoutError:
+            warnings.warn(
+                "The executor did not finishing joining "
+                f"its threads within {timeout} seconds.",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+            executor.shutdown(wait=False)
 
     async def shutdown_asyncgens(self) -> None:
         await self._shutdown_asyncgenerators(self._asyncgens)
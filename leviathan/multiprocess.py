@@ -0,0 +1,358 @@
+from .loop import Loop, ThreadSafeLoop
+
+from typing import Any, Callable
+from dataclasses import dataclass
+from logging import getLogger
+
+import asyncio, os, signal, socket, time, traceback
+
+logger = getLogger(__package__)
+
+DEFAULT_SHUTDOWN_TIMEOUT = 30.0
+# Workers that die sooner than this after being started wait restart_delay before coming back,
+# so a worker that can't start doesn't turn into a fork loop
+MIN_WORKER_LIFETIME = 1.0
+DEFAULT_RESTART_DELAY = 1.0
+# Time given to the workers on top of shutdown_timeout before they are killed
+KILL_GRACE_PERIOD = 5.0
+
+_STOP_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+
+def _bind_socket(family: int, address: Any, reuse_address: bool) -> socket.socket:
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    try:
+        if reuse_address:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, True)
+        # Every worker has its own listening socket and the kernel spreads the connections among them
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, True)
+        if family == socket.AF_INET6:
+            sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, True)
+        sock.bind(address)
+    except:
+        sock.close()
+        raise
+    return sock
+
+
+async def _serve_worker(
+    loop: Loop | ThreadSafeLoop,
+    protocol_factory: Callable[[], asyncio.BaseProtocol],
+    addresses: list[tuple[int, Any]],
+    backlog: int,
+    reuse_address: bool,
+    shutdown_timeout: float,
+    ready_fd: int,
+) -> None:
+    stopping = loop.create_future()
+
+    def stop() -> None:
+        if not stopping.done():
+            stopping.set_result(None)
+
+    for sig in _STOP_SIGNALS:
+        loop.add_signal_handler(sig, stop)
+
+    servers = []
+    try:
+        for family, address in addresses:
+            sock = _bind_socket(family, address, reuse_address)
+            servers.append(await loop.create_server(protocol_factory, sock=sock, backlog=backlog))
+
+        # The supervisor waits for this before retiring the worker this one replaces
+        os.write(ready_fd, b"\x01")
+        os.close(ready_fd)
+
+        await stopping
+    finally:
+        # New connections go to the other workers from now on, the current ones get shutdown_timeout
+        # to finish before they are aborted
+        for server in servers:
+            server.close()
+
+        waiters = [loop.create_task(server.wait_closed()) for server in servers]
+        if waiters:
+            _, pending = await asyncio.wait(waiters, timeout=shutdown_timeout)
+            if pending:
+                for server in servers:
+                    server.abort_clients()
+                await asyncio.wait(pending)
+
+
+def _run_worker(
+    loop_factory: Callable[[], Loop | ThreadSafeLoop],
+    protocol_factory: Callable[[], asyncio.BaseProtocol],
+    addresses: list[tuple[int, Any]],
+    backlog: int,
+    reuse_address: bool,
+    shutdown_timeout: float,
+    ready_fd: int,
+) -> int:
+    loop = loop_factory()
+    try:
+        loop.run_until_complete(_serve_worker(
+            loop, protocol_factory, addresses, backlog, reuse_address, shutdown_timeout, ready_fd
+        ))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+    finally:
+        loop.close()
+    return 0
+
+
+@dataclass
+class _Worker:
+    slot: int
+    pid: int
+    pidfd: int
+    # Read end of the pipe the worker writes to once it's serving, -1 after that
+    ready_fd: int
+    start_time: float
+    # Told to stop because a new worker took its slot
+    retiring: bool = False
+
+
+class _Supervisor:
+    def __init__(
+        self,
+        loop: Loop,
+        workers: int,
+        start_worker: Callable[[int], int],
+        shutdown_timeout: float,
+        restart_delay: float,
+    ) -> None:
+        self._loop = loop
+        self._workers_num = workers
+        self._start_worker = start_worker
+        self._shutdown_timeout = shutdown_timeout
+        self._restart_delay = restart_delay
+
+        # pid -> worker, retiring workers and replacements included
+        self._workers: dict[int, _Worker] = {}
+        # slot -> worker serving it
+        self._slots: dict[int, _Worker] = {}
+        self._restart_handles: dict[int, asyncio.TimerHandle] = {}
+        self._kill_handle: asyncio.TimerHandle | None = None
+        self._stopping = False
+        self._stopped: asyncio.Future[None] = loop.create_future()
+
+        # Rolling restart: slots still to be replaced and the worker that is starting for the current one
+        self._restart_queue: list[int] = []
+        self._replacement: _Worker | None = None
+
+    async def run(self) -> None:
+        loop = self._loop
+        for sig in _STOP_SIGNALS:
+            loop.add_signal_handler(sig, self.stop)
+        loop.add_signal_handler(signal.SIGHUP, self.restart)
+
+        try:
+            for slot in range(self._workers_num):
+                self._slots[slot] = self._fork_worker(slot)
+            await self._stopped
+        finally:
+            if self._kill_handle is not None:
+                self._kill_handle.cancel()
+            for sig in (*_STOP_SIGNALS, signal.SIGHUP):
+                loop.remove_signal_handler(sig)
+
+    def _fork_worker(self, slot: int) -> _Worker:
+        ready_r, ready_w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 1
+            try:
+                # Nothing that belongs to the supervisor is used from here on, the worker only leaves
+                # through os._exit()
+                os.close(ready_r)
+                for worker in self._workers.values():
+                    os.close(worker.pidfd)
+                    if worker.ready_fd >= 0:
+                        os.close(worker.ready_fd)
+                exit_code = self._start_worker(ready_w)
+            except BaseException:
+                traceback.print_exc()
+            finally:
+                os._exit(exit_code)
+
+        os.close(ready_w)
+        pidfd = os.pidfd_open(pid)
+        worker = _Worker(slot, pid, pidfd, ready_r, time.monotonic())
+        self._workers[pid] = worker
+        self._loop.add_reader(pidfd, self._worker_exited, worker)
+        self._loop.add_reader(ready_r, self._worker_ready, worker)
+        return worker
+
+    def _spawn(self, slot: int) -> None:
+        self._restart_handles.pop(slot, None)
+        if self._stopping:
+            return
+
+        self._slots[slot] = self._fork_worker(slot)
+
+    def _close_ready_fd(self, worker: _Worker) -> None:
+        if worker.ready_fd < 0:
+            return
+
+        self._loop.remove_reader(worker.ready_fd)
+        os.close(worker.ready_fd)
+        worker.ready_fd = -1
+
+    def _worker_ready(self, worker: _Worker) -> None:
+        # Nothing to read means the worker died before serving, _worker_exited takes care of it
+        ready = os.read(worker.ready_fd, 1) != b""
+        self._close_ready_fd(worker)
+        if not ready or worker is not self._replacement:
+            return
+
+        # The new worker is serving, only now the one it replaces stops accepting connections
+        self._replacement = None
+        old_worker = self._slots.get(worker.slot)
+        self._slots[worker.slot] = worker
+        if old_worker is not None:
+            self._retire(old_worker)
+        self._restart_next()
+
+    def _retire(self, worker: _Worker) -> None:
+        worker.retiring = True
+        try:
+            os.kill(worker.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def _worker_exited(self, worker: _Worker) -> None:
+        del self._workers[worker.pid]
+        self._close_ready_fd(worker)
+        self._loop.remove_reader(worker.pidfd)
+        os.close(worker.pidfd)
+        _, status = os.waitpid(worker.pid, 0)
+        exit_code = os.waitstatus_to_exitcode(status)
+
+        slot = worker.slot
+        if self._slots.get(slot) is worker:
+            del self._slots[slot]
+
+        if self._stopping:
+            if not self._workers and not self._stopped.done():
+                self._stopped.set_result(None)
+            return
+
+        if worker.retiring:
+            return
+
+        if worker is self._replacement:
+            # The worker it was going to replace keeps serving
+            logger.warning(
+                "Replacement for worker %d (pid %d) exited with code %d before serving",
+                slot, worker.pid, exit_code
+            )
+            self._replacement = None
+            if slot not in self._slots:
+                # Its worker crashed meanwhile, the slot can't be left empty
+                self._restart_handles[slot] = self._loop.call_later(self._restart_delay, self._spawn, slot)
+            self._restart_next()
+            return
+
+        delay = 0.0
+        if exit_code != 0:
+            logger.warning("Worker %d (pid %d) exited with code %d, restarting it", slot, worker.pid, exit_code)
+            if time.monotonic() - worker.start_time < MIN_WORKER_LIFETIME:
+                delay = self._restart_delay
+
+        replacement = self._replacement
+        if replacement is not None and replacement.slot == slot:
+            # The worker being started for this slot takes its place
+            return
+        self._restart_handles[slot] = self._loop.call_later(delay, self._spawn, slot)
+
+    def restart(self) -> None:
+        if self._stopping:
+            return
+
+        # Workers are replaced one slot at a time, a new one is serving before the old one is told to stop
+        queued = set(self._restart_queue)
+        self._restart_queue.extend(slot for slot in range(self._workers_num) if slot not in queued)
+        if self._replacement is None:
+            self._restart_next()
+
+    def _restart_next(self) -> None:
+        if self._stopping or not self._restart_queue:
+            return
+
+        slot = self._restart_queue.pop(0)
+        # A slot waiting for a restart after a crash is filled by the replacement
+        handle = self._restart_handles.pop(slot, None)
+        if handle is not None:
+            handle.cancel()
+        self._replacement = self._fork_worker(slot)
+
+    def _forward_signal(self, sig: int) -> None:
+        for pid in self._workers:
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                pass
+
+    def stop(self) -> None:
+        if self._stopping:
+            return
+
+        self._stopping = True
+        self._restart_queue.clear()
+        self._replacement = None
+        for handle in self._restart_handles.values():
+            handle.cancel()
+        self._restart_handles.clear()
+
+        if not self._workers:
+            self._stopped.set_result(None)
+            return
+
+        self._forward_signal(signal.SIGTERM)
+        self._kill_handle = self._loop.call_later(
+            self._shutdown_timeout + KILL_GRACE_PERIOD, self._forward_signal, signal.SIGKILL
+        )
+
+
+def serve_multiprocess(
+    protocol_factory: Callable[[], asyncio.BaseProtocol],
+    host: str | list[str] | None = None,
+    port: int | None = None,
+    *,
+    workers: int | None = None,
+    family: int = socket.AF_UNSPEC,
+    backlog: int = 100,
+    reuse_address: bool | None = None,
+    shutdown_timeout: float = DEFAULT_SHUTDOWN_TIMEOUT,
+    restart_delay: float = DEFAULT_RESTART_DELAY,
+    loop_factory: Callable[[], Loop | ThreadSafeLoop] = Loop,
+) -> None:
+    if workers is None:
+        workers = len(os.sched_getaffinity(0))
+    elif workers < 1:
+        raise ValueError("workers must be at least 1")
+    if reuse_address is None:
+        reuse_address = os.name == "posix"
+
+    loop = Loop()
+    try:
+        # The addresses are resolved and bound once here, so every worker listens on the same ones even
+        # with port 0. These sockets never listen, they only keep the addresses while workers come and go.
+        server = loop.run_until_complete(loop.create_server(
+            protocol_factory, host, port, family=family, backlog=backlog,
+            reuse_address=reuse_address, reuse_port=True, start_serving=False
+        ))
+        try:
+            addresses = [(sock.family, sock.getsockname()) for sock in server.sockets]
+            supervisor = _Supervisor(
+                loop, workers,
+                lambda ready_fd: _run_worker(
+                    loop_factory, protocol_factory, addresses, backlog, reuse_address, shutdown_timeout,
+                    ready_fd
+                ),
+                shutdown_timeout, restart_delay,
+            )
+            loop.run_until_complete(supervisor.run())
+        finally:
+            server.close()
+    finally:
+        loop.close()
@@ -0,0 +1,490 @@
+from typing import Any, Callable, TYPE_CHECKING
+from logging import getLogger
+
+import asyncio, collections, os, signal, subprocess
+
+if TYPE_CHECKING:
+    from .loop import Loop, ThreadSafeLoop
+
+logger = getLogger(__package__)
+
+# Default capacity of a pipe, a single read can't return more than this
+PIPE_READ_SIZE = 64 * 1024
+
+DEFAULT_HIGH_WATER_MARK = 64 * 1024
+
+
+class _ReadPipeTransport(asyncio.ReadTransport):
+    def __init__(
+        self,
+        loop: "Loop | ThreadSafeLoop",
+        pipe: Any,
+        protocol: "_SubprocessPipeProtocol",
+    ) -> None:
+        super().__init__({"pipe": pipe})
+        self._loop = loop
+        self._pipe = pipe
+        self._protocol = protocol
+        self._closing = False
+        self._paused = False
+        self._resume_waiter: asyncio.Future[None] | None = None
+
+        # The pipe stays blocking, io_uring would hand back EAGAIN instead of waiting for it otherwise
+        self._read_task = loop.create_task(self._read_pipe())
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} fd={self._pipe.fileno() if not self._closing else None}>"
+
+    async def _read_pipe(self) -> None:
+        loop = self._loop
+        protocol = self._protocol
+        exception: BaseException | None = None
+        try:
+            while True:
+                # Reads are done straight on the ring, the pipe isn't polled first
+                data: bytes = await loop.file_read(self._pipe, PIPE_READ_SIZE)  # type: ignore
+                if not data:
+                    break
+
+                protocol.data_received(data)
+                if self._paused:
+                    self._resume_waiter = loop.create_future()
+                    await self._resume_waiter
+        except asyncio.CancelledError:
+            if not self._closing:
+                raise
+        except OSError as exc:
+            exception = exc
+        finally:
+            self._resume_waiter = None
+
+        self._close(exception)
+
+    def _close(self, exception: BaseException | None) -> None:
+        self._closing = True
+        pipe = self._pipe
+        self._pipe = None
+        if pipe is not None:
+            pipe.close()
+            self._loop.call_soon(self._protocol.connection_lost, exception)
+
+    def is_reading(self) -> bool:
+        return not self._paused and not self._closing
+
+    def pause_reading(self) -> None:
+        self._paused = True
+
+    def resume_reading(self) -> None:
+        if not self._paused:
+            return
+
+        self._paused = False
+        waiter = self._resume_waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def set_protocol(self, protocol: asyncio.BaseProtocol) -> None:
+        self._protocol = protocol  # type: ignore
+
+    def get_protocol(self) -> asyncio.BaseProtocol:
+        return self._protocol
+
+    def is_closing(self) -> bool:
+        return self._closing
+
+    def close(self) -> None:
+        if self._closing:
+            return
+
+        self._closing = True
+        # Cancelling the pending read cancels its operation on the ring
+        self._read_task.cancel()
+
+
+class _WritePipeTransport(asyncio.WriteTransport):
+    def __init__(
+        self,
+        loop: "Loop | ThreadSafeLoop",
+        pipe: Any,
+        protocol: "_SubprocessPipeProtocol",
+    ) -> None:
+        super().__init__({"pipe": pipe})
+        self._loop = loop
+        self._pipe = pipe
+        self._fileno: int = pipe.fileno()
+        self._protocol = protocol
+
+        # New data is coalesced here while the previous write is in flight
+        self._buffer = bytearray()
+        self._in_flight = 0
+        self._write_task: asyncio.Task[None] | None = None
+
+        self._high_water = DEFAULT_HIGH_WATER_MARK
+        self._low_water = DEFAULT_HIGH_WATER_MARK // 4
+        self._protocol_paused = False
+
+        self._eof = False
+        self._closing = False
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} fd={self._fileno if self._pipe is not None else None}>"
+
+    def get_write_buffer_size(self) -> int:
+        return self._in_flight + len(self._buffer)
+
+    def get_write_buffer_limits(self) -> tuple[int, int]:
+        return self._low_water, self._high_water
+
+    def set_write_buffer_limits(self, high: int | None = None, low: int | None = None) -> None:
+        if high is None:
+            high = DEFAULT_HIGH_WATER_MARK if low is None else 4 * low
+        if low is None:
+            low = high // 4
+        if not high >= low >= 0:
+            raise ValueError(f"high ({high!r}) must be >= low ({low!r}) must be >= 0")
+
+        self._high_water = high
+        self._low_water = low
+        self._maybe_pause_protocol()
+
+    def _maybe_pause_protocol(self) -> None:
+        if self._protocol_paused or self.get_write_buffer_size() <= self._high_water:
+            return
+
+        self._protocol_paused = True
+        try:
+            self._protocol.pause_writing()
+        except (SystemExit, KeyboardInterrupt):
+            raise
+        except BaseException as exc:
+            self._loop.call_exception_handler({
+                "message": "protocol.pause_writing() failed",
+                "exception": exc,
+                "transport": self,
+                "protocol": self._protocol,
+            })
+
+    def _maybe_resume_protocol(self) -> None:
+        if not self._protocol_paused or self.get_write_buffer_size() > self._low_water:
+            return
+
+        self._protocol_paused = False
+        try:
+            self._protocol.resume_writing()
+        except (SystemExit, KeyboardInterrupt):
+            raise
+        except BaseException as exc:
+            self._loop.call_exception_handler({
+                "message": "protocol.resume_writing() failed",
+                "exception": exc,
+                "transport": self,
+                "protocol": self._protocol,
+            })
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        if self._eof:
+            raise RuntimeError("Cannot call write() after write_eof()")
+        if self._pipe is None or self._closing or not data:
+            return
+
+        self._buffer.extend(data)
+        if self._write_task is None:
+            self._write_task = self._loop.create_task(self._write_pipe())
+        self._maybe_pause_protocol()
+
+    async def _write_pipe(self) -> None:
+        loop = self._loop
+        try:
+            while self._buffer:
+                data = bytes(self._buffer)
+                self._buffer.clear()
+                self._in_flight = len(data)
+                try:
+                    # The ring waits for the pipe to have room, every byte is written before completing
+                    await loop.file_write(self._pipe, data)  # type: ignore
+                finally:
+                    self._in_flight = 0
+                self._maybe_resume_protocol()
+        except asyncio.CancelledError:
+            if self._pipe is not None:
+                raise
+            return
+        except OSError as exc:
+            self._write_task = None
+            self._force_close(exc)
+            return
+
+        self._write_task = None
+        if self._eof or self._closing:
+            self._call_connection_lost(None)
+
+    def can_write_eof(self) -> bool:
+        return True
+
+    def write_eof(self) -> None:
+        if self._eof or self._closing:
+            return
+
+        self._eof = True
+        if self._write_task is None:
+            self._call_connection_lost(None)
+
+    def is_closing(self) -> bool:
+        return self._closing
+
+    def close(self) -> None:
+        if self._closing:
+            return
+
+        self._closing = True
+        if self._write_task is None:
+            self._call_connection_lost(None)
+
+    def abort(self) -> None:
+        self._force_close(None)
+
+    def set_protocol(self, protocol: asyncio.BaseProtocol) -> None:
+        self._protocol = protocol  # type: ignore
+
+    def get_protocol(self) -> asyncio.BaseProtocol:
+        return self._protocol
+
+    def _force_close(self, exception: BaseException | None) -> None:
+        self._closing = True
+        self._buffer.clear()
+        self._call_connection_lost(exception)
+
+    def _call_connection_lost(self, exception: BaseException | None) -> None:
+        pipe = self._pipe
+        if pipe is None:
+            return
+
+        self._pipe = None
+        write_task = self._write_task
+        self._write_task = None
+        if write_task is not None:
+            write_task.cancel()
+
+        pipe.close()
+        self._loop.call_soon(self._protocol.connection_lost, exception)
+
+
+class _SubprocessPipeProtocol(asyncio.Protocol):
+    def __init__(self, transport: "SubprocessTransport", fd: int) -> None:
+        self.transport = transport
+        self.fd = fd
+        self.disconnected = False
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self.disconnected = True
+        self.transport._pipe_connection_lost(self.fd, exc)
+
+    def pause_writing(self) -> None:
+        self.transport._protocol.pause_writing()  # type: ignore
+
+    def resume_writing(self) -> None:
+        self.transport._protocol.resume_writing()  # type: ignore
+
+    def data_received(self, data: bytes) -> None:
+        self.transport._pipe_data_received(self.fd, data)
+
+
+class SubprocessTransport(asyncio.SubprocessTransport):
+    def __init__(
+        self,
+        loop: "Loop | ThreadSafeLoop",
+        protocol: asyncio.SubprocessProtocol,
+        args: Any,
+        shell: bool,
+        stdin: Any,
+        stdout: Any,
+        stderr: Any,
+        bufsize: int,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__()
+        self._loop = loop
+        self._protocol = protocol
+        self._closed = False
+        self._returncode: int | None = None
+        self._exit_waiters: list[asyncio.Future[int]] | None = []
+        self._pipes: dict[int, asyncio.BaseTransport] = {}
+        self._pipe_protocols: dict[int, _SubprocessPipeProtocol] = {}
+        # Pipe events are held until the protocol has been told about the transport
+        self._pending_calls: collections.deque[tuple[Callable[..., object], tuple[Any, ...]]] | None = (
+            collections.deque()
+        )
+        self._finished = False
+        self._pidfd = -1
+
+        self._proc: subprocess.Popen[bytes] | None = subprocess.Popen(
+            args, shell=shell, stdin=stdin, stdout=stdout, stderr=stderr,
+            universal_newlines=False, bufsize=bufsize, **kwargs
+        )
+        self._pid = self._proc.pid
+        self._extra["subprocess"] = self._proc
+
+        try:
+            # The pidfd becomes readable once the child exits, it's polled on the ring like any other fd
+            self._pidfd = os.pidfd_open(self._pid)
+            loop.add_reader(self._pidfd, self._process_ready)
+        except:
+            self.close()
+            raise
+
+    def __repr__(self) -> str:
+        info = [self.__class__.__name__]
+        if self._closed:
+            info.append("closed")
+        info.append(f"pid={self._pid}")
+        if self._returncode is not None:
+            info.append(f"returncode={self._returncode}")
+        else:
+            info.append("running")
+        return "<{}>".format(" ".join(info))
+
+    def _connect_pipes(self) -> None:
+        proc = self._proc
+        assert proc is not None
+
+        for fd, pipe in enumerate((proc.stdin, proc.stdout, proc.stderr)):
+            if pipe is None:
+                continue
+
+            pipe_protocol = _SubprocessPipeProtocol(self, fd)
+            self._pipe_protocols[fd] = pipe_protocol
+            if fd == 0:
+                self._pipes[fd] = _WritePipeTransport(self._loop, pipe, pipe_protocol)
+            else:
+                self._pipes[fd] = _ReadPipeTransport(self._loop, pipe, pipe_protocol)
+
+    def _start(self) -> None:
+        self._connect_pipes()
+        self._protocol.connection_made(self)
+
+        pending_calls = self._pending_calls
+        self._pending_calls = None
+        assert pending_calls is not None
+        for callback, data in pending_calls:
+            self._loop.call_soon(callback, *data)
+
+    def _process_ready(self) -> None:
+        loop = self._loop
+        loop.remove_reader(self._pidfd)
+        os.close(self._pidfd)
+        self._pidfd = -1
+
+        try:
+            _, status = os.waitpid(self._pid, 0)
+            returncode = os.waitstatus_to_exitcode(status)
+        except ChildProcessError:
+            # Somebody else reaped the child, its status is lost
+            returncode = 255
+            logger.warning("Unknown child process pid %d, will report returncode 255", self._pid)
+
+        self._process_exited(returncode)
+
+    def _call(self, callback: Callable[..., object], *data: Any) -> None:
+        if self._pending_calls is not None:
+            self._pending_calls.append((callback, data))
+        else:
+            self._loop.call_soon(callback, *data)
+
+    def _pipe_connection_lost(self, fd: int, exc: Exception | None) -> None:
+        self._call(self._protocol.pipe_connection_lost, fd, exc)
+        self._try_finish()
+
+    def _pipe_data_received(self, fd: int, data: bytes) -> None:
+        self._call(self._protocol.pipe_data_received, fd, data)
+
+    def _process_exited(self, returncode: int) -> None:
+        self._returncode = returncode
+        if self._proc is not None and self._proc.returncode is None:
+            # Popen complains about children it didn't reap itself otherwise
+            self._proc.returncode = returncode
+        self._call(self._protocol.process_exited)
+
+        self._try_finish()
+
+    def _try_finish(self) -> None:
+        if self._finished or self._returncode is None:
+            return
+
+        if all(protocol.disconnected for protocol in self._pipe_protocols.values()):
+            self._finished = True
+            self._call(self._call_connection_lost, None)
+
+    def _call_connection_lost(self, exc: Exception | None) -> None:
+        try:
+            self._protocol.connection_lost(exc)
+        finally:
+            exit_waiters = self._exit_waiters or []
+            self._exit_waiters = None
+            for waiter in exit_waiters:
+                if not waiter.cancelled():
+                    waiter.set_result(self._returncode)  # type: ignore
+            self._proc = None
+
+    async def _wait(self) -> int:
+        if self._returncode is not None:
+            return self._returncode
+
+        waiter: asyncio.Future[int] = self._loop.create_future()
+        assert self._exit_waiters is not None
+        self._exit_waiters.append(waiter)
+        return await waiter
+
+    def get_pid(self) -> int:
+        return self._pid
+
+    def get_returncode(self) -> int | None:
+        return self._returncode
+
+    def get_pipe_transport(self, fd: int) -> asyncio.BaseTransport | None:
+        return self._pipes.get(fd)
+
+    def set_protocol(self, protocol: asyncio.BaseProtocol) -> None:
+        self._protocol = protocol  # type: ignore
+
+    def get_protocol(self) -> asyncio.BaseProtocol:
+        return self._protocol
+
+    def is_closing(self) -> bool:
+        return self._closed
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+
+        for pipe in self._pipes.values():
+            pipe.close()
+
+        proc = self._proc
+        if proc is not None and self._returncode is None:
+            # Popen.poll() isn't used, it would reap the child behind the pidfd's back
+            try:
+                proc.kill()
+            except (ProcessLookupError, PermissionError):
+                pass
+
+            if self._pidfd < 0:
+                # The pidfd couldn't be opened, nobody else is going to reap the child
+                proc.wait()
+
+    def _check_proc(self) -> None:
+        if self._proc is None:
+            raise ProcessLookupError()
+
+    def send_signal(self, signal: int) -> None:
+        self._check_proc()
+        try:
+            os.kill(self._pid, signal)
+        except ProcessLookupError:
+            pass
+
+    def terminate(self) -> None:
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self) -> None:
+        self.send_signal(signal.SIGKILL)
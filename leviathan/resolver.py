@@ -0,0 +1,523 @@
+from typing import Any, Iterable, TYPE_CHECKING
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import asyncio, functools, ipaddress, secrets, socket, struct, time
+
+if TYPE_CHECKING:
+    from .loop import Loop, ThreadSafeLoop
+
+RESOLV_CONF_PATH = "/etc/resolv.conf"
+HOSTS_PATH = "/etc/hosts"
+
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_ATTEMPTS = 2
+DEFAULT_NDOTS = 1
+
+DNS_PORT = 53
+MAX_UDP_MESSAGE_SIZE = 4096
+
+TYPE_A = 1
+TYPE_CNAME = 5
+TYPE_PTR = 12
+TYPE_AAAA = 28
+CLASS_IN = 1
+
+RCODE_NOERROR = 0
+RCODE_NXDOMAIN = 3
+
+_FLAG_QR = 0x8000
+_FLAG_TC = 0x0200
+_FLAG_RD = 0x0100
+
+_HEADER = struct.Struct("!HHHHHH")
+_RECORD = struct.Struct("!HHIH")
+
+
+class DNSError(Exception):
+    pass
+
+
+class NameNotFound(DNSError):
+    pass
+
+
+@dataclass(slots=True)
+class _Answer:
+    addresses: list[str]
+    canonical_name: str
+    ttl: int
+
+
+@dataclass(slots=True)
+class _Config:
+    nameservers: list[tuple[str, int]]
+    search: list[str]
+    ndots: int
+    timeout: float
+    attempts: int
+
+
+def _read_resolv_conf(path: str) -> _Config:
+    config = _Config([], [], DEFAULT_NDOTS, DEFAULT_TIMEOUT, DEFAULT_ATTEMPTS)
+    try:
+        with open(path) as file:
+            lines = file.readlines()
+    except OSError:
+        return config
+
+    for line in lines:
+        fields = line.split("#", 1)[0].split(";", 1)[0].split()
+        if not fields:
+            continue
+
+        match fields[0]:
+            case "nameserver" if len(fields) > 1:
+                config.nameservers.append((fields[1], DNS_PORT))
+            case "domain" if len(fields) > 1:
+                config.search = [fields[1]]
+            case "search":
+                config.search = fields[1:]
+            case "options":
+                for option in fields[1:]:
+                    name, _, value = option.partition(":")
+                    if not value.isdigit():
+                        continue
+                    if name == "ndots":
+                        config.ndots = min(int(value), 15)
+                    elif name == "timeout":
+                        config.timeout = float(max(int(value), 1))
+                    elif name == "attempts":
+                        config.attempts = max(int(value), 1)
+
+    return config
+
+
+def _read_hosts(path: str) -> tuple[dict[str, list[str]], dict[str, str]]:
+    names: dict[str, list[str]] = {}
+    addresses: dict[str, str] = {}
+    try:
+        with open(path) as file:
+            lines = file.readlines()
+    except OSError:
+        return names, addresses
+
+    for line in lines:
+        fields = line.split("#", 1)[0].split()
+        if len(fields) < 2:
+            continue
+
+        try:
+            address = str(ipaddress.ip_address(fields[0].split("%", 1)[0]))
+        except ValueError:
+            continue
+
+        for name in fields[1:]:
+            names.setdefault(name.lower(), []).append(address)
+        addresses.setdefault(address, fields[1])
+
+    return names, addresses
+
+
+def _encode_name(name: str) -> bytes:
+    encoded = bytearray()
+    for label in name.rstrip(".").split("."):
+        if not label:
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+
+        label_bytes = label.encode("idna")
+        if len(label_bytes) > 63:
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        encoded.append(len(label_bytes))
+        encoded.extend(label_bytes)
+
+    encoded.append(0)
+    return bytes(encoded)
+
+
+def _decode_name(message: bytes, offset: int) -> tuple[str, int]:
+    labels: list[str] = []
+    end_offset = -1
+    # Every pointer has to go backwards, otherwise the message is looping
+    limit = offset
+    while True:
+        length = message[offset]
+        if length & 0xC0 == 0xC0:
+            pointer = ((length & 0x3F) << 8) | message[offset + 1]
+            if pointer >= limit:
+                raise DNSError("invalid name compression")
+
+            if end_offset < 0:
+                end_offset = offset + 2
+            offset = limit = pointer
+            continue
+
+        offset += 1
+        if length == 0:
+            break
+
+        labels.append(message[offset:offset + length].decode("ascii", "replace"))
+        offset += length
+
+    return ".".join(labels), end_offset if end_offset >= 0 else offset
+
+
+# Every query gets its own random ID, the next one can't be guessed from those seen before
+def _new_query_id() -> int:
+    return secrets.randbits(16)
+
+
+def _build_query(query_id: int, name: str, qtype: int) -> bytes:
+    return _HEADER.pack(query_id, _FLAG_RD, 1, 0, 0, 0) + _encode_name(name) + struct.pack(
+        "!HH", qtype, CLASS_IN
+    )
+
+
+# Returns None if the message isn't the response to the query
+def _parse_response(message: bytes, query_id: int, name: str, qtype: int) -> _Answer | None:
+    try:
+        response_id, flags, qdcount, ancount, _, _ = _HEADER.unpack_from(message)
+        if response_id != query_id or not flags & _FLAG_QR or qdcount != 1:
+            return None
+
+        question_name, offset = _decode_name(message, _HEADER.size)
+        if question_name.lower() != name.rstrip(".").lower():
+            return None
+        if struct.unpack_from("!HH", message, offset) != (qtype, CLASS_IN):
+            return None
+        offset += 4
+
+        rcode = flags & 0xF
+        if rcode == RCODE_NXDOMAIN:
+            raise NameNotFound(name)
+        if rcode != RCODE_NOERROR:
+            raise DNSError(f"server failure (rcode {rcode})")
+
+        addresses: list[str] = []
+        canonical_name = question_name
+        ttl: int | None = None
+        for _ in range(ancount):
+            _, offset = _decode_name(message, offset)
+            rtype, rclass, rttl, rdlength = _RECORD.unpack_from(message, offset)
+            offset += _RECORD.size
+            rdata_offset = offset
+            offset += rdlength
+            if offset > len(message):
+                raise DNSError("truncated record")
+
+            if rclass != CLASS_IN or rtype not in (qtype, TYPE_CNAME):
+                continue
+
+            ttl = rttl if ttl is None else min(ttl, rttl)
+            if rtype == TYPE_CNAME:
+                canonical_name, _ = _decode_name(message, rdata_offset)
+            elif rtype == TYPE_A and rdlength == 4:
+                addresses.append(socket.inet_ntop(socket.AF_INET, message[rdata_offset:offset]))
+            elif rtype == TYPE_AAAA and rdlength == 16:
+                addresses.append(socket.inet_ntop(socket.AF_INET6, message[rdata_offset:offset]))
+            elif rtype == TYPE_PTR:
+                ptr_name, _ = _decode_name(message, rdata_offset)
+                addresses.append(ptr_name)
+    except (IndexError, struct.error) as exc:
+        raise DNSError("malformed response") from exc
+
+    return _Answer(addresses, canonical_name, ttl or 0)
+
+
+def _reverse_pointer(address: str) -> str:
+    return ipaddress.ip_address(address.split("%", 1)[0]).reverse_pointer
+
+
+# Stub resolver running its queries on the loop, answers are kept in a LRU cache until their TTL expires.
+# Names are looked up in the hosts file first, the rest is asked to the nameservers from resolv.conf.
+class Resolver:
+    def __init__(
+        self,
+        loop: "Loop | ThreadSafeLoop",
+        *,
+        nameservers: Iterable[str | tuple[str, int]] | None = None,
+        search: Iterable[str] | None = None,
+        ndots: int | None = None,
+        timeout: float | None = None,
+        attempts: int | None = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        resolv_conf_path: str = RESOLV_CONF_PATH,
+        hosts_path: str | None = HOSTS_PATH,
+    ) -> None:
+        if cache_size < 0:
+            raise ValueError("cache_size must be a non-negative integer")
+
+        config = _read_resolv_conf(resolv_conf_path)
+        if nameservers is not None:
+            config.nameservers = [
+                (nameserver, DNS_PORT) if isinstance(nameserver, str) else nameserver
+                for nameserver in nameservers
+            ]
+        if search is not None:
+            config.search = list(search)
+        if ndots is not None:
+            config.ndots = ndots
+        if timeout is not None:
+            config.timeout = timeout
+        if attempts is not None:
+            config.attempts = max(attempts, 1)
+
+        self._loop = loop
+        self._config = config
+        self._hosts, self._hosts_addresses = (
+            _read_hosts(hosts_path) if hosts_path is not None else ({}, {})
+        )
+
+        self._cache: OrderedDict[tuple[str, int], tuple[float, _Answer]] = OrderedDict()
+        self._cache_size = cache_size
+        self._pending: dict[tuple[str, int], asyncio.Task[_Answer]] = {}
+
+    @property
+    def nameservers(self) -> list[tuple[str, int]]:
+        return list(self._config.nameservers)
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    def _cache_get(self, key: tuple[str, int]) -> _Answer | None:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+
+        expires_at, answer = entry
+        if expires_at <= time.monotonic():
+            del self._cache[key]
+            return None
+
+        self._cache.move_to_end(key)
+        return answer
+
+    def _cache_put(self, key: tuple[str, int], answer: _Answer) -> None:
+        if answer.ttl <= 0 or self._cache_size == 0:
+            return
+
+        self._cache[key] = (time.monotonic() + answer.ttl, answer)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    async def _exchange_udp(
+        self, nameserver: tuple[str, int], query: bytes, query_id: int, name: str, qtype: int
+    ) -> _Answer | None:
+        loop = self._loop
+        family = socket.AF_INET6 if ":" in nameserver[0] else socket.AF_INET
+        with socket.socket(family, socket.SOCK_DGRAM) as sock:
+            sock.setblocking(False)
+            sock.connect(nameserver)
+            await loop.sock_sendall(sock, query)
+
+            async def receive() -> _Answer | None:
+                while True:
+                    message = await loop.sock_recv(sock, MAX_UDP_MESSAGE_SIZE)
+                    if len(message) < _HEADER.size:
+                        continue
+
+                    # Truncated answers are asked again over TCP
+                    if _HEADER.unpack_from(message)[1] & _FLAG_TC:
+                        return None
+
+                    answer = _parse_response(message, query_id, name, qtype)
+                    if answer is not None:
+                        return answer
+
+            return await asyncio.wait_for(receive(), self._config.timeout)
+
+    async def _exchange_tcp(
+        self, nameserver: tuple[str, int], query: bytes, query_id: int, name: str, qtype: int
+    ) -> _Answer:
+        loop = self._loop
+        family = socket.AF_INET6 if ":" in nameserver[0] else socket.AF_INET
+        with socket.socket(family, socket.SOCK_STREAM) as sock:
+            sock.setblocking(False)
+
+            async def exchange() -> _Answer:
+                await loop.sock_connect(sock, nameserver)
+                await loop.sock_sendall(sock, struct.pack("!H", len(query)) + query)
+
+                data = bytearray()
+                while len(data) < 2 or len(data) < 2 + struct.unpack_from("!H", data)[0]:
+                    chunk = await loop.sock_recv(sock, MAX_UDP_MESSAGE_SIZE)
+                    if not chunk:
+                        raise DNSError("connection closed by the nameserver")
+                    data.extend(chunk)
+
+                answer = _parse_response(bytes(data[2:]), query_id, name, qtype)
+                if answer is None:
+                    raise DNSError("unexpected response")
+                return answer
+
+            return await asyncio.wait_for(exchange(), self._config.timeout)
+
+    async def _query_nameservers(self, name: str, qtype: int) -> _Answer:
+        config = self._config
+        if not config.nameservers:
+            raise DNSError("no nameservers configured")
+
+        last_error: Exception = DNSError("no answer")
+        for _ in range(config.attempts):
+            for nameserver in config.nameservers:
+                query_id = _new_query_id()
+                query = _build_query(query_id, name, qtype)
+                try:
+                    answer = await self._exchange_udp(nameserver, query, query_id, name, qtype)
+                    if answer is None:
+                        answer = await self._exchange_tcp(nameserver, query, query_id, name, qtype)
+                    return answer
+                except NameNotFound:
+                    raise
+                except (DNSError, OSError, TimeoutError) as exc:
+                    last_error = exc
+
+        raise last_error
+
+    def _query_done(self, key: tuple[str, int], task: asyncio.Task[_Answer]) -> None:
+        del self._pending[key]
+        if not task.cancelled() and task.exception() is None:
+            self._cache_put(key, task.result())
+
+    async def _query(self, name: str, qtype: int) -> _Answer:
+        key = (name.lower(), qtype)
+        answer = self._cache_get(key)
+        if answer is not None:
+            return answer
+
+        # Concurrent lookups of the same name share the query, which outlives the cancelled ones
+        task = self._pending.get(key)
+        if task is None:
+            task = self._loop.create_task(self._query_nameservers(name, qtype))
+            self._pending[key] = task
+            task.add_done_callback(functools.partial(self._query_done, key))
+
+        return await asyncio.shield(task)
+
+    def _candidate_names(self, name: str) -> list[str]:
+        if name.endswith("."):
+            return [name]
+
+        config = self._config
+        searched = [f"{name}.{domain.strip('.')}" for domain in config.search if domain.strip(".")]
+        if name.count(".") >= config.ndots:
+            return [name, *searched]
+        return [*searched, name]
+
+    async def _resolve_name(self, name: str, qtypes: list[int]) -> tuple[list[str], str]:
+        not_found = True
+        for candidate in self._candidate_names(name):
+            addresses: list[str] = []
+            canonical_name = candidate
+            for qtype in qtypes:
+                try:
+                    answer = await self._query(candidate, qtype)
+                except NameNotFound:
+                    continue
+
+                not_found = False
+                addresses.extend(answer.addresses)
+                if answer.addresses:
+                    canonical_name = answer.canonical_name
+
+            if addresses:
+                return addresses, canonical_name
+
+        if not_found:
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        raise socket.gaierror(socket.EAI_NODATA, "No address associated with hostname")
+
+    # Returns the addresses of host and its canonical name
+    async def resolve(self, host: str, family: int = socket.AF_UNSPEC) -> tuple[list[str], str]:
+        wanted_families = (
+            (socket.AF_INET, socket.AF_INET6) if family == socket.AF_UNSPEC else (family,)
+        )
+
+        hosts_addresses = self._hosts.get(host.rstrip(".").lower())
+        if hosts_addresses is not None:
+            addresses = [
+                address for address in hosts_addresses
+                if (socket.AF_INET6 if ":" in address else socket.AF_INET) in wanted_families
+            ]
+            if addresses:
+                return addresses, host
+
+        # IPv4 goes first, connections are attempted one address after the other
+        qtypes = [
+            qtype for qtype, qfamily in ((TYPE_A, socket.AF_INET), (TYPE_AAAA, socket.AF_INET6))
+            if qfamily in wanted_families
+        ]
+        if not qtypes:
+            raise socket.gaierror(socket.EAI_FAMILY, "ai_family not supported")
+
+        try:
+            return await self._resolve_name(host, qtypes)
+        except (DNSError, OSError, TimeoutError) as exc:
+            if isinstance(exc, socket.gaierror):
+                raise
+            raise socket.gaierror(
+                socket.EAI_AGAIN, "Temporary failure in name resolution"
+            ) from exc
+
+    async def getaddrinfo(
+        self,
+        host: bytes | str | None,
+        port: bytes | str | int | None,
+        *,
+        family: int = 0,
+        type: int = 0,
+        proto: int = 0,
+        flags: int = 0,
+    ) -> list[tuple[Any, ...]]:
+        if isinstance(host, bytes):
+            host = host.decode("idna")
+
+        # Numeric hosts and local addresses never need a lookup
+        try:
+            return socket.getaddrinfo(
+                host, port, family, type, proto, flags | socket.AI_NUMERICHOST
+            )
+        except socket.gaierror as exc:
+            if host is None or exc.errno != socket.EAI_NONAME or flags & socket.AI_NUMERICHOST:
+                raise
+
+        addresses, canonical_name = await self.resolve(host, family)
+
+        infos: list[tuple[Any, ...]] = []
+        numeric_flags = (flags & ~socket.AI_CANONNAME) | socket.AI_NUMERICHOST
+        for address in addresses:
+            address_family = socket.AF_INET6 if ":" in address else socket.AF_INET
+            infos.extend(
+                socket.getaddrinfo(address, port, address_family, type, proto, numeric_flags)
+            )
+
+        if infos and flags & socket.AI_CANONNAME:
+            infos[0] = (*infos[0][:3], canonical_name.rstrip("."), infos[0][4])
+        return infos
+
+    async def getnameinfo(self, sockaddr: tuple[Any, ...], flags: int = 0) -> tuple[str, str]:
+        numeric_host, service = socket.getnameinfo(sockaddr, flags | socket.NI_NUMERICHOST)
+        if flags & socket.NI_NUMERICHOST:
+            return numeric_host, service
+
+        address = numeric_host.split("%", 1)[0]
+        name = self._hosts_addresses.get(address)
+        if name is None:
+            try:
+                answer = await self._query(_reverse_pointer(address), TYPE_PTR)
+            except (DNSError, OSError, TimeoutError):
+                answer = None
+
+            if answer is not None and answer.addresses:
+                name = answer.addresses[0]
+
+        if name is None:
+            if flags & socket.NI_NAMEREQD:
+                raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+            return numeric_host, service
+
+        if flags & socket.NI_NOFQDN:
+            name = name.split(".", 1)[0]
+        return name, service
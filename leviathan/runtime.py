@@ -0,0 +1,172 @@
+from .loop import ThreadSafeLoop
+
+from typing import Any, Coroutine, TypeVar
+
+import asyncio, concurrent.futures, itertools, os, threading
+
+_T = TypeVar("_T")
+
+
+# Runs several loops, each one on its own thread, and hands coroutines over to them. Results cross from one
+# loop to another with call_soon_threadsafe, which other threads reach through the loop's lock-free inbox.
+class Runtime:
+    def __init__(self, n_loops: int | None = None, *, pin_threads: bool = False) -> None:
+        cpus = sorted(os.sched_getaffinity(0))
+        if n_loops is None:
+            n_loops = len(cpus)
+        elif n_loops < 1:
+            raise ValueError("n_loops must be at least 1")
+
+        self._n_loops = n_loops
+        self._cpus = cpus if pin_threads else None
+        self._loops: list[ThreadSafeLoop] = []
+        self._threads: list[threading.Thread] = []
+        self._next_loop = itertools.count()
+        self._started = False
+        self._closed = False
+
+    def __repr__(self) -> str:
+        state = "closed" if self._closed else ("running" if self._started else "idle")
+        return f"<{self.__class__.__name__} n_loops={self._n_loops} {state}>"
+
+    def __enter__(self) -> "Runtime":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._n_loops
+
+    @property
+    def loops(self) -> tuple[ThreadSafeLoop, ...]:
+        return tuple(self._loops)
+
+    def start(self) -> None:
+        if self._closed:
+            raise RuntimeError("Runtime is closed")
+        if self._started:
+            raise RuntimeError("Runtime is already started")
+
+        ready = threading.Barrier(self._n_loops + 1)
+        loops: list[ThreadSafeLoop | None] = [None] * self._n_loops
+        errors: list[BaseException] = []
+        for index in range(self._n_loops):
+            thread = threading.Thread(
+                target=self._run_loop, args=(index, loops, errors, ready),
+                name=f"leviathan-runtime-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+        ready.wait()
+        self._loops = [loop for loop in loops if loop is not None]
+        self._started = True
+        if errors:
+            self.close()
+            raise errors[0]
+
+    def _run_loop(
+        self,
+        index: int,
+        loops: list[ThreadSafeLoop | None],
+        errors: list[BaseException],
+        ready: threading.Barrier,
+    ) -> None:
+        try:
+            if self._cpus is not None:
+                os.sched_setaffinity(0, {self._cpus[index % len(self._cpus)]})
+            loop = ThreadSafeLoop()
+        except BaseException as exc:
+            errors.append(exc)
+            ready.wait()
+            return
+
+        loops[index] = loop
+        # The loop only reports itself as ready once it runs, otherwise a stop() dispatched right
+        # away could arrive before run_forever() and be lost
+        loop.call_soon(ready.wait)
+        try:
+            loop.run_forever()
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                loop.run_until_complete(asyncio.wait(tasks))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+
+        self._closed = True
+        for loop in self._loops:
+            loop.call_soon_threadsafe(loop.stop)
+
+        current_thread = threading.current_thread()
+        for thread in self._threads:
+            if thread is not current_thread:
+                thread.join()
+
+        self._threads.clear()
+        self._loops.clear()
+
+    def _get_loop(self, index: int) -> ThreadSafeLoop:
+        if not self._started or self._closed:
+            raise RuntimeError("Runtime is not running")
+        return self._loops[index]
+
+    def next_index(self) -> int:
+        # It only spreads the work, two callers racing for the same turn don't break anything
+        return next(self._next_loop) % self._n_loops
+
+    # Can be called from any thread
+    def spawn_on(self, index: int, coro: Coroutine[Any, Any, _T]) -> concurrent.futures.Future[_T]:
+        loop = self._get_loop(index)
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def spawn(self, coro: Coroutine[Any, Any, _T]) -> concurrent.futures.Future[_T]:
+        return self.spawn_on(self.next_index(), coro)
+
+    # Unlike awaiting the future returned by spawn_on(), the result is handed back straight to the
+    # calling loop, with no concurrent.futures.Future in between
+    async def run_on(self, index: int, coro: Coroutine[Any, Any, _T]) -> _T:
+        target = self._get_loop(index)
+        caller = asyncio.get_running_loop()
+        if target is caller:
+            return await coro
+
+        waiter: asyncio.Future[_T] = caller.create_future()
+        remote_task: list[asyncio.Task[_T]] = []
+
+        def copy_result(task: asyncio.Task[_T]) -> None:
+            if waiter.done():
+                return
+            if task.cancelled():
+                waiter.cancel()
+            elif (exc := task.exception()) is not None:
+                waiter.set_exception(exc)
+            else:
+                waiter.set_result(task.result())
+
+        def start_task() -> None:
+            task = target.create_task(coro)
+            remote_task.append(task)
+            task.add_done_callback(lambda task: caller.call_soon_threadsafe(copy_result, task))
+
+        # Callbacks from the same thread keep their order, so the task always exists by then
+        def cancel_task() -> None:
+            remote_task[0].cancel()
+
+        target.call_soon_threadsafe(start_task)
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            target.call_soon_threadsafe(cancel_task)
+            raise
+
+    async def run(self, coro: Coroutine[Any, Any, _T]) -> _T:
+        return await self.run_on(self.next_index(), coro)
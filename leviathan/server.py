@@ -0,0 +1,220 @@
+from typing import Any, Callable, Iterable, TYPE_CHECKING
+from logging import getLogger
+
+import asyncio, errno, os, socket, weakref
+
+if TYPE_CHECKING:
+    from .loop import Loop, ThreadSafeLoop
+
+logger = getLogger(__package__)
+
+# Same as asyncio, accepting is retried after running out of file descriptors
+ACCEPT_RETRY_DELAY = 1
+
+_OUT_OF_RESOURCES_ERRNOS = frozenset((errno.EMFILE, errno.ENFILE, errno.ENOBUFS, errno.ENOMEM))
+
+
+class Server(asyncio.AbstractServer):
+    def __init__(
+        self,
+        loop: "Loop | ThreadSafeLoop",
+        sockets: Iterable[socket.socket],
+        protocol_factory: Callable[[], asyncio.BaseProtocol],
+        backlog: int,
+        unix_path: str | bytes | None = None,
+    ) -> None:
+        self._loop = loop
+        self._sockets: list[socket.socket] | None = list(sockets)
+        # Weak references so abandoned transports can still be collected
+        self._clients: weakref.WeakSet[asyncio.Transport] = weakref.WeakSet()
+        self._waiters: list[asyncio.Future[None]] | None = []
+        self._protocol_factory = protocol_factory
+        self._backlog = backlog
+        self._unix_path = unix_path
+        self._accept_tasks: list[asyncio.Task[None]] = []
+        self._serving = False
+        self._serving_forever_fut: asyncio.Future[None] | None = None
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} sockets={self.sockets!r}>"
+
+    def _attach(self, transport: asyncio.Transport) -> None:
+        assert self._sockets is not None
+        self._clients.add(transport)
+
+    def _detach(self, transport: asyncio.Transport) -> None:
+        self._clients.discard(transport)
+        if len(self._clients) == 0 and self._sockets is None:
+            self._wakeup()
+
+    def _wakeup(self) -> None:
+        waiters = self._waiters
+        self._waiters = None
+        if waiters is None:
+            return
+
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _start_serving(self) -> None:
+        if self._serving or self._sockets is None:
+            return
+        self._serving = True
+
+        for sock in self._sockets:
+            sock.listen(self._backlog)
+            self._accept_tasks.append(
+                self._loop.create_task(self._accept_connections(sock))
+            )
+
+    async def _accept_connections(self, sock: socket.socket) -> None:
+        loop = self._loop
+        while True:
+            try:
+                # A single multishot accept hands over every new connection, it only finishes on errors
+                await loop._sock_accept_multishot(sock, self._accept_connection)
+            except OSError as exc:
+                if exc.errno in _OUT_OF_RESOURCES_ERRNOS:
+                    loop.call_exception_handler(
+                        {
+                            "message": "socket.accept() out of system resource",
+                            "exception": exc,
+                            "socket": sock,
+                        }
+                    )
+                    await asyncio.sleep(ACCEPT_RETRY_DELAY)
+                    continue
+
+                if self._sockets is not None:
+                    loop.call_exception_handler(
+                        {
+                            "message": "Error accepting connections",
+                            "exception": exc,
+                            "socket": sock,
+                        }
+                    )
+                return
+
+    def _accept_connection(self, conn: socket.socket) -> None:
+        if self._sockets is None:
+            conn.close()
+            return
+
+        protocol: asyncio.BaseProtocol | None = None
+        transport: asyncio.Transport | None = None
+        try:
+            protocol = self._protocol_factory()
+            transport = self._loop._make_stream_transport(conn, protocol, server=self)
+            self._attach(transport)
+            protocol.connection_made(transport)
+        except (SystemExit, KeyboardInterrupt):
+            raise
+        except BaseException as exc:
+            context: dict[str, Any] = {
+                "message": "Error on transport creation for incoming connection",
+                "exception": exc,
+            }
+            if protocol is not None:
+                context["protocol"] = protocol
+            if transport is not None:
+                context["transport"] = transport
+                transport.close()
+            else:
+                conn.close()
+            self._loop.call_exception_handler(context)
+
+    def _cleanup_unix_socket(self) -> None:
+        path = self._unix_path
+        if path is None:
+            return
+
+        self._unix_path = None
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        except OSError as err:
+            logger.error("Unable to clean up listening UNIX socket %r: %r", path, err)
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    def is_serving(self) -> bool:
+        return self._serving
+
+    @property
+    def sockets(self) -> tuple[socket.socket, ...]:
+        if self._sockets is None:
+            return ()
+        return tuple(self._sockets)
+
+    def close(self) -> None:
+        sockets = self._sockets
+        if sockets is None:
+            return
+        self._sockets = None
+
+        for task in self._accept_tasks:
+            task.cancel()
+        self._accept_tasks.clear()
+
+        for sock in sockets:
+            sock.close()
+        self._cleanup_unix_socket()
+
+        self._serving = False
+
+        if (
+            self._serving_forever_fut is not None
+            and not self._serving_forever_fut.done()
+        ):
+            self._serving_forever_fut.cancel()
+            self._serving_forever_fut = None
+
+        if len(self._clients) == 0:
+            self._wakeup()
+
+    def close_clients(self) -> None:
+        for transport in self._clients.copy():
+            transport.close()
+
+    def abort_clients(self) -> None:
+        for transport in self._clients.copy():
+            transport.abort()
+
+    async def start_serving(self) -> None:
+        self._start_serving()
+        # Skip one loop iteration so the accept operations are submitted
+        await asyncio.sleep(0)
+
+    async def serve_forever(self) -> None:
+        if self._serving_forever_fut is not None:
+            raise RuntimeError(
+                f"server {self!r} is already being awaited on serve_forever()"
+            )
+        if self._sockets is None:
+            raise RuntimeError(f"server {self!r} is closed")
+
+        self._start_serving()
+        self._serving_forever_fut = self._loop.create_future()
+
+        try:
+            await self._serving_forever_fut
+        except asyncio.CancelledError:
+            try:
+                self.close()
+                await self.wait_closed()
+            finally:
+                raise
+        finally:
+            self._serving_forever_fut = None
+
+    async def wait_closed(self) -> None:
+        # Unblocked once the server is closed and all its connections have been dropped
+        if self._waiters is None:
+            return
+
+        waiter: asyncio.Future[None] = self._loop.create_future()
+        self._waiters.append(waiter)
+        await waiter
@@ -1,7 +1,8 @@
 from .leviathan_zig_single_thread import Task as _TaskSingleThread
 from .leviathan_zig import Task as _Task
 
-from typing import TypeVar, Coroutine, Optional, Any
+from contextvars import Context
+from typing import TypeVar, Coroutine, Optional, Any, Iterable
 import asyncio
 
 T = TypeVar('T')
@@ -10,22 +11,129 @@ T = TypeVar('T')
 class Task(_TaskSingleThread):
     def __init__(self, coro: Coroutine[Any, Any, T], *, loop: Optional[asyncio.AbstractEventLoop] = None,
                  name: Optional[Any] = None, context: Optional[Any] = None, eager_start: bool = False) -> None:
-        if eager_start:
-            raise RuntimeError("eager_start is not supported")
-
         if loop is None:
             loop = asyncio.get_running_loop()
 
-        _TaskSingleThread.__init__(self, coro, loop, name=name, context=context)
+        _TaskSingleThread.__init__(self, coro, loop, name=name, context=context, eager_start=eager_start)
 
 
 class ThreadSafeTask(_Task):
     def __init__(self, coro: Coroutine[Any, Any, T], *, loop: Optional[asyncio.AbstractEventLoop] = None,
                  name: Optional[Any] = None, context: Optional[Any] = None, eager_start: bool = False) -> None:
-        if eager_start:
-            raise RuntimeError("eager_start is not supported")
-
         if loop is None:
             loop = asyncio.get_running_loop()
 
-        _Task.__init__(self, coro, loop, name=name, context=context)
+        _Task.__init__(self, coro, loop, name=name, context=context, eager_start=eager_start)
+
+
+# Mapped to the values expected by the loop's _wait
+_RETURN_WHEN = {
+    asyncio.FIRST_COMPLETED: 0,
+    asyncio.FIRST_EXCEPTION: 1,
+    asyncio.ALL_COMPLETED: 2,
+}
+
+
+def gather(*coros_or_futures: Any, return_exceptions: bool = False) -> asyncio.Future[list[Any]]:
+    if not coros_or_futures:
+        return asyncio.gather(return_exceptions=return_exceptions)
+
+    loop: Optional[asyncio.AbstractEventLoop] = None
+    arg_to_fut: dict[Any, asyncio.Future[Any]] = {}
+    children: list[asyncio.Future[Any]] = []
+    for arg in coros_or_futures:
+        fut = arg_to_fut.get(arg)
+        if fut is None:
+            fut = asyncio.ensure_future(arg, loop=loop)
+            if loop is None:
+                loop = fut.get_loop()
+            arg_to_fut[arg] = fut
+        children.append(fut)
+
+    # Futures from other implementations or loops go through asyncio
+    native_gather = getattr(loop, "_gather", None)
+    if native_gather is not None:
+        outer = native_gather(tuple(children), return_exceptions)
+        if outer is not None:
+            return outer
+
+    return asyncio.gather(*children, return_exceptions=return_exceptions)
+
+
+class TaskGroup(asyncio.TaskGroup):
+    # Same as asyncio's, except that children from a Leviathan loop get a native done callback. It only calls
+    # back into _on_task_done() when the group runs out of tasks or a child fails.
+    def create_task(self, coro: Coroutine[Any, Any, T], *, name: Optional[str] = None,
+                    context: Optional[Context] = None) -> asyncio.Task[T]:
+        if not self._entered:  # type: ignore
+            raise RuntimeError(f"TaskGroup {self!r} has not been entered")
+        if self._exiting and not self._tasks:  # type: ignore
+            raise RuntimeError(f"TaskGroup {self!r} is finished")
+        if self._aborting:  # type: ignore
+            raise RuntimeError(f"TaskGroup {self!r} is shutting down")
+
+        loop: asyncio.AbstractEventLoop = self._loop  # type: ignore
+        if context is None:
+            task = loop.create_task(coro, name=name)
+        else:
+            task = loop.create_task(coro, name=name, context=context)
+
+        # Eager tasks can be done already
+        if task.done():
+            self._on_task_done(task)  # type: ignore
+        else:
+            self._tasks.add(task)  # type: ignore
+            native_add = getattr(loop, "_task_group_add", None)
+            if native_add is None or not native_add(self, task):
+                task.add_done_callback(self._on_task_done)  # type: ignore
+        try:
+            return task
+        finally:
+            # Otherwise task.exception().__traceback__ keeps this frame and the task alive
+            del task
+
+
+def _release_waiter(waiter: asyncio.Future[None]) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+async def wait(
+    fs: Iterable[asyncio.Future[T]], *, timeout: Optional[float] = None,
+    return_when: str = asyncio.ALL_COMPLETED
+) -> tuple[set[asyncio.Future[T]], set[asyncio.Future[T]]]:
+    if asyncio.isfuture(fs) or asyncio.iscoroutine(fs):
+        raise TypeError(f"expect a list of futures, not {type(fs).__name__}")
+    if not fs:
+        raise ValueError("Set of Tasks/Futures is empty.")
+    if return_when not in _RETURN_WHEN:
+        raise ValueError(f"Invalid return_when value: {return_when}")
+
+    fs = set(fs)
+    if any(asyncio.iscoroutine(f) for f in fs):
+        raise TypeError("Passing coroutines is forbidden, use tasks explicitly.")
+
+    loop = asyncio.get_running_loop()
+    native_wait = getattr(loop, "_wait", None)
+    waiter = None
+    if native_wait is not None:
+        waiter = native_wait(tuple(fs), _RETURN_WHEN[return_when])
+    if waiter is None:
+        return await asyncio.wait(fs, timeout=timeout, return_when=return_when)
+
+    timeout_handle = None
+    if timeout is not None:
+        timeout_handle = loop.call_later(timeout, _release_waiter, waiter)
+    try:
+        await waiter
+    finally:
+        if timeout_handle is not None:
+            timeout_handle.cancel()
+
+    done, pending = set(), set()
+    for f in fs:
+        if f.done():
+            done.add(f)
+        else:
+            pending.add(f)
+    return done, pending
@@ -17,7 +17,7 @@ pub const ExecuteCallbacksReturn = enum {
 };
 
 pub const CallbackType = enum {
-    ZigGeneric, PythonGeneric, PythonFutureCallbacksSet, PythonFuture, PythonTask
+    ZigGeneric, ZigGenericIO, PythonGeneric, PythonFutureCallbacksSet, PythonFuture, PythonTask
 };
 
 pub const ZigGenericCallback = *const fn (?*anyopaque, status: ExecuteCallbacksReturn) ExecuteCallbacksReturn;
@@ -27,8 +27,20 @@ pub const ZigGenericCallbackData = struct {
     can_execute: bool = true,
 };
 
+pub const ZigGenericIOCallback = *const fn (
+    ?*anyopaque, io_uring_res: i32, io_uring_flags: u32, status: ExecuteCallbacksReturn
+) ExecuteCallbacksReturn;
+pub const ZigGenericIOCallbackData = struct {
+    callback: ZigGenericIOCallback,
+    data: ?*anyopaque,
+    io_uring_res: i32 = 0,
+    io_uring_flags: u32 = 0,
+    can_execute: bool = true,
+};
+
 pub const Callback = union(CallbackType) {
     ZigGeneric: ZigGenericCallbackData,
+    ZigGenericIO: ZigGenericIOCallbackData,
     PythonGeneric: Handle.GenericCallbackData,
     PythonFutureCallbacksSet: Future.Callback.CallbacksSetData,
     PythonFuture: Future.Callback.Data,
@@ -141,6 +153,16 @@ pub inline fn run_callback(
                     };
                 }
             },
+            .ZigGenericIO => |data| blk: {
+                if (data.can_execute) {
+                    break :blk data.callback(data.data, data.io_uring_res, data.io_uring_flags, status);
+                }else{
+                    break :blk switch (data.callback(data.data, data.io_uring_res, data.io_uring_flags, .Stop)) {
+                        .Exception => .Exception,
+                        else => .Continue
+                    };
+                }
+            },
             .PythonGeneric => |data| Handle.callback_for_python_generic_callbacks(allocator, data),
             .PythonFutureCallbacksSet => |data| Future.Callback.run_python_future_set_callbacks(
                 allocator, data, status
@@ -151,6 +173,7 @@ pub inline fn run_callback(
         else => blk: {
             const ret: ExecuteCallbacksReturn = switch (callback) {
                 .ZigGeneric => |data| data.callback(data.data, .Stop),
+                .ZigGenericIO => |data| data.callback(data.data, data.io_uring_res, data.io_uring_flags, .Stop),
                 .PythonGeneric => |data| {
                     Handle.release_python_generic_callback(allocator, data);
                     break :blk .Continue;
@@ -13,7 +13,6 @@ const PyObject = *python_c.PyObject;
 const MaxCallbacks = 8;
 
 pub const CallbacksSetData = struct {
-    sets_queue: *CallbackManager.CallbacksSetsQueue,
     future: *Future.Python.FutureObject,
 };
 
@@ -99,11 +98,36 @@ pub fn callback_for_python_future_callbacks(data: Data) CallbackManager.ExecuteC
     return .Continue;
 }
 
+pub fn execute_callbacks(
+    self: *Future, allocator: std.mem.Allocator, status: CallbackManager.ExecuteCallbacksReturn
+) CallbackManager.ExecuteCallbacksReturn {
+    const inline_callbacks_num = self.inline_callbacks_num;
+    if (inline_callbacks_num == 0) return .None;
+    self.inline_callbacks_num = 0;
+
+    var exec_status = status;
+    for (self.inline_callbacks[0..inline_callbacks_num]) |callback| {
+        switch (CallbackManager.run_callback(allocator, callback, exec_status)) {
+            .Continue => {},
+            .Stop, .Exception => |v| {
+                exec_status = v;
+            },
+            else => unreachable
+        }
+    }
+
+    // The queue only has callbacks once the inline slots are taken
+    return switch (CallbackManager.execute_callbacks(allocator, &self.callbacks_queue, exec_status, false)) {
+        .None => exec_status,
+        else => |v| v
+    };
+}
+
 pub inline fn run_python_future_set_callbacks(
     allocator: std.mem.Allocator, data: CallbacksSetData, status: CallbackManager.ExecuteCallbacksReturn
 ) CallbackManager.ExecuteCallbacksReturn {
     defer python_c.py_decref(@ptrCast(data.future));
-    return CallbackManager.execute_callbacks(allocator, data.sets_queue, status, false);
+    return execute_callbacks(utils.get_data_ptr(Future, data.future), allocator, status);
 }
 
 pub fn create_python_handle(self: *Future, callback_data: PyObject) !CallbackManager.Callback {
@@ -129,48 +153,111 @@ pub inline fn add_done_callback(
 ) !void {
     if (self.status != .PENDING) return error.FutureAlreadyFinished;
 
-    const allocator = self.callbacks_arena_allocator;
+    const inline_callbacks_num = self.inline_callbacks_num;
+    if (inline_callbacks_num < Future.InlineCallbacks) {
+        self.inline_callbacks[inline_callbacks_num] = callback;
+        self.inline_callbacks_num = inline_callbacks_num + 1;
+        return;
+    }
+
+    const allocator = self.callbacks_arena.allocator();
     _ = try CallbackManager.append_new_callback(
         allocator, &self.callbacks_queue, callback, MaxCallbacks
     );
 }
 
+inline fn disable_callbacks(callbacks: []CallbackManager.Callback, callback_id: u64) usize {
+    var removed_count: usize = 0;
+    for (callbacks) |*callback| {
+        switch (@as(CallbackManager.CallbackType, callback.*)) {
+            .ZigGeneric => {
+                if (@as(u64, @intFromPtr(callback.ZigGeneric.callback)) == callback_id) {
+                    callback.ZigGeneric.can_execute = false;
+                    removed_count += 1;
+                }
+            },
+            .PythonFuture => {
+                if (@as(u64, @intFromPtr(callback.PythonFuture.py_callback)) == callback_id) {
+                    callback.PythonFuture.can_execute = false;
+                    removed_count += 1;
+                }
+            },
+            else => unreachable
+        }
+    }
+
+    return removed_count;
+}
+
 pub fn remove_done_callback(self: *Future, callback_id: u64) usize {
     if (self.status != .PENDING) return 0;
 
+    var removed_count = disable_callbacks(self.inline_callbacks[0..self.inline_callbacks_num], callback_id);
+
     const callbacks_queue = &self.callbacks_queue.queue;
     var node = callbacks_queue.first;
-    var removed_count: usize = 0;
     while (node) |n| {
         node = n.next;
         const queue: CallbackManager.CallbacksSet = n.data;
-        for (queue.callbacks[0..queue.callbacks_num]) |*callback| {
-            switch (@as(CallbackManager.CallbackType, callback.*)) {
-                .ZigGeneric => {
-                    if (@as(u64, @intFromPtr(callback.ZigGeneric.callback)) == callback_id) {
-                        callback.ZigGeneric.can_execute = false;
-                        removed_count += 1;
-                    }
-                },
-                .PythonFuture => {
-                    if (@as(u64, @intFromPtr(callback.PythonFuture.py_callback)) == callback_id) {
-                        callback.PythonFuture.can_execute = false;
-                        removed_count += 1;
-                    }
-                },
-                else => unreachable
-            }
-        }
+        removed_count += disable_callbacks(queue.callbacks[0..queue.callbacks_num], callback_id);
     }
 
     return removed_count;
 }
 
+fn detached_zig_callback(
+    _: ?*anyopaque, status: CallbackManager.ExecuteCallbacksReturn
+) CallbackManager.ExecuteCallbacksReturn {
+    return status;
+}
+
+inline fn detach_zig_callback_from(
+    callbacks: []CallbackManager.Callback, callback: CallbackManager.ZigGenericCallback, data: ?*anyopaque
+) bool {
+    for (callbacks) |*cb| {
+        switch (cb.*) {
+            .ZigGeneric => |*zig_callback| {
+                if (zig_callback.callback == callback and zig_callback.data == data) {
+                    zig_callback.callback = &detached_zig_callback;
+                    zig_callback.data = null;
+                    return true;
+                }
+            },
+            else => {}
+        }
+    }
+
+    return false;
+}
+
+// Unlike remove_done_callback, the callback won't be called at all, not even with .Stop, so whoever
+// detaches it has to release its data
+pub fn detach_zig_callback(
+    self: *Future, callback: CallbackManager.ZigGenericCallback, data: ?*anyopaque
+) bool {
+    if (self.status != .PENDING) return false;
+
+    if (detach_zig_callback_from(self.inline_callbacks[0..self.inline_callbacks_num], callback, data)) {
+        return true;
+    }
+
+    var node = self.callbacks_queue.queue.first;
+    while (node) |n| {
+        node = n.next;
+        const queue: CallbackManager.CallbacksSet = n.data;
+        if (detach_zig_callback_from(queue.callbacks[0..queue.callbacks_num], callback, data)) {
+            return true;
+        }
+    }
+
+    return false;
+}
+
 pub inline fn call_done_callbacks(self: *Future, new_status: Future.FutureStatus) !void {
     if (self.status != .PENDING) return error.FutureAlreadyFinished;
     defer self.status = new_status;
 
-    if (self.callbacks_queue.last_set == null) {
+    if (self.inline_callbacks_num == 0) {
         return;
     }
 
@@ -180,7 +267,6 @@ pub inline fn call_done_callbacks(self: *Future, new_status: Future.FutureStatus
 
     const callback: CallbackManager.Callback = .{
         .PythonFutureCallbacksSet = .{
-            .sets_queue = &self.callbacks_queue,
             .future = pyfut
         }
     };
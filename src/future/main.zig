@@ -4,6 +4,8 @@ const builtin = @import("builtin");
 const Loop = @import("../loop/main.zig");
 const CallbackManager = @import("../callback_manager.zig");
 
+const python_c = @import("python_c");
+
 const lock = @import("../utils/lock.zig");
 
 pub const FutureStatus = enum {
@@ -15,36 +17,71 @@ status: FutureStatus = .PENDING,
 
 mutex: lock.Mutex = lock.init(),
 
+// Nearly every future gets one done callback at most, the task awaiting it. The arena-backed queue is only
+// used once the inline slots are taken.
+inline_callbacks: [InlineCallbacks]CallbackManager.Callback = undefined,
+inline_callbacks_num: usize = 0,
+
 callbacks_arena: std.heap.ArenaAllocator,
-callbacks_arena_allocator: std.mem.Allocator = undefined,
 callbacks_queue: CallbackManager.CallbacksSetsQueue = undefined,
 loop: *Loop,
 
+// Called by cancel() instead of cancelling the future when set, it returns false if a Python error was set.
+// Gather uses it to cancel its children and finish only once all of them are done.
+cancel_hook: ?CancelHook = null,
+
 released: bool = false,
+// Set while the future sits in the loop's freelist, its arena is reused by the next future
+arena_retained: bool = false,
+
+// Memory kept by the arena of a recycled future, anything above it goes back to the allocator
+const MaxRetainedArenaBytes = 4096;
+
+pub const InlineCallbacks = 2;
+
+pub const CancelHook = struct {
+    callback: *const fn (?*anyopaque, cancel_msg: ?*python_c.PyObject) bool,
+    data: ?*anyopaque
+};
 
 
 pub fn init(self: *Future, loop: *Loop) void {
+    const callbacks_arena = blk: {
+        if (self.arena_retained) break :blk self.callbacks_arena;
+        break :blk std.heap.ArenaAllocator.init(loop.allocator);
+    };
+
     self.* = .{
         .loop = loop,
-        .callbacks_arena = std.heap.ArenaAllocator.init(loop.allocator)
+        .callbacks_arena = callbacks_arena
     };
 
-    self.callbacks_arena_allocator = self.callbacks_arena.allocator();
     self.callbacks_queue = .{
-        .queue = CallbackManager.LinkedList.init(self.callbacks_arena_allocator),
+        .queue = CallbackManager.LinkedList.init(self.callbacks_arena.allocator()),
         .last_set = null
     };
 }
 
 pub inline fn release(self: *Future) void {
     if (self.status == .PENDING) {
-        _ = CallbackManager.execute_callbacks(self.loop.allocator, &self.callbacks_queue, .Stop, false);
+        _ = Callback.execute_callbacks(self, self.loop.allocator, .Stop);
     }
 
     self.callbacks_arena.deinit();
     self.released = true;
 }
 
+// Like release, but the arena keeps its memory for the future that reuses this one
+pub inline fn recycle(self: *Future) void {
+    if (self.status == .PENDING) {
+        _ = Callback.execute_callbacks(self, self.loop.allocator, .Stop);
+    }
+
+    _ = self.callbacks_arena.reset(.{ .retain_with_limit = MaxRetainedArenaBytes });
+    self.arena_retained = true;
+    self.released = true;
+}
+
 pub const Callback = @import("callback.zig");
 pub const Python = @import("python/main.zig");
 
@@ -9,16 +9,24 @@ const PythonFutureObject = Future.Python.FutureObject;
 const utils = @import("../../utils/utils.zig");
 
 pub inline fn future_fast_cancel(instance: *PythonFutureObject, cancel_msg_py_object: ?PyObject) bool {
+    const future_data = utils.get_data_ptr(Future, instance);
     if (cancel_msg_py_object) |pyobj| {
         if (python_c.PyUnicode_Check(pyobj) == 0) {
             python_c.PyErr_SetString(python_c.PyExc_TypeError.?, "Cancel message must be a string\x00");
             return false;
         }
+    }
 
+    if (future_data.cancel_hook) |hook| {
+        if (future_data.status == .PENDING) {
+            return hook.callback(hook.data, cancel_msg_py_object);
+        }
+    }
+
+    if (cancel_msg_py_object) |pyobj| {
         instance.cancel_msg_py_object = python_c.py_newref(pyobj);
     }
 
-    const future_data = utils.get_data_ptr(Future, instance);
     Future.Callback.call_done_callbacks(future_data, .CANCELED) catch |err| {
         const err_trace = @errorReturnTrace();
         utils.print_error_traces(err_trace, err);
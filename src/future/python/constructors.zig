@@ -40,6 +40,19 @@ pub inline fn future_init_configuration(self: *PythonFutureObject, leviathan_loo
 }
 
 pub inline fn fast_new_future(leviathan_loop: *LoopObject) !*PythonFutureObject {
+    const loop_data = utils.get_data_ptr(Loop, leviathan_loop);
+    if (loop_data.get_freelists()) |freelists| {
+        if (freelists.futures.pop()) |object| {
+            const instance: *PythonFutureObject = @ptrCast(object);
+            Loop.Freelists.revive(object, &Future.Python.FutureType);
+
+            future_set_initial_values(instance);
+            future_init_configuration(instance, leviathan_loop);
+            python_c.PyObject_GC_Track(instance);
+            return instance;
+        }
+    }
+
     const instance: *PythonFutureObject = @ptrCast(
         Future.Python.FutureType.tp_alloc.?(&Future.Python.FutureType, 0) orelse return error.PythonError
     );
@@ -68,22 +81,29 @@ pub fn future_new(
     return @ptrCast(self);
 }
 
-pub fn future_clear(self: ?*PythonFutureObject) callconv(.C) c_int {
-    const py_future = self.?;
+pub inline fn future_release_fields(py_future: *PythonFutureObject, comptime recycle: bool) void {
     const future_data = utils.get_data_ptr(Future, py_future);
     if (!future_data.released) {
         const _result = future_data.result;
         if (_result) |res| {
             python_c.py_decref(@alignCast(@ptrCast(res)));
         }
-        future_data.release();
+
+        if (recycle) {
+            future_data.recycle();
+        }else{
+            future_data.release();
+        }
     }
 
     python_c.py_decref_and_set_null(@ptrCast(&py_future.py_loop));
     python_c.py_decref_and_set_null(&py_future.exception);
     python_c.py_decref_and_set_null(&py_future.exception_tb);
     python_c.py_decref_and_set_null(&py_future.cancel_msg_py_object);
+}
 
+pub fn future_clear(self: ?*PythonFutureObject) callconv(.C) c_int {
+    future_release_fields(self.?, false);
     return 0;
 }
 
@@ -102,10 +122,30 @@ pub fn future_traverse(self: ?*PythonFutureObject, visit: python_c.visitproc, ar
     );
 }
 
+// Only futures created with the exact type go back to their loop's freelist, subclasses are freed as usual
+pub inline fn must_recycle_future(py_future: *PythonFutureObject, @"type": *python_c.PyTypeObject) bool {
+    return (
+        !utils.get_data_ptr(Future, py_future).released and
+        python_c.is_type(@ptrCast(py_future), @"type")
+    );
+}
+
 pub fn future_dealloc(self: ?*PythonFutureObject) callconv(.C) void {
     const instance = self.?;
 
     python_c.PyObject_GC_UnTrack(instance);
+    if (must_recycle_future(instance, &Future.Python.FutureType)) {
+        // Releasing the fields can run arbitrary code, the loop has to outlive the future
+        const py_loop = python_c.py_newref(instance.py_loop.?);
+        defer python_c.py_decref(@ptrCast(py_loop));
+
+        future_release_fields(instance, true);
+        if (utils.get_data_ptr(Loop, py_loop).get_freelists()) |freelists| {
+            if (freelists.futures.push(@ptrCast(instance))) return;
+        }
+        utils.get_data_ptr(Future, instance).callbacks_arena.deinit();
+    }
+
     _ = future_clear(instance);
 
     const @"type": *python_c.PyTypeObject = @ptrCast(python_c.Py_TYPE(@ptrCast(instance)) orelse unreachable);
@@ -163,7 +203,12 @@ pub fn future_iternext(self: ?*PythonFutureObject) callconv(.C) ?PyObject {
     if (future_data.status != .PENDING) {
         const res = result.get_result(instance);
         if (res) |py_res| {
-            python_c.PyErr_SetObject(python_c.PyExc_StopIteration, py_res);
+            defer python_c.py_decref(py_res);
+
+            // Tuples would be unpacked as the exception arguments
+            const stop_iteration: PyObject = python_c.PyObject_CallOneArg(python_c.PyExc_StopIteration, py_res)
+                orelse return null;
+            python_c.PyErr_SetRaisedException(stop_iteration);
         }
         return null;
     }
@@ -5,11 +5,14 @@ const python_c = @import("python_c");
 const PyObject = *python_c.PyObject;
 
 const CallbackManager = @import("callback_manager.zig");
+const Loop = @import("loop/main.zig");
 const utils = @import("utils/utils.zig");
 
 pub const PythonHandleObject = extern struct {
     ob_base: python_c.PyObject,
     contextvars: ?PyObject,
+    // Set for handles created by the loop, they go back to its freelists when deallocated
+    freelists: ?*Loop.Freelists,
     cancelled: bool
 };
 
@@ -118,11 +121,29 @@ pub fn callback_for_python_generic_callbacks(
     return .Continue;
 }
 
-pub inline fn fast_new_handle(contextvars: PyObject) !*PythonHandleObject {
-    const instance: *PythonHandleObject = @ptrCast(
-        PythonHandleType.tp_alloc.?(&PythonHandleType, 0) orelse return error.PythonError
-    );
+// Handles taken from the freelists already hold their reference to them
+pub inline fn alloc_handle(
+    comptime T: type, @"type": *python_c.PyTypeObject, comptime freelist_name: []const u8, loop_data: *Loop
+) !*T {
+    const freelists = loop_data.get_freelists() orelse {
+        const instance: *T = @ptrCast(@"type".tp_alloc.?(@"type", 0) orelse return error.PythonError);
+        return instance;
+    };
+
+    if (@field(freelists, freelist_name).pop()) |object| {
+        Loop.Freelists.revive(object, @"type");
+        return @ptrCast(object);
+    }
+
+    const instance: *T = @ptrCast(@"type".tp_alloc.?(@"type", 0) orelse return error.PythonError);
+    freelists.refs += 1;
+    return instance;
+}
+
+pub inline fn fast_new_handle(contextvars: PyObject, loop_data: *Loop) !*PythonHandleObject {
+    const instance = try alloc_handle(PythonHandleObject, &PythonHandleType, "handles", loop_data);
     instance.contextvars = contextvars;
+    instance.freelists = loop_data.get_freelists();
     instance.cancelled = false;
 
     return instance;
@@ -130,9 +151,17 @@ pub inline fn fast_new_handle(contextvars: PyObject) !*PythonHandleObject {
 
 fn handle_dealloc(self: ?*PythonHandleObject) void {
     const instance = self.?;
-    python_c.py_xdecref(instance.contextvars);
+    python_c.py_decref_and_set_null(&instance.contextvars);
 
     const @"type": *python_c.PyTypeObject = @ptrCast(python_c.Py_TYPE(@ptrCast(instance)) orelse unreachable);
+    if (instance.freelists) |freelists| {
+        if (freelists.push_handle(instance)) return;
+
+        @"type".tp_free.?(@ptrCast(instance));
+        freelists.unref();
+        return;
+    }
+
     @"type".tp_free.?(@ptrCast(instance));
 }
 
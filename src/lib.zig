@@ -10,13 +10,15 @@ const task = leviathan.Task;
 const loop = leviathan.Loop;
 const handle = leviathan.Handle;
 const timer_handle = leviathan.TimerHandle;
+const transports = leviathan.Transports;
 
 const leviathan_types = .{
     &future.Python.FutureType,
     &task.PythonTaskType,
     &loop.Python.LoopType,
     &handle.PythonHandleType,
-    &timer_handle.PythonTimerHandleType
+    &timer_handle.PythonTimerHandleType,
+    &transports.Stream.Python.StreamTransportType
 };
 
 fn on_module_exit() callconv(.C) void {
@@ -52,7 +54,8 @@ fn initialize_python_module() !*python_c.PyObject {
         "Task\x00",
         "Loop\x00",
         "Handle\x00",
-        "TimerHandle\x00"
+        "TimerHandle\x00",
+        "StreamTransport\x00"
     };
 
     inline for (leviathan_modules_name, leviathan_types) |leviathan_module_name, leviathan_module_obj| {
@@ -0,0 +1,266 @@
+const std = @import("std");
+const builtin = @import("builtin");
+
+const python_c = @import("python_c");
+
+const utils = @import("../utils/utils.zig");
+
+const Loop = @import("main.zig");
+const CallbackManager = @import("../callback_manager.zig");
+
+// Workers are started on demand, up to the same limit ThreadPoolExecutor uses
+const MaxWorkersLimit = 32;
+const QueueCapacity = 1024;
+
+pub const Job = struct {
+    // Runs on a worker thread with the GIL held
+    run: *const fn (job: *Job) void,
+    // Runs on the loop, it's also called for jobs that never ran while the executor is being released
+    complete: *const fn (job: *Job, status: CallbackManager.ExecuteCallbacksReturn) void,
+
+    next: ?*Job = null
+};
+
+// Bounded MPMC queue, every slot has a sequence number that tells whether it can be written or read
+const JobsQueue = struct {
+    const Slot = struct {
+        sequence: std.atomic.Value(usize),
+        job: *Job = undefined
+    };
+
+    slots: []Slot,
+    enqueue_pos: std.atomic.Value(usize) = std.atomic.Value(usize).init(0),
+    dequeue_pos: std.atomic.Value(usize) = std.atomic.Value(usize).init(0),
+
+    fn init(allocator: std.mem.Allocator) !JobsQueue {
+        const slots = try allocator.alloc(Slot, QueueCapacity);
+        for (slots, 0..) |*slot, index| {
+            slot.* = .{ .sequence = std.atomic.Value(usize).init(index) };
+        }
+
+        return .{ .slots = slots };
+    }
+
+    fn push(self: *JobsQueue, job: *Job) bool {
+        var pos = self.enqueue_pos.load(.monotonic);
+        while (true) {
+            const slot = &self.slots[pos % QueueCapacity];
+            const sequence = slot.sequence.load(.acquire);
+            const diff = @as(isize, @bitCast(sequence -% pos));
+            if (diff == 0) {
+                pos = self.enqueue_pos.cmpxchgWeak(pos, pos +% 1, .monotonic, .monotonic) orelse {
+                    slot.job = job;
+                    slot.sequence.store(pos +% 1, .release);
+                    return true;
+                };
+            }else if (diff < 0) {
+                return false;
+            }else{
+                pos = self.enqueue_pos.load(.monotonic);
+            }
+        }
+    }
+
+    fn pop(self: *JobsQueue) ?*Job {
+        var pos = self.dequeue_pos.load(.monotonic);
+        while (true) {
+            const slot = &self.slots[pos % QueueCapacity];
+            const sequence = slot.sequence.load(.acquire);
+            const diff = @as(isize, @bitCast(sequence -% (pos +% 1)));
+            if (diff == 0) {
+                pos = self.dequeue_pos.cmpxchgWeak(pos, pos +% 1, .monotonic, .monotonic) orelse {
+                    const job = slot.job;
+                    slot.sequence.store(pos +% QueueCapacity, .release);
+                    return job;
+                };
+            }else if (diff < 0) {
+                return null;
+            }else{
+                pos = self.dequeue_pos.load(.monotonic);
+            }
+        }
+    }
+};
+
+loop: *Loop,
+
+queue: JobsQueue,
+// Jobs that didn't fit in the queue, guarded by the loop's mutex and moved to the queue as others finish
+backlog_first: ?*Job = null,
+backlog_last: ?*Job = null,
+
+// Finished jobs are pushed here by the workers, the loop takes all of them at once
+completed_jobs: std.atomic.Value(?*Job) = std.atomic.Value(?*Job).init(null),
+
+// Futex the idle workers wait on, it's bumped every time a job is queued
+jobs_epoch: std.atomic.Value(u32) = std.atomic.Value(u32).init(0),
+idle_workers: std.atomic.Value(u32) = std.atomic.Value(u32).init(0),
+stopping: std.atomic.Value(bool) = std.atomic.Value(bool).init(false),
+
+workers: []std.Thread,
+workers_count: usize = 0,
+
+
+pub fn init(loop: *Loop) !void {
+    const allocator = loop.allocator;
+    const cpu_count = std.Thread.getCpuCount() catch 1;
+    const workers = try allocator.alloc(std.Thread, @min(MaxWorkersLimit, cpu_count + 4));
+    errdefer allocator.free(workers);
+
+    loop.executor = .{
+        .loop = loop,
+        .queue = try JobsQueue.init(allocator),
+        .workers = workers
+    };
+}
+
+inline fn run_job(self: *Executor, job: *Job, thread_state: *python_c.ThreadState) void {
+    python_c.acquire_gil(thread_state);
+    job.run(job);
+    _ = python_c.release_gil();
+
+    push_completed_job(self, job);
+}
+
+fn worker_main(self: *Executor) void {
+    const gil_state = python_c.PyGILState_Ensure();
+    const thread_state = python_c.release_gil();
+    defer {
+        python_c.acquire_gil(thread_state);
+        python_c.PyGILState_Release(gil_state);
+    }
+
+    while (true) {
+        if (self.queue.pop()) |job| {
+            run_job(self, job, thread_state);
+            continue;
+        }
+
+        if (self.stopping.load(.acquire)) break;
+
+        // Checking the queue again after reading the epoch makes sure no wake up is missed
+        const epoch = self.jobs_epoch.load(.acquire);
+        if (self.queue.pop()) |job| {
+            run_job(self, job, thread_state);
+            continue;
+        }
+
+        _ = self.idle_workers.fetchAdd(1, .seq_cst);
+        std.Thread.Futex.wait(&self.jobs_epoch, epoch);
+        _ = self.idle_workers.fetchSub(1, .seq_cst);
+    }
+}
+
+fn push_completed_job(self: *Executor, job: *Job) void {
+    var head = self.completed_jobs.load(.monotonic);
+    while (true) {
+        job.next = head;
+        head = self.completed_jobs.cmpxchgWeak(head, job, .release, .monotonic) orelse break;
+    }
+
+    // Only the first job of a batch wakes the loop up, the rest is picked up with it
+    if (head == null) {
+        Loop.Scheduling.Soon.dispatch(self.loop, .{
+            .ZigGeneric = .{
+                .callback = &complete_jobs,
+                .data = self
+            }
+        }) catch |err| {
+            const err_trace = @errorReturnTrace();
+            utils.print_error_traces(err_trace, err);
+            @panic("Executor couldn't dispatch its completed jobs");
+        };
+    }
+}
+
+fn complete_jobs(data: ?*anyopaque, status: CallbackManager.ExecuteCallbacksReturn) CallbackManager.ExecuteCallbacksReturn {
+    const self: *Executor = @alignCast(@ptrCast(data.?));
+
+    var node = self.completed_jobs.swap(null, .acquire);
+    while (node) |job| {
+        node = job.next;
+        job.complete(job, status);
+    }
+
+    if (status != .Continue) return status;
+
+    const mutex = &self.loop.mutex;
+    mutex.lock();
+    defer mutex.unlock();
+
+    // Room was made in the queue for the jobs that didn't fit
+    while (self.backlog_first) |job| {
+        const next_job = job.next;
+        if (!self.queue.push(job)) break;
+
+        self.backlog_first = next_job;
+        if (next_job == null) self.backlog_last = null;
+        notify_workers(self);
+    }
+
+    return status;
+}
+
+inline fn notify_workers(self: *Executor) void {
+    _ = self.jobs_epoch.fetchAdd(1, .seq_cst);
+    if (self.idle_workers.load(.seq_cst) > 0) {
+        std.Thread.Futex.wake(&self.jobs_epoch, 1);
+    }
+}
+
+// The loop's mutex must be held
+pub fn submit(self: *Executor, job: *Job) !void {
+    // Workers are started before queueing, so a failure doesn't leave the job behind
+    if (self.idle_workers.load(.monotonic) == 0 and self.workers_count < self.workers.len) {
+        if (std.Thread.spawn(.{}, worker_main, .{self})) |worker| {
+            self.workers[self.workers_count] = worker;
+            self.workers_count += 1;
+        }else |err| {
+            if (self.workers_count == 0) return err;
+        }
+    }
+
+    job.next = null;
+    if (self.backlog_first != null or !self.queue.push(job)) {
+        if (self.backlog_last) |last| {
+            last.next = job;
+        }else{
+            self.backlog_first = job;
+        }
+        self.backlog_last = job;
+        return;
+    }
+
+    notify_workers(self);
+}
+
+// Called with the GIL held, which is given up while waiting for the workers
+pub fn deinit(self: *Executor) void {
+    if (!builtin.single_threaded) {
+        self.stopping.store(true, .release);
+        _ = self.jobs_epoch.fetchAdd(1, .release);
+        std.Thread.Futex.wake(&self.jobs_epoch, std.math.maxInt(u32));
+
+        const thread_state = python_c.release_gil();
+        for (self.workers[0..self.workers_count]) |worker| {
+            worker.join();
+        }
+        python_c.acquire_gil(thread_state);
+    }
+
+    while (self.queue.pop()) |job| {
+        job.complete(job, .Stop);
+    }
+
+    while (self.backlog_first) |job| {
+        self.backlog_first = job.next;
+        job.complete(job, .Stop);
+    }
+    self.backlog_last = null;
+
+    const allocator = self.loop.allocator;
+    allocator.free(self.queue.slots);
+    allocator.free(self.workers);
+}
+
+const Executor = @This();
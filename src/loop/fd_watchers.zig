@@ -0,0 +1,237 @@
+const std = @import("std");
+
+const python_c = @import("python_c");
+const PyObject = *python_c.PyObject;
+
+const utils = @import("../utils/utils.zig");
+
+const Loop = @import("main.zig");
+const CallbackManager = @import("../callback_manager.zig");
+
+pub const WatcherType = enum {
+    Reader, Writer
+};
+
+pub const Watcher = struct {
+    loop: *Loop,
+    callback: CallbackManager.Callback,
+    fd: std.posix.fd_t,
+    watcher_type: WatcherType,
+    blocking_task_id: Loop.Scheduling.IO.BlockingTaskId = undefined,
+    armed: bool = false,
+    removed: bool = false,
+};
+
+const WatchersMap = std.AutoHashMap(std.posix.fd_t, *Watcher);
+
+readers: WatchersMap,
+writers: WatchersMap,
+loop: *Loop,
+
+inline fn release_watcher_callback(watcher: *Watcher) void {
+    var callback = watcher.callback;
+    CallbackManager.cancel_callback(&callback, true);
+    _ = CallbackManager.run_callback(watcher.loop.allocator, callback, .Stop);
+}
+
+fn report_poll_error(callback: CallbackManager.Callback, errno: std.posix.E) !void {
+    const data = switch (callback) {
+        .PythonGeneric => |data| data,
+        else => return
+    };
+
+    const exception: PyObject = utils.create_python_os_error(errno) orelse return error.PythonError;
+    defer python_c.py_decref(exception);
+
+    const exc_message: PyObject = python_c.PyUnicode_FromString("Polling the file descriptor failed\x00")
+        orelse return error.PythonError;
+    defer python_c.py_decref(exc_message);
+
+    var args: [4]?PyObject = undefined;
+    args[0] = exception;
+    args[1] = exc_message;
+    args[2] = data.py_callback;
+    args[3] = @ptrCast(data.py_handle);
+
+    const knames: PyObject = python_c.Py_BuildValue("(sss)\x00", "message\x00", "callback\x00", "handle\x00")
+        orelse return error.PythonError;
+    defer python_c.py_decref(knames);
+
+    const exc_handler_ret: PyObject = python_c.PyObject_Vectorcall(data.exception_handler, &args, 1, knames)
+        orelse return error.PythonError;
+    python_c.py_decref(exc_handler_ret);
+}
+
+// The poll itself failed, e.g. the fd was closed without removing its watcher. Re-arming would fail the same
+// way on every iteration, so the watcher is dropped instead
+fn drop_failed_watcher(watcher: *Watcher, errno: std.posix.E) CallbackManager.ExecuteCallbacksReturn {
+    const loop = watcher.loop;
+    const watchers = loop.fd_watchers.get_watchers_map(watcher.watcher_type);
+    if (watchers.get(watcher.fd) == watcher) {
+        _ = watchers.remove(watcher.fd);
+    }
+
+    defer {
+        release_watcher_callback(watcher);
+        loop.allocator.destroy(watcher);
+    }
+
+    report_poll_error(watcher.callback, errno) catch |err| {
+        if (err != error.PythonError) {
+            utils.put_python_runtime_error_message(@errorName(err));
+        }
+        return .Exception;
+    };
+    return .Continue;
+}
+
+fn watcher_handler(
+    data: ?*anyopaque, io_uring_res: i32, io_uring_flags: u32,
+    status: CallbackManager.ExecuteCallbacksReturn
+) CallbackManager.ExecuteCallbacksReturn {
+    const watcher: *Watcher = @alignCast(@ptrCast(data.?));
+    const loop = watcher.loop;
+
+    if (status != .Continue) {
+        if (!watcher.removed) {
+            release_watcher_callback(watcher);
+        }
+        loop.allocator.destroy(watcher);
+        return status;
+    }
+
+    if ((io_uring_flags & std.os.linux.IORING_CQE_F_MORE) == 0) {
+        watcher.armed = false;
+    }
+
+    if (watcher.removed) {
+        if (!watcher.armed) {
+            loop.allocator.destroy(watcher);
+        }
+        return .Continue;
+    }
+
+    if (io_uring_res < 0) {
+        watcher.armed = false;
+        return drop_failed_watcher(watcher, @enumFromInt(-io_uring_res));
+    }
+
+    const ret = CallbackManager.run_callback(loop.allocator, watcher.callback, .Continue);
+    if (!watcher.armed) {
+        if (watcher.removed) {
+            loop.allocator.destroy(watcher);
+            return ret;
+        }
+
+        // Polls are one-shot to keep asyncio's level-triggered semantics, re-arming is batched with the next submit
+        arm(watcher) catch |err| {
+            const err_trace = @errorReturnTrace();
+            utils.print_error_traces(err_trace, err);
+
+            utils.put_python_runtime_error_message(@errorName(err));
+            return .Exception;
+        };
+    }
+
+    return ret;
+}
+
+fn arm(watcher: *Watcher) !void {
+    const wait_data: Loop.Scheduling.IO.WaitData = .{
+        .callback = .{
+            .ZigGenericIO = .{
+                .data = watcher,
+                .callback = &watcher_handler
+            }
+        },
+        .fd = watcher.fd,
+    };
+
+    const loop = watcher.loop;
+    watcher.blocking_task_id = try switch (watcher.watcher_type) {
+        .Reader => Loop.Scheduling.IO.queue(loop, .{ .WaitReadable = wait_data }),
+        .Writer => Loop.Scheduling.IO.queue(loop, .{ .WaitWritable = wait_data }),
+    };
+    watcher.armed = true;
+}
+
+inline fn get_watchers_map(self: *FDWatchers, watcher_type: WatcherType) *WatchersMap {
+    return switch (watcher_type) {
+        .Reader => &self.readers,
+        .Writer => &self.writers
+    };
+}
+
+pub fn link(
+    self: *FDWatchers, fd: std.posix.fd_t, watcher_type: WatcherType, callback: CallbackManager.Callback
+) !void {
+    switch (@as(CallbackManager.CallbackType, callback)) {
+        .ZigGeneric, .PythonGeneric => {},
+        else => return error.InvalidCallback
+    }
+
+    const loop = self.loop;
+    const watchers = self.get_watchers_map(watcher_type);
+    if (watchers.get(fd)) |watcher| {
+        var prev_callback = watcher.callback;
+        watcher.callback = callback;
+
+        CallbackManager.cancel_callback(&prev_callback, true);
+        try Loop.Scheduling.Soon._dispatch(loop, prev_callback);
+        return;
+    }
+
+    const allocator = loop.allocator;
+    const watcher = try allocator.create(Watcher);
+    errdefer allocator.destroy(watcher);
+
+    watcher.* = .{
+        .loop = loop,
+        .callback = callback,
+        .fd = fd,
+        .watcher_type = watcher_type
+    };
+
+    try watchers.put(fd, watcher);
+    errdefer _ = watchers.remove(fd);
+
+    try arm(watcher);
+}
+
+pub fn unlink(self: *FDWatchers, fd: std.posix.fd_t, watcher_type: WatcherType) !bool {
+    const watchers = self.get_watchers_map(watcher_type);
+    const watcher = (watchers.fetchRemove(fd) orelse return false).value;
+    watcher.removed = true;
+
+    var callback = watcher.callback;
+    CallbackManager.cancel_callback(&callback, true);
+    try Loop.Scheduling.Soon._dispatch(self.loop, callback);
+
+    // Otherwise the watcher is being handled right now and its handler will release it
+    if (watcher.armed) {
+        try Loop.Scheduling.IO.cancel(self.loop, watcher.blocking_task_id);
+    }
+    return true;
+}
+
+pub fn init(loop: *Loop) void {
+    loop.fd_watchers = .{
+        .readers = WatchersMap.init(loop.allocator),
+        .writers = WatchersMap.init(loop.allocator),
+        .loop = loop
+    };
+}
+
+pub fn deinit(self: *FDWatchers) void {
+    for ([_]*WatchersMap{ &self.readers, &self.writers }) |watchers| {
+        var iter = watchers.valueIterator();
+        while (iter.next()) |watcher| {
+            // The pending poll is cancelled with the rest of the ring, which releases the watcher
+            watcher.*.removed = true;
+            release_watcher_callback(watcher.*);
+        }
+        watchers.deinit();
+    }
+}
+
+const FDWatchers = @This();
@@ -0,0 +1,146 @@
+const std = @import("std");
+
+const python_c = @import("python_c");
+const PyObject = *python_c.PyObject;
+
+const utils = @import("../utils/utils.zig");
+
+const Future = @import("../future/main.zig");
+const Handle = @import("../handle.zig");
+const TimerHandle = @import("../timer_handle.zig");
+
+pub const DefaultCapacity = 256;
+
+// Dead objects waiting to be handed out again instead of going through tp_alloc, like CPython's own
+// freelists they are only touched with the GIL held
+pub const Freelist = struct {
+    objects: []PyObject,
+    len: usize = 0,
+
+    hits: u64 = 0,
+    misses: u64 = 0,
+
+    fn init(allocator: std.mem.Allocator, capacity: usize) !Freelist {
+        return .{
+            .objects = try allocator.alloc(PyObject, capacity)
+        };
+    }
+
+    pub inline fn pop(self: *Freelist) ?PyObject {
+        const len = self.len;
+        if (len == 0) {
+            self.misses += 1;
+            return null;
+        }
+
+        self.hits += 1;
+        self.len = len - 1;
+        return self.objects[len - 1];
+    }
+
+    pub inline fn push(self: *Freelist, object: PyObject) bool {
+        const len = self.len;
+        if (len == self.objects.len) return false;
+
+        self.objects[len] = object;
+        self.len = len + 1;
+        return true;
+    }
+};
+
+allocator: std.mem.Allocator,
+
+futures: Freelist,
+tasks: Freelist,
+handles: Freelist,
+timer_handles: Freelist,
+
+// One for the loop and one for every handle created from it, pooled or not. Handles can outlive the loop
+refs: usize = 1,
+closed: bool = false,
+
+
+pub fn create(allocator: std.mem.Allocator, capacity: usize) !*Freelists {
+    const self = try allocator.create(Freelists);
+    errdefer allocator.destroy(self);
+
+    const futures = try Freelist.init(allocator, capacity);
+    errdefer allocator.free(futures.objects);
+
+    const tasks = try Freelist.init(allocator, capacity);
+    errdefer allocator.free(tasks.objects);
+
+    const handles = try Freelist.init(allocator, capacity);
+    errdefer allocator.free(handles.objects);
+
+    const timer_handles = try Freelist.init(allocator, capacity);
+
+    self.* = .{
+        .allocator = allocator,
+        .futures = futures,
+        .tasks = tasks,
+        .handles = handles,
+        .timer_handles = timer_handles
+    };
+    return self;
+}
+
+// Objects from the freelists are dead, they have to be brought back before being initialized
+pub inline fn revive(object: PyObject, @"type": *python_c.PyTypeObject) void {
+    _ = python_c.PyObject_Init(object, @"type");
+}
+
+pub inline fn push_handle(self: *Freelists, py_handle: *Handle.PythonHandleObject) bool {
+    if (self.closed) return false;
+
+    const object: PyObject = @ptrCast(py_handle);
+    if (python_c.is_type(object, &Handle.PythonHandleType)) {
+        return self.handles.push(object);
+    }else if (python_c.is_type(object, &TimerHandle.PythonTimerHandleType)) {
+        return self.timer_handles.push(object);
+    }
+
+    return false;
+}
+
+pub inline fn unref(self: *Freelists) void {
+    self.refs -= 1;
+    if (self.refs > 0) return;
+
+    const allocator = self.allocator;
+    allocator.free(self.futures.objects);
+    allocator.free(self.tasks.objects);
+    allocator.free(self.handles.objects);
+    allocator.free(self.timer_handles.objects);
+    allocator.destroy(self);
+}
+
+inline fn free_objects(freelist: *Freelist, comptime kind: enum { Future, Handle }) usize {
+    const len = freelist.len;
+    for (freelist.objects[0..len]) |object| {
+        if (kind == .Future) {
+            // Futures and tasks keep their callbacks arena while they are pooled
+            const py_future: *Future.Python.FutureObject = @ptrCast(object);
+            utils.get_data_ptr(Future, py_future).callbacks_arena.deinit();
+        }
+
+        const @"type": *python_c.PyTypeObject = python_c.get_type(object);
+        @"type".tp_free.?(@ptrCast(object));
+    }
+    freelist.len = 0;
+    return len;
+}
+
+// Called while the loop is being released, handles deallocated later are freed as usual
+pub fn close(self: *Freelists) void {
+    _ = free_objects(&self.futures, .Future);
+    _ = free_objects(&self.tasks, .Future);
+
+    self.refs -= free_objects(&self.handles, .Handle);
+    self.refs -= free_objects(&self.timer_handles, .Handle);
+
+    self.closed = true;
+    self.unref();
+}
+
+const Freelists = @This();
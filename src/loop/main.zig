@@ -5,7 +5,6 @@ const CallbackManager = @import("../callback_manager.zig");
 const python_c = @import("python_c");
 
 const CallbacksSetLinkedList = CallbackManager.LinkedList;
-const BlockingTasksSetLinkedList = Scheduling.IO.BlockingTasksSetLinkedList;
 
 const lock = @import("../utils/lock.zig");
 
@@ -17,13 +16,15 @@ ready_tasks_queue_index: u8 = 0,
 
 ready_tasks_queues: [2]CallbackManager.CallbacksSetsQueue,
 
-blocking_tasks_epoll_fd: std.posix.fd_t = -1,
-blocking_ready_epoll_events: []std.os.linux.epoll_event,
-blocking_tasks_queue: BlockingTasksSetLinkedList,
+blocking_tasks_set: Scheduling.IO.BlockingTasksSet,
 blocking_ready_tasks: []std.os.linux.io_uring_cqe,
 
-unlock_epoll_fd: std.posix.fd_t = -1,
-epoll_locked: bool = false,
+timer_wheel: Scheduling.Later.TimerWheel,
+
+// Set while the loop is blocked waiting for completions, with the mutex unlocked
+io_waiting: bool = false,
+inbox: Scheduling.Soon.Inbox = .{},
+busy_poll: Runner.BusyPoll = .{},
 
 max_callbacks_sets_per_queue: [2]usize,
 ready_tasks_queue_min_bytes_capacity: usize,
@@ -31,13 +32,19 @@ ready_tasks_queue_min_bytes_capacity: usize,
 mutex: lock.Mutex,
 
 unix_signals: UnixSignals,
+fd_watchers: FDWatchers,
+executor: Executor,
+freelists: *Freelists,
 
 running: bool = false,
 stopping: bool = false,
 initialized: bool = false,
 
 
-pub fn init(self: *Loop, allocator: std.mem.Allocator, rtq_min_capacity: usize) !void {
+pub fn init(
+    self: *Loop, allocator: std.mem.Allocator, rtq_min_capacity: usize, busy_poll_ns: u64,
+    freelists_capacity: usize
+) !void {
     if (self.initialized) {
         @panic("Loop is already initialized");
     }
@@ -49,8 +56,8 @@ pub fn init(self: *Loop, allocator: std.mem.Allocator, rtq_min_capacity: usize)
     const blocking_ready_tasks = try allocator.alloc(std.os.linux.io_uring_cqe, Scheduling.IO.TotalItems);
     errdefer allocator.free(blocking_ready_tasks);
 
-    const blocking_ready_epoll_events = try allocator.alloc(std.os.linux.epoll_event, 256);
-    errdefer allocator.free(blocking_ready_epoll_events);
+    const freelists = try Freelists.create(allocator, freelists_capacity);
+    errdefer freelists.close();
 
     self.* = .{
         .allocator = allocator,
@@ -68,17 +75,26 @@ pub fn init(self: *Loop, allocator: std.mem.Allocator, rtq_min_capacity: usize)
             max_callbacks_sets_per_queue,
         },
         .ready_tasks_queue_min_bytes_capacity = rtq_min_capacity,
-        .blocking_tasks_queue = BlockingTasksSetLinkedList.init(allocator),
+        .blocking_tasks_set = undefined,
         .blocking_ready_tasks = blocking_ready_tasks,
-        .blocking_tasks_epoll_fd = try std.posix.epoll_create1(0),
-        .blocking_ready_epoll_events = blocking_ready_epoll_events,
-        .unix_signals = undefined
+        .timer_wheel = Scheduling.Later.TimerWheel.init(allocator, try Scheduling.Later.get_current_tick()),
+        .busy_poll = Runner.BusyPoll.init(busy_poll_ns),
+        .unix_signals = undefined,
+        .fd_watchers = undefined,
+        .executor = undefined,
+        .freelists = freelists
     };
-    errdefer {
-        std.posix.close(self.blocking_tasks_epoll_fd);
-    }
+
+    try self.blocking_tasks_set.init(allocator);
+    errdefer self.blocking_tasks_set.deinit();
+
+    try self.inbox.init();
+    errdefer self.inbox.deinit();
+    try self.inbox.arm(&self.blocking_tasks_set);
 
     try UnixSignals.init(self);
+    FDWatchers.init(self);
+    try Executor.init(self);
 
     self.initialized = true;
 }
@@ -89,16 +105,23 @@ pub fn release(self: *Loop) void {
     }
 
     const allocator = self.allocator;
-    const blocking_tasks_queue = &self.blocking_tasks_queue;
-    if (!blocking_tasks_queue.is_empty()) {
-        for (0..blocking_tasks_queue.len) |_| {
-            const set = blocking_tasks_queue.pop() catch unreachable;
-            set.cancel_all(self) catch unreachable;
-            _ = set.deinit();
-        }
-    }
+
+    // Workers could still be dispatching their completions
+    self.executor.deinit();
+
+    // Callbacks pushed by other threads after the last iteration are released with the rest
+    self.inbox.drain(self, &self.ready_tasks_queues[self.ready_tasks_queue_index]) catch unreachable;
+
+    const blocking_tasks_set = &self.blocking_tasks_set;
+    blocking_tasks_set.cancel_all(self) catch unreachable;
+    blocking_tasks_set.deinit();
+
+    self.timer_wheel.cancel_all(self) catch unreachable;
+    self.timer_wheel.deinit();
 
     self.unix_signals.deinit() catch unreachable;
+    self.fd_watchers.deinit();
+    self.inbox.deinit();
 
     for (&self.ready_tasks_queues) |*ready_tasks_queue| {
         _  = CallbackManager.execute_callbacks(allocator, ready_tasks_queue, .Stop, false);
@@ -109,23 +132,26 @@ pub fn release(self: *Loop) void {
         }
     }
 
-    if (self.blocking_tasks_epoll_fd != -1) {
-        std.posix.close(self.blocking_tasks_epoll_fd);
-    }
-
-    if (self.unlock_epoll_fd != -1) {
-        std.posix.close(self.unlock_epoll_fd);
-    }
-
-    allocator.free(self.blocking_ready_epoll_events);
     allocator.free(self.blocking_ready_tasks);
 
+    // Releasing the callbacks above can send more objects to the freelists
+    self.freelists.close();
+
     self.initialized = false;
 }
 
+// The freelists are gone once the loop is released
+pub inline fn get_freelists(self: *Loop) ?*Freelists {
+    if (!self.initialized) return null;
+    return self.freelists;
+}
+
 pub const Runner = @import("runner.zig");
 pub const Scheduling = @import("scheduling/main.zig");
 pub const UnixSignals = @import("unix_signals.zig");
+pub const FDWatchers = @import("fd_watchers.zig");
+pub const Executor = @import("executor.zig");
+pub const Freelists = @import("freelists.zig");
 pub const Python = @import("python/main.zig");
 
 const Loop = @This();
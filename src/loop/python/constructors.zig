@@ -59,6 +59,44 @@ inline fn z_loop_new(
         orelse return error.PythonError;
     defer python_c.py_decref(asyncion_tasks_modules);
 
+    const swap_current_task_func: PyObject = python_c.PyObject_GetAttrString(asyncion_tasks_modules, "_swap_current_task\x00")
+        orelse return error.PythonError;
+    errdefer python_c.py_decref(swap_current_task_func);
+
+    const future_blocking_str: PyObject = python_c.PyUnicode_InternFromString("_asyncio_future_blocking\x00")
+        orelse return error.PythonError;
+    errdefer python_c.py_decref(future_blocking_str);
+
+    const add_done_callback_str: PyObject = python_c.PyUnicode_InternFromString("add_done_callback\x00")
+        orelse return error.PythonError;
+    errdefer python_c.py_decref(add_done_callback_str);
+
+    const result_str: PyObject = python_c.PyUnicode_InternFromString("result\x00")
+        orelse return error.PythonError;
+    errdefer python_c.py_decref(result_str);
+
+    const asyncio_future_type: PyObject = python_c.PyObject_GetAttrString(asyncio_module, "Future\x00")
+        orelse return error.PythonError;
+    errdefer python_c.py_decref(asyncio_future_type);
+
+    const asyncio_task_type: PyObject = python_c.PyObject_GetAttrString(asyncio_module, "Task\x00")
+        orelse return error.PythonError;
+    errdefer python_c.py_decref(asyncio_task_type);
+
+    const future_blocking_descr: PyObject = python_c.PyObject_GetAttr(asyncio_future_type, future_blocking_str)
+        orelse return error.PythonError;
+    errdefer python_c.py_decref(future_blocking_descr);
+
+    const future_add_done_callback_descr: PyObject = python_c.PyObject_GetAttr(asyncio_future_type, add_done_callback_str)
+        orelse return error.PythonError;
+    errdefer python_c.py_decref(future_add_done_callback_descr);
+
+    // With the pure Python futures, _asyncio_future_blocking is a plain attribute and there is no fast path
+    const future_blocking_descr_type = python_c.get_type(future_blocking_descr);
+    const stdlib_futures_fast_path = (
+        future_blocking_descr_type.tp_descr_get != null and future_blocking_descr_type.tp_descr_set != null
+    );
+
     const sys_module: PyObject = python_c.PyImport_ImportModule("sys\x00")
         orelse return error.PythonError;
     errdefer python_c.py_decref(sys_module);
@@ -109,6 +147,17 @@ inline fn z_loop_new(
     instance.leave_task_func = leave_task_func;
     instance.register_task_func = register_task_func;
     instance.unregister_task_func = unregister_task_func;
+    instance.swap_current_task_func = swap_current_task_func;
+
+    instance.future_blocking_str = future_blocking_str;
+    instance.add_done_callback_str = add_done_callback_str;
+    instance.result_str = result_str;
+
+    instance.asyncio_future_type = asyncio_future_type;
+    instance.asyncio_task_type = asyncio_task_type;
+    instance.future_blocking_descr = future_blocking_descr;
+    instance.future_add_done_callback_descr = future_add_done_callback_descr;
+    instance.stdlib_futures_fast_path = stdlib_futures_fast_path;
 
     instance.asyncgens_set = weakref_set;
     instance.asyncgens_set_add = weakref_add;
@@ -148,8 +197,19 @@ pub fn loop_clear(self: ?*LoopObject) callconv(.C) c_int {
 
     python_c.py_decref_and_set_null(&py_loop.enter_task_func);
     python_c.py_decref_and_set_null(&py_loop.leave_task_func);
+    python_c.py_decref_and_set_null(&py_loop.swap_current_task_func);
+
+    python_c.py_decref_and_set_null(&py_loop.future_blocking_str);
+    python_c.py_decref_and_set_null(&py_loop.add_done_callback_str);
+    python_c.py_decref_and_set_null(&py_loop.result_str);
+
+    python_c.py_decref_and_set_null(&py_loop.asyncio_future_type);
+    python_c.py_decref_and_set_null(&py_loop.asyncio_task_type);
+    python_c.py_decref_and_set_null(&py_loop.future_blocking_descr);
+    python_c.py_decref_and_set_null(&py_loop.future_add_done_callback_descr);
 
     python_c.py_decref_and_set_null(&py_loop.exception_handler);
+    python_c.py_decref_and_set_null(&py_loop.task_factory);
 
     python_c.py_decref_and_set_null(&py_loop.asyncgens_set);
     python_c.py_decref_and_set_null(&py_loop.asyncgens_set_add);
@@ -173,7 +233,13 @@ pub fn loop_traverse(self: ?*LoopObject, visit: python_c.visitproc, arg: ?*anyop
             instance.set_running_loop,
             instance.enter_task_func,
             instance.leave_task_func,
+            instance.swap_current_task_func,
+            instance.asyncio_future_type,
+            instance.asyncio_task_type,
+            instance.future_blocking_descr,
+            instance.future_add_done_callback_descr,
             instance.exception_handler,
+            instance.task_factory,
             instance.asyncgens_set,
             instance.asyncgens_set_add,
             instance.asyncgens_set_discard,
@@ -195,21 +261,35 @@ pub fn loop_dealloc(self: ?*LoopObject) callconv(.C) void {
 inline fn z_loop_init(
     self: *LoopObject, args: ?PyObject, kwargs: ?PyObject
 ) !c_int {
-    var kwlist: [4][*c]u8 = undefined;
+    var kwlist: [5][*c]u8 = undefined;
     kwlist[0] = @constCast("ready_tasks_queue_min_bytes_capacity\x00");
     kwlist[1] = @constCast("exception_handler\x00");
-    kwlist[2] = null;
+    kwlist[2] = @constCast("busy_poll_us\x00");
+    kwlist[3] = @constCast("freelist_size\x00");
+    kwlist[4] = null;
 
     var ready_tasks_queue_min_bytes_capacity: u64 = 0;
     var exception_handler: ?PyObject = null;
+    var busy_poll_us: i64 = 0;
+    var freelist_size: i64 = Loop.Freelists.DefaultCapacity;
 
     if (python_c.PyArg_ParseTupleAndKeywords(
-            args, kwargs, "KO\x00", @ptrCast(&kwlist), &ready_tasks_queue_min_bytes_capacity,
-            &exception_handler
+            args, kwargs, "KO|LL\x00", @ptrCast(&kwlist), &ready_tasks_queue_min_bytes_capacity,
+            &exception_handler, &busy_poll_us, &freelist_size
     ) < 0) {
         return error.PythonError;
     }
 
+    if (busy_poll_us < 0) {
+        python_c.PyErr_SetString(python_c.PyExc_ValueError, "busy_poll_us can't be negative\x00");
+        return error.PythonError;
+    }
+
+    if (freelist_size < 0) {
+        python_c.PyErr_SetString(python_c.PyExc_ValueError, "freelist_size can't be negative\x00");
+        return error.PythonError;
+    }
+
     if (python_c.PyCallable_Check(exception_handler.?) < 0) {
         utils.put_python_runtime_error_message("Invalid exception handler\x00");
         return error.PythonError;
@@ -220,7 +300,10 @@ inline fn z_loop_init(
 
     const allocator = utils.gpa.allocator();
     const loop_data = utils.get_data_ptr(Loop, self);
-    try loop_data.init(allocator, @intCast(ready_tasks_queue_min_bytes_capacity));
+    try loop_data.init(
+        allocator, @intCast(ready_tasks_queue_min_bytes_capacity),
+        @as(u64, @intCast(busy_poll_us)) *| std.time.ns_per_us, @intCast(freelist_size)
+    );
 
     return 0;
 }
@@ -0,0 +1,157 @@
+const python_c = @import("python_c");
+const PyObject = *python_c.PyObject;
+
+const utils = @import("../../utils/utils.zig");
+
+const CallbackManager = @import("../../callback_manager.zig");
+const Future = @import("../../future/main.zig");
+const Loop = @import("../main.zig");
+const LoopObject = Loop.Python.LoopObject;
+const PythonFutureObject = Future.Python.FutureObject;
+
+const Executor = Loop.Executor;
+
+const std = @import("std");
+const builtin = @import("builtin");
+
+const PythonJob = struct {
+    job: Executor.Job,
+    loop: *Loop,
+    py_future: *PythonFutureObject,
+    py_callable: ?PyObject,
+    py_args: ?PyObject,
+
+    result: ?PyObject = null,
+    exception: ?PyObject = null
+};
+
+inline fn is_future_pending(py_future: *PythonFutureObject) bool {
+    const future_data = utils.get_data_ptr(Future, py_future);
+    const mutex = &future_data.mutex;
+    mutex.lock();
+    defer mutex.unlock();
+
+    return future_data.status == .PENDING;
+}
+
+fn run_job(job: *Executor.Job) void {
+    const python_job: *PythonJob = @fieldParentPtr("job", job);
+    defer {
+        python_c.py_decref_and_set_null(&python_job.py_callable);
+        python_c.py_decref_and_set_null(&python_job.py_args);
+    }
+
+    // The future was cancelled before any worker got to it
+    if (!is_future_pending(python_job.py_future)) return;
+
+    python_job.result = python_c.PyObject_Call(python_job.py_callable.?, python_job.py_args.?, null);
+    if (python_job.result == null) {
+        python_job.exception = python_c.PyErr_GetRaisedException();
+    }
+}
+
+fn set_future_outcome(python_job: *PythonJob) !void {
+    const py_future = python_job.py_future;
+    const future_data = utils.get_data_ptr(Future, py_future);
+    const mutex = &future_data.mutex;
+    mutex.lock();
+    defer mutex.unlock();
+
+    if (future_data.status != .PENDING) return;
+
+    if (python_job.result) |result| {
+        try Future.Python.Result.future_fast_set_result(future_data, result);
+    }else if (python_job.exception) |exception| {
+        _ = try Future.Python.Result.future_fast_set_exception(py_future, future_data, exception);
+    }
+}
+
+fn complete_job(job: *Executor.Job, status: CallbackManager.ExecuteCallbacksReturn) void {
+    const python_job: *PythonJob = @fieldParentPtr("job", job);
+    defer {
+        // Jobs released before running still hold their callable
+        python_c.py_xdecref(python_job.py_callable);
+        python_c.py_xdecref(python_job.py_args);
+        python_c.py_xdecref(python_job.result);
+        python_c.py_xdecref(python_job.exception);
+        python_c.py_decref(@ptrCast(python_job.py_future));
+
+        python_job.loop.allocator.destroy(python_job);
+    }
+
+    if (status != .Continue) return;
+
+    set_future_outcome(python_job) catch |err| {
+        const err_trace = @errorReturnTrace();
+        utils.print_error_traces(err_trace, err);
+    };
+}
+
+inline fn z_loop_run_in_thread_pool(self: *LoopObject, args: []?PyObject) !*PythonFutureObject {
+    if (builtin.single_threaded) {
+        utils.put_python_runtime_error_message("Loop.run_in_executor is not supported\x00");
+        return error.PythonError;
+    }
+
+    if (args.len < 1) {
+        utils.put_python_runtime_error_message("Invalid number of arguments\x00");
+        return error.PythonError;
+    }
+
+    const py_callable = args[0].?;
+    if (python_c.PyCallable_Check(py_callable) <= 0) {
+        python_c.PyErr_SetString(python_c.PyExc_TypeError, "Invalid callback\x00");
+        return error.PythonError;
+    }
+
+    const call_args = args[1..];
+    const py_args: PyObject = python_c.PyTuple_New(@intCast(call_args.len))
+        orelse return error.PythonError;
+    errdefer python_c.py_decref(py_args);
+
+    for (call_args, 0..) |arg, index| {
+        _ = python_c.PyTuple_SetItem(py_args, @intCast(index), python_c.py_newref(arg.?));
+    }
+
+    const py_future = try Future.Python.Constructors.fast_new_future(self);
+    errdefer python_c.py_decref(@ptrCast(py_future));
+
+    const loop_data = utils.get_data_ptr(Loop, self);
+    const python_job = try loop_data.allocator.create(PythonJob);
+    errdefer loop_data.allocator.destroy(python_job);
+
+    python_job.* = .{
+        .job = .{
+            .run = &run_job,
+            .complete = &complete_job
+        },
+        .loop = loop_data,
+        .py_future = python_c.py_newref(py_future),
+        .py_callable = python_c.py_newref(py_callable),
+        .py_args = py_args
+    };
+    errdefer {
+        python_c.py_decref(@ptrCast(py_future));
+        python_c.py_decref(py_callable);
+    }
+
+    const mutex = &loop_data.mutex;
+    mutex.lock();
+    defer mutex.unlock();
+
+    if (!loop_data.initialized) {
+        utils.put_python_runtime_error_message("Loop is closed\x00");
+        return error.PythonError;
+    }
+
+    try loop_data.executor.submit(&python_job.job);
+    return py_future;
+}
+
+pub fn loop_run_in_thread_pool(
+    self: ?*LoopObject, args: ?[*]?PyObject, nargs: isize
+) callconv(.C) ?*PythonFutureObject {
+    return utils.execute_zig_function(z_loop_run_in_thread_pool, .{
+        self.?, args.?[0..@as(usize, @intCast(nargs))]
+    });
+}
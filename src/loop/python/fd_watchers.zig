@@ -0,0 +1,144 @@
+const python_c = @import("python_c");
+const PyObject = *python_c.PyObject;
+
+const utils = @import("../../utils/utils.zig");
+
+const CallbackManager = @import("../../callback_manager.zig");
+const Handle = @import("../../handle.zig");
+const Loop = @import("../main.zig");
+const LoopObject = Loop.Python.LoopObject;
+
+const Scheduling = @import("scheduling.zig");
+
+const std = @import("std");
+
+inline fn get_fd(py_fd: PyObject) !std.posix.fd_t {
+    const fd = python_c.PyObject_AsFileDescriptor(py_fd);
+    if (fd < 0) {
+        return error.PythonError;
+    }
+
+    switch (std.os.linux.E.init(std.os.linux.fcntl(fd, std.posix.F.GETFD, 0))) {
+        .SUCCESS => {},
+        else => |err| {
+            utils.put_python_os_error(err);
+            return error.PythonError;
+        }
+    }
+
+    return fd;
+}
+
+inline fn z_loop_add_watcher(
+    self: *LoopObject, args: []?PyObject, comptime watcher_type: Loop.FDWatchers.WatcherType
+) !PyObject {
+    if (args.len < 2) {
+        utils.put_python_runtime_error_message("Invalid number of arguments\x00");
+        return error.PythonError;
+    }
+
+    if (python_c.PyCallable_Check(args[1].?) <= 0) {
+        python_c.PyErr_SetString(python_c.PyExc_TypeError, "Invalid callback\x00");
+        return error.PythonError;
+    }
+
+    const loop_data = utils.get_data_ptr(Loop, self);
+    const fd = try get_fd(args[0].?);
+
+    const context: PyObject = python_c.PyContext_CopyCurrent()
+        orelse return error.PythonError;
+    errdefer python_c.py_decref(context);
+
+    const allocator = loop_data.allocator;
+    const callback_info = try Scheduling.get_callback_info(allocator, args[2..]);
+    errdefer {
+        if (callback_info) |_args| {
+            for (_args) |arg| {
+                python_c.py_decref(@ptrCast(arg));
+            }
+            allocator.free(_args);
+        }
+    }
+    const py_handle: *Handle.PythonHandleObject = try Handle.fast_new_handle(context, loop_data);
+    errdefer python_c.py_decref(@ptrCast(py_handle));
+
+    const py_callback = python_c.py_newref(args[1].?);
+    errdefer python_c.py_decref(py_callback);
+
+    const mutex = &loop_data.mutex;
+    mutex.lock();
+    defer mutex.unlock();
+    if (!loop_data.initialized) {
+        utils.put_python_runtime_error_message("Loop is closed\x00");
+        return error.PythonError;
+    }
+
+    const callback: CallbackManager.Callback = .{
+        .PythonGeneric = .{
+            .args = callback_info,
+            .exception_handler = self.exception_handler.?,
+            .py_callback = py_callback,
+            .py_context = context,
+            .py_handle = py_handle,
+            .cancelled = &py_handle.cancelled,
+            .can_release = false
+        }
+    };
+
+    try loop_data.fd_watchers.link(fd, watcher_type, callback);
+
+    return python_c.get_py_none();
+}
+
+inline fn z_loop_remove_watcher(
+    self: *LoopObject, py_fd: PyObject, comptime watcher_type: Loop.FDWatchers.WatcherType
+) !PyObject {
+    const fd = python_c.PyObject_AsFileDescriptor(py_fd);
+    if (fd < 0) {
+        return error.PythonError;
+    }
+
+    const loop_data = utils.get_data_ptr(Loop, self);
+    const mutex = &loop_data.mutex;
+    mutex.lock();
+    defer mutex.unlock();
+
+    if (!loop_data.initialized) {
+        return python_c.get_py_false();
+    }
+
+    const removed = try loop_data.fd_watchers.unlink(fd, watcher_type);
+    return python_c.PyBool_FromLong(@intCast(@intFromBool(removed)));
+}
+
+pub fn loop_add_reader(
+    self: ?*LoopObject, args: ?[*]?PyObject, nargs: isize
+) callconv(.C) ?PyObject {
+    return utils.execute_zig_function(z_loop_add_watcher, .{
+        self.?, args.?[0..@as(usize, @intCast(nargs))], .Reader
+    });
+}
+
+pub fn loop_add_writer(
+    self: ?*LoopObject, args: ?[*]?PyObject, nargs: isize
+) callconv(.C) ?PyObject {
+    return utils.execute_zig_function(z_loop_add_watcher, .{
+        self.?, args.?[0..@as(usize, @intCast(nargs))], .Writer
+    });
+}
+
+pub fn loop_remove_reader(
+    self: ?*LoopObject, py_fd: ?PyObject
+) callconv(.C) ?PyObject {
+    return utils.execute_zig_function(z_loop_remove_watcher, .{
+        self.?, py_fd.?, .Reader
+    });
+}
+
+pub fn loop_remove_writer(
+    self: ?*LoopObject, py_fd: ?PyObject
+) callconv(.C) ?PyObject {
+    return utils.execute_zig_function(z_loop_remove_watcher, .{
+        self.?, py_fd.?, .Writer
+    });
+}
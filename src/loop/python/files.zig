@@ -0,0 +1,106 @@
+const python_c = @import("python_c");
+const PyObject = *python_c.PyObject;
+
+const utils = @import("../../utils/utils.zig");
+
+const Future = @import("../../future/main.zig");
+const Loop = @import("../main.zig");
+const LoopObject = Loop.Python.LoopObject;
+const PythonFutureObject = Future.Python.FutureObject;
+
+const Sockets = @import("sockets.zig");
+
+// Regular files are always "ready" for epoll, so reading them goes through io_uring instead of
+// blocking the loop. The operations themselves are shared with the sockets ones.
+
+fn get_offset(args: []?PyObject) !usize {
+    if (args.len < 3) return Sockets.CurrentPosition;
+
+    const offset = python_c.PyLong_AsLongLong(args[2].?);
+    if (offset == -1) {
+        if (python_c.PyErr_Occurred() != null) return error.PythonError;
+        return Sockets.CurrentPosition;
+    }
+
+    if (offset < 0) {
+        python_c.PyErr_SetString(python_c.PyExc_ValueError, "negative offset\x00");
+        return error.PythonError;
+    }
+    return @intCast(offset);
+}
+
+inline fn check_number_of_arguments(args: []?PyObject) !void {
+    if (args.len < 2 or args.len > 3) {
+        utils.put_python_runtime_error_message("Invalid number of arguments\x00");
+        return error.PythonError;
+    }
+}
+
+inline fn z_loop_file_read(self: *LoopObject, args: []?PyObject) !*PythonFutureObject {
+    try check_number_of_arguments(args);
+
+    const nbytes = python_c.PyLong_AsSsize_t(args[1].?);
+    if (nbytes < 0) {
+        if (python_c.PyErr_Occurred() == null) {
+            python_c.PyErr_SetString(python_c.PyExc_ValueError, "negative size in file_read\x00");
+        }
+        return error.PythonError;
+    }
+
+    const offset = try get_offset(args);
+    const py_bytes: PyObject = python_c.PyBytes_FromStringAndSize(null, nbytes)
+        orelse return error.PythonError;
+    return try Sockets.queue_operation(self, args[0].?, .{
+        .FileRead = .{ .py_bytes = py_bytes, .offset = offset }
+    });
+}
+
+inline fn z_loop_file_readinto(self: *LoopObject, args: []?PyObject) !*PythonFutureObject {
+    try check_number_of_arguments(args);
+
+    const offset = try get_offset(args);
+    var buffer: python_c.Py_buffer = undefined;
+    if (python_c.PyObject_GetBuffer(args[1].?, &buffer, python_c.PyBUF_WRITABLE) < 0) {
+        return error.PythonError;
+    }
+    return try Sockets.queue_operation(self, args[0].?, .{
+        .FileReadInto = .{ .buffer = buffer, .offset = offset }
+    });
+}
+
+inline fn z_loop_file_write(self: *LoopObject, args: []?PyObject) !*PythonFutureObject {
+    try check_number_of_arguments(args);
+
+    const offset = try get_offset(args);
+    var buffer: python_c.Py_buffer = undefined;
+    if (python_c.PyObject_GetBuffer(args[1].?, &buffer, python_c.PyBUF_SIMPLE) < 0) {
+        return error.PythonError;
+    }
+    return try Sockets.queue_operation(self, args[0].?, .{
+        .FileWrite = .{ .buffer = buffer, .offset = offset }
+    });
+}
+
+pub fn loop_file_read(
+    self: ?*LoopObject, args: ?[*]?PyObject, nargs: isize
+) callconv(.C) ?*PythonFutureObject {
+    return utils.execute_zig_function(z_loop_file_read, .{
+        self.?, args.?[0..@as(usize, @intCast(nargs))]
+    });
+}
+
+pub fn loop_file_readinto(
+    self: ?*LoopObject, args: ?[*]?PyObject, nargs: isize
+) callconv(.C) ?*PythonFutureObject {
+    return utils.execute_zig_function(z_loop_file_readinto, .{
+        self.?, args.?[0..@as(usize, @intCast(nargs))]
+    });
+}
+
+pub fn loop_file_write(
+    self: ?*LoopObject, args: ?[*]?PyObject, nargs: isize
+) callconv(.C) ?*PythonFutureObject {
+    return utils.execute_zig_function(z_loop_file_write, .{
+        self.?, args.?[0..@as(usize, @intCast(nargs))]
+    });
+}
@@ -0,0 +1,43 @@
+const python_c = @import("python_c");
+const PyObject = *python_c.PyObject;
+
+const utils = @import("../../utils/utils.zig");
+
+const Loop = @import("../main.zig");
+const LoopObject = Loop.Python.LoopObject;
+
+const Freelists = Loop.Freelists;
+
+inline fn build_freelist_stats(freelist: *const Freelists.Freelist) ?PyObject {
+    return python_c.Py_BuildValue(
+        "{s:n,s:n,s:K,s:K}\x00",
+        "size\x00", @as(python_c.Py_ssize_t, @intCast(freelist.len)),
+        "capacity\x00", @as(python_c.Py_ssize_t, @intCast(freelist.objects.len)),
+        "hits\x00", @as(c_ulonglong, freelist.hits),
+        "misses\x00", @as(c_ulonglong, freelist.misses)
+    );
+}
+
+pub fn loop_get_freelist_stats(self: ?*LoopObject, _: ?PyObject) callconv(.C) ?PyObject {
+    const loop_data = utils.get_data_ptr(Loop, self.?);
+    const freelists = loop_data.get_freelists() orelse {
+        utils.put_python_runtime_error_message("Loop is closed\x00");
+        return null;
+    };
+
+    const stats: PyObject = python_c.PyDict_New() orelse return null;
+    inline for (.{"futures", "tasks", "handles", "timer_handles"}) |name| {
+        const freelist_stats: PyObject = build_freelist_stats(&@field(freelists, name)) orelse {
+            python_c.py_decref(stats);
+            return null;
+        };
+        defer python_c.py_decref(freelist_stats);
+
+        if (python_c.PyDict_SetItemString(stats, name ++ "\x00", freelist_stats) < 0) {
+            python_c.py_decref(stats);
+            return null;
+        }
+    }
+
+    return stats;
+}
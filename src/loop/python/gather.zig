@@ -0,0 +1,554 @@
+const python_c = @import("python_c");
+const PyObject = *python_c.PyObject;
+
+const utils = @import("../../utils/utils.zig");
+
+const CallbackManager = @import("../../callback_manager.zig");
+const Future = @import("../../future/main.zig");
+const Loop = @import("../main.zig");
+const LoopObject = Loop.Python.LoopObject;
+const PythonFutureObject = Future.Python.FutureObject;
+
+// The wrapper maps asyncio's FIRST_COMPLETED, FIRST_EXCEPTION and ALL_COMPLETED to these values
+const ReturnWhen = enum(u8) {
+    FirstCompleted = 0,
+    FirstException = 1,
+    AllCompleted = 2
+};
+
+const Mode = union(enum) {
+    Gather: struct {
+        results: ?PyObject = null,
+        return_exceptions: bool
+    },
+    Wait: ReturnWhen
+};
+
+const Child = struct {
+    operation: *Operation,
+    index: usize
+};
+
+// Shared by every future being gathered or waited, each one of them gets a single Zig callback pointing to
+// its own Child
+const Operation = struct {
+    loop: *Loop,
+    py_outer: *PythonFutureObject,
+    py_futures: []*PythonFutureObject,
+    children: []Child,
+    mode: Mode,
+
+    pending: usize,
+    references: usize = 1,
+
+    // Gather only, a cancelled gather finishes once every child is done
+    cancel_requested: bool = false,
+    cancel_msg: ?PyObject = null
+};
+
+fn unref_operation(operation: *Operation) void {
+    operation.references -= 1;
+    if (operation.references > 0) return;
+
+    for (operation.py_futures) |py_future| {
+        python_c.py_decref(@ptrCast(py_future));
+    }
+    python_c.py_decref(@ptrCast(operation.py_outer));
+    python_c.py_xdecref(operation.cancel_msg);
+
+    switch (operation.mode) {
+        .Gather => |data| python_c.py_decref(data.results.?),
+        .Wait => {}
+    }
+
+    const allocator = operation.loop.allocator;
+    allocator.free(operation.py_futures);
+    allocator.free(operation.children);
+    allocator.destroy(operation);
+}
+
+inline fn is_pending(py_future: *PythonFutureObject) bool {
+    const future_data = utils.get_data_ptr(Future, py_future);
+    const mutex = &future_data.mutex;
+    mutex.lock();
+    defer mutex.unlock();
+
+    return future_data.status == .PENDING;
+}
+
+inline fn has_exception(py_future: *PythonFutureObject) bool {
+    const future_data = utils.get_data_ptr(Future, py_future);
+    const mutex = &future_data.mutex;
+    mutex.lock();
+    defer mutex.unlock();
+
+    return future_data.status == .FINISHED and py_future.exception != null;
+}
+
+// Returns a new reference to the result of a done future, or to the exception it would raise
+inline fn get_outcome(py_future: *PythonFutureObject, is_exception: *bool) ?PyObject {
+    const future_data = utils.get_data_ptr(Future, py_future);
+    const mutex = &future_data.mutex;
+    mutex.lock();
+    defer mutex.unlock();
+
+    if (Future.Python.Result.get_result(py_future)) |result| {
+        is_exception.* = false;
+        return result;
+    }
+
+    is_exception.* = true;
+    return python_c.PyErr_GetRaisedException();
+}
+
+inline fn set_cancelled_error(operation: *Operation, outer_data: *Future) !void {
+    const py_outer = operation.py_outer;
+    const cancelled_error = py_outer.cancelled_error_exc.?;
+    const exception: PyObject = blk: {
+        if (operation.cancel_msg) |msg| {
+            break :blk python_c.PyObject_CallOneArg(cancelled_error, msg);
+        }
+        break :blk python_c.PyObject_CallNoArgs(cancelled_error);
+    } orelse return error.PythonError;
+    defer python_c.py_decref(exception);
+
+    _ = try Future.Python.Result.future_fast_set_exception(py_outer, outer_data, exception);
+}
+
+fn gather_child_done(operation: *Operation, index: usize, results: PyObject, return_exceptions: bool) !void {
+    var is_exception: bool = undefined;
+    const outcome = get_outcome(operation.py_futures[index], &is_exception) orelse return error.PythonError;
+    defer python_c.py_decref(outcome);
+
+    const py_outer = operation.py_outer;
+    const outer_data = utils.get_data_ptr(Future, py_outer);
+    const mutex = &outer_data.mutex;
+    mutex.lock();
+    defer mutex.unlock();
+
+    if (outer_data.status != .PENDING) return;
+
+    if (operation.cancel_requested) {
+        if (operation.pending == 0) {
+            try set_cancelled_error(operation, outer_data);
+        }
+        return;
+    }
+
+    if (is_exception and !return_exceptions) {
+        _ = try Future.Python.Result.future_fast_set_exception(py_outer, outer_data, outcome);
+        return;
+    }
+
+    if (python_c.PyList_SetItem(results, @intCast(index), python_c.py_newref(outcome)) < 0) {
+        return error.PythonError;
+    }
+
+    if (operation.pending == 0) {
+        try Future.Python.Result.future_fast_set_result(outer_data, results);
+    }
+}
+
+fn wait_child_done(operation: *Operation, index: usize, return_when: ReturnWhen) !void {
+    const done = switch (return_when) {
+        .FirstCompleted => true,
+        .FirstException => operation.pending == 0 or has_exception(operation.py_futures[index]),
+        .AllCompleted => operation.pending == 0
+    };
+    if (!done) return;
+
+    const outer_data = utils.get_data_ptr(Future, operation.py_outer);
+    const mutex = &outer_data.mutex;
+    mutex.lock();
+    defer mutex.unlock();
+
+    if (outer_data.status != .PENDING) return;
+
+    const py_none = python_c.get_py_none();
+    defer python_c.py_decref(py_none);
+
+    try Future.Python.Result.future_fast_set_result(outer_data, py_none);
+}
+
+fn on_child_done(operation: *Operation, index: usize) CallbackManager.ExecuteCallbacksReturn {
+    operation.pending -= 1;
+
+    const ret = switch (operation.mode) {
+        .Gather => |data| gather_child_done(operation, index, data.results.?, data.return_exceptions),
+        .Wait => |return_when| wait_child_done(operation, index, return_when)
+    };
+    ret catch |err| {
+        if (err != error.PythonError) {
+            utils.put_python_runtime_error_message(@errorName(err));
+        }
+        return .Exception;
+    };
+
+    return .Continue;
+}
+
+fn child_done_callback(
+    data: ?*anyopaque, status: CallbackManager.ExecuteCallbacksReturn
+) CallbackManager.ExecuteCallbacksReturn {
+    const child: *Child = @alignCast(@ptrCast(data.?));
+    const operation = child.operation;
+    defer unref_operation(operation);
+
+    if (status != .Continue) return status;
+
+    return on_child_done(operation, child.index);
+}
+
+// Called with the outer future's mutex held instead of cancelling it. Like asyncio.gather, the children are
+// asked to cancel and the outer future only gets its CancelledError once all of them are done.
+fn cancel_gather(data: ?*anyopaque, cancel_msg: ?PyObject) bool {
+    const operation: *Operation = @alignCast(@ptrCast(data.?));
+    operation.cancel_requested = true;
+    if (cancel_msg) |msg| {
+        python_c.py_xdecref(operation.cancel_msg);
+        operation.cancel_msg = python_c.py_newref(msg);
+    }
+
+    // The message can only be given by keyword to Leviathan futures
+    const args: PyObject = python_c.PyTuple_New(0) orelse return false;
+    defer python_c.py_decref(args);
+
+    var kwargs: ?PyObject = null;
+    if (cancel_msg) |msg| {
+        kwargs = python_c.Py_BuildValue("{s:O}\x00", "msg\x00", msg) orelse return false;
+    }
+    defer python_c.py_xdecref(kwargs);
+
+    for (operation.py_futures) |py_future| {
+        if (!is_pending(py_future)) continue;
+
+        const cancel_function: PyObject = python_c.PyObject_GetAttrString(@ptrCast(py_future), "cancel\x00")
+            orelse return false;
+        defer python_c.py_decref(cancel_function);
+
+        const ret: PyObject = python_c.PyObject_Call(cancel_function, args, kwargs) orelse return false;
+        python_c.py_decref(ret);
+    }
+
+    return true;
+}
+
+// Once the outer future is done the children that are still pending don't matter anymore, their callbacks
+// are detached so the operation doesn't keep them and the outer future alive until they finish
+fn detach_children(operation: *Operation) void {
+    for (operation.py_futures, operation.children) |py_future, *child| {
+        const future_data = utils.get_data_ptr(Future, py_future);
+        const detached = blk: {
+            const mutex = &future_data.mutex;
+            mutex.lock();
+            defer mutex.unlock();
+
+            break :blk Future.Callback.detach_zig_callback(future_data, &child_done_callback, child);
+        };
+
+        if (detached) {
+            unref_operation(operation);
+        }
+    }
+}
+
+fn outer_done_callback(
+    data: ?*anyopaque, status: CallbackManager.ExecuteCallbacksReturn
+) CallbackManager.ExecuteCallbacksReturn {
+    const operation: *Operation = @alignCast(@ptrCast(data.?));
+    defer unref_operation(operation);
+
+    const outer_data = utils.get_data_ptr(Future, operation.py_outer);
+    outer_data.cancel_hook = null;
+
+    if (status != .Continue) return status;
+
+    detach_children(operation);
+    return .Continue;
+}
+
+// Returns null if any of the futures isn't a Leviathan future from this loop, the wrapper falls back to
+// asyncio for them
+fn create_operation(self: *LoopObject, py_tuple: PyObject, mode: Mode) !?*Operation {
+    const futures_num: usize = @intCast(python_c.PyTuple_Size(py_tuple));
+    for (0..futures_num) |index| {
+        const item: PyObject = python_c.PyTuple_GetItem(py_tuple, @intCast(index)) orelse return error.PythonError;
+        if (!python_c.type_check(item, &Future.Python.FutureType)) return null;
+
+        const py_future: *PythonFutureObject = @ptrCast(item);
+        if (py_future.py_loop != self) return null;
+    }
+
+    const loop_data = utils.get_data_ptr(Loop, self);
+    const allocator = loop_data.allocator;
+
+    const operation = try allocator.create(Operation);
+    errdefer allocator.destroy(operation);
+
+    const py_futures = try allocator.alloc(*PythonFutureObject, futures_num);
+    errdefer allocator.free(py_futures);
+
+    const children = try allocator.alloc(Child, futures_num);
+    errdefer allocator.free(children);
+
+    var operation_mode = mode;
+    switch (operation_mode) {
+        .Gather => |*data| {
+            data.results = python_c.PyList_New(@intCast(futures_num)) orelse return error.PythonError;
+        },
+        .Wait => {}
+    }
+    errdefer {
+        switch (operation_mode) {
+            .Gather => |data| python_c.py_decref(data.results.?),
+            .Wait => {}
+        }
+    }
+
+    const py_outer = try Future.Python.Constructors.fast_new_future(self);
+
+    for (py_futures, children, 0..) |*py_future, *child, index| {
+        py_future.* = @ptrCast(python_c.py_newref(python_c.PyTuple_GetItem(py_tuple, @intCast(index)).?));
+        child.* = .{
+            .operation = operation,
+            .index = index
+        };
+    }
+
+    operation.* = .{
+        .loop = loop_data,
+        .py_outer = py_outer,
+        .py_futures = py_futures,
+        .children = children,
+        .mode = operation_mode,
+        .pending = futures_num
+    };
+    return operation;
+}
+
+inline fn start_operation(self: *LoopObject, py_sequence: PyObject, mode: Mode) !PyObject {
+    const py_tuple: PyObject = python_c.PySequence_Tuple(py_sequence) orelse return error.PythonError;
+    defer python_c.py_decref(py_tuple);
+
+    const operation = (try create_operation(self, py_tuple, mode)) orelse return python_c.get_py_none();
+    defer unref_operation(operation);
+
+    for (operation.py_futures, operation.children) |py_future, *child| {
+        const future_data = utils.get_data_ptr(Future, py_future);
+        const registered = blk: {
+            const mutex = &future_data.mutex;
+            mutex.lock();
+            defer mutex.unlock();
+
+            if (future_data.status != .PENDING) break :blk false;
+
+            try Future.Callback.add_done_callback(future_data, .{
+                .ZigGeneric = .{
+                    .callback = &child_done_callback,
+                    .data = child
+                }
+            });
+            break :blk true;
+        };
+
+        if (registered) {
+            operation.references += 1;
+        }else if (on_child_done(operation, child.index) == .Exception) {
+            return error.PythonError;
+        }
+    }
+
+    const py_outer = operation.py_outer;
+    const outer_data = utils.get_data_ptr(Future, py_outer);
+    const outer_pending = blk: {
+        const mutex = &outer_data.mutex;
+        mutex.lock();
+        defer mutex.unlock();
+
+        if (outer_data.status != .PENDING) break :blk false;
+
+        try Future.Callback.add_done_callback(outer_data, .{
+            .ZigGeneric = .{
+                .callback = &outer_done_callback,
+                .data = operation
+            }
+        });
+        operation.references += 1;
+
+        if (mode == .Gather) {
+            outer_data.cancel_hook = .{
+                .callback = &cancel_gather,
+                .data = operation
+            };
+        }
+        break :blk true;
+    };
+
+    if (!outer_pending) {
+        detach_children(operation);
+    }
+
+    return @ptrCast(python_c.py_newref(py_outer));
+}
+
+inline fn z_loop_gather(self: *LoopObject, args: []?PyObject) !PyObject {
+    if (args.len != 2) {
+        utils.put_python_runtime_error_message("Invalid number of arguments\x00");
+        return error.PythonError;
+    }
+
+    const return_exceptions = python_c.PyObject_IsTrue(args[1].?);
+    if (return_exceptions < 0) return error.PythonError;
+
+    return try start_operation(self, args[0].?, .{
+        .Gather = .{
+            .return_exceptions = (return_exceptions != 0)
+        }
+    });
+}
+
+pub fn loop_gather(
+    self: ?*LoopObject, args: ?[*]?PyObject, nargs: isize
+) callconv(.C) ?PyObject {
+    return utils.execute_zig_function(z_loop_gather, .{
+        self.?, args.?[0..@as(usize, @intCast(nargs))]
+    });
+}
+
+inline fn z_loop_wait(self: *LoopObject, args: []?PyObject) !PyObject {
+    if (args.len != 2) {
+        utils.put_python_runtime_error_message("Invalid number of arguments\x00");
+        return error.PythonError;
+    }
+
+    const py_return_when = python_c.PyLong_AsLong(args[1].?);
+    if (py_return_when < 0 or py_return_when > @intFromEnum(ReturnWhen.AllCompleted)) {
+        if (python_c.PyErr_Occurred() == null) {
+            python_c.PyErr_SetString(python_c.PyExc_ValueError, "Invalid return_when value\x00");
+        }
+        return error.PythonError;
+    }
+
+    const return_when: ReturnWhen = @enumFromInt(py_return_when);
+    return try start_operation(self, args[0].?, .{ .Wait = return_when });
+}
+
+pub fn loop_wait(
+    self: ?*LoopObject, args: ?[*]?PyObject, nargs: isize
+) callconv(.C) ?PyObject {
+    return utils.execute_zig_function(z_loop_wait, .{
+        self.?, args.?[0..@as(usize, @intCast(nargs))]
+    });
+}
+
+// TaskGroup children are added one at a time while the group is running, so each one gets its own record
+// instead of a slot in an Operation. The group's _tasks set already counts the pending children.
+const GroupChild = struct {
+    loop: *Loop,
+    py_group: PyObject,
+    py_task: *PythonFutureObject
+};
+
+fn release_group_child(child: *GroupChild) void {
+    python_c.py_decref(child.py_group);
+    python_c.py_decref(@ptrCast(child.py_task));
+    child.loop.allocator.destroy(child);
+}
+
+fn group_child_done(child: *GroupChild) !void {
+    const py_group = child.py_group;
+    const py_task: PyObject = @ptrCast(child.py_task);
+
+    const py_tasks: PyObject = python_c.PyObject_GetAttrString(py_group, "_tasks\x00")
+        orelse return error.PythonError;
+    defer python_c.py_decref(py_tasks);
+
+    if (python_c.PySet_Discard(py_tasks, py_task) < 0) return error.PythonError;
+
+    const remaining = python_c.PySet_Size(py_tasks);
+    if (remaining < 0) return error.PythonError;
+
+    // Waking up __aexit__ and handling errors is left to asyncio's own callback, both only happen once
+    if (remaining > 0 and !has_exception(child.py_task)) return;
+
+    const on_task_done: PyObject = python_c.PyObject_GetAttrString(py_group, "_on_task_done\x00")
+        orelse return error.PythonError;
+    defer python_c.py_decref(on_task_done);
+
+    const ret: PyObject = python_c.PyObject_CallOneArg(on_task_done, py_task) orelse return error.PythonError;
+    python_c.py_decref(ret);
+}
+
+fn group_child_done_callback(
+    data: ?*anyopaque, status: CallbackManager.ExecuteCallbacksReturn
+) CallbackManager.ExecuteCallbacksReturn {
+    const child: *GroupChild = @alignCast(@ptrCast(data.?));
+    defer release_group_child(child);
+
+    if (status != .Continue) return status;
+
+    group_child_done(child) catch |err| {
+        if (err != error.PythonError) {
+            utils.put_python_runtime_error_message(@errorName(err));
+        }
+        return .Exception;
+    };
+    return .Continue;
+}
+
+// Returns False if the task isn't a pending Leviathan task from this loop, the wrapper adds asyncio's done
+// callback to it then
+inline fn z_loop_task_group_add(self: *LoopObject, args: []?PyObject) !PyObject {
+    if (args.len != 2) {
+        utils.put_python_runtime_error_message("Invalid number of arguments\x00");
+        return error.PythonError;
+    }
+
+    const item = args[1].?;
+    if (!python_c.type_check(item, &Future.Python.FutureType)) return python_c.get_py_false();
+
+    const py_task: *PythonFutureObject = @ptrCast(item);
+    if (py_task.py_loop != self) return python_c.get_py_false();
+
+    const loop_data = utils.get_data_ptr(Loop, self);
+    const child = try loop_data.allocator.create(GroupChild);
+    child.* = .{
+        .loop = loop_data,
+        .py_group = python_c.py_newref(args[0].?),
+        .py_task = @ptrCast(python_c.py_newref(item))
+    };
+
+    const future_data = utils.get_data_ptr(Future, py_task);
+    const registered = blk: {
+        const mutex = &future_data.mutex;
+        mutex.lock();
+        defer mutex.unlock();
+
+        if (future_data.status != .PENDING) break :blk false;
+
+        Future.Callback.add_done_callback(future_data, .{
+            .ZigGeneric = .{
+                .callback = &group_child_done_callback,
+                .data = child
+            }
+        }) catch |err| {
+            release_group_child(child);
+            return err;
+        };
+        break :blk true;
+    };
+
+    if (!registered) {
+        release_group_child(child);
+        return python_c.get_py_false();
+    }
+    return python_c.get_py_true();
+}
+
+pub fn loop_task_group_add(
+    self: ?*LoopObject, args: ?[*]?PyObject, nargs: isize
+) callconv(.C) ?PyObject {
+    return utils.execute_zig_function(z_loop_task_group_add, .{
+        self.?, args.?[0..@as(usize, @intCast(nargs))]
+    });
+}
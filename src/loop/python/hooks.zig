@@ -37,7 +37,7 @@ inline fn append_new_task(
         orelse return error.PythonError;
     errdefer python_c.py_decref(context);
 
-    const task = try Task.Constructors.fast_new_task(self, aclose, context, null);
+    const task = try Task.Constructors.fast_new_task(self, aclose, context, null, false);
     python_c.py_decref(@ptrCast(task));
 
     return python_c.get_py_none();
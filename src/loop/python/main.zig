@@ -10,6 +10,12 @@ const Scheduling = @import("scheduling.zig");
 const Control = @import("control.zig");
 const Utils = @import("utils/main.zig");
 const UnixSignal = @import("unix_signals.zig");
+const FDWatchers = @import("fd_watchers.zig");
+const Sockets = @import("sockets.zig");
+const Executor = @import("executor.zig");
+const Files = @import("files.zig");
+const Freelists = @import("freelists.zig");
+const Gather = @import("gather.zig");
 pub const Hooks = @import("hooks.zig");
 
 const PythonLoopMethods: []const python_c.PyMethodDef = &[_]python_c.PyMethodDef{
@@ -90,6 +96,18 @@ const PythonLoopMethods: []const python_c.PyMethodDef = &[_]python_c.PyMethodDef
         .ml_doc = "Schedule callback to be called with args arguments at the next iteration of the event loop.\x00",
         .ml_flags = python_c.METH_FASTCALL | python_c.METH_KEYWORDS
     },
+    python_c.PyMethodDef{
+        .ml_name = "set_task_factory\x00",
+        .ml_meth = @ptrCast(&Utils.TaskFactory.loop_set_task_factory),
+        .ml_doc = "Set a task factory that will be used by create_task(), None restores the default one.\x00",
+        .ml_flags = python_c.METH_O
+    },
+    python_c.PyMethodDef{
+        .ml_name = "get_task_factory\x00",
+        .ml_meth = @ptrCast(&Utils.TaskFactory.loop_get_task_factory),
+        .ml_doc = "Return the task factory, or None if the default one is in use.\x00",
+        .ml_flags = python_c.METH_NOARGS
+    },
 
 
     python_c.PyMethodDef{
@@ -105,6 +123,144 @@ const PythonLoopMethods: []const python_c.PyMethodDef = &[_]python_c.PyMethodDef
         .ml_flags = python_c.METH_O
     },
 
+    // --------------------- FD watchers ---------------------
+    python_c.PyMethodDef{
+        .ml_name = "add_reader\x00",
+        .ml_meth = @ptrCast(&FDWatchers.loop_add_reader),
+        .ml_doc = "Start monitoring the fd file descriptor for read availability.\x00",
+        .ml_flags = python_c.METH_FASTCALL
+    },
+    python_c.PyMethodDef{
+        .ml_name = "remove_reader\x00",
+        .ml_meth = @ptrCast(&FDWatchers.loop_remove_reader),
+        .ml_doc = "Stop monitoring the fd file descriptor for read availability.\x00",
+        .ml_flags = python_c.METH_O
+    },
+    python_c.PyMethodDef{
+        .ml_name = "add_writer\x00",
+        .ml_meth = @ptrCast(&FDWatchers.loop_add_writer),
+        .ml_doc = "Start monitoring the fd file descriptor for write availability.\x00",
+        .ml_flags = python_c.METH_FASTCALL
+    },
+    python_c.PyMethodDef{
+        .ml_name = "remove_writer\x00",
+        .ml_meth = @ptrCast(&FDWatchers.loop_remove_writer),
+        .ml_doc = "Stop monitoring the fd file descriptor for write availability.\x00",
+        .ml_flags = python_c.METH_O
+    },
+
+    // --------------------- Sockets ---------------------
+    python_c.PyMethodDef{
+        .ml_name = "sock_recv\x00",
+        .ml_meth = @ptrCast(&Sockets.loop_sock_recv),
+        .ml_doc = "Receive up to nbytes from sock.\x00",
+        .ml_flags = python_c.METH_FASTCALL
+    },
+    python_c.PyMethodDef{
+        .ml_name = "sock_recv_into\x00",
+        .ml_meth = @ptrCast(&Sockets.loop_sock_recv_into),
+        .ml_doc = "Receive data from sock into the buf buffer.\x00",
+        .ml_flags = python_c.METH_FASTCALL
+    },
+    python_c.PyMethodDef{
+        .ml_name = "sock_sendall\x00",
+        .ml_meth = @ptrCast(&Sockets.loop_sock_sendall),
+        .ml_doc = "Send data to the sock socket until all data is sent.\x00",
+        .ml_flags = python_c.METH_FASTCALL
+    },
+    python_c.PyMethodDef{
+        .ml_name = "sock_accept\x00",
+        .ml_meth = @ptrCast(&Sockets.loop_sock_accept),
+        .ml_doc = "Accept a connection.\x00",
+        .ml_flags = python_c.METH_O
+    },
+    python_c.PyMethodDef{
+        .ml_name = "_sock_accept_multishot\x00",
+        .ml_meth = @ptrCast(&Sockets.loop_sock_accept_multishot),
+        .ml_doc = "Pass every connection accepted on sock to callback until the returned future is done.\x00",
+        .ml_flags = python_c.METH_FASTCALL
+    },
+    python_c.PyMethodDef{
+        .ml_name = "_sock_sendfile\x00",
+        .ml_meth = @ptrCast(&Sockets.loop_sock_sendfile),
+        .ml_doc = "Send count bytes of file from offset, or until its end if count is None, through sock.\x00",
+        .ml_flags = python_c.METH_FASTCALL
+    },
+    python_c.PyMethodDef{
+        .ml_name = "_sock_recvmmsg\x00",
+        .ml_meth = @ptrCast(&Sockets.loop_sock_recvmmsg),
+        .ml_doc = "Pass every batch of datagrams received on sock to callback until the returned future is done.\x00",
+        .ml_flags = python_c.METH_FASTCALL
+    },
+    python_c.PyMethodDef{
+        .ml_name = "_sock_sendmmsg\x00",
+        .ml_meth = @ptrCast(&Sockets.loop_sock_sendmmsg),
+        .ml_doc = "Send the first (data, address) datagrams at once without blocking and return how many were sent.\x00",
+        .ml_flags = python_c.METH_FASTCALL
+    },
+    python_c.PyMethodDef{
+        .ml_name = "sock_connect\x00",
+        .ml_meth = @ptrCast(&Sockets.loop_sock_connect),
+        .ml_doc = "Connect sock to a remote socket at address.\x00",
+        .ml_flags = python_c.METH_FASTCALL
+    },
+
+    // --------------------- Files ---------------------
+    python_c.PyMethodDef{
+        .ml_name = "file_read\x00",
+        .ml_meth = @ptrCast(&Files.loop_file_read),
+        .ml_doc = "Read up to size bytes from the fd file at offset, or at its current position if offset is -1.\x00",
+        .ml_flags = python_c.METH_FASTCALL
+    },
+    python_c.PyMethodDef{
+        .ml_name = "file_readinto\x00",
+        .ml_meth = @ptrCast(&Files.loop_file_readinto),
+        .ml_doc = "Read from the fd file into the buf buffer at offset, or at its current position if offset is -1.\x00",
+        .ml_flags = python_c.METH_FASTCALL
+    },
+    python_c.PyMethodDef{
+        .ml_name = "file_write\x00",
+        .ml_meth = @ptrCast(&Files.loop_file_write),
+        .ml_doc = "Write all data to the fd file at offset, or at its current position if offset is -1.\x00",
+        .ml_flags = python_c.METH_FASTCALL
+    },
+
+    // --------------------- Executor ---------------------
+    python_c.PyMethodDef{
+        .ml_name = "_run_in_thread_pool\x00",
+        .ml_meth = @ptrCast(&Executor.loop_run_in_thread_pool),
+        .ml_doc = "Call func(*args) in one of the loop's worker threads and return a future for its result.\x00",
+        .ml_flags = python_c.METH_FASTCALL
+    },
+
+    // --------------------- Freelists ---------------------
+    python_c.PyMethodDef{
+        .ml_name = "get_freelist_stats\x00",
+        .ml_meth = @ptrCast(&Freelists.loop_get_freelist_stats),
+        .ml_doc = "Return the size, capacity, hits and misses of the loop's freelists.\x00",
+        .ml_flags = python_c.METH_NOARGS
+    },
+
+    // --------------------- Gather ---------------------
+    python_c.PyMethodDef{
+        .ml_name = "_gather\x00",
+        .ml_meth = @ptrCast(&Gather.loop_gather),
+        .ml_doc = "Return a future aggregating the results of the given futures, or None if one isn't from this loop.\x00",
+        .ml_flags = python_c.METH_FASTCALL
+    },
+    python_c.PyMethodDef{
+        .ml_name = "_wait\x00",
+        .ml_meth = @ptrCast(&Gather.loop_wait),
+        .ml_doc = "Return a future done when the return_when condition is met, or None if a future isn't from this loop.\x00",
+        .ml_flags = python_c.METH_FASTCALL
+    },
+    python_c.PyMethodDef{
+        .ml_name = "_task_group_add\x00",
+        .ml_meth = @ptrCast(&Gather.loop_task_group_add),
+        .ml_doc = "Track a pending task of a TaskGroup with a native done callback, return False if it can't be.\x00",
+        .ml_flags = python_c.METH_FASTCALL
+    },
+
     // --------------------- Sentinel ---------------------
     python_c.PyMethodDef{
         .ml_name = null, .ml_meth = null, .ml_doc = null, .ml_flags = 0
@@ -142,8 +298,22 @@ pub const LoopObject = extern struct {
     leave_task_func: ?PyObject,
     register_task_func: ?PyObject,
     unregister_task_func: ?PyObject,
+    swap_current_task_func: ?PyObject,
+
+    // Cached to await foreign futures without looking up the same attributes on every await
+    future_blocking_str: ?PyObject,
+    add_done_callback_str: ?PyObject,
+    result_str: ?PyObject,
+
+    // Futures and tasks from the stdlib are handled straight through the descriptors of their C type
+    asyncio_future_type: ?PyObject,
+    asyncio_task_type: ?PyObject,
+    future_blocking_descr: ?PyObject,
+    future_add_done_callback_descr: ?PyObject,
+    stdlib_futures_fast_path: bool,
 
     exception_handler: ?PyObject,
+    task_factory: ?PyObject,
 
     asyncgens_set: ?PyObject,
     asyncgens_set_add: ?PyObject,
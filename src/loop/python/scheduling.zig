@@ -40,7 +40,7 @@ pub inline fn get_callback_info(allocator: std.mem.Allocator, args: []?PyObject)
 
 inline fn z_loop_call_soon(
     self: *LoopObject, args: []?PyObject,
-    knames: ?PyObject
+    knames: ?PyObject, comptime threadsafe: bool
 ) !*Handle.PythonHandleObject {
     if (args.len == 0) {
         utils.put_python_runtime_error_message("Invalid number of arguments\x00");
@@ -85,7 +85,7 @@ inline fn z_loop_call_soon(
         }
     }
 
-    const py_handle: *Handle.PythonHandleObject = try Handle.fast_new_handle(context.?);
+    const py_handle: *Handle.PythonHandleObject = try Handle.fast_new_handle(context.?, loop_data);
     errdefer python_c.py_decref(@ptrCast(py_handle));
 
     const py_callback = python_c.py_newref(args[0].?);
@@ -96,6 +96,28 @@ inline fn z_loop_call_soon(
         return error.PythonError;
     }
 
+    const callback: CallbackManager.Callback = .{
+        .PythonGeneric = .{
+            .args = callback_info,
+            .exception_handler = self.exception_handler.?,
+            .py_callback = py_callback,
+            .py_context = context.?,
+            .py_handle = py_handle,
+            .cancelled = &py_handle.cancelled
+        }
+    };
+
+    if (threadsafe and loop_data.inbox.is_foreign_thread()) {
+        // The loop's mutex isn't taken, the checks are only as good as what this thread can see
+        if (!@atomicLoad(bool, &loop_data.initialized, .acquire)) {
+            utils.put_python_runtime_error_message("Loop is closed\x00");
+            return error.PythonError;
+        }
+
+        try loop_data.inbox.push(loop_data, callback);
+        return python_c.py_newref(py_handle);
+    }
+
     const mutex = &loop_data.mutex;
     mutex.lock();
     defer mutex.unlock();
@@ -110,16 +132,6 @@ inline fn z_loop_call_soon(
         return error.PythonError;
     }
 
-    const callback: CallbackManager.Callback = .{
-        .PythonGeneric = .{
-            .args = callback_info,
-            .exception_handler = self.exception_handler.?,
-            .py_callback = py_callback,
-            .py_context = context.?,
-            .py_handle = py_handle,
-            .cancelled = &py_handle.cancelled
-        }
-    };
     try Loop.Scheduling.Soon._dispatch(loop_data, callback);
     return python_c.py_newref(py_handle);
 }
@@ -128,7 +140,7 @@ pub fn loop_call_soon(
     self: ?*LoopObject, args: ?[*]?PyObject, nargs: isize, knames: ?PyObject
 ) callconv(.C) ?*Handle.PythonHandleObject {
     return utils.execute_zig_function(z_loop_call_soon, .{
-        self.?, args.?[0..@as(usize, @intCast(nargs))], knames
+        self.?, args.?[0..@as(usize, @intCast(nargs))], knames, false
     });
 }
 
@@ -141,7 +153,7 @@ pub fn loop_call_soon_threadsafe(
     }
 
     return utils.execute_zig_function(z_loop_call_soon, .{
-        self.?, args.?[0..@as(usize, @intCast(nargs))], knames
+        self.?, args.?[0..@as(usize, @intCast(nargs))], knames, true
     });
 }
 
@@ -200,7 +212,9 @@ inline fn z_loop_delayed_call(
         }
     };
 
-    const py_timer_handle: *TimerHandle.PythonTimerHandleObject = try TimerHandle.fast_new_timer_handle(time, context.?);
+    const py_timer_handle: *TimerHandle.PythonTimerHandleObject = try TimerHandle.fast_new_timer_handle(
+        time, context.?, loop_data
+    );
     errdefer python_c.py_decref(@ptrCast(py_timer_handle));
 
     const py_callback = python_c.py_newref(args[1].?);
@@ -235,13 +249,8 @@ inline fn z_loop_delayed_call(
             .cancelled = &py_timer_handle.handle.cancelled
         }
     };
-    try Loop.Scheduling.IO.queue(loop_data, .{
-        .WaitTimer = .{
-            .callback = callback,
-            .duration = time,
-            .delay_type = .Absolute
-        }
-    });
+    py_timer_handle.loop_data = loop_data;
+    try Loop.Scheduling.Later.queue(loop_data, callback, time, &py_timer_handle.timer_node);
     return python_c.py_newref(py_timer_handle);
 }
 pub fn loop_call_later(
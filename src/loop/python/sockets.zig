@@ -0,0 +1,1359 @@
+const python_c = @import("python_c");
+const PyObject = *python_c.PyObject;
+
+const utils = @import("../../utils/utils.zig");
+
+const CallbackManager = @import("../../callback_manager.zig");
+const Future = @import("../../future/main.zig");
+const Loop = @import("../main.zig");
+const LoopObject = Loop.Python.LoopObject;
+const PythonFutureObject = Future.Python.FutureObject;
+
+const IO = Loop.Scheduling.IO;
+
+const std = @import("std");
+
+pub const SocketAddress = struct {
+    address: std.net.Address = undefined,
+    address_len: std.posix.socklen_t = @sizeOf(std.net.Address)
+};
+
+const SendAllData = struct {
+    buffer: python_c.Py_buffer,
+    sent: usize = 0
+};
+
+// Offset used by file operations to read or write at the file's current position
+pub const CurrentPosition = std.math.maxInt(usize);
+
+const FileReadData = struct {
+    py_bytes: ?PyObject,
+    offset: usize
+};
+
+const FileReadIntoData = struct {
+    buffer: python_c.Py_buffer,
+    offset: usize
+};
+
+const FileWriteData = struct {
+    buffer: python_c.Py_buffer,
+    offset: usize,
+    written: usize = 0
+};
+
+// Bytes go from the file to the pipe and from the pipe to the socket without being copied to user space
+const SendFileData = struct {
+    py_file: PyObject,
+    file_fd: std.posix.fd_t,
+    offset: usize,
+    // Left to move into the pipe, null means until the end of the file
+    remaining: ?usize,
+    pipe: [2]std.posix.fd_t,
+    pipe_size: usize,
+
+    // Moved into the pipe but not sent yet
+    in_pipe: usize = 0,
+    sent: usize = 0,
+    waiting_writable: bool = false
+};
+
+// Datagrams are pulled with recvmmsg every time the socket becomes readable, and each batch is passed
+// to the callback in a single call
+pub const DatagramBatchSize = 64;
+// Every slot of the batch gets a buffer of this size unless the transport asks for another one, bigger
+// datagrams are truncated by the kernel and reported as EMSGSIZE instead of being delivered
+const DefaultDatagramBufferSize = 8 * 1024;
+// A busy socket is read this many times per readiness, then the poll is armed again to let the loop go on
+const DatagramBatchRounds = 4;
+
+const RecvDatagramsData = struct {
+    py_callback: PyObject,
+    allocator: std.mem.Allocator,
+    buffers: []u8,
+    buffer_size: usize
+};
+
+// Regular files share the same operations, py_socket is then the file object or its descriptor
+pub const OperationData = union(enum) {
+    Recv: ?PyObject,
+    RecvInto: python_c.Py_buffer,
+    SendAll: SendAllData,
+    Accept: SocketAddress,
+    // Keeps accepting connections until the future is done, each one is passed to the callback
+    AcceptMultishot: PyObject,
+    // Keeps receiving datagrams until the future is done, each batch is passed to the callback
+    RecvDatagrams: RecvDatagramsData,
+    Connect: SocketAddress,
+    SendFile: SendFileData,
+    FileRead: FileReadData,
+    FileReadInto: FileReadIntoData,
+    FileWrite: FileWriteData
+};
+
+const SocketOperation = struct {
+    loop: *Loop,
+    py_future: ?*PythonFutureObject = null,
+    py_socket: PyObject,
+    fd: std.posix.fd_t = -1,
+    data: OperationData,
+    blocking_task_id: IO.BlockingTaskId = undefined,
+
+    // One reference for the io_uring completion and another one for the future's done callback
+    references: u8 = 1,
+    completed: bool = false
+};
+
+inline fn get_buffer_slice(buffer: *const python_c.Py_buffer) []u8 {
+    const buf: [*]u8 = @ptrCast(buffer.buf orelse return &.{});
+    return buf[0..@intCast(buffer.len)];
+}
+
+inline fn release_operation_data(data: *OperationData) void {
+    switch (data.*) {
+        .Recv => |py_bytes| python_c.py_xdecref(py_bytes),
+        .RecvInto => |*buffer| python_c.PyBuffer_Release(buffer),
+        .SendAll => |*send_data| python_c.PyBuffer_Release(&send_data.buffer),
+        .AcceptMultishot => |py_callback| python_c.py_decref(py_callback),
+        .RecvDatagrams => |recv_data| {
+            python_c.py_decref(recv_data.py_callback);
+            recv_data.allocator.free(recv_data.buffers);
+        },
+        .Accept, .Connect => {},
+        .SendFile => |sendfile_data| {
+            python_c.py_decref(sendfile_data.py_file);
+            for (sendfile_data.pipe) |fd| std.posix.close(fd);
+        },
+        .FileRead => |read_data| python_c.py_xdecref(read_data.py_bytes),
+        .FileReadInto => |*read_data| python_c.PyBuffer_Release(&read_data.buffer),
+        .FileWrite => |*write_data| python_c.PyBuffer_Release(&write_data.buffer)
+    }
+}
+
+inline fn unref_operation(operation: *SocketOperation) void {
+    operation.references -= 1;
+    if (operation.references == 0) {
+        operation.loop.allocator.destroy(operation);
+    }
+}
+
+fn finish_operation(operation: *SocketOperation) void {
+    release_operation_data(&operation.data);
+    python_c.py_decref(operation.py_socket);
+
+    const py_future = operation.py_future;
+    operation.completed = true;
+    unref_operation(operation);
+
+    // Releasing the future may run its done callback, which drops the last reference
+    python_c.py_xdecref(@ptrCast(py_future));
+}
+
+fn get_blocking_operation(operation: *SocketOperation) IO.BlockingOperationData {
+    const callback: CallbackManager.Callback = .{
+        .ZigGenericIO = .{
+            .callback = &operation_completed,
+            .data = operation
+        }
+    };
+
+    const fd = operation.fd;
+    return switch (operation.data) {
+        .Recv => |py_bytes| .{
+            .PerformRecv = .{
+                .fd = fd,
+                .callback = callback,
+                .data = blk: {
+                    const buf: [*]u8 = @ptrCast(python_c.PyBytes_AsString(py_bytes.?));
+                    break :blk buf[0..@intCast(python_c.PyBytes_Size(py_bytes.?))];
+                }
+            }
+        },
+        .RecvInto => |*buffer| .{
+            .PerformRecv = .{
+                .fd = fd,
+                .callback = callback,
+                .data = get_buffer_slice(buffer)
+            }
+        },
+        .SendAll => |*send_data| .{
+            .PerformSend = .{
+                .fd = fd,
+                .callback = callback,
+                .data = get_buffer_slice(&send_data.buffer)[send_data.sent..]
+            }
+        },
+        .Accept => |*socket_address| .{
+            .PerformAccept = .{
+                .fd = fd,
+                .callback = callback,
+                .address = &socket_address.address.any,
+                .address_len = &socket_address.address_len
+            }
+        },
+        .AcceptMultishot => .{
+            .PerformAccept = .{
+                .fd = fd,
+                .callback = callback,
+                .multishot = true
+            }
+        },
+        .RecvDatagrams => .{
+            .WaitReadable = .{
+                .fd = fd,
+                .callback = callback
+            }
+        },
+        .Connect => |*socket_address| .{
+            .PerformConnect = .{
+                .fd = fd,
+                .callback = callback,
+                .address = &socket_address.address.any,
+                .address_len = socket_address.address_len
+            }
+        },
+        .SendFile => |*sendfile_data| blk: {
+            if (sendfile_data.waiting_writable) {
+                break :blk .{
+                    .WaitWritable = .{
+                        .fd = fd,
+                        .callback = callback
+                    }
+                };
+            }
+
+            if (sendfile_data.in_pipe > 0) {
+                break :blk .{
+                    .PerformSplice = .{
+                        .fd_in = sendfile_data.pipe[0],
+                        .fd_out = fd,
+                        .len = sendfile_data.in_pipe,
+                        .callback = callback
+                    }
+                };
+            }
+
+            var len = sendfile_data.pipe_size;
+            if (sendfile_data.remaining) |remaining| len = @min(len, remaining);
+            break :blk .{
+                .PerformSplice = .{
+                    .fd_in = sendfile_data.file_fd,
+                    .offset_in = sendfile_data.offset + sendfile_data.sent,
+                    .fd_out = sendfile_data.pipe[1],
+                    .len = len,
+                    .callback = callback
+                }
+            };
+        },
+        .FileRead => |read_data| .{
+            .PerformRead = .{
+                .fd = fd,
+                .callback = callback,
+                .data = .{
+                    .buffer = blk: {
+                        const buf: [*]u8 = @ptrCast(python_c.PyBytes_AsString(read_data.py_bytes.?));
+                        break :blk buf[0..@intCast(python_c.PyBytes_Size(read_data.py_bytes.?))];
+                    }
+                },
+                .offset = read_data.offset
+            }
+        },
+        .FileReadInto => |*read_data| .{
+            .PerformRead = .{
+                .fd = fd,
+                .callback = callback,
+                .data = .{ .buffer = get_buffer_slice(&read_data.buffer) },
+                .offset = read_data.offset
+            }
+        },
+        .FileWrite => |*write_data| .{
+            .PerformWrite = .{
+                .fd = fd,
+                .callback = callback,
+                .data = get_buffer_slice(&write_data.buffer)[write_data.written..],
+                .offset = blk: {
+                    if (write_data.offset == CurrentPosition) break :blk CurrentPosition;
+                    break :blk write_data.offset + write_data.written;
+                }
+            }
+        }
+    };
+}
+
+inline fn queue_blocking_operation(operation: *SocketOperation) !void {
+    const loop = operation.loop;
+    const mutex = &loop.mutex;
+    mutex.lock();
+    defer mutex.unlock();
+
+    if (!loop.initialized) {
+        utils.put_python_runtime_error_message("Loop is closed\x00");
+        return error.PythonError;
+    }
+
+    operation.blocking_task_id = try IO.queue(loop, get_blocking_operation(operation));
+}
+
+pub fn address_to_py(address: *const std.net.Address, address_len: std.posix.socklen_t) !PyObject {
+    switch (address.any.family) {
+        std.posix.AF.INET, std.posix.AF.INET6 => {
+            var buf: [64]u8 = undefined;
+            const formatted = try std.fmt.bufPrint(&buf, "{}", .{address.*});
+
+            // Addresses are formatted as "host:port" and "[host]:port"
+            const host = blk: {
+                if (address.any.family == std.posix.AF.INET) {
+                    break :blk formatted[0..std.mem.lastIndexOfScalar(u8, formatted, ':').?];
+                }
+                break :blk formatted[1..std.mem.indexOfScalar(u8, formatted, ']').?];
+            };
+
+            const py_host: PyObject = python_c.PyUnicode_FromStringAndSize(host.ptr, @intCast(host.len))
+                orelse return error.PythonError;
+            defer python_c.py_decref(py_host);
+
+            if (address.any.family == std.posix.AF.INET) {
+                return python_c.Py_BuildValue("(OH)\x00", py_host, address.getPort())
+                    orelse error.PythonError;
+            }
+
+            return python_c.Py_BuildValue(
+                "(OHII)\x00", py_host, address.getPort(), address.in6.sa.flowinfo, address.in6.sa.scope_id
+            ) orelse error.PythonError;
+        },
+        std.posix.AF.UNIX => {
+            const path_len = @as(usize, address_len) -| @offsetOf(std.posix.sockaddr.un, "path");
+            const path = address.un.path[0..@min(path_len, address.un.path.len)];
+            if (path.len > 0 and path[0] == 0) {
+                // Linux's abstract namespace
+                return python_c.PyBytes_FromStringAndSize(path.ptr, @intCast(path.len))
+                    orelse error.PythonError;
+            }
+
+            const len = std.mem.indexOfScalar(u8, path, 0) orelse path.len;
+            return python_c.PyUnicode_DecodeFSDefaultAndSize(path.ptr, @intCast(len))
+                orelse error.PythonError;
+        },
+        else => return python_c.get_py_none()
+    }
+}
+
+inline fn get_socket_family(py_socket: PyObject) !u32 {
+    const py_family: PyObject = python_c.PyObject_GetAttrString(py_socket, "family\x00")
+        orelse return error.PythonError;
+    defer python_c.py_decref(py_family);
+
+    const family = python_c.PyLong_AsLong(py_family);
+    if (family < 0) {
+        if (python_c.PyErr_Occurred() == null) {
+            python_c.PyErr_SetString(python_c.PyExc_ValueError, "Invalid socket family\x00");
+        }
+        return error.PythonError;
+    }
+
+    return @intCast(family);
+}
+
+fn resolve_host(py_socket: PyObject, py_host: PyObject, port: u16) !PyObject {
+    const socket_module: PyObject = python_c.PyImport_ImportModule("socket\x00")
+        orelse return error.PythonError;
+    defer python_c.py_decref(socket_module);
+
+    var socket_info: [3]PyObject = undefined;
+    for (&socket_info, [_][*c]const u8{"family\x00", "type\x00", "proto\x00"}, 0..) |*value, name, index| {
+        value.* = python_c.PyObject_GetAttrString(py_socket, name) orelse {
+            for (socket_info[0..index]) |prev_value| python_c.py_decref(prev_value);
+            return error.PythonError;
+        };
+    }
+    defer {
+        for (socket_info) |value| python_c.py_decref(value);
+    }
+
+    // Same as socket.connect, names that aren't numeric addresses are resolved synchronously
+    const addresses: PyObject = python_c.PyObject_CallMethod(
+        socket_module, "getaddrinfo\x00", "OHOOO\x00", py_host, port,
+        socket_info[0], socket_info[1], socket_info[2]
+    ) orelse return error.PythonError;
+    defer python_c.py_decref(addresses);
+
+    const first_address: PyObject = python_c.PySequence_GetItem(addresses, 0)
+        orelse return error.PythonError;
+    defer python_c.py_decref(first_address);
+
+    return python_c.PySequence_GetItem(first_address, 4) orelse error.PythonError;
+}
+
+pub fn address_from_py(py_socket: PyObject, py_address: PyObject, comptime can_resolve: bool) !SocketAddress {
+    const family = try get_socket_family(py_socket);
+    return try address_from_py_with_family(py_socket, family, py_address, can_resolve);
+}
+
+fn address_from_py_with_family(
+    py_socket: PyObject, family: u32, py_address: PyObject, comptime can_resolve: bool
+) !SocketAddress {
+    switch (family) {
+        std.posix.AF.INET, std.posix.AF.INET6 => {
+            var host_ptr: [*c]const u8 = null;
+            var port: c_int = 0;
+            var flowinfo: c_uint = 0;
+            var scope_id: c_uint = 0;
+            if (python_c.PyArg_ParseTuple(
+                py_address, "si|II\x00", &host_ptr, &port, &flowinfo, &scope_id
+            ) == 0) {
+                return error.PythonError;
+            }
+
+            if (port < 0 or port > std.math.maxInt(u16)) {
+                python_c.PyErr_SetString(python_c.PyExc_OverflowError, "port must be 0-65535.\x00");
+                return error.PythonError;
+            }
+
+            const host = std.mem.span(host_ptr);
+            var socket_address: SocketAddress = .{};
+            if (family == std.posix.AF.INET) {
+                socket_address.address = std.net.Address.parseIp4(
+                    if (host.len == 0) "0.0.0.0" else host, @intCast(port)
+                ) catch {
+                    if (!can_resolve) return error.InvalidAddress;
+
+                    const py_host: PyObject = python_c.PySequence_GetItem(py_address, 0)
+                        orelse return error.PythonError;
+                    defer python_c.py_decref(py_host);
+
+                    const resolved_address = try resolve_host(py_socket, py_host, @intCast(port));
+                    defer python_c.py_decref(resolved_address);
+                    return try address_from_py(py_socket, resolved_address, false);
+                };
+            }else{
+                socket_address.address = std.net.Address.parseIp6(
+                    if (host.len == 0) "::" else host, @intCast(port)
+                ) catch {
+                    if (!can_resolve) return error.InvalidAddress;
+
+                    const py_host: PyObject = python_c.PySequence_GetItem(py_address, 0)
+                        orelse return error.PythonError;
+                    defer python_c.py_decref(py_host);
+
+                    const resolved_address = try resolve_host(py_socket, py_host, @intCast(port));
+                    defer python_c.py_decref(resolved_address);
+                    return try address_from_py(py_socket, resolved_address, false);
+                };
+                socket_address.address.in6.sa.flowinfo = flowinfo;
+                if (scope_id != 0) {
+                    socket_address.address.in6.sa.scope_id = scope_id;
+                }
+            }
+            socket_address.address_len = socket_address.address.getOsSockLen();
+
+            return socket_address;
+        },
+        std.posix.AF.UNIX => {
+            const py_path: PyObject = blk: {
+                if (python_c.PyUnicode_Check(py_address) != 0) {
+                    break :blk python_c.PyUnicode_EncodeFSDefault(py_address)
+                        orelse return error.PythonError;
+                }
+                break :blk python_c.py_newref(py_address);
+            };
+            defer python_c.py_decref(py_path);
+
+            var path_ptr: [*c]u8 = null;
+            var path_len: python_c.Py_ssize_t = 0;
+            if (python_c.PyBytes_AsStringAndSize(py_path, &path_ptr, &path_len) < 0) {
+                return error.PythonError;
+            }
+
+            var socket_address: SocketAddress = .{
+                .address = .{ .un = .{ .path = undefined } }
+            };
+            const path = socket_address.address.un.path[0..];
+            if (path_len >= path.len) {
+                python_c.PyErr_SetString(python_c.PyExc_OSError, "AF_UNIX path too long\x00");
+                return error.PythonError;
+            }
+
+            const len: usize = @intCast(path_len);
+            @memcpy(path[0..len], path_ptr[0..len]);
+            path[len] = 0;
+
+            socket_address.address_len = @intCast(@offsetOf(std.posix.sockaddr.un, "path") + len);
+            return socket_address;
+        },
+        else => {
+            python_c.PyErr_SetString(python_c.PyExc_ValueError, "Unsupported socket family\x00");
+            return error.PythonError;
+        }
+    }
+}
+
+fn create_accepted_socket(fd: std.posix.fd_t) !PyObject {
+    var fd_owned = true;
+    errdefer {
+        if (fd_owned) std.posix.close(fd);
+    }
+
+    const socket_module: PyObject = python_c.PyImport_ImportModule("socket\x00")
+        orelse return error.PythonError;
+    defer python_c.py_decref(socket_module);
+
+    // Family, type and proto are detected from the file descriptor
+    const py_connection: PyObject = python_c.PyObject_CallMethod(
+        socket_module, "socket\x00", "iiii\x00", @as(c_int, -1), @as(c_int, -1), @as(c_int, -1), fd
+    ) orelse return error.PythonError;
+    fd_owned = false;
+    errdefer python_c.py_decref(py_connection);
+
+    const ret: PyObject = python_c.PyObject_CallMethod(py_connection, "setblocking\x00", "i\x00", @as(c_int, 0))
+        orelse return error.PythonError;
+    python_c.py_decref(ret);
+
+    return py_connection;
+}
+
+fn create_accepted_connection(operation: *SocketOperation, fd: std.posix.fd_t) !PyObject {
+    const py_connection = try create_accepted_socket(fd);
+    defer python_c.py_decref(py_connection);
+
+    const socket_address = &operation.data.Accept;
+    const py_address = try address_to_py(&socket_address.address, socket_address.address_len);
+    defer python_c.py_decref(py_address);
+
+    return python_c.PyTuple_Pack(2, py_connection, py_address) orelse error.PythonError;
+}
+
+// Returns true if the transfer goes on with another operation
+fn continue_sendfile(operation: *SocketOperation, io_uring_res: i32) !bool {
+    const sendfile_data = &operation.data.SendFile;
+    if (sendfile_data.waiting_writable) {
+        if (io_uring_res < 0) return false;
+
+        sendfile_data.waiting_writable = false;
+        try queue_blocking_operation(operation);
+        return true;
+    }
+
+    if (io_uring_res < 0) {
+        // Splicing into a non-blocking socket gives up once its buffer is full
+        if (sendfile_data.in_pipe == 0 or @as(std.posix.E, @enumFromInt(-io_uring_res)) != .AGAIN) {
+            return false;
+        }
+
+        sendfile_data.waiting_writable = true;
+        try queue_blocking_operation(operation);
+        return true;
+    }
+
+    const nbytes: usize = @intCast(io_uring_res);
+    // Nothing moved means the end of the file was reached
+    if (nbytes == 0) return false;
+
+    if (sendfile_data.in_pipe > 0) {
+        sendfile_data.in_pipe -= nbytes;
+        sendfile_data.sent += nbytes;
+        if (sendfile_data.in_pipe == 0 and sendfile_data.remaining == 0) return false;
+    }else{
+        sendfile_data.in_pipe = nbytes;
+        if (sendfile_data.remaining) |*remaining| remaining.* -= nbytes;
+    }
+
+    try queue_blocking_operation(operation);
+    return true;
+}
+
+fn resolve_future(operation: *SocketOperation, io_uring_res: i32) !bool {
+    const py_future = operation.py_future.?;
+    const future_data = utils.get_data_ptr(Future, py_future);
+    const mutex = &future_data.mutex;
+    mutex.lock();
+    defer mutex.unlock();
+
+    if (future_data.status != .PENDING) {
+        // Nobody is waiting for the new connection anymore
+        if (operation.data == .Accept and io_uring_res >= 0) {
+            std.posix.close(io_uring_res);
+        }
+        return true;
+    }
+
+    if (operation.data == .SendFile and try continue_sendfile(operation, io_uring_res)) {
+        return false;
+    }
+
+    if (io_uring_res < 0) {
+        const exception = utils.create_python_os_error(@enumFromInt(-io_uring_res))
+            orelse return error.PythonError;
+        defer python_c.py_decref(exception);
+
+        _ = try Future.Python.Result.future_fast_set_exception(py_future, future_data, exception);
+        return true;
+    }
+
+    const nbytes: usize = @intCast(io_uring_res);
+    const result: PyObject = switch (operation.data) {
+        .Recv => |*py_bytes| blk: {
+            if (nbytes < python_c.PyBytes_Size(py_bytes.*.?)) {
+                if (python_c._PyBytes_Resize(@ptrCast(py_bytes), @intCast(nbytes)) < 0) {
+                    return error.PythonError;
+                }
+            }
+
+            const py_result = py_bytes.*.?;
+            py_bytes.* = null;
+            break :blk py_result;
+        },
+        .RecvInto => python_c.PyLong_FromSize_t(nbytes) orelse return error.PythonError,
+        .SendAll => |*send_data| blk: {
+            send_data.sent += nbytes;
+            if (send_data.sent < send_data.buffer.len) {
+                try queue_blocking_operation(operation);
+                return false;
+            }
+            break :blk python_c.get_py_none();
+        },
+        .Accept => try create_accepted_connection(operation, io_uring_res),
+        .AcceptMultishot, .RecvDatagrams => unreachable,
+        .Connect => python_c.get_py_none(),
+        .SendFile => |sendfile_data| python_c.PyLong_FromSize_t(sendfile_data.sent) orelse return error.PythonError,
+        .FileRead => |*read_data| blk: {
+            if (nbytes < python_c.PyBytes_Size(read_data.py_bytes.?)) {
+                if (python_c._PyBytes_Resize(@ptrCast(&read_data.py_bytes), @intCast(nbytes)) < 0) {
+                    return error.PythonError;
+                }
+            }
+
+            const py_result = read_data.py_bytes.?;
+            read_data.py_bytes = null;
+            break :blk py_result;
+        },
+        .FileReadInto => python_c.PyLong_FromSize_t(nbytes) orelse return error.PythonError,
+        .FileWrite => |*write_data| blk: {
+            write_data.written += nbytes;
+            // Nothing written means no progress can be made, what was written so far is returned
+            if (nbytes > 0 and write_data.written < write_data.buffer.len) {
+                try queue_blocking_operation(operation);
+                return false;
+            }
+            break :blk python_c.PyLong_FromSize_t(write_data.written) orelse return error.PythonError;
+        }
+    };
+    defer python_c.py_decref(result);
+
+    try Future.Python.Result.future_fast_set_result(future_data, result);
+    return true;
+}
+
+inline fn set_future_exception(operation: *SocketOperation) !void {
+    const exception: PyObject = python_c.PyErr_GetRaisedException()
+        orelse return error.PythonError;
+    defer python_c.py_decref(exception);
+
+    const py_future = operation.py_future.?;
+    const future_data = utils.get_data_ptr(Future, py_future);
+    const mutex = &future_data.mutex;
+    mutex.lock();
+    defer mutex.unlock();
+
+    if (future_data.status == .PENDING) {
+        _ = try Future.Python.Result.future_fast_set_exception(py_future, future_data, exception);
+    }
+}
+
+inline fn is_future_pending(operation: *SocketOperation) bool {
+    const future_data = utils.get_data_ptr(Future, operation.py_future.?);
+    const mutex = &future_data.mutex;
+    mutex.lock();
+    defer mutex.unlock();
+
+    return future_data.status == .PENDING;
+}
+
+fn deliver_accepted_connection(operation: *SocketOperation, io_uring_res: i32, more: bool) !bool {
+    if (!is_future_pending(operation)) {
+        if (io_uring_res >= 0) {
+            std.posix.close(io_uring_res);
+        }
+        return !more;
+    }
+
+    if (io_uring_res < 0) {
+        const exception = utils.create_python_os_error(@enumFromInt(-io_uring_res))
+            orelse return error.PythonError;
+        defer python_c.py_decref(exception);
+
+        const py_future = operation.py_future.?;
+        const future_data = utils.get_data_ptr(Future, py_future);
+        const mutex = &future_data.mutex;
+        mutex.lock();
+        defer mutex.unlock();
+
+        if (future_data.status == .PENDING) {
+            _ = try Future.Python.Result.future_fast_set_exception(py_future, future_data, exception);
+        }
+        return !more;
+    }
+
+    // The future's mutex isn't held, the callback could cancel it
+    const py_connection = try create_accepted_socket(io_uring_res);
+    defer python_c.py_decref(py_connection);
+
+    const ret: PyObject = python_c.PyObject_CallOneArg(operation.data.AcceptMultishot, py_connection)
+        orelse return error.PythonError;
+    python_c.py_decref(ret);
+
+    if (!more) {
+        // The kernel stopped the multishot accept without any error, it's armed again
+        try queue_blocking_operation(operation);
+    }
+    return false;
+}
+
+fn accept_multishot_completed(
+    operation: *SocketOperation, io_uring_res: i32, io_uring_flags: u32,
+    status: CallbackManager.ExecuteCallbacksReturn
+) CallbackManager.ExecuteCallbacksReturn {
+    const more = (io_uring_flags & std.os.linux.IORING_CQE_F_MORE) != 0;
+    if (status != .Continue) {
+        // Released callbacks that never got a completion come with a zeroed result
+        if (io_uring_res > 0) {
+            std.posix.close(io_uring_res);
+        }
+
+        // The operation is released by the completion that doesn't expect more of them
+        if (!more) {
+            finish_operation(operation);
+        }
+        return status;
+    }
+
+    const finished = deliver_accepted_connection(operation, io_uring_res, more) catch |err| blk: {
+        if (err != error.PythonError) {
+            const err_trace = @errorReturnTrace();
+            utils.print_error_traces(err_trace, err);
+            utils.put_python_runtime_error_message(@errorName(err));
+        }
+
+        // Setting the exception cancels the operation through the future's done callback
+        set_future_exception(operation) catch {
+            if (!more) finish_operation(operation);
+            return .Exception;
+        };
+        break :blk !more;
+    };
+
+    if (finished) {
+        finish_operation(operation);
+    }
+    return .Continue;
+}
+
+inline fn is_truncated(header: *const std.os.linux.mmsghdr) bool {
+    return (header.hdr.flags & std.os.linux.MSG.TRUNC) != 0;
+}
+
+// Truncated datagrams are left out of the list, the caller reports them separately
+fn create_datagrams_list(
+    headers: []const std.os.linux.mmsghdr, addresses: []const std.net.Address, recv_data: *const RecvDatagramsData,
+    truncated: usize
+) !PyObject {
+    const py_datagrams: PyObject = python_c.PyList_New(@intCast(headers.len - truncated))
+        orelse return error.PythonError;
+    errdefer python_c.py_decref(py_datagrams);
+
+    var py_last_address: ?PyObject = null;
+    var last_address: []const u8 = &.{};
+    defer python_c.py_xdecref(py_last_address);
+
+    var list_index: usize = 0;
+    for (headers, addresses, 0..) |*header, *address, index| {
+        if (is_truncated(header)) continue;
+
+        const data = recv_data.buffers[index * recv_data.buffer_size..][0..header.len];
+        const py_data: PyObject = python_c.PyBytes_FromStringAndSize(data.ptr, @intCast(data.len))
+            orelse return error.PythonError;
+        defer python_c.py_decref(py_data);
+
+        // Peers tend to send several datagrams in a row, so the address is only converted when it changes
+        const address_bytes = std.mem.asBytes(address)[0..header.hdr.namelen];
+        if (py_last_address == null or !std.mem.eql(u8, last_address, address_bytes)) {
+            const py_address = blk: {
+                if (address_bytes.len == 0) break :blk python_c.get_py_none();
+                break :blk try address_to_py(address, header.hdr.namelen);
+            };
+            python_c.py_xdecref(py_last_address);
+            py_last_address = py_address;
+            last_address = address_bytes;
+        }
+
+        const py_datagram: PyObject = python_c.PyTuple_Pack(2, py_data, py_last_address.?)
+            orelse return error.PythonError;
+        if (python_c.PyList_SetItem(py_datagrams, @intCast(list_index), py_datagram) < 0) {
+            return error.PythonError;
+        }
+        list_index += 1;
+    }
+
+    return py_datagrams;
+}
+
+inline fn call_datagrams_callback(py_callback: PyObject, py_datagrams: PyObject, py_exception: PyObject) !void {
+    var args: [2]PyObject = .{ py_datagrams, py_exception };
+    const ret: PyObject = python_c.PyObject_Vectorcall(py_callback, &args, args.len, null)
+        orelse return error.PythonError;
+    python_c.py_decref(ret);
+}
+
+fn receive_datagrams(operation: *SocketOperation) !void {
+    const recv_data = &operation.data.RecvDatagrams;
+
+    var headers: [DatagramBatchSize]std.os.linux.mmsghdr = undefined;
+    var iovecs: [DatagramBatchSize]std.posix.iovec = undefined;
+    var addresses: [DatagramBatchSize]std.net.Address = undefined;
+
+    for (0..DatagramBatchRounds) |_| {
+        for (&headers, &iovecs, &addresses, 0..) |*header, *iovec, *address, index| {
+            iovec.* = .{
+                .base = recv_data.buffers[index * recv_data.buffer_size..].ptr,
+                .len = recv_data.buffer_size
+            };
+            header.* = .{
+                .hdr = .{
+                    .name = &address.any,
+                    .namelen = @sizeOf(std.net.Address),
+                    .iov = @ptrCast(iovec),
+                    .iovlen = 1,
+                    .control = null,
+                    .controllen = 0,
+                    .flags = 0
+                },
+                .len = 0
+            };
+        }
+
+        const rc = std.os.linux.recvmmsg(
+            operation.fd, &headers, DatagramBatchSize, std.os.linux.MSG.DONTWAIT | std.os.linux.MSG.TRUNC, null
+        );
+        const received: usize = switch (std.os.linux.E.init(rc)) {
+            .SUCCESS => rc,
+            .AGAIN, .INTR => return,
+            else => |errno| {
+                // Errors like ECONNREFUSED don't stop the endpoint, they are just reported
+                const exception = utils.create_python_os_error(errno) orelse return error.PythonError;
+                defer python_c.py_decref(exception);
+
+                try call_datagrams_callback(recv_data.py_callback, python_c.get_py_none(), exception);
+                return;
+            }
+        };
+
+        var truncated: usize = 0;
+        for (headers[0..received]) |*header| {
+            if (is_truncated(header)) truncated += 1;
+        }
+
+        if (truncated < received) {
+            const py_datagrams = try create_datagrams_list(
+                headers[0..received], addresses[0..received], recv_data, truncated
+            );
+            defer python_c.py_decref(py_datagrams);
+
+            try call_datagrams_callback(recv_data.py_callback, py_datagrams, python_c.get_py_none());
+        }
+
+        if (truncated > 0) {
+            const exception = utils.create_python_os_error(.MSGSIZE) orelse return error.PythonError;
+            defer python_c.py_decref(exception);
+
+            for (0..truncated) |_| {
+                if (!is_future_pending(operation)) return;
+                try call_datagrams_callback(recv_data.py_callback, python_c.get_py_none(), exception);
+            }
+        }
+        if (received < DatagramBatchSize or !is_future_pending(operation)) return;
+    }
+}
+
+fn deliver_datagrams(operation: *SocketOperation, io_uring_res: i32) !bool {
+    if (!is_future_pending(operation)) return true;
+
+    if (io_uring_res < 0) {
+        const exception = utils.create_python_os_error(@enumFromInt(-io_uring_res))
+            orelse return error.PythonError;
+        defer python_c.py_decref(exception);
+
+        const py_future = operation.py_future.?;
+        const future_data = utils.get_data_ptr(Future, py_future);
+        const mutex = &future_data.mutex;
+        mutex.lock();
+        defer mutex.unlock();
+
+        if (future_data.status == .PENDING) {
+            _ = try Future.Python.Result.future_fast_set_exception(py_future, future_data, exception);
+        }
+        return true;
+    }
+
+    try receive_datagrams(operation);
+
+    // The callback could have cancelled the future
+    if (!is_future_pending(operation)) return true;
+
+    try queue_blocking_operation(operation);
+    return false;
+}
+
+fn operation_completed(
+    data: ?*anyopaque, io_uring_res: i32, io_uring_flags: u32, status: CallbackManager.ExecuteCallbacksReturn
+) CallbackManager.ExecuteCallbacksReturn {
+    const operation: *SocketOperation = @alignCast(@ptrCast(data.?));
+    if (operation.data == .AcceptMultishot) {
+        return accept_multishot_completed(operation, io_uring_res, io_uring_flags, status);
+    }
+
+    if (status != .Continue) {
+        finish_operation(operation);
+        return status;
+    }
+
+    const result = switch (operation.data) {
+        .RecvDatagrams => deliver_datagrams(operation, io_uring_res),
+        else => resolve_future(operation, io_uring_res)
+    };
+    const finished = result catch |err| blk: {
+        if (err != error.PythonError) {
+            const err_trace = @errorReturnTrace();
+            utils.print_error_traces(err_trace, err);
+            utils.put_python_runtime_error_message(@errorName(err));
+        }
+
+        set_future_exception(operation) catch {
+            finish_operation(operation);
+            return .Exception;
+        };
+        break :blk true;
+    };
+
+    if (finished) {
+        finish_operation(operation);
+    }
+    return .Continue;
+}
+
+fn future_done_callback(
+    data: ?*anyopaque, status: CallbackManager.ExecuteCallbacksReturn
+) CallbackManager.ExecuteCallbacksReturn {
+    const operation: *SocketOperation = @alignCast(@ptrCast(data.?));
+    defer unref_operation(operation);
+
+    if (status != .Continue or operation.completed) {
+        return status;
+    }
+
+    // The future was cancelled while the operation was still in flight
+    const loop = operation.loop;
+    const mutex = &loop.mutex;
+    mutex.lock();
+    defer mutex.unlock();
+
+    IO.cancel(loop, operation.blocking_task_id) catch |err| {
+        const err_trace = @errorReturnTrace();
+        utils.print_error_traces(err_trace, err);
+
+        utils.put_python_runtime_error_message(@errorName(err));
+        return .Exception;
+    };
+
+    return .Continue;
+}
+
+// Takes the ownership of data even on failure
+pub fn queue_operation(self: *LoopObject, py_socket: PyObject, data: OperationData) !*PythonFutureObject {
+    const loop_data = utils.get_data_ptr(Loop, self);
+    const allocator = loop_data.allocator;
+
+    const operation = allocator.create(SocketOperation) catch |err| {
+        var operation_data = data;
+        release_operation_data(&operation_data);
+        return err;
+    };
+    operation.* = .{
+        .loop = loop_data,
+        .py_socket = python_c.py_newref(py_socket),
+        .data = data
+    };
+    errdefer finish_operation(operation);
+
+    operation.fd = python_c.PyObject_AsFileDescriptor(py_socket);
+    if (operation.fd < 0) {
+        return error.PythonError;
+    }
+
+    const py_future = try Future.Python.Constructors.fast_new_future(self);
+    errdefer python_c.py_decref(@ptrCast(py_future));
+
+    operation.py_future = python_c.py_newref(py_future);
+    try Future.Callback.add_done_callback(utils.get_data_ptr(Future, py_future), .{
+        .ZigGeneric = .{
+            .callback = &future_done_callback,
+            .data = operation
+        }
+    });
+    operation.references += 1;
+
+    try queue_blocking_operation(operation);
+    return py_future;
+}
+
+inline fn z_loop_sock_recv(self: *LoopObject, args: []?PyObject) !*PythonFutureObject {
+    if (args.len != 2) {
+        utils.put_python_runtime_error_message("Invalid number of arguments\x00");
+        return error.PythonError;
+    }
+
+    const nbytes = python_c.PyLong_AsSsize_t(args[1].?);
+    if (nbytes < 0) {
+        if (python_c.PyErr_Occurred() == null) {
+            python_c.PyErr_SetString(python_c.PyExc_ValueError, "negative buffersize in recv\x00");
+        }
+        return error.PythonError;
+    }
+
+    const py_bytes: PyObject = python_c.PyBytes_FromStringAndSize(null, nbytes)
+        orelse return error.PythonError;
+    return try queue_operation(self, args[0].?, .{ .Recv = py_bytes });
+}
+
+inline fn z_loop_sock_recv_into(self: *LoopObject, args: []?PyObject) !*PythonFutureObject {
+    if (args.len != 2) {
+        utils.put_python_runtime_error_message("Invalid number of arguments\x00");
+        return error.PythonError;
+    }
+
+    var buffer: python_c.Py_buffer = undefined;
+    if (python_c.PyObject_GetBuffer(args[1].?, &buffer, python_c.PyBUF_WRITABLE) < 0) {
+        return error.PythonError;
+    }
+    return try queue_operation(self, args[0].?, .{ .RecvInto = buffer });
+}
+
+inline fn z_loop_sock_sendall(self: *LoopObject, args: []?PyObject) !*PythonFutureObject {
+    if (args.len != 2) {
+        utils.put_python_runtime_error_message("Invalid number of arguments\x00");
+        return error.PythonError;
+    }
+
+    var buffer: python_c.Py_buffer = undefined;
+    if (python_c.PyObject_GetBuffer(args[1].?, &buffer, python_c.PyBUF_SIMPLE) < 0) {
+        return error.PythonError;
+    }
+    return try queue_operation(self, args[0].?, .{ .SendAll = .{ .buffer = buffer } });
+}
+
+// Linux specific fcntl commands, they are missing from std
+const F_SETPIPE_SZ = 1031;
+const F_GETPIPE_SZ = 1032;
+
+const SendFilePipeSize = 1024 * 1024;
+const DefaultPipeSize = 64 * 1024;
+
+fn create_sendfile_pipe() !struct { fds: [2]std.posix.fd_t, size: usize } {
+    var fds: [2]std.posix.fd_t = undefined;
+    switch (std.os.linux.E.init(std.os.linux.pipe2(&fds, .{ .CLOEXEC = true }))) {
+        .SUCCESS => {},
+        else => |errno| {
+            utils.put_python_os_error(errno);
+            return error.PythonError;
+        }
+    }
+
+    // A bigger pipe moves more data per splice, the system limit may not allow it though
+    _ = std.os.linux.fcntl(fds[1], F_SETPIPE_SZ, SendFilePipeSize);
+    const rc = std.os.linux.fcntl(fds[1], F_GETPIPE_SZ, 0);
+    const size: usize = switch (std.os.linux.E.init(rc)) {
+        .SUCCESS => rc,
+        else => DefaultPipeSize
+    };
+
+    return .{ .fds = fds, .size = size };
+}
+
+inline fn z_loop_sock_sendfile(self: *LoopObject, args: []?PyObject) !*PythonFutureObject {
+    if (args.len != 4) {
+        utils.put_python_runtime_error_message("Invalid number of arguments\x00");
+        return error.PythonError;
+    }
+
+    const py_file = args[1].?;
+    const file_fd = python_c.PyObject_AsFileDescriptor(py_file);
+    if (file_fd < 0) return error.PythonError;
+
+    const offset = python_c.PyLong_AsSsize_t(args[2].?);
+    if (offset < 0) {
+        if (python_c.PyErr_Occurred() == null) {
+            python_c.PyErr_SetString(python_c.PyExc_ValueError, "negative offset\x00");
+        }
+        return error.PythonError;
+    }
+
+    var remaining: ?usize = null;
+    if (!python_c.is_none(args[3].?)) {
+        const count = python_c.PyLong_AsSsize_t(args[3].?);
+        if (count <= 0) {
+            if (python_c.PyErr_Occurred() == null) {
+                python_c.PyErr_SetString(python_c.PyExc_ValueError, "count must be a positive integer\x00");
+            }
+            return error.PythonError;
+        }
+        remaining = @intCast(count);
+    }
+
+    const pipe = try create_sendfile_pipe();
+    return try queue_operation(self, args[0].?, .{
+        .SendFile = .{
+            .py_file = python_c.py_newref(py_file),
+            .file_fd = file_fd,
+            .offset = @intCast(offset),
+            .remaining = remaining,
+            .pipe = pipe.fds,
+            .pipe_size = pipe.size
+        }
+    });
+}
+
+inline fn z_loop_sock_accept(self: *LoopObject, py_socket: PyObject) !*PythonFutureObject {
+    return try queue_operation(self, py_socket, .{ .Accept = .{} });
+}
+
+inline fn z_loop_sock_accept_multishot(self: *LoopObject, args: []?PyObject) !*PythonFutureObject {
+    if (args.len != 2) {
+        utils.put_python_runtime_error_message("Invalid number of arguments\x00");
+        return error.PythonError;
+    }
+
+    if (python_c.PyCallable_Check(args[1].?) <= 0) {
+        python_c.PyErr_SetString(python_c.PyExc_TypeError, "Invalid callback\x00");
+        return error.PythonError;
+    }
+
+    return try queue_operation(self, args[0].?, .{ .AcceptMultishot = python_c.py_newref(args[1].?) });
+}
+
+inline fn z_loop_sock_recvmmsg(self: *LoopObject, args: []?PyObject) !*PythonFutureObject {
+    if (args.len != 2 and args.len != 3) {
+        utils.put_python_runtime_error_message("Invalid number of arguments\x00");
+        return error.PythonError;
+    }
+
+    if (python_c.PyCallable_Check(args[1].?) <= 0) {
+        python_c.PyErr_SetString(python_c.PyExc_TypeError, "Invalid callback\x00");
+        return error.PythonError;
+    }
+
+    var buffer_size: usize = DefaultDatagramBufferSize;
+    if (args.len == 3) {
+        const max_size = python_c.PyLong_AsSsize_t(args[2].?);
+        if (max_size <= 0) {
+            if (python_c.PyErr_Occurred() == null) {
+                python_c.PyErr_SetString(python_c.PyExc_ValueError, "max_size must be positive\x00");
+            }
+            return error.PythonError;
+        }
+        buffer_size = @intCast(max_size);
+    }
+
+    const allocator = utils.get_data_ptr(Loop, self).allocator;
+    const buffers = try allocator.alloc(u8, try std.math.mul(usize, DatagramBatchSize, buffer_size));
+    return try queue_operation(self, args[0].?, .{
+        .RecvDatagrams = .{
+            .py_callback = python_c.py_newref(args[1].?),
+            .allocator = allocator,
+            .buffers = buffers,
+            .buffer_size = buffer_size
+        }
+    });
+}
+
+const OutgoingDatagram = struct {
+    buffer: python_c.Py_buffer,
+    py_address: ?PyObject
+};
+
+fn prepare_datagram(
+    py_socket: PyObject, family: u32, py_datagram: PyObject, socket_address: *SocketAddress,
+    previous: ?*const OutgoingDatagram, previous_address: *const SocketAddress
+) !OutgoingDatagram {
+    var py_data: ?PyObject = null;
+    var py_address: ?PyObject = null;
+    if (python_c.PyArg_ParseTuple(py_datagram, "OO\x00", &py_data, &py_address) == 0) {
+        return error.PythonError;
+    }
+
+    if (python_c.is_none(py_address.?)) {
+        py_address = null;
+    }else if (previous != null and previous.?.py_address == py_address) {
+        socket_address.* = previous_address.*;
+    }else{
+        socket_address.* = try address_from_py_with_family(py_socket, family, py_address.?, true);
+    }
+
+    var datagram: OutgoingDatagram = .{ .buffer = undefined, .py_address = py_address };
+    if (python_c.PyObject_GetBuffer(py_data.?, &datagram.buffer, python_c.PyBUF_SIMPLE) < 0) {
+        return error.PythonError;
+    }
+    return datagram;
+}
+
+// Sends the first datagrams of the sequence with a single sendmmsg and returns how many of them were sent.
+// It doesn't wait for the socket to be writable, the error of the first datagram is raised instead.
+inline fn z_loop_sock_sendmmsg(self: *LoopObject, args: []?PyObject) !PyObject {
+    _ = self;
+    if (args.len != 2) {
+        utils.put_python_runtime_error_message("Invalid number of arguments\x00");
+        return error.PythonError;
+    }
+
+    const py_socket = args[0].?;
+    const py_datagrams = args[1].?;
+
+    const fd = python_c.PyObject_AsFileDescriptor(py_socket);
+    if (fd < 0) return error.PythonError;
+
+    const family = try get_socket_family(py_socket);
+    const length = python_c.PySequence_Size(py_datagrams);
+    if (length < 0) return error.PythonError;
+    const count = @min(@as(usize, @intCast(length)), DatagramBatchSize);
+    if (count == 0) return python_c.PyLong_FromLong(0) orelse error.PythonError;
+
+    var datagrams: [DatagramBatchSize]OutgoingDatagram = undefined;
+    var addresses: [DatagramBatchSize]SocketAddress = undefined;
+    var iovecs: [DatagramBatchSize]std.posix.iovec_const = undefined;
+    var headers: [DatagramBatchSize]std.os.linux.mmsghdr_const = undefined;
+
+    var prepared: usize = 0;
+    defer {
+        for (datagrams[0..prepared]) |*datagram| python_c.PyBuffer_Release(&datagram.buffer);
+    }
+
+    while (prepared < count) : (prepared += 1) {
+        const py_datagram: PyObject = python_c.PySequence_GetItem(py_datagrams, @intCast(prepared))
+            orelse return error.PythonError;
+        defer python_c.py_decref(py_datagram);
+
+        const previous = if (prepared > 0) &datagrams[prepared - 1] else null;
+        const previous_address = if (prepared > 0) &addresses[prepared - 1] else &addresses[0];
+        datagrams[prepared] = prepare_datagram(
+            py_socket, family, py_datagram, &addresses[prepared], previous, previous_address
+        ) catch |err| {
+            // The invalid datagram is left for the next call, which raises its error
+            if (prepared == 0) return err;
+            python_c.PyErr_Clear();
+            break;
+        };
+
+        const buffer = &datagrams[prepared].buffer;
+        iovecs[prepared] = .{ .base = @ptrCast(buffer.buf), .len = @intCast(buffer.len) };
+
+        const has_address = datagrams[prepared].py_address != null;
+        headers[prepared] = .{
+            .hdr = .{
+                .name = if (has_address) &addresses[prepared].address.any else null,
+                .namelen = if (has_address) addresses[prepared].address_len else 0,
+                .iov = @ptrCast(&iovecs[prepared]),
+                .iovlen = 1,
+                .control = null,
+                .controllen = 0,
+                .flags = 0
+            },
+            .len = 0
+        };
+    }
+
+    const rc = std.os.linux.sendmmsg(fd, &headers, @intCast(prepared), std.posix.MSG.NOSIGNAL);
+    switch (std.os.linux.E.init(rc)) {
+        .SUCCESS => return python_c.PyLong_FromSize_t(rc) orelse error.PythonError,
+        else => |errno| {
+            utils.put_python_os_error(errno);
+            return error.PythonError;
+        }
+    }
+}
+
+inline fn z_loop_sock_connect(self: *LoopObject, args: []?PyObject) !*PythonFutureObject {
+    if (args.len != 2) {
+        utils.put_python_runtime_error_message("Invalid number of arguments\x00");
+        return error.PythonError;
+    }
+
+    const socket_address = try address_from_py(args[0].?, args[1].?, true);
+    return try queue_operation(self, args[0].?, .{ .Connect = socket_address });
+}
+
+pub fn loop_sock_recv(
+    self: ?*LoopObject, args: ?[*]?PyObject, nargs: isize
+) callconv(.C) ?*PythonFutureObject {
+    return utils.execute_zig_function(z_loop_sock_recv, .{
+        self.?, args.?[0..@as(usize, @intCast(nargs))]
+    });
+}
+
+pub fn loop_sock_recv_into(
+    self: ?*LoopObject, args: ?[*]?PyObject, nargs: isize
+) callconv(.C) ?*PythonFutureObject {
+    return utils.execute_zig_function(z_loop_sock_recv_into, .{
+        self.?, args.?[0..@as(usize, @intCast(nargs))]
+    });
+}
+
+pub fn loop_sock_sendall(
+    self: ?*LoopObject, args: ?[*]?PyObject, nargs: isize
+) callconv(.C) ?*PythonFutureObject {
+    return utils.execute_zig_function(z_loop_sock_sendall, .{
+        self.?, args.?[0..@as(usize, @intCast(nargs))]
+    });
+}
+
+pub fn loop_sock_sendfile(
+    self: ?*LoopObject, args: ?[*]?PyObject, nargs: isize
+) callconv(.C) ?*PythonFutureObject {
+    return utils.execute_zig_function(z_loop_sock_sendfile, .{
+        self.?, args.?[0..@as(usize, @intCast(nargs))]
+    });
+}
+
+pub fn loop_sock_accept(
+    self: ?*LoopObject, py_socket: ?PyObject
+) callconv(.C) ?*PythonFutureObject {
+    return utils.execute_zig_function(z_loop_sock_accept, .{self.?, py_socket.?});
+}
+
+pub fn loop_sock_accept_multishot(
+    self: ?*LoopObject, args: ?[*]?PyObject, nargs: isize
+) callconv(.C) ?*PythonFutureObject {
+    return utils.execute_zig_function(z_loop_sock_accept_multishot, .{
+        self.?, args.?[0..@as(usize, @intCast(nargs))]
+    });
+}
+
+pub fn loop_sock_recvmmsg(
+    self: ?*LoopObject, args: ?[*]?PyObject, nargs: isize
+) callconv(.C) ?*PythonFutureObject {
+    return utils.execute_zig_function(z_loop_sock_recvmmsg, .{
+        self.?, args.?[0..@as(usize, @intCast(nargs))]
+    });
+}
+
+pub fn loop_sock_sendmmsg(
+    self: ?*LoopObject, args: ?[*]?PyObject, nargs: isize
+) callconv(.C) ?PyObject {
+    return utils.execute_zig_function(z_loop_sock_sendmmsg, .{
+        self.?, args.?[0..@as(usize, @intCast(nargs))]
+    });
+}
+
+pub fn loop_sock_connect(
+    self: ?*LoopObject, args: ?[*]?PyObject, nargs: isize
+) callconv(.C) ?*PythonFutureObject {
+    return utils.execute_zig_function(z_loop_sock_connect, .{
+        self.?, args.?[0..@as(usize, @intCast(nargs))]
+    });
+}
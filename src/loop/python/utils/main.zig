@@ -1,3 +1,4 @@
 pub const Future = @import("future.zig");
 pub const Task = @import("task.zig");
+pub const TaskFactory = @import("task_factory.zig");
 pub const Time = @import("time.zig");
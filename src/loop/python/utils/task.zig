@@ -5,13 +5,14 @@ const utils = @import("../../../utils/utils.zig");
 
 const Loop = @import("../../main.zig");
 const Task = @import("../../../task/main.zig");
+const TaskFactory = @import("task_factory.zig");
 
 const PythonLoopObject = Loop.Python.LoopObject;
 const PythonTaskObject = Task.PythonTaskObject;
 
-inline fn z_loop_create_task(
+inline fn z_loop_create_task_object(
     self: *PythonLoopObject, args: []?PyObject,
-    knames: ?PyObject
+    knames: ?PyObject, eager_start: *bool
 ) !*PythonTaskObject {
     if (args.len != 1) {
         utils.put_python_runtime_error_message("Invalid number of arguments\x00");
@@ -20,10 +21,11 @@ inline fn z_loop_create_task(
 
     var context: ?PyObject = null;
     var name: ?PyObject = null;
+    var py_eager_start: ?PyObject = null;
     try python_c.parse_vector_call_kwargs(
         knames, args.ptr + args.len,
-        &.{"context\x00", "name\x00"},
-        &.{&context, &name},
+        &.{"context\x00", "name\x00", "eager_start\x00"},
+        &.{&context, &name, &py_eager_start},
     );
     errdefer python_c.py_xdecref(name);
 
@@ -54,10 +56,39 @@ inline fn z_loop_create_task(
         }
     }
 
+    if (py_eager_start) |v| {
+        defer python_c.py_decref(v);
+        const value = python_c.PyObject_IsTrue(v);
+        if (value < 0) return error.PythonError;
+        eager_start.* = (value != 0);
+    }
+
     const coro: PyObject = python_c.py_newref(args[0].?);
     errdefer python_c.py_decref(coro);
 
-    const task = try Task.Constructors.fast_new_task(self, coro, context.?, name);
+    const task = try Task.Constructors.fast_new_task(self, coro, context.?, name, eager_start.*);
+    return task;
+}
+
+inline fn z_loop_create_task(
+    self: *PythonLoopObject, args: []?PyObject,
+    knames: ?PyObject
+) !*PythonTaskObject {
+    if (self.task_factory) |task_factory| {
+        if (args.len != 1) {
+            utils.put_python_runtime_error_message("Invalid number of arguments\x00");
+            return error.PythonError;
+        }
+        return @ptrCast(try TaskFactory.call_task_factory(self, task_factory, args, knames));
+    }
+
+    var eager_start: bool = false;
+    const task = try z_loop_create_task_object(self, args, knames, &eager_start);
+    if (Task.Constructors.must_start_eagerly(self, eager_start)) {
+        errdefer python_c.py_decref(@ptrCast(task));
+        try Task.Constructors.task_eager_start(task);
+    }
+
     return task;
 }
 
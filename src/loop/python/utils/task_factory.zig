@@ -0,0 +1,68 @@
+const python_c = @import("python_c");
+const PyObject = *python_c.PyObject;
+
+const utils = @import("../../../utils/utils.zig");
+
+const Loop = @import("../../main.zig");
+
+const PythonLoopObject = Loop.Python.LoopObject;
+
+// Calls the factory like asyncio does, factory(loop, coro, **kwargs), with the keyword arguments given to
+// create_task passed along untouched
+pub fn call_task_factory(
+    self: *PythonLoopObject, task_factory: PyObject, args: []?PyObject, knames: ?PyObject
+) !PyObject {
+    const kwargs_len: usize = blk: {
+        if (knames) |kwargs| {
+            const len = python_c.PyTuple_Size(kwargs);
+            if (len < 0) return error.PythonError;
+            break :blk @intCast(len);
+        }
+        break :blk 0;
+    };
+
+    // The loop goes first, so the arguments can't be forwarded as they are
+    var stack_args: [8]?PyObject = undefined;
+    const allocator = utils.get_data_ptr(Loop, self).allocator;
+    const total = 1 + args.len + kwargs_len;
+    const factory_args = blk: {
+        if (total <= stack_args.len) break :blk stack_args[0..total];
+        break :blk try allocator.alloc(?PyObject, total);
+    };
+    defer if (total > stack_args.len) allocator.free(factory_args);
+
+    factory_args[0] = @ptrCast(self);
+    @memcpy(factory_args[1..], args.ptr[0..(args.len + kwargs_len)]);
+
+    // The factory could replace itself while it runs
+    python_c.py_incref(task_factory);
+    defer python_c.py_decref(task_factory);
+
+    return python_c.PyObject_Vectorcall(task_factory, factory_args.ptr, 1 + args.len, knames)
+        orelse error.PythonError;
+}
+
+pub fn loop_set_task_factory(self: ?*PythonLoopObject, factory: ?PyObject) callconv(.C) ?PyObject {
+    const instance = self.?;
+    const py_factory = factory.?;
+
+    if (python_c.is_none(py_factory)) {
+        python_c.py_decref_and_set_null(&instance.task_factory);
+    }else if (python_c.PyCallable_Check(py_factory) <= 0) {
+        python_c.PyErr_SetString(python_c.PyExc_TypeError, "task factory must be a callable or None\x00");
+        return null;
+    }else{
+        const old_factory = instance.task_factory;
+        instance.task_factory = python_c.py_newref(py_factory);
+        python_c.py_xdecref(old_factory);
+    }
+
+    return python_c.get_py_none();
+}
+
+pub fn loop_get_task_factory(self: ?*PythonLoopObject, _: ?PyObject) callconv(.C) ?PyObject {
+    if (self.?.task_factory) |py_factory| {
+        return python_c.py_newref(py_factory);
+    }
+    return python_c.get_py_none();
+}
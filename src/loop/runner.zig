@@ -1,7 +1,6 @@
 const Loop = @import("main.zig");
 const CallbackManager = @import("../callback_manager.zig");
 
-const BlockingTasksSetLinkedList = Loop.Scheduling.IO.BlockingTasksSetLinkedList;
 const CallbacksSetLinkedList = CallbackManager.LinkedList;
 
 const Lock = @import("../utils/lock.zig").Mutex;
@@ -76,59 +75,190 @@ pub inline fn call_once(
 }
 
 inline fn fetch_completed_tasks(
-    allocator: std.mem.Allocator, epoll_fd: std.posix.fd_t, blocking_tasks_queue: *BlockingTasksSetLinkedList,
-    blocking_tasks_set: ?*Loop.Scheduling.IO.BlockingTasksSet, blocking_ready_tasks: []std.os.linux.io_uring_cqe,
-    ready_queue: *CallbackManager.CallbacksSetsQueue
+    allocator: std.mem.Allocator, set: *Loop.Scheduling.IO.BlockingTasksSet,
+    blocking_ready_tasks: []std.os.linux.io_uring_cqe, ready_queue: *CallbackManager.CallbacksSetsQueue,
+    inbox: *Loop.Scheduling.Soon.Inbox
 ) !void {
-    if (blocking_tasks_set) |set| {
-        const ring = &set.ring;
+    const ring = &set.ring;
+    while (true) {
         const nevents = try ring.copy_cqes(blocking_ready_tasks, 0);
         for (blocking_ready_tasks[0..nevents]) |cqe| {
+            if (cqe.user_data == 0) continue;
+            if (cqe.user_data == Loop.Scheduling.IO.WakeupUserData) {
+                try inbox.wakeup_completed(set, cqe.flags);
+                continue;
+            }
+
             const blocking_task_data: Loop.Scheduling.IO.BlockingTaskDataLinkedList.Node = @ptrFromInt(cqe.user_data);
-            try set.pop(blocking_task_data);
+            var callback = blocking_task_data.data.callback;
+            if ((cqe.flags & std.os.linux.IORING_CQE_F_MORE) == 0) {
+                try set.pop(blocking_task_data);
+            }
+
+            switch (callback) {
+                .ZigGenericIO => |*data| {
+                    data.io_uring_res = cqe.res;
+                    data.io_uring_flags = cqe.flags;
+                },
+                else => {}
+            }
 
             _ = try CallbackManager.append_new_callback(
-                allocator, ready_queue, blocking_task_data.data, Loop.MaxCallbacks
+                allocator, ready_queue, callback, Loop.MaxCallbacks
             );
         }
 
-        if (set.tasks_data.len == 0) {
-            Loop.Scheduling.IO.remove_tasks_set(epoll_fd, blocking_tasks_queue, set);
+        if (nevents < blocking_ready_tasks.len) break;
+    }
+}
+
+fn wait_for_completions(ring: *std.os.linux.IoUring, timeout: i32) !void {
+    // The timeout is given to io_uring_enter itself, so waiting doesn't cost an extra sqe
+    const ts: std.os.linux.kernel_timespec = .{
+        .sec = @divTrunc(timeout, std.time.ms_per_s),
+        .nsec = @rem(timeout, std.time.ms_per_s) * std.time.ns_per_ms
+    };
+    const arg: std.os.linux.io_uring_getevents_arg = .{
+        .sigmask = 0,
+        .sigmask_sz = std.os.linux.NSIG / 8,
+        .pad = 0,
+        .ts = if (timeout < 0) 0 else @intFromPtr(&ts)
+    };
+
+    const ret = std.os.linux.syscall6(
+        .io_uring_enter, @as(usize, @bitCast(@as(isize, ring.fd))), 0, 1,
+        std.os.linux.IORING_ENTER_GETEVENTS | std.os.linux.IORING_ENTER_EXT_ARG,
+        @intFromPtr(&arg), @sizeOf(std.os.linux.io_uring_getevents_arg)
+    );
+    switch (std.os.linux.E.init(ret)) {
+        // BUSY means the overflowed completions have to be reaped first, they are fetched right after
+        .SUCCESS, .TIME, .INTR, .BUSY => {},
+        else => |errno| return std.posix.unexpectedErrno(errno)
+    }
+}
+
+// Spinning on the completion queue before going to sleep saves the wake up cost when completions
+// come in quickly. The window follows how long the previous waits took, so idle loops stop spinning.
+pub const BusyPoll = struct {
+    // How many spin iterations go by between yields to the scheduler
+    pub const YieldInterval = 64;
+
+    max_ns: u64 = 0,
+    window_ns: u64 = 0,
+    // Moving average of the waits that spinning could have caught
+    avg_wait_ns: u64 = 0,
+
+    pub fn init(max_ns: u64) BusyPoll {
+        return .{
+            .max_ns = max_ns,
+            .window_ns = max_ns,
+            .avg_wait_ns = max_ns / 2
+        };
+    }
+
+    pub inline fn enabled(self: *const BusyPoll) bool {
+        return self.max_ns > 0;
+    }
+
+    fn spin(self: *const BusyPoll, ring: *std.os.linux.IoUring, timeout: i32, start_time: std.time.Instant) bool {
+        var window_ns = self.window_ns;
+        if (timeout >= 0) {
+            window_ns = @min(window_ns, @as(u64, @intCast(timeout)) * std.time.ns_per_ms);
+        }
+
+        var iterations: usize = 0;
+        while (ring.cq_ready() == 0) {
+            const now = std.time.Instant.now() catch return false;
+            if (now.since(start_time) >= window_ns) return false;
+
+            iterations += 1;
+            if (iterations % YieldInterval == 0) {
+                // Now and then let whoever is going to produce the completion run
+                std.Thread.yield() catch {};
+            }else{
+                std.atomic.spinLoopHint();
+            }
+        }
+        return true;
+    }
+
+    pub fn record_wait(self: *BusyPoll, elapsed_ns: u64) void {
+        if (elapsed_ns <= self.max_ns) {
+            // EWMA with a weight of 1/8 for the new sample
+            const avg_wait_ns = self.avg_wait_ns;
+            self.avg_wait_ns = avg_wait_ns - avg_wait_ns / 8 + elapsed_ns / 8;
+        }else{
+            // Spinning wouldn't have caught it, long idle waits shouldn't keep the window wide open
+            self.avg_wait_ns /= 2;
+        }
+
+        // Spinning for a bit longer than the usual wait catches most completions
+        self.window_ns = @min(self.max_ns, self.avg_wait_ns * 2);
+    }
+};
+
+fn wait_with_busy_poll(busy_poll: *BusyPoll, ring: *std.os.linux.IoUring, timeout: i32) !void {
+    const start_time = try std.time.Instant.now();
+    if (!busy_poll.spin(ring, timeout, start_time)) {
+        var remaining_timeout = timeout;
+        if (timeout > 0) {
+            const elapsed_ms = (try std.time.Instant.now()).since(start_time) / std.time.ns_per_ms;
+            remaining_timeout = @intCast(@max(@as(i64, timeout) - @as(i64, @intCast(elapsed_ms)), 0));
+        }
+
+        if (remaining_timeout != 0) {
+            try wait_for_completions(ring, remaining_timeout);
         }
     }
+
+    busy_poll.record_wait((try std.time.Instant.now()).since(start_time));
+}
+
+inline fn has_ready_callbacks(ready_queue: *const CallbackManager.CallbacksSetsQueue) bool {
+    const first_set = ready_queue.queue.first orelse return false;
+    return first_set.data.callbacks_num > 0;
 }
 
 fn poll_blocking_events(
     loop: *Loop, mutex: *Lock, wait: bool, ready_queue: *CallbackManager.CallbacksSetsQueue
 ) !void {
-    const epoll_fd = loop.blocking_tasks_epoll_fd;
-    const blocking_ready_epoll_events = loop.blocking_ready_epoll_events;
+    const blocking_tasks_set = &loop.blocking_tasks_set;
+    try blocking_tasks_set.submit();
 
-    const nevents = blk: {
-        if (wait) {
-            loop.epoll_locked = true;
+    // Callbacks dispatched from other threads while the previous batch was running can't be left waiting
+    if (wait and !has_ready_callbacks(ready_queue)) {
+        const ring = &blocking_tasks_set.ring;
+        const timeout = try Loop.Scheduling.Later.get_wait_timeout(loop);
+        // Producers push to the inbox before checking io_waiting, so either they see the loop sleeping
+        // and wake it up or the loop sees their callbacks here
+        @atomicStore(bool, &loop.io_waiting, true, .seq_cst);
+        if (timeout != 0 and ring.cq_ready() == 0 and loop.inbox.is_empty()) {
             mutex.unlock();
+            // Other threads can only wake the loop up if they are able to run meanwhile
+            const thread_state = python_c.release_gil();
             defer {
+                // The GIL goes first, whoever holds the mutex may be waiting for it
+                python_c.acquire_gil(thread_state);
                 mutex.lock();
-                loop.epoll_locked = false;
             }
 
-            break :blk std.posix.epoll_wait(epoll_fd, blocking_ready_epoll_events, -1);
-        }else{
-            break :blk std.posix.epoll_wait(epoll_fd, blocking_ready_epoll_events, 0);
+            if (loop.busy_poll.enabled()) {
+                try wait_with_busy_poll(&loop.busy_poll, ring, timeout);
+            }else{
+                try wait_for_completions(ring, timeout);
+            }
         }
-    };
+    }
 
-    const allocator = loop.allocator;
-    const blocking_tasks_queue = &loop.blocking_tasks_queue;
-    const blocking_ready_tasks = loop.blocking_ready_tasks;
+    @atomicStore(bool, &loop.io_waiting, false, .seq_cst);
+    loop.inbox.reset_wakeup();
 
-    for (blocking_ready_epoll_events[0..nevents]) |event| {
-        try fetch_completed_tasks(
-            allocator, epoll_fd, blocking_tasks_queue, @ptrFromInt(event.data.ptr),
-            blocking_ready_tasks, ready_queue
-        );
-    }
+    try fetch_completed_tasks(
+        loop.allocator, blocking_tasks_set, loop.blocking_ready_tasks, ready_queue, &loop.inbox
+    );
+    try loop.inbox.drain(loop, ready_queue);
+
+    try Loop.Scheduling.Later.fetch_expired(loop, ready_queue);
 }
 
 pub fn start(self: *Loop) !void {
@@ -152,7 +282,9 @@ pub fn start(self: *Loop) !void {
     }
 
     self.running = true;
+    self.inbox.set_owner(std.Thread.getCurrentId());
     defer {
+        self.inbox.set_owner(0);
         self.running = false;
         self.stopping = false;
     }
@@ -1,7 +1,7 @@
 const std = @import("std");
+const builtin = @import("builtin");
 
 const linked_list =  @import("../../../utils/linked_list.zig");
-pub const BlockingTasksSetLinkedList = linked_list.init(*BlockingTasksSet);
 pub const BlockingTaskDataLinkedList = linked_list.init(BlockingTaskData);
 
 const CallbackManger = @import("../../../callback_manager.zig");
@@ -10,54 +10,55 @@ const Loop = @import("../../main.zig");
 pub const Read = @import("read.zig");
 pub const Write = @import("write.zig");
 pub const Timer = @import("timer.zig");
+pub const Socket = @import("socket.zig");
+pub const Splice = @import("splice.zig");
 
-pub const BlockingTaskData = CallbackManger.Callback;
+// Completions of the poll that wakes the loop up when another thread writes to the inbox's eventfd
+pub const WakeupUserData: u64 = 1;
 
+pub const BlockingTaskData = struct {
+    callback: CallbackManger.Callback,
+    // Bumped every time the slot is taken or given back, so stale task ids stop matching it
+    generation: u32 = 0
+};
+
+// Entries of the submission queue, the slots for in-flight operations grow past it on demand
 pub const TotalItems = 1024;
 
+// Provided buffers shared by the multishot recvs of the loop, they are allocated on first use
+pub const RecvBufferSize = 16 * 1024;
+pub const RecvBuffersCount = 256;
+const RecvBufferGroupId = 0;
+
 pub const BlockingTasksSet = struct {
     allocator: std.mem.Allocator,
     ring: std.os.linux.IoUring,
     tasks_data: BlockingTaskDataLinkedList,
     free_items: BlockingTaskDataLinkedList,
+    pending_sqes: u32 = 0,
 
-    eventfd: std.posix.fd_t,
+    recv_buffer_group: ?std.os.linux.IoUring.BufferGroup = null,
 
-    node: BlockingTasksSetLinkedList.Node,
-
-    pub fn init(allocator: std.mem.Allocator, node: BlockingTasksSetLinkedList.Node) !*BlockingTasksSet {
-        const set = allocator.create(BlockingTasksSet) catch unreachable;
-        errdefer allocator.destroy(set);
-
-        const eventfd = try std.posix.eventfd(1, std.os.linux.EFD.NONBLOCK|std.os.linux.EFD.CLOEXEC);
-        errdefer std.posix.close(eventfd);
-
-        set.* = .{
+    pub fn init(self: *BlockingTasksSet, allocator: std.mem.Allocator) !void {
+        self.* = .{
             .allocator = allocator,
             .ring = try std.os.linux.IoUring.init(TotalItems, 0),
             .tasks_data = BlockingTaskDataLinkedList.init(allocator),
             .free_items = BlockingTaskDataLinkedList.init(allocator),
-            .node = node,
-            .eventfd = eventfd
         };
-        errdefer set.ring.deinit();
-
-        try set.ring.register_eventfd(eventfd);
         errdefer {
-            while (set.free_items.len > 0) {
-                _ = set.free_items.pop() catch unreachable;
+            while (self.free_items.len > 0) {
+                _ = self.free_items.pop() catch unreachable;
             }
+            self.ring.deinit();
         }
 
         for (0..TotalItems) |_| {
-            try set.free_items.append(undefined);
+            try self.free_items.append(.{ .callback = undefined });
         }
-
-        node.data = set;
-        return set;
     }
 
-    pub fn deinit(self: *BlockingTasksSet) BlockingTasksSetLinkedList.Node {
+    pub fn deinit(self: *BlockingTasksSet) void {
         if (self.tasks_data.len > 0) {
             @panic("Free items count is not equal to total items");
         }
@@ -66,24 +67,25 @@ pub const BlockingTasksSet = struct {
             _ = self.free_items.pop() catch unreachable;
         }
 
-        const node = self.node;
-
-        self.ring.unregister_eventfd() catch unreachable;
-        std.posix.close(self.eventfd);
+        if (self.recv_buffer_group) |*buffer_group| {
+            buffer_group.deinit();
+            self.allocator.free(buffer_group.buffers);
+        }
 
         self.ring.deinit();
-        self.allocator.destroy(self);
-        return node;
     }
 
-    pub fn push(self: *BlockingTasksSet, data: CallbackManger.Callback) !BlockingTaskDataLinkedList.Node {
-        const free_items = &self.free_items;
-        if (free_items.len == 0) {
-            return error.NoFreeItems;
+    pub fn push(self: *BlockingTasksSet, callback: CallbackManger.Callback) !BlockingTaskDataLinkedList.Node {
+        // Keep room for the sqe that is about to be prepared
+        if (self.pending_sqes >= self.ring.sq.sqes.len) {
+            try self.submit();
         }
 
-        const node = try free_items.popleft_node();
-        node.data = data;
+        const free_items = &self.free_items;
+        // Slots are never freed until the loop is released, so task ids can't point to freed memory
+        const node = free_items.popleft_node() catch try free_items.create_new_node(.{ .callback = undefined });
+        node.data.callback = callback;
+        node.data.generation +%= 1;
         self.tasks_data.append_node(node);
 
         return node;
@@ -96,14 +98,59 @@ pub const BlockingTasksSet = struct {
         }
 
         try tasks_data.unlink_node(node);
+        node.data.generation +%= 1;
         self.free_items.append_node(node);
     }
 
+    pub fn get_recv_buffer_group(self: *BlockingTasksSet) !*std.os.linux.IoUring.BufferGroup {
+        if (self.recv_buffer_group) |*buffer_group| {
+            return buffer_group;
+        }
+
+        const allocator = self.allocator;
+        const buffers = try allocator.alloc(u8, RecvBufferSize * RecvBuffersCount);
+        errdefer allocator.free(buffers);
+
+        self.recv_buffer_group = try std.os.linux.IoUring.BufferGroup.init(
+            &self.ring, RecvBufferGroupId, buffers, RecvBufferSize, RecvBuffersCount
+        );
+        return &self.recv_buffer_group.?;
+    }
+
+    pub inline fn get_selected_buffer(self: *BlockingTasksSet, buffer_id: u16) []u8 {
+        return self.recv_buffer_group.?.get(buffer_id);
+    }
+
+    pub fn submit(self: *BlockingTasksSet) !void {
+        // The kernel stops consuming the queue after an sqe fails, the rest is submitted again
+        while (self.pending_sqes > 0) {
+            const ret = try self.ring.submit();
+            if (ret == 0 or ret > self.pending_sqes) {
+                @panic("Unexpected number of submitted sqes");
+            }
+            self.pending_sqes -= ret;
+        }
+    }
+
+    // Sqes that don't own a slot, like cancellations and wake ups. Their completions are ignored
+    pub fn push_untracked(self: *BlockingTasksSet) !*std.os.linux.io_uring_sqe {
+        if (self.pending_sqes >= self.ring.sq.sqes.len) {
+            try self.submit();
+        }
+
+        const sqe = try self.ring.get_sqe();
+        self.pending_sqes += 1;
+        return sqe;
+    }
+
     pub fn cancel_all(self: *BlockingTasksSet, loop: *Loop) !void {
         while (self.tasks_data.len > 0) {
-            var callback = try self.tasks_data.pop();
-            CallbackManger.cancel_callback(&callback, true);
+            const node = try self.tasks_data.pop_node();
+            var callback = node.data.callback;
+            node.data.generation +%= 1;
+            self.free_items.append_node(node);
 
+            CallbackManger.cancel_callback(&callback, true);
             try Loop.Scheduling.Soon.dispatch(loop, callback);
         }
     }
@@ -114,12 +161,24 @@ pub const BlockingOperation = enum {
     WaitWritable,
     PerformRead,
     PerformWrite,
+    PerformRecv,
+    PerformRecvMultishot,
+    PerformSend,
+    PerformAccept,
+    PerformConnect,
+    PerformSplice,
     WaitTimer
 };
 
 pub const WaitData = struct {
     callback: CallbackManger.Callback,
-    fd: std.os.linux.fd_t
+    fd: std.os.linux.fd_t,
+    multishot: bool = false
+};
+
+pub const BlockingTaskId = struct {
+    node: BlockingTaskDataLinkedList.Node,
+    generation: u32
 };
 
 pub const BlockingOperationData = union(BlockingOperation) {
@@ -127,71 +186,87 @@ pub const BlockingOperationData = union(BlockingOperation) {
     WaitWritable: WaitData,
     PerformRead: Read.PerformData,
     PerformWrite: Write.PerformData,
+    PerformRecv: Socket.RecvData,
+    PerformRecvMultishot: Socket.RecvMultishotData,
+    PerformSend: Socket.SendData,
+    PerformAccept: Socket.AcceptData,
+    PerformConnect: Socket.ConnectData,
+    PerformSplice: Splice.PerformData,
     WaitTimer: Timer.WaitData
 };
 
-inline fn get_blocking_tasks_set(
-    allocator: std.mem.Allocator, epoll_fd: std.posix.fd_t,
-    blocking_tasks_queue: *BlockingTasksSetLinkedList
-) !*BlockingTasksSet {
-    if (blocking_tasks_queue.last) |node| {
-        const set: *BlockingTasksSet = node.data;
-        if (set.free_items.len > 0) {
-            return set;
-        }
-    }
-
-    const new_node = try blocking_tasks_queue.create_new_node(undefined);
-    errdefer blocking_tasks_queue.release_node(new_node);
+pub fn queue(self: *Loop, event: BlockingOperationData) !BlockingTaskId {
+    const blocking_tasks_set = &self.blocking_tasks_set;
+    const node = switch (event) {
+        .WaitReadable => |data| try Read.wait_ready(blocking_tasks_set, data),
+        .WaitWritable => |data| try Write.wait_ready(blocking_tasks_set, data),
+        .PerformRead => |data| try Read.perform(blocking_tasks_set, data),
+        .PerformWrite => |data| try Write.perform(blocking_tasks_set, data),
+        .PerformRecv => |data| try Socket.recv(blocking_tasks_set, data),
+        .PerformRecvMultishot => |data| try Socket.recv_multishot(blocking_tasks_set, data),
+        .PerformSend => |data| try Socket.send(blocking_tasks_set, data),
+        .PerformAccept => |data| try Socket.accept(blocking_tasks_set, data),
+        .PerformConnect => |data| try Socket.connect(blocking_tasks_set, data),
+        .PerformSplice => |data| try Splice.perform(blocking_tasks_set, data),
+        .WaitTimer => |data| try Timer.wait(blocking_tasks_set, data),
+    };
 
-    const new_set = try BlockingTasksSet.init(allocator, new_node);
-    errdefer {
-        _ = new_set.deinit();
-        blocking_tasks_queue.unlink_node(new_node) catch unreachable;
-        blocking_tasks_queue.release_node(new_node);
+    // If the loop is already sleeping, nobody would flush the new sqe until something else wakes it up
+    if (!builtin.single_threaded and self.io_waiting) {
+        try blocking_tasks_set.submit();
     }
 
-    var epoll_event: std.os.linux.epoll_event = .{
-        .events = std.os.linux.EPOLL.IN | std.os.linux.EPOLL.ET,
-        .data = std.os.linux.epoll_data{
-            .ptr = @intFromPtr(new_set)
-        }
+    return .{
+        .node = node,
+        .generation = node.data.generation
     };
+}
+
+inline fn is_in_flight(task_id: BlockingTaskId) bool {
+    // Completions are fetched before their callbacks run. By then the slot could have been reused,
+    // so the id is only trusted while the slot is still in the same generation.
+    return task_id.node.data.generation == task_id.generation;
+}
+
+pub fn cancel(self: *Loop, task_id: BlockingTaskId) !void {
+    if (!is_in_flight(task_id)) return;
 
-    blocking_tasks_queue.append_node(new_node);
-    errdefer _ = blocking_tasks_queue.pop_node() catch unreachable;
+    const set = &self.blocking_tasks_set;
+    const sqe = try set.push_untracked();
+    sqe.prep_cancel(@intFromPtr(task_id.node), 0);
+    sqe.user_data = 0;
 
-    try std.posix.epoll_ctl(epoll_fd, std.os.linux.EPOLL.CTL_ADD, new_set.eventfd, &epoll_event);
-    return new_set;
+    if (!builtin.single_threaded and self.io_waiting) {
+        try set.submit();
+    }
 }
 
-pub inline fn remove_tasks_set(
-    epoll_fd: std.posix.fd_t, blocking_tasks_queue: *BlockingTasksSetLinkedList,
-    blocking_tasks_set: *BlockingTasksSet
-) void {
-    std.posix.epoll_ctl(epoll_fd, std.os.linux.EPOLL.CTL_DEL, blocking_tasks_set.eventfd, null) catch unreachable;
-    const node = blocking_tasks_set.deinit();
-    blocking_tasks_queue.unlink_node(node) catch unreachable;
-    blocking_tasks_queue.release_node(node);
+// Interrupts the loop while it's waiting for completions, a no-op completion is enough for that
+pub fn wakeup(self: *Loop) !void {
+    const set = &self.blocking_tasks_set;
+    const sqe = try set.push_untracked();
+    sqe.prep_nop();
+    sqe.user_data = 0;
+
+    try set.submit();
 }
 
-pub fn queue(self: *Loop, event: BlockingOperationData) !void {
-    const blocking_tasks_queue = &self.blocking_tasks_queue;
-    const epoll_fd = self.blocking_tasks_epoll_fd;
-    const blocking_tasks_set = try get_blocking_tasks_set(
-        self.allocator, epoll_fd, blocking_tasks_queue
-    );
-    errdefer {
-        if (blocking_tasks_set.tasks_data.len > 0) {
-            remove_tasks_set(epoll_fd, blocking_tasks_queue, blocking_tasks_set);
-        }
+// Returns the buffer picked by the kernel for a completion, its data is valid until it's released
+pub inline fn get_selected_buffer(
+    self: *Loop, io_uring_flags: u32
+) ?struct { id: u16, data: []u8 } {
+    if ((io_uring_flags & std.os.linux.IORING_CQE_F_BUFFER) == 0) {
+        return null;
     }
 
-    switch (event) {
-        .WaitReadable => |data| try Read.wait_ready(blocking_tasks_set, data),
-        .WaitWritable => |data| try Write.wait_ready(blocking_tasks_set, data),
-        .PerformRead => |data| try Read.perform(blocking_tasks_set, data),
-        .PerformWrite => |data| try Write.perform(blocking_tasks_set, data),
-        .WaitTimer => |data| try Timer.wait(blocking_tasks_set, data),
-    }
+    const buffer_id: u16 = @intCast(io_uring_flags >> std.os.linux.IORING_CQE_BUFFER_SHIFT);
+    return .{ .id = buffer_id, .data = self.blocking_tasks_set.get_selected_buffer(buffer_id) };
+}
+
+pub fn release_selected_buffer(self: *Loop, buffer_id: u16) void {
+    self.blocking_tasks_set.recv_buffer_group.?.put(buffer_id);
+}
+
+pub fn submit_pending(self: *Loop) !void {
+    try self.blocking_tasks_set.submit();
 }
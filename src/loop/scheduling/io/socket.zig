@@ -0,0 +1,99 @@
+const std = @import("std");
+
+const CallbackManager = @import("../../../callback_manager.zig");
+const IO = @import("main.zig");
+
+pub const RecvData = struct {
+    fd: std.posix.fd_t,
+    callback: CallbackManager.Callback,
+    data: []u8,
+    flags: u32 = 0
+};
+
+// The data is received into the buffers provided by the set, one completion is posted per chunk
+pub const RecvMultishotData = struct {
+    fd: std.posix.fd_t,
+    callback: CallbackManager.Callback,
+    flags: u32 = 0
+};
+
+pub const SendData = struct {
+    fd: std.posix.fd_t,
+    callback: CallbackManager.Callback,
+    data: []const u8,
+    flags: u32 = std.posix.MSG.NOSIGNAL
+};
+
+pub const AcceptData = struct {
+    fd: std.posix.fd_t,
+    callback: CallbackManager.Callback,
+    address: ?*std.posix.sockaddr = null,
+    address_len: ?*std.posix.socklen_t = null,
+    flags: u32 = std.posix.SOCK.CLOEXEC,
+    // All completions share the same address, so it's better left unset
+    multishot: bool = false
+};
+
+pub const ConnectData = struct {
+    fd: std.posix.fd_t,
+    callback: CallbackManager.Callback,
+    address: *const std.posix.sockaddr,
+    address_len: std.posix.socklen_t
+};
+
+pub fn recv(set: *IO.BlockingTasksSet, data: RecvData) !IO.BlockingTaskDataLinkedList.Node {
+    const data_ptr = try set.push(data.callback);
+    errdefer set.pop(data_ptr) catch unreachable;
+
+    const ring = &set.ring;
+    _ = try ring.recv(@intCast(@intFromPtr(data_ptr)), data.fd, .{ .buffer = data.data }, data.flags);
+    set.pending_sqes += 1;
+    return data_ptr;
+}
+
+pub fn recv_multishot(set: *IO.BlockingTasksSet, data: RecvMultishotData) !IO.BlockingTaskDataLinkedList.Node {
+    const buffer_group = try set.get_recv_buffer_group();
+
+    const data_ptr = try set.push(data.callback);
+    errdefer set.pop(data_ptr) catch unreachable;
+
+    _ = try buffer_group.recv_multishot(@intCast(@intFromPtr(data_ptr)), data.fd, data.flags);
+    set.pending_sqes += 1;
+    return data_ptr;
+}
+
+pub fn send(set: *IO.BlockingTasksSet, data: SendData) !IO.BlockingTaskDataLinkedList.Node {
+    const data_ptr = try set.push(data.callback);
+    errdefer set.pop(data_ptr) catch unreachable;
+
+    const ring = &set.ring;
+    _ = try ring.send(@intCast(@intFromPtr(data_ptr)), data.fd, data.data, data.flags);
+    set.pending_sqes += 1;
+    return data_ptr;
+}
+
+pub fn accept(set: *IO.BlockingTasksSet, data: AcceptData) !IO.BlockingTaskDataLinkedList.Node {
+    const data_ptr = try set.push(data.callback);
+    errdefer set.pop(data_ptr) catch unreachable;
+
+    const ring = &set.ring;
+    if (data.multishot) {
+        _ = try ring.accept_multishot(
+            @intCast(@intFromPtr(data_ptr)), data.fd, data.address, data.address_len, data.flags
+        );
+    }else{
+        _ = try ring.accept(@intCast(@intFromPtr(data_ptr)), data.fd, data.address, data.address_len, data.flags);
+    }
+    set.pending_sqes += 1;
+    return data_ptr;
+}
+
+pub fn connect(set: *IO.BlockingTasksSet, data: ConnectData) !IO.BlockingTaskDataLinkedList.Node {
+    const data_ptr = try set.push(data.callback);
+    errdefer set.pop(data_ptr) catch unreachable;
+
+    const ring = &set.ring;
+    _ = try ring.connect(@intCast(@intFromPtr(data_ptr)), data.fd, data.address, data.address_len);
+    set.pending_sqes += 1;
+    return data_ptr;
+}
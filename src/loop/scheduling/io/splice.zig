@@ -0,0 +1,28 @@
+const std = @import("std");
+
+const CallbackManager = @import("../../../callback_manager.zig");
+const IO = @import("main.zig");
+
+// Offset meaning the fd's current position, it's the only one allowed for pipes
+pub const CurrentPosition = std.math.maxInt(u64);
+
+pub const PerformData = struct {
+    fd_in: std.posix.fd_t,
+    offset_in: u64 = CurrentPosition,
+    fd_out: std.posix.fd_t,
+    offset_out: u64 = CurrentPosition,
+    len: usize,
+    callback: CallbackManager.Callback
+};
+
+pub fn perform(set: *IO.BlockingTasksSet, data: PerformData) !IO.BlockingTaskDataLinkedList.Node {
+    const data_ptr = try set.push(data.callback);
+    errdefer set.pop(data_ptr) catch unreachable;
+
+    const ring = &set.ring;
+    _ = try ring.splice(
+        @intCast(@intFromPtr(data_ptr)), data.fd_in, data.offset_in, data.fd_out, data.offset_out, data.len
+    );
+    set.pending_sqes += 1;
+    return data_ptr;
+}
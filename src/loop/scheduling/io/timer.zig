@@ -14,7 +14,7 @@ pub const WaitData = struct {
     delay_type: DelayType
 };
 
-pub fn wait(set: *IO.BlockingTasksSet, data: WaitData) !void {
+pub fn wait(set: *IO.BlockingTasksSet, data: WaitData) !IO.BlockingTaskDataLinkedList.Node {
     const data_ptr = try set.push(data.callback);
     errdefer set.pop(data_ptr) catch unreachable;
 
@@ -44,8 +44,6 @@ pub fn wait(set: *IO.BlockingTasksSet, data: WaitData) !void {
         );
     }
 
-    const ret = try ring.submit();
-    if (ret != 1) {
-        @panic("Unexpected number of submitted sqes");
-    }
+    set.pending_sqes += 1;
+    return data_ptr;
 }
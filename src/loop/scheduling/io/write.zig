@@ -10,26 +10,25 @@ pub const PerformData = struct {
     offset: usize
 };
 
-pub fn wait_ready(set: *IO.BlockingTasksSet, data: IO.WaitData) !void {
+pub fn wait_ready(set: *IO.BlockingTasksSet, data: IO.WaitData) !IO.BlockingTaskDataLinkedList.Node {
     const data_ptr = try set.push(data.callback);
     errdefer set.pop(data_ptr) catch unreachable;
 
     const ring: *std.os.linux.IoUring = &set.ring;
-    _ = try ring.poll_add(@intCast(@intFromPtr(data_ptr)), data.fd, std.c.POLL.OUT);
-    const ret = try ring.submit();
-    if (ret != 1) {
-        @panic("Unexpected number of submitted sqes");
+    const sqe = try ring.poll_add(@intCast(@intFromPtr(data_ptr)), data.fd, std.c.POLL.OUT);
+    if (data.multishot) {
+        sqe.len = std.os.linux.IORING_POLL_ADD_MULTI;
     }
+    set.pending_sqes += 1;
+    return data_ptr;
 }
 
-pub fn perform(set: *IO.BlockingTasksSet, data: PerformData) !void {
+pub fn perform(set: *IO.BlockingTasksSet, data: PerformData) !IO.BlockingTaskDataLinkedList.Node {
     const data_ptr = try set.push(data.callback);
     errdefer set.pop(data_ptr) catch unreachable;
 
     const ring = &set.ring;
     _ = try ring.write(@intCast(@intFromPtr(data_ptr)), data.fd, data.data, data.offset);
-    const ret = try ring.submit();
-    if (ret != 1) {
-        @panic("Unexpected number of submitted sqes");
-    }
+    set.pending_sqes += 1;
+    return data_ptr;
 }
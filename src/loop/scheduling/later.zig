@@ -0,0 +1,306 @@
+const std = @import("std");
+
+const Loop = @import("../main.zig");
+
+const CallbackManager = @import("../../callback_manager.zig");
+const LinkedList = @import("../../utils/linked_list.zig");
+
+pub const TimerData = struct {
+    callback: CallbackManager.Callback,
+    deadline: u64,
+    expires: u64,
+    node_ref: ?*?TimersLinkedList.Node = null,
+    level: u8 = 0,
+    slot: u8 = 0
+};
+
+pub const TimersLinkedList = LinkedList.init(TimerData);
+
+pub const LevelBits = 6;
+pub const SlotsPerLevel = 1 << LevelBits;
+pub const Levels = 7;
+
+// Every tick is a millisecond, 7 levels of 64 slots cover ~139 years of monotonic time
+pub const TickDuration = std.time.ns_per_ms;
+pub const MaxTick: u64 = (1 << (LevelBits * Levels)) - 1;
+
+const SlotMask: u64 = SlotsPerLevel - 1;
+const MaxFreeNodes = 1024;
+
+pub const TimerWheel = struct {
+    slots: [Levels][SlotsPerLevel]TimersLinkedList,
+    occupied: [Levels]u64,
+    free_nodes: TimersLinkedList,
+
+    current_tick: u64,
+    len: usize = 0,
+
+    pub fn init(allocator: std.mem.Allocator, current_tick: u64) TimerWheel {
+        var wheel: TimerWheel = .{
+            .slots = undefined,
+            .occupied = .{0} ** Levels,
+            .free_nodes = TimersLinkedList.init(allocator),
+            .current_tick = current_tick
+        };
+
+        for (&wheel.slots) |*level| {
+            for (level) |*slot| {
+                slot.* = TimersLinkedList.init(allocator);
+            }
+        }
+
+        return wheel;
+    }
+
+    pub fn deinit(self: *TimerWheel) void {
+        if (self.len > 0) {
+            @panic("Timer wheel still has pending timers");
+        }
+
+        const free_nodes = &self.free_nodes;
+        while (free_nodes.len > 0) {
+            const node = free_nodes.pop_node() catch unreachable;
+            free_nodes.release_node(node);
+        }
+    }
+
+    inline fn get_position(current_tick: u64, expires: u64) struct { u8, u8 } {
+        if (expires <= current_tick) {
+            return .{ 0, @intCast(current_tick & SlotMask) };
+        }
+
+        const highest_bit: u64 = 63 - @clz(expires ^ current_tick);
+        const level = highest_bit / LevelBits;
+        return .{
+            @intCast(level),
+            @intCast((expires >> @intCast(level * LevelBits)) & SlotMask)
+        };
+    }
+
+    inline fn link_node(self: *TimerWheel, node: TimersLinkedList.Node) void {
+        const level, const slot = get_position(self.current_tick, node.data.expires);
+        node.data.level = level;
+        node.data.slot = slot;
+
+        const list = &self.slots[level][slot];
+        if (level == 0) {
+            // Timers sharing a tick must still run in deadline order
+            const deadline = node.data.deadline;
+            var prev_node = list.last;
+            while (prev_node) |n| {
+                if (n.data.deadline <= deadline) break;
+                prev_node = n.prev;
+            }
+            list.insert_after_node(prev_node, node);
+        }else{
+            list.append_node(node);
+        }
+        self.occupied[level] |= @as(u64, 1) << @intCast(slot);
+    }
+
+    inline fn unlink_node(self: *TimerWheel, node: TimersLinkedList.Node) void {
+        const level = node.data.level;
+        const slot = node.data.slot;
+
+        const list = &self.slots[level][slot];
+        list.unlink_node(node) catch unreachable;
+        if (list.len == 0) {
+            self.occupied[level] &= ~(@as(u64, 1) << @intCast(slot));
+        }
+    }
+
+    inline fn release_node(self: *TimerWheel, node: TimersLinkedList.Node) void {
+        if (node.data.node_ref) |ref| {
+            ref.* = null;
+        }
+
+        const free_nodes = &self.free_nodes;
+        if (free_nodes.len < MaxFreeNodes) {
+            free_nodes.append_node(node);
+        }else{
+            free_nodes.release_node(node);
+        }
+    }
+
+    pub fn add(
+        self: *TimerWheel, callback: CallbackManager.Callback, deadline: u64,
+        node_ref: ?*?TimersLinkedList.Node
+    ) !TimersLinkedList.Node {
+        const free_nodes = &self.free_nodes;
+        const node = blk: {
+            if (free_nodes.len > 0) {
+                break :blk free_nodes.pop_node() catch unreachable;
+            }
+            break :blk try free_nodes.create_new_node(undefined);
+        };
+
+        node.data = .{
+            .callback = callback,
+            .deadline = deadline,
+            .expires = get_tick(deadline),
+            .node_ref = node_ref
+        };
+        self.link_node(node);
+        self.len += 1;
+
+        if (node_ref) |ref| {
+            ref.* = node;
+        }
+
+        return node;
+    }
+
+    pub fn remove(self: *TimerWheel, node: TimersLinkedList.Node) CallbackManager.Callback {
+        self.unlink_node(node);
+        self.len -= 1;
+
+        const callback = node.data.callback;
+        self.release_node(node);
+        return callback;
+    }
+
+    pub fn next_event_tick(self: *const TimerWheel) ?u64 {
+        if (self.len == 0) return null;
+
+        const current_tick = self.current_tick;
+        var next_tick: ?u64 = null;
+        for (self.occupied, 0..) |occupied, level| {
+            const shift: u6 = @intCast(level * LevelBits);
+            const index: u6 = @intCast((current_tick >> shift) & SlotMask);
+
+            const pending_slots = occupied >> index;
+            if (pending_slots == 0) continue;
+
+            const slot: u64 = index + @ctz(pending_slots);
+            const base = (current_tick >> (shift + LevelBits)) << (shift + LevelBits);
+            const tick = base | (slot << shift);
+            if (next_tick == null or tick < next_tick.?) {
+                next_tick = tick;
+            }
+        }
+
+        return next_tick;
+    }
+
+    inline fn cascade(self: *TimerWheel, level: usize, slot: u6) void {
+        const list = &self.slots[level][slot];
+        var node = list.first;
+
+        list.first = null;
+        list.last = null;
+        list.len = 0;
+        self.occupied[level] &= ~(@as(u64, 1) << slot);
+
+        while (node) |n| {
+            node = n.next;
+            self.link_node(n);
+        }
+    }
+
+    pub fn expire(
+        self: *TimerWheel, allocator: std.mem.Allocator, now_tick: u64,
+        ready_queue: *CallbackManager.CallbacksSetsQueue, max_callbacks: usize
+    ) !void {
+        while (self.next_event_tick()) |tick| {
+            if (tick > now_tick) break;
+            self.current_tick = tick;
+
+            var level: usize = Levels - 1;
+            while (level > 0) : (level -= 1) {
+                const slot: u6 = @intCast((tick >> @intCast(level * LevelBits)) & SlotMask);
+                if ((self.occupied[level] >> slot) & 1 == 1) {
+                    self.cascade(level, slot);
+                }
+            }
+
+            const slot: u6 = @intCast(tick & SlotMask);
+            const list = &self.slots[0][slot];
+            while (list.len > 0) {
+                const node = list.popleft_node() catch unreachable;
+                if (list.len == 0) {
+                    self.occupied[0] &= ~(@as(u64, 1) << slot);
+                }
+                self.len -= 1;
+
+                const callback = node.data.callback;
+                self.release_node(node);
+                _ = try CallbackManager.append_new_callback(allocator, ready_queue, callback, max_callbacks);
+            }
+
+            self.current_tick = tick + 1;
+        }
+
+        if (self.current_tick <= now_tick) {
+            self.current_tick = now_tick + 1;
+        }
+    }
+
+    pub fn cancel_all(self: *TimerWheel, loop: *Loop) !void {
+        for (&self.slots, &self.occupied) |*level, *occupied| {
+            for (level) |*list| {
+                while (list.len > 0) {
+                    const node = try list.popleft_node();
+                    self.len -= 1;
+
+                    var callback = node.data.callback;
+                    self.release_node(node);
+
+                    CallbackManager.cancel_callback(&callback, true);
+                    try Loop.Scheduling.Soon.dispatch(loop, callback);
+                }
+            }
+            occupied.* = 0;
+        }
+    }
+};
+
+pub inline fn get_tick(deadline: u64) u64 {
+    return @min(deadline / TickDuration + @intFromBool(deadline % TickDuration != 0), MaxTick);
+}
+
+pub inline fn get_deadline(time: std.posix.timespec) u64 {
+    const nanoseconds = @as(i128, time.sec) * std.time.ns_per_s + time.nsec;
+    return @intCast(std.math.clamp(nanoseconds, 0, std.math.maxInt(u64)));
+}
+
+pub inline fn get_current_tick() !u64 {
+    var time: std.posix.timespec = undefined;
+    try std.posix.clock_gettime(.MONOTONIC, &time);
+
+    const nanoseconds = @as(u64, @intCast(time.sec)) * std.time.ns_per_s + @as(u64, @intCast(time.nsec));
+    return nanoseconds / TickDuration;
+}
+
+pub fn queue(
+    self: *Loop, callback: CallbackManager.Callback, when: std.posix.timespec,
+    node_ref: ?*?TimersLinkedList.Node
+) !void {
+    const timer_wheel = &self.timer_wheel;
+    const deadline = get_deadline(when);
+    if (get_tick(deadline) < timer_wheel.current_tick) {
+        try Loop.Scheduling.Soon._dispatch(self, callback);
+        return;
+    }
+
+    _ = try timer_wheel.add(callback, deadline, node_ref);
+}
+
+pub fn remove(self: *Loop, node: TimersLinkedList.Node) CallbackManager.Callback {
+    return self.timer_wheel.remove(node);
+}
+
+pub fn get_wait_timeout(self: *Loop) !i32 {
+    const timer_wheel = &self.timer_wheel;
+    const tick = timer_wheel.next_event_tick() orelse return -1;
+    const current_tick = try get_current_tick();
+    if (tick <= current_tick) return 0;
+
+    return @intCast(@min(tick - current_tick, std.math.maxInt(i32)));
+}
+
+pub fn fetch_expired(self: *Loop, ready_queue: *CallbackManager.CallbacksSetsQueue) !void {
+    const timer_wheel = &self.timer_wheel;
+    if (timer_wheel.len == 0) return;
+
+    try timer_wheel.expire(self.allocator, try get_current_tick(), ready_queue, Loop.MaxCallbacks);
+}
@@ -6,16 +6,14 @@ const CallbackManager = @import("../../callback_manager.zig");
 const std = @import("std");
 const builtin = @import("builtin");
 
-inline fn unlock_epoll(self: *Loop) !void {
-    const data: [8]u8 = .{1} ** 8;
-    _ = try std.posix.write(self.unlock_epoll_fd, &data);
-
-    self.epoll_locked = false;
+inline fn wakeup(self: *Loop) !void {
+    try Loop.Scheduling.IO.wakeup(self);
+    self.io_waiting = false;
 }
 
 pub inline fn _dispatch(self: *Loop, callback: CallbackManager.Callback) !void {
-    if (!builtin.single_threaded and self.epoll_locked) {
-        try unlock_epoll(self);
+    if (!builtin.single_threaded and self.io_waiting) {
+        try wakeup(self);
     }
 
     const ready_queue = &self.ready_tasks_queues[self.ready_tasks_queue_index];
@@ -23,12 +21,139 @@ pub inline fn _dispatch(self: *Loop, callback: CallbackManager.Callback) !void {
 }
 
 pub inline fn _dispatch_threadsafe(self: *Loop, callback: CallbackManager.Callback) !void {
+    // Other threads don't wait for the loop's mutex, their callbacks go through the inbox instead
+    if (self.inbox.is_foreign_thread()) {
+        return try self.inbox.push(self, callback);
+    }
+
     const mutex = &self.mutex;
     mutex.lock();
     defer mutex.unlock();
 
-
     try _dispatch(self, callback);
 }
 
 pub const dispatch = if (builtin.single_threaded) _dispatch else _dispatch_threadsafe;
+
+// Lock-free multi-producer queue for callbacks coming from threads other than the one running the loop.
+// Producers push onto a stack with a single CAS and the loop takes the whole stack once per iteration.
+// A sleeping loop is woken up by writing to an eventfd, which is polled on the ring, once per sleep.
+pub const Inbox = struct {
+    const Node = struct {
+        callback: CallbackManager.Callback,
+        next: ?*Node
+    };
+
+    head: ?*Node = null,
+    // Thread running the loop, 0 while it isn't running
+    owner: std.Thread.Id = 0,
+    wakeup_fd: std.posix.fd_t = -1,
+    wakeup_pending: bool = false,
+
+    pub fn init(self: *Inbox) !void {
+        self.* = .{};
+        if (builtin.single_threaded) return;
+
+        self.wakeup_fd = try std.posix.eventfd(0, std.os.linux.EFD.CLOEXEC | std.os.linux.EFD.NONBLOCK);
+    }
+
+    pub fn deinit(self: *Inbox) void {
+        if (self.wakeup_fd >= 0) {
+            std.posix.close(self.wakeup_fd);
+            self.wakeup_fd = -1;
+        }
+    }
+
+    pub fn arm(self: *Inbox, set: *Loop.Scheduling.IO.BlockingTasksSet) !void {
+        if (builtin.single_threaded) return;
+
+        const sqe = try set.push_untracked();
+        sqe.prep_poll_add(self.wakeup_fd, std.os.linux.POLL.IN);
+        sqe.len = std.os.linux.IORING_POLL_ADD_MULTI;
+        sqe.user_data = Loop.Scheduling.IO.WakeupUserData;
+    }
+
+    // Called by the loop, with its mutex held, for every completion of the eventfd poll
+    pub fn wakeup_completed(self: *Inbox, set: *Loop.Scheduling.IO.BlockingTasksSet, io_uring_flags: u32) !void {
+        var value: u64 = undefined;
+        _ = std.os.linux.read(self.wakeup_fd, std.mem.asBytes(&value), @sizeOf(u64));
+
+        if ((io_uring_flags & std.os.linux.IORING_CQE_F_MORE) == 0) {
+            try self.arm(set);
+        }
+    }
+
+    pub inline fn set_owner(self: *Inbox, owner: std.Thread.Id) void {
+        @atomicStore(std.Thread.Id, &self.owner, owner, .release);
+    }
+
+    // While the loop isn't running, its mutex isn't contended, and keeping the order of the callbacks
+    // dispatched before it starts matters more
+    pub inline fn is_foreign_thread(self: *Inbox) bool {
+        const owner = @atomicLoad(std.Thread.Id, &self.owner, .acquire);
+        return owner != 0 and owner != std.Thread.getCurrentId();
+    }
+
+    pub inline fn is_empty(self: *Inbox) bool {
+        return @atomicLoad(?*Node, &self.head, .seq_cst) == null;
+    }
+
+    fn push_node(self: *Inbox, node: *Node) void {
+        var head = @atomicLoad(?*Node, &self.head, .monotonic);
+        while (true) {
+            node.next = head;
+            head = @cmpxchgWeak(?*Node, &self.head, head, node, .seq_cst, .monotonic) orelse return;
+        }
+    }
+
+    pub fn push(self: *Inbox, loop: *Loop, callback: CallbackManager.Callback) !void {
+        const node = try loop.allocator.create(Node);
+        node.* = .{ .callback = callback, .next = null };
+        self.push_node(node);
+
+        // Pairs with the loop publishing io_waiting before it checks the inbox for the last time.
+        // Only the first producer that finds the loop sleeping pays for the syscall.
+        if (
+            @atomicLoad(bool, &loop.io_waiting, .seq_cst) and
+            !@atomicRmw(bool, &self.wakeup_pending, .Xchg, true, .seq_cst)
+        ) {
+            const value: u64 = 1;
+            _ = std.os.linux.write(self.wakeup_fd, std.mem.asBytes(&value), @sizeOf(u64));
+        }
+    }
+
+    pub inline fn reset_wakeup(self: *Inbox) void {
+        @atomicStore(bool, &self.wakeup_pending, false, .seq_cst);
+    }
+
+    // Moves every pushed callback to the ready queue, in the order they were pushed
+    pub fn drain(self: *Inbox, loop: *Loop, ready_queue: *CallbackManager.CallbacksSetsQueue) !void {
+        if (self.is_empty()) return;
+
+        var node = @atomicRmw(?*Node, &self.head, .Xchg, null, .acquire);
+        var reversed: ?*Node = null;
+        while (node) |n| {
+            node = n.next;
+            n.next = reversed;
+            reversed = n;
+        }
+
+        const allocator = loop.allocator;
+        while (reversed) |n| {
+            _ = CallbackManager.append_new_callback(
+                allocator, ready_queue, n.callback, Loop.MaxCallbacks
+            ) catch |err| {
+                // Whatever is left is given back, it's taken again on the next iteration
+                var pending: ?*Node = n;
+                while (pending) |p| {
+                    pending = p.next;
+                    self.push_node(p);
+                }
+                return err;
+            };
+
+            reversed = n.next;
+            allocator.destroy(n);
+        }
+    }
+};
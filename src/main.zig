@@ -7,3 +7,4 @@ pub const Task = @import("task/main.zig");
 pub const Loop = @import("loop/main.zig");
 pub const Handle = @import("handle.zig");
 pub const TimerHandle = @import("timer_handle.zig");
+pub const Transports = @import("transports/main.zig");
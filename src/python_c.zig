@@ -15,6 +15,19 @@ pub inline fn type_check(obj: *Python.PyObject, @"type": *Python.PyTypeObject) b
     return is_type(obj, @"type") or Python.PyType_IsSubtype(get_type(obj), @"type") != 0;
 }
 
+// PyThreadState can't be translated from the headers, it's only handled as an opaque pointer
+pub const ThreadState = opaque {};
+extern fn PyEval_SaveThread() callconv(.C) *ThreadState;
+extern fn PyEval_RestoreThread(thread_state: *ThreadState) callconv(.C) void;
+
+pub inline fn release_gil() *ThreadState {
+    return PyEval_SaveThread();
+}
+
+pub inline fn acquire_gil(thread_state: *ThreadState) void {
+    PyEval_RestoreThread(thread_state);
+}
+
 pub inline fn get_py_true() *Python.PyObject {
     const py_true_struct: *Python.PyObject = @ptrCast(&Python._Py_TrueStruct);
     Python.py_incref(py_true_struct);
@@ -120,15 +120,70 @@ inline fn cancel_future_object(
     return .Continue;
 }
 
+inline fn get_wakeup_callback(task: *Task.PythonTaskObject) ?PyObject {
+    if (task.wakeup_callback) |callback| {
+        return callback;
+    }
+
+    const callback: PyObject = python_c.PyCFunction_New(
+        @constCast(&LeviathanPyTaskWakeupMethod), @ptrCast(task)
+    ) orelse return null;
+    task.wakeup_callback = callback;
+    return callback;
+}
+
+inline fn is_stdlib_future(py_loop: *Loop.Python.LoopObject, future: PyObject) bool {
+    return py_loop.stdlib_futures_fast_path and (
+        python_c.is_type(future, @ptrCast(py_loop.asyncio_future_type.?)) or
+        python_c.is_type(future, @ptrCast(py_loop.asyncio_task_type.?))
+    );
+}
+
+inline fn get_asyncio_future_blocking(
+    py_loop: *Loop.Python.LoopObject, future: PyObject, stdlib_future: bool
+) ?PyObject {
+    if (stdlib_future) {
+        const descr = py_loop.future_blocking_descr.?;
+        return python_c.get_type(descr).tp_descr_get.?(descr, future, @ptrCast(python_c.get_type(future)));
+    }
+    return python_c.PyObject_GetAttr(future, py_loop.future_blocking_str.?);
+}
+
+inline fn clear_asyncio_future_blocking(
+    py_loop: *Loop.Python.LoopObject, future: PyObject, stdlib_future: bool
+) c_int {
+    if (stdlib_future) {
+        const descr = py_loop.future_blocking_descr.?;
+        return python_c.get_type(descr).tp_descr_set.?(descr, future, @ptrCast(&python_c._Py_FalseStruct));
+    }
+    return python_c.PyObject_SetAttr(future, py_loop.future_blocking_str.?, @ptrCast(&python_c._Py_FalseStruct));
+}
+
+inline fn add_wakeup_callback(
+    py_loop: *Loop.Python.LoopObject, future: PyObject, callback: PyObject, stdlib_future: bool
+) ?PyObject {
+    const args: [2]?PyObject = .{future, callback};
+    if (stdlib_future) {
+        return python_c.PyObject_Vectorcall(py_loop.future_add_done_callback_descr.?, &args, args.len, null);
+    }
+    return python_c.PyObject_VectorcallMethod(
+        py_loop.add_done_callback_str.?, &args, args.len, null
+    );
+}
+
 inline fn handle_legacy_future_object(
     task: *Task.PythonTaskObject, future: PyObject
 ) CallbackManager.ExecuteCallbacksReturn {
-    const loop_data = utils.get_data_ptr(Loop, task.fut.py_loop.?);
+    const py_loop = task.fut.py_loop.?;
+    const loop_data = utils.get_data_ptr(Loop, py_loop);
     const allocator = loop_data.allocator;
 
-    const asyncio_future_blocking: PyObject = python_c.PyObject_GetAttrString(
-        future, "_asyncio_future_blocking\x00"
-    ) orelse return .Exception;
+    // Futures and tasks from asyncio itself skip the attribute lookups and go straight to their C type
+    const stdlib_future = is_stdlib_future(py_loop, future);
+
+    const asyncio_future_blocking: PyObject = get_asyncio_future_blocking(py_loop, future, stdlib_future)
+        orelse return .Exception;
+    defer python_c.py_decref(asyncio_future_blocking);
 
     if (!python_c.type_check(asyncio_future_blocking, &python_c.PyBool_Type)) {
         return execute_zig_function(
@@ -140,23 +195,14 @@ inline fn handle_legacy_future_object(
     }
 
     if (python_c.Py_IsTrue(asyncio_future_blocking) != 0) {
-        const add_done_callback_func: PyObject = python_c.PyObject_GetAttrString(
-            future, "add_done_callback\x00"
-        ) orelse return .Exception;
-        defer python_c.py_decref(add_done_callback_func);
-        
-        const wrapper: PyObject = python_c.PyCFunction_New(
-            @constCast(&LeviathanPyTaskWakeupMethod), @ptrCast(task)
-        ) orelse return .Exception;
-        defer python_c.py_decref(wrapper);
-
-        const ret: PyObject = python_c.PyObject_CallOneArg(add_done_callback_func, wrapper) orelse {
-            return .Exception;
-        };
+        const wakeup_callback: PyObject = get_wakeup_callback(task) orelse return .Exception;
+
+        const ret: PyObject = add_wakeup_callback(py_loop, future, wakeup_callback, stdlib_future)
+            orelse return .Exception;
         python_c.py_decref(ret);
         python_c.py_incref(@ptrCast(task));
 
-        if (python_c.PyObject_SetAttrString(future, "_asyncio_future_blocking", python_c.get_py_false()) < 0) {
+        if (clear_asyncio_future_blocking(py_loop, future, stdlib_future) < 0) {
             return .Exception;
         }
 
@@ -333,8 +379,8 @@ inline fn release_python_task_callback(task: *Task.PythonTaskObject, exc_value:
     python_c.py_xdecref(exc_value);
 }
 
-pub fn step_run_and_handle_result(
-    task: *Task.PythonTaskObject, exc_value: ?PyObject
+inline fn step(
+    task: *Task.PythonTaskObject, exc_value: ?PyObject, comptime eager_start: bool
 ) CallbackManager.ExecuteCallbacksReturn {
     var exception_value: ?PyObject = exc_value;
     defer release_python_task_callback(task, exception_value);
@@ -382,9 +428,15 @@ pub fn step_run_and_handle_result(
     const py_none = python_c.get_py_none();
     defer python_c.py_decref(py_none);
 
-    var ret: PyObject = python_c.PyObject_Vectorcall(py_loop.enter_task_func.?, &enter_task_args, enter_task_args.len, null)
-        orelse return .Exception;
-    python_c.py_decref(ret);
+    // An eager task runs its first step while the task that created it is still the current one, so it only
+    // takes its place for a while, like asyncio does
+    var ret: PyObject = python_c.PyObject_Vectorcall(
+        if (eager_start) py_loop.swap_current_task_func.? else py_loop.enter_task_func.?,
+        &enter_task_args, enter_task_args.len, null
+    ) orelse return .Exception;
+    const previous_task: ?PyObject = if (eager_start) ret else null;
+    defer python_c.py_xdecref(previous_task);
+    if (!eager_start) python_c.py_decref(ret);
 
     const new_status = blk: {
         mutex.unlock();
@@ -398,8 +450,19 @@ pub fn step_run_and_handle_result(
         var coro_ret: ?PyObject = null;
         const gen_ret: python_c.PySendResult = blk2: {
             if (exception_value) |value| {
+                // Getting a value back means the coroutine caught the exception and awaited something else
                 if (python_c.PyObject_CallOneArg(task.coro_throw.?, value)) |v| {
                     coro_ret = v;
+                    break :blk2 python_c.PYGEN_NEXT;
+                }
+
+                // Otherwise it either returned, which is reported through StopIteration, or it failed
+                if (python_c.PyErr_ExceptionMatches(python_c.PyExc_StopIteration) != 0) {
+                    const stop_iteration: PyObject = python_c.PyErr_GetRaisedException().?;
+                    defer python_c.py_decref(stop_iteration);
+
+                    coro_ret = python_c.PyObject_GetAttrString(stop_iteration, "value\x00")
+                        orelse break :blk2 python_c.PYGEN_ERROR;
                     break :blk2 python_c.PYGEN_RETURN;
                 }
                 break :blk2 python_c.PYGEN_ERROR;
@@ -415,6 +478,7 @@ pub fn step_run_and_handle_result(
 
         switch (gen_ret) {
             python_c.PYGEN_RETURN => {
+                defer python_c.py_decref(coro_ret.?);
                 if (task.must_cancel) {
                     if (!Future.Python.Cancel.future_fast_cancel(&task.fut, task.fut.cancel_msg_py_object)) {
                         break :blk .Exception;
@@ -437,13 +501,39 @@ pub fn step_run_and_handle_result(
         }
     };
 
-    ret = python_c.PyObject_Vectorcall(py_loop.leave_task_func.?, &enter_task_args, enter_task_args.len, null)
-        orelse return .Exception;
+    // The wakeup callback holds a reference to the task, it's not needed anymore once the task is done
+    if (future_data.status != .PENDING) {
+        python_c.py_decref_and_set_null(&task.wakeup_callback);
+    }
+
+    if (eager_start) {
+        const swap_task_args: [2]?PyObject = .{
+            @ptrCast(py_loop), previous_task
+        };
+        ret = python_c.PyObject_Vectorcall(py_loop.swap_current_task_func.?, &swap_task_args, swap_task_args.len, null)
+            orelse return .Exception;
+    }else{
+        ret = python_c.PyObject_Vectorcall(py_loop.leave_task_func.?, &enter_task_args, enter_task_args.len, null)
+            orelse return .Exception;
+    }
     python_c.py_decref(ret);
 
     return new_status;
 }
 
+pub fn step_run_and_handle_result(
+    task: *Task.PythonTaskObject, exc_value: ?PyObject
+) CallbackManager.ExecuteCallbacksReturn {
+    return step(task, exc_value, false);
+}
+
+// First step of a task created with eager_start, run straight from the constructor instead of the ready queue.
+// If the coroutine suspends, the task goes on like any other one.
+pub fn eager_step(task: *Task.PythonTaskObject) CallbackManager.ExecuteCallbacksReturn {
+    python_c.py_incref(@ptrCast(task));
+    return step(task, null, true);
+}
+
 fn wakeup_task(
     data: ?*anyopaque, status: CallbackManager.ExecuteCallbacksReturn
 ) CallbackManager.ExecuteCallbacksReturn {
@@ -470,11 +560,10 @@ fn wakeup_task(
         }
     }else{
         // Third party future
-        const get_result_func: PyObject = python_c.PyObject_GetAttrString(py_future, "result\x00")
-            orelse return .Exception;
-        defer python_c.py_decref(get_result_func);
-
-        const ret: ?PyObject = python_c.PyObject_CallNoArgs(get_result_func);
+        const result_args: [1]?PyObject = .{py_future};
+        const ret: ?PyObject = python_c.PyObject_VectorcallMethod(
+            task.fut.py_loop.?.result_str.?, &result_args, result_args.len, null
+        );
         if (ret) |result| {
             python_c.py_decref(result);
         }else{
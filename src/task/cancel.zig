@@ -7,16 +7,50 @@ const Future = @import("../future/main.zig");
 const Task = @import("main.zig");
 const PythonTaskObject = Task.PythonTaskObject;
 
-pub fn task_cancel(self: ?*PythonTaskObject, args: ?PyObject, kwargs: ?PyObject) callconv(.C) ?PyObject {
-    const instance = self.?;
+inline fn cancel_fut_waiter(fut_waiter: PyObject, cancel_msg_py_object: ?PyObject) !bool {
+    if (python_c.is_type(fut_waiter, &Future.Python.FutureType)) {
+        const leviathan_fut: *Future.Python.FutureObject = @ptrCast(fut_waiter);
+        const future_data = utils.get_data_ptr(Future, leviathan_fut);
+        const mutex = &future_data.mutex;
+        mutex.lock();
+        defer mutex.unlock();
+
+        if (future_data.status != .PENDING) {
+            return false;
+        }
 
+        if (!Future.Python.Cancel.future_fast_cancel(leviathan_fut, cancel_msg_py_object)) {
+            return error.PythonError;
+        }
+        return true;
+    }
+
+    const ret: PyObject = blk: {
+        if (cancel_msg_py_object) |msg| {
+            break :blk python_c.PyObject_CallMethod(fut_waiter, "cancel\x00", "O\x00", msg);
+        }
+        break :blk python_c.PyObject_CallMethod(fut_waiter, "cancel\x00", null);
+    } orelse return error.PythonError;
+    defer python_c.py_decref(ret);
+
+    return switch (python_c.PyObject_IsTrue(ret)) {
+        -1 => error.PythonError,
+        0 => false,
+        else => true
+    };
+}
+
+inline fn request_cancel(
+    instance: *PythonTaskObject, args: ?PyObject, kwargs: ?PyObject, fut_waiter: *?PyObject,
+    cancel_msg: *?PyObject
+) !bool {
     const future_data = utils.get_data_ptr(Future, &instance.fut);
     const mutex = &future_data.mutex;
     mutex.lock();
     defer mutex.unlock();
 
     switch (future_data.status) {
-        .FINISHED,.CANCELED => return python_c.get_py_false(),
+        .FINISHED,.CANCELED => return false,
         else => {}
     }
 
@@ -31,13 +65,13 @@ pub fn task_cancel(self: ?*PythonTaskObject, args: ?PyObject, kwargs: ?PyObject)
             args, kwargs, "|O:msg\x00", @ptrCast(&kwlist), &cancel_msg_py_object
         ) < 0
     ) {
-        return null;
+        return error.PythonError;
     }
 
     if (cancel_msg_py_object) |pyobj| {
         if (python_c.PyUnicode_Check(pyobj) == 0) {
             python_c.PyErr_SetString(python_c.PyExc_TypeError.?, "Cancel message must be a string\x00");
-            return null;
+            return error.PythonError;
         }
 
         python_c.py_xdecref(instance.fut.cancel_msg_py_object);
@@ -45,10 +79,48 @@ pub fn task_cancel(self: ?*PythonTaskObject, args: ?PyObject, kwargs: ?PyObject)
     }
 
     instance.cancel_requests +|= 1;
-    instance.must_cancel = true;
+
+    if (instance.fut_waiter) |waiter| {
+        fut_waiter.* = python_c.py_newref(waiter);
+        if (instance.fut.cancel_msg_py_object) |msg| {
+            cancel_msg.* = python_c.py_newref(msg);
+        }
+    }else{
+        instance.must_cancel = true;
+    }
+    return true;
+}
+
+inline fn z_task_cancel(instance: *PythonTaskObject, args: ?PyObject, kwargs: ?PyObject) !PyObject {
+    var fut_waiter: ?PyObject = null;
+    var cancel_msg_py_object: ?PyObject = null;
+    if (!try request_cancel(instance, args, kwargs, &fut_waiter, &cancel_msg_py_object)) {
+        return python_c.get_py_false();
+    }
+
+    // The task's mutex isn't held here, cancelling the awaited future may call into Python
+    if (fut_waiter) |waiter| {
+        defer python_c.py_decref(waiter);
+        defer python_c.py_xdecref(cancel_msg_py_object);
+
+        // The task is woken up with the CancelledError once the awaited future is cancelled
+        if (!try cancel_fut_waiter(waiter, cancel_msg_py_object)) {
+            const future_data = utils.get_data_ptr(Future, &instance.fut);
+            const mutex = &future_data.mutex;
+            mutex.lock();
+            defer mutex.unlock();
+
+            instance.must_cancel = true;
+        }
+    }
+
     return python_c.get_py_true();
 }
 
+pub fn task_cancel(self: ?*PythonTaskObject, args: ?PyObject, kwargs: ?PyObject) callconv(.C) ?PyObject {
+    return utils.execute_zig_function(z_task_cancel, .{self.?, args, kwargs});
+}
+
 pub fn task_uncancel(self: ?*PythonTaskObject) callconv(.C) ?PyObject {
     const instance = self.?;
     const future_data = utils.get_data_ptr(Future, &instance.fut);
@@ -21,6 +21,7 @@ inline fn task_set_initial_values(self: *PythonTaskObject) void {
     self.name = null;
 
     self.fut_waiter = null;
+    self.wakeup_callback = null;
 
     self.weakref_list = null;
 
@@ -56,11 +57,19 @@ inline fn task_init_configuration(
     self.py_context = context;
 }
 
-inline fn task_schedule_coro(self: *PythonTaskObject, loop: *LoopObject) !void {
+// Like asyncio, tasks only start eagerly while the loop is running
+pub inline fn must_start_eagerly(loop: *LoopObject, eager_start: bool) bool {
+    return eager_start and utils.get_data_ptr(Loop, loop).running;
+}
+
+inline fn task_schedule_coro(self: *PythonTaskObject, loop: *LoopObject, eager_start: bool) !void {
     const ret: PyObject = python_c.PyObject_CallOneArg(loop.register_task_func.?, @ptrCast(self))
         orelse return error.PythonError;
     python_c.py_decref(ret);
 
+    // Its first step runs from task_eager_start(), it only goes through the ready queue if it suspends
+    if (must_start_eagerly(loop, eager_start)) return;
+
     const loop_data = utils.get_data_ptr(Loop, loop);
 
     const callback: CallbackManager.Callback = .{
@@ -73,20 +82,44 @@ inline fn task_schedule_coro(self: *PythonTaskObject, loop: *LoopObject) !void {
     python_c.py_incref(@ptrCast(self));
 }
 
+// Runs the first step of a task created with eager_start. It's kept apart from the constructors, by now the
+// task already owns its arguments and a failure can't give them back to the caller.
+pub fn task_eager_start(self: *PythonTaskObject) !void {
+    switch (Task.Callback.eager_step(self)) {
+        .Continue => {},
+        else => return error.PythonError
+    }
+}
+
 pub inline fn fast_new_task(
     loop: *LoopObject, coro: PyObject,
-    context: PyObject, name: ?PyObject
+    context: PyObject, name: ?PyObject, eager_start: bool
 ) !*PythonTaskObject {
-    const instance: *PythonTaskObject = @ptrCast(
-        Task.PythonTaskType.tp_alloc.?(&Task.PythonTaskType, 0) orelse return error.PythonError
-    );
-    task_set_initial_values(instance);
+    const instance: *PythonTaskObject = blk: {
+        const loop_data = utils.get_data_ptr(Loop, loop);
+        if (loop_data.get_freelists()) |freelists| {
+            if (freelists.tasks.pop()) |object| {
+                Loop.Freelists.revive(object, &Task.PythonTaskType);
+
+                const py_task: *PythonTaskObject = @ptrCast(object);
+                task_set_initial_values(py_task);
+                python_c.PyObject_GC_Track(py_task);
+                break :blk py_task;
+            }
+        }
+
+        const py_task: *PythonTaskObject = @ptrCast(
+            Task.PythonTaskType.tp_alloc.?(&Task.PythonTaskType, 0) orelse return error.PythonError
+        );
+        task_set_initial_values(py_task);
+        break :blk py_task;
+    };
     errdefer python_c.py_decref(@ptrCast(instance));
 
     try task_init_configuration(instance, loop, coro, context, name);
     errdefer { instance.py_context = null; }
 
-    try task_schedule_coro(instance, loop);
+    try task_schedule_coro(instance, loop, eager_start);
 
     return instance;
 }
@@ -110,23 +143,8 @@ pub fn task_new(
     return @ptrCast(self);
 }
 
-pub fn task_clear(self: ?*PythonTaskObject) callconv(.C) c_int {
-    const py_task = self.?;
-    const fut = &py_task.fut;
-
-    const future_data = utils.get_data_ptr(Future, fut);
-    if (!future_data.released) {
-        const _result = future_data.result;
-        if (_result) |res| {
-            python_c.py_decref(@alignCast(@ptrCast(res)));
-        }
-        future_data.release();
-    }
-
-    python_c.py_decref_and_set_null(@ptrCast(&fut.py_loop));
-    python_c.py_decref_and_set_null(&fut.exception);
-    python_c.py_decref_and_set_null(&fut.exception_tb);
-    python_c.py_decref_and_set_null(&fut.cancel_msg_py_object);
+inline fn task_release_fields(py_task: *PythonTaskObject, comptime recycle: bool) void {
+    Future.Python.Constructors.future_release_fields(&py_task.fut, recycle);
 
     python_c.py_decref_and_set_null(&py_task.py_context);
     python_c.py_decref_and_set_null(&py_task.name);
@@ -135,12 +153,16 @@ pub fn task_clear(self: ?*PythonTaskObject) callconv(.C) c_int {
     python_c.py_decref_and_set_null(&py_task.coro_throw);
 
     python_c.py_decref_and_set_null(&py_task.fut_waiter);
+    python_c.py_decref_and_set_null(&py_task.wakeup_callback);
 
     if (py_task.weakref_list != null) {
         python_c.PyObject_ClearWeakRefs(@ptrCast(py_task));
         py_task.weakref_list = null;
     }
+}
 
+pub fn task_clear(self: ?*PythonTaskObject) callconv(.C) c_int {
+    task_release_fields(self.?, false);
     return 0;
 }
 
@@ -159,7 +181,9 @@ pub fn task_traverse(self: ?*PythonTaskObject, visit: python_c.visitproc, arg: ?
             instance.py_context,
             instance.name,
             instance.coro,
-            instance.coro_throw
+            instance.coro_throw,
+            instance.fut_waiter,
+            instance.wakeup_callback
         }, visit, arg
     );
 }
@@ -168,30 +192,44 @@ pub fn task_dealloc(self: ?*PythonTaskObject) callconv(.C) void {
     const instance = self.?;
 
     python_c.PyObject_GC_UnTrack(instance);
+    if (Future.Python.Constructors.must_recycle_future(&instance.fut, &Task.PythonTaskType)) {
+        // Releasing the fields can run arbitrary code, the loop has to outlive the task
+        const py_loop = python_c.py_newref(instance.fut.py_loop.?);
+        defer python_c.py_decref(@ptrCast(py_loop));
+
+        task_release_fields(instance, true);
+        if (utils.get_data_ptr(Loop, py_loop).get_freelists()) |freelists| {
+            if (freelists.tasks.push(@ptrCast(instance))) return;
+        }
+        utils.get_data_ptr(Future, &instance.fut).callbacks_arena.deinit();
+    }
+
     _ = task_clear(instance);
 
     const @"type": *python_c.PyTypeObject = @ptrCast(python_c.Py_TYPE(@ptrCast(instance)) orelse unreachable);
     @"type".tp_free.?(@ptrCast(instance));
 }
 
-inline fn z_task_init(
+inline fn z_task_init_configuration(
     self: *PythonTaskObject, args: ?PyObject, kwargs: ?PyObject
-) !c_int {
-    var kwlist: [5][*c]u8 = undefined;
+) !bool {
+    var kwlist: [6][*c]u8 = undefined;
     kwlist[0] = @constCast("coro\x00");
     kwlist[1] = @constCast("loop\x00");
     kwlist[2] = @constCast("name\x00");
     kwlist[3] = @constCast("context\x00");
-    kwlist[4] = null;
+    kwlist[4] = @constCast("eager_start\x00");
+    kwlist[5] = null;
 
     var coro: ?PyObject = null;
     var py_loop: ?PyObject = null;
     var name: ?PyObject = null;
     var context: ?PyObject = null;
+    var eager_start: c_int = 0;
 
     if (python_c.PyArg_ParseTupleAndKeywords(
-            args, kwargs, "OO|$OO\x00", @ptrCast(&kwlist), &coro, &py_loop,
-            &name, &context
+            args, kwargs, "OO|$OOp\x00", @ptrCast(&kwlist), &coro, &py_loop,
+            &name, &context, &eager_start
         ) < 0) {
         return error.PythonError;
     }
@@ -238,7 +276,17 @@ inline fn z_task_init(
     try task_init_configuration(self, leviathan_loop, coro.?, context.?, name);
     errdefer { self.py_context = null; }
 
-    try task_schedule_coro(self, leviathan_loop);
+    try task_schedule_coro(self, leviathan_loop, eager_start != 0);
+    return eager_start != 0;
+}
+
+inline fn z_task_init(
+    self: *PythonTaskObject, args: ?PyObject, kwargs: ?PyObject
+) !c_int {
+    const eager_start = try z_task_init_configuration(self, args, kwargs);
+    if (must_start_eagerly(self.fut.py_loop.?, eager_start)) {
+        try task_eager_start(self);
+    }
 
     return 0;
 }
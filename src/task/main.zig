@@ -117,6 +117,8 @@ pub const PythonTaskObject = extern struct {
     coro_throw: ?PyObject,
 
     fut_waiter: ?PyObject,
+    // Callable given to foreign futures to wake the task up, created once and kept until the task is done
+    wakeup_callback: ?PyObject,
 
     weakref_list: ?PyObject,
 
@@ -5,21 +5,29 @@ const python_c = @import("python_c");
 const PyObject = *python_c.PyObject;
 
 const Handle = @import("handle.zig");
+const Loop = @import("loop/main.zig");
 const utils = @import("utils/utils.zig");
 
 
 pub const PythonTimerHandleObject = extern struct {
     handle: Handle.PythonHandleObject,
-    when: std.posix.timespec
+    when: std.posix.timespec,
+    loop_data: ?*Loop,
+    timer_node: ?Loop.Scheduling.Later.TimersLinkedList.Node
 };
 
-pub inline fn fast_new_timer_handle(time: std.posix.timespec, contextvars: PyObject) !*PythonTimerHandleObject {
-    const instance: *PythonTimerHandleObject = @ptrCast(
-        PythonTimerHandleType.tp_alloc.?(&PythonTimerHandleType, 0) orelse return error.PythonError
+pub inline fn fast_new_timer_handle(
+    time: std.posix.timespec, contextvars: PyObject, loop_data: *Loop
+) !*PythonTimerHandleObject {
+    const instance = try Handle.alloc_handle(
+        PythonTimerHandleObject, &PythonTimerHandleType, "timer_handles", loop_data
     );
     instance.handle.contextvars = contextvars;
+    instance.handle.freelists = loop_data.get_freelists();
     instance.handle.cancelled = false;
     instance.when = time;
+    instance.loop_data = null;
+    instance.timer_node = null;
 
     return instance;
 }
@@ -69,7 +77,36 @@ pub fn timer_handle_when(self: ?*PythonTimerHandleObject, _: ?PyObject) callconv
     return python_c.PyFloat_FromDouble(when);
 }
 
+fn timer_handle_cancel(self: ?*PythonTimerHandleObject, _: ?PyObject) callconv(.C) ?PyObject {
+    const instance = self.?;
+    @atomicStore(bool, &instance.handle.cancelled, true, .monotonic);
+
+    // A pending node implies the loop is still alive, it clears every node before being released
+    if (instance.timer_node == null) {
+        return python_c.get_py_none();
+    }
+
+    const loop_data = instance.loop_data.?;
+    const callback = blk: {
+        const mutex = &loop_data.mutex;
+        mutex.lock();
+        defer mutex.unlock();
+
+        const node = instance.timer_node orelse return python_c.get_py_none();
+        break :blk Loop.Scheduling.Later.remove(loop_data, node);
+    };
+
+    Handle.release_python_generic_callback(loop_data.allocator, callback.PythonGeneric);
+    return python_c.get_py_none();
+}
+
 const PythonTimerHandleMethods: []const python_c.PyMethodDef = &[_]python_c.PyMethodDef{
+    python_c.PyMethodDef{
+        .ml_name = "cancel\x00",
+        .ml_meth = @ptrCast(&timer_handle_cancel),
+        .ml_doc = "Cancel the callback and release it from the loop's timers right away.\x00",
+        .ml_flags = python_c.METH_NOARGS
+    },
     python_c.PyMethodDef{
         .ml_name = "when\x00",
         .ml_meth = @ptrCast(&timer_handle_when),
@@ -0,0 +1 @@
+pub const Stream = @import("stream/main.zig");
@@ -0,0 +1,125 @@
+const std = @import("std");
+
+const Loop = @import("../../loop/main.zig");
+const IO = Loop.Scheduling.IO;
+
+pub const DefaultHighWaterMark = 64 * 1024;
+
+// Capacity kept by the write buffers once they are drained
+const MaxIdleBufferCapacity = 1024 * 1024;
+
+const Buffer = std.ArrayListUnmanaged(u8);
+
+loop: *Loop,
+fd: std.posix.fd_t,
+
+// Streaming protocols use a multishot recv, what's received while reading is paused is kept here
+held_data: Buffer = .{},
+held_eof: bool = false,
+read_task_id: ?IO.BlockingTaskId = null,
+read_multishot: bool = false,
+reading: bool = true,
+
+// Buffered protocols receive straight into get_buffer() memory
+buffered_protocol: bool = false,
+protocol_buffer_len: usize = 0,
+protocol_buffer_acquired: bool = false,
+// The protocol that provided the buffer has been replaced since
+protocol_buffer_orphaned: bool = false,
+
+// New data is coalesced into write_buffer while sending_buffer is in flight
+write_buffer: Buffer = .{},
+sending_buffer: Buffer = .{},
+sent: usize = 0,
+write_task_id: ?IO.BlockingTaskId = null,
+
+high_water_mark: usize = DefaultHighWaterMark,
+low_water_mark: usize = DefaultHighWaterMark / 4,
+protocol_paused: bool = false,
+
+eof_requested: bool = false,
+closing: bool = false,
+closed: bool = false,
+
+initialized: bool = false,
+
+const StreamTransport = @This();
+
+pub fn init(self: *StreamTransport, loop: *Loop, fd: std.posix.fd_t) !void {
+    if (self.initialized) {
+        @panic("Transport is already initialized");
+    }
+
+    self.* = .{
+        .loop = loop,
+        .fd = fd,
+        .initialized = true
+    };
+}
+
+pub fn release(self: *StreamTransport) void {
+    if (!self.initialized) return;
+
+    const allocator = self.loop.allocator;
+    self.held_data.deinit(allocator);
+    self.write_buffer.deinit(allocator);
+    self.sending_buffer.deinit(allocator);
+
+    self.initialized = false;
+}
+
+pub inline fn has_pending_data(self: *const StreamTransport) bool {
+    return self.protocol_buffer_len > 0 or self.held_data.items.len > 0 or self.held_eof;
+}
+
+pub inline fn hold_data(self: *StreamTransport, data: []const u8) !void {
+    try self.held_data.appendSlice(self.loop.allocator, data);
+}
+
+pub inline fn get_write_buffer_size(self: *const StreamTransport) usize {
+    return (self.sending_buffer.items.len - self.sent) + self.write_buffer.items.len;
+}
+
+pub inline fn append_write_data(self: *StreamTransport, data: []const u8) !void {
+    try self.write_buffer.appendSlice(self.loop.allocator, data);
+}
+
+pub inline fn discard_written_data(self: *StreamTransport, nbytes: usize) void {
+    const write_buffer = &self.write_buffer;
+    const remaining = write_buffer.items.len - nbytes;
+    std.mem.copyForwards(u8, write_buffer.items[0..remaining], write_buffer.items[nbytes..]);
+    write_buffer.shrinkRetainingCapacity(remaining);
+}
+
+// Returns the data that must be sent next, null if everything has been written
+pub fn get_data_to_send(self: *StreamTransport) ?[]const u8 {
+    const sending_buffer = &self.sending_buffer;
+    if (self.sent < sending_buffer.items.len) {
+        return sending_buffer.items[self.sent..];
+    }
+
+    sending_buffer.clearRetainingCapacity();
+    self.sent = 0;
+
+    std.mem.swap(Buffer, sending_buffer, &self.write_buffer);
+    if (sending_buffer.items.len > 0) {
+        return sending_buffer.items;
+    }
+
+    const allocator = self.loop.allocator;
+    inline for (.{sending_buffer, &self.write_buffer}) |buffer| {
+        if (buffer.capacity > MaxIdleBufferCapacity) {
+            buffer.clearAndFree(allocator);
+        }
+    }
+    return null;
+}
+
+pub fn clear_write_buffers(self: *StreamTransport) void {
+    self.write_buffer.clearRetainingCapacity();
+
+    // The in-flight data must outlive the send operation, it's just marked as consumed
+    self.sent = self.sending_buffer.items.len;
+}
+
+pub const Python = @import("python/main.zig");
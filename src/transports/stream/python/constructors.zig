@@ -0,0 +1,151 @@
+const python_c = @import("python_c");
+const PyObject = *python_c.PyObject;
+
+const utils = @import("../../../utils/utils.zig");
+
+const StreamTransport = @import("../main.zig");
+const Handle = @import("../../../handle.zig");
+const Loop = @import("../../../loop/main.zig");
+
+const Control = @import("control.zig");
+const Read = @import("read.zig");
+
+const LoopObject = Loop.Python.LoopObject;
+const StreamTransportObject = StreamTransport.Python.StreamTransportObject;
+
+inline fn z_transport_init(
+    self: *StreamTransportObject, args: ?PyObject, kwargs: ?PyObject
+) !c_int {
+    var kwlist: [6][*c]u8 = undefined;
+    kwlist[0] = @constCast("sock\x00");
+    kwlist[1] = @constCast("protocol\x00");
+    kwlist[2] = @constCast("loop\x00");
+    kwlist[3] = @constCast("extra\x00");
+    kwlist[4] = @constCast("server\x00");
+    kwlist[5] = null;
+
+    var py_socket: ?PyObject = null;
+    var py_protocol: ?PyObject = null;
+    var py_loop: ?PyObject = null;
+    var py_extra: ?PyObject = null;
+    var py_server: ?PyObject = null;
+
+    if (python_c.PyArg_ParseTupleAndKeywords(
+            args, kwargs, "OOO|OO\x00", @ptrCast(&kwlist), &py_socket, &py_protocol, &py_loop,
+            &py_extra, &py_server
+    ) < 0) {
+        return error.PythonError;
+    }
+
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    if (transport_data.initialized) {
+        utils.put_python_runtime_error_message("Transport is already initialized\x00");
+        return error.PythonError;
+    }
+
+    const leviathan_loop: *LoopObject = @ptrCast(py_loop.?);
+    if (!python_c.type_check(@ptrCast(leviathan_loop), &Loop.Python.LoopType)) {
+        python_c.PyErr_SetString(
+            python_c.PyExc_TypeError, "Invalid asyncio event loop. Only Leviathan's event loops are allowed\x00"
+        );
+        return error.PythonError;
+    }
+
+    const fd = python_c.PyObject_AsFileDescriptor(py_socket.?);
+    if (fd < 0) {
+        return error.PythonError;
+    }
+
+    const context: PyObject = python_c.PyContext_CopyCurrent()
+        orelse return error.PythonError;
+    self.py_handle = Handle.fast_new_handle(context, utils.get_data_ptr(Loop, leviathan_loop)) catch |err| {
+        python_c.py_decref(context);
+        return err;
+    };
+
+    self.py_loop = python_c.py_newref(leviathan_loop);
+    self.py_socket = python_c.py_newref(py_socket.?);
+    if (py_extra) |extra| {
+        if (!python_c.is_none(extra)) {
+            self.py_extra = python_c.py_newref(extra);
+        }
+    }
+    if (py_server) |server| {
+        if (!python_c.is_none(server)) {
+            self.py_server = python_c.py_newref(server);
+        }
+    }
+
+    try transport_data.init(utils.get_data_ptr(Loop, leviathan_loop), fd);
+    try Control.set_protocol(self, py_protocol.?);
+    try Read.schedule_reading(self);
+
+    return 0;
+}
+
+pub fn transport_init(
+    self: ?*StreamTransportObject, args: ?PyObject, kwargs: ?PyObject
+) callconv(.C) c_int {
+    return utils.execute_zig_function(z_transport_init, .{self.?, args, kwargs});
+}
+
+pub fn transport_clear(self: ?*StreamTransportObject) callconv(.C) c_int {
+    const py_transport = self.?;
+
+    python_c.py_decref_and_set_null(@ptrCast(&py_transport.py_handle));
+    python_c.py_decref_and_set_null(&py_transport.py_socket);
+    python_c.py_decref_and_set_null(&py_transport.py_extra);
+    python_c.py_decref_and_set_null(&py_transport.py_server);
+    python_c.py_decref_and_set_null(&py_transport.exception);
+    python_c.py_decref_and_set_null(@ptrCast(&py_transport.py_empty_waiter));
+
+    Control.clear_protocol(py_transport);
+    Read.release_protocol_buffer(py_transport);
+
+    if (py_transport.weakref_list != null) {
+        python_c.PyObject_ClearWeakRefs(@ptrCast(py_transport));
+        py_transport.weakref_list = null;
+    }
+
+    return 0;
+}
+
+pub fn transport_traverse(
+    self: ?*StreamTransportObject, visit: python_c.visitproc, arg: ?*anyopaque
+) callconv(.C) c_int {
+    const instance = self.?;
+    return python_c.py_visit(
+        &[_]?*python_c.PyObject{
+            @ptrCast(instance.py_loop),
+            @ptrCast(instance.py_handle),
+            instance.py_socket,
+            instance.py_extra,
+            instance.py_server,
+            instance.exception,
+            instance.protocol,
+            instance.protocol_data_received,
+            instance.protocol_get_buffer,
+            instance.protocol_buffer_updated,
+            instance.protocol_eof_received,
+            instance.protocol_connection_lost,
+            instance.protocol_pause_writing,
+            instance.protocol_resume_writing,
+            @ptrCast(instance.protocol_buffer.obj),
+            @ptrCast(instance.py_empty_waiter),
+        }, visit, arg
+    );
+}
+
+pub fn transport_dealloc(self: ?*StreamTransportObject) callconv(.C) void {
+    const instance = self.?;
+
+    python_c.PyObject_GC_UnTrack(instance);
+    _ = transport_clear(instance);
+
+    // In-flight operations hold a reference, nothing can be using the buffers at this point
+    utils.get_data_ptr(StreamTransport, instance).release();
+    python_c.py_decref_and_set_null(@ptrCast(&instance.py_loop));
+
+    const @"type": *python_c.PyTypeObject = @ptrCast(python_c.Py_TYPE(@ptrCast(instance)) orelse unreachable);
+    @"type".tp_free.?(@ptrCast(instance));
+}
@@ -0,0 +1,376 @@
+const python_c = @import("python_c");
+const PyObject = *python_c.PyObject;
+
+const utils = @import("../../../utils/utils.zig");
+
+const CallbackManager = @import("../../../callback_manager.zig");
+const StreamTransport = @import("../main.zig");
+const Loop = @import("../../../loop/main.zig");
+
+const Read = @import("read.zig");
+const Write = @import("write.zig");
+
+const StreamTransportObject = StreamTransport.Python.StreamTransportObject;
+
+const IO = Loop.Scheduling.IO;
+
+const std = @import("std");
+
+const ProtocolMethods = .{
+    .{"protocol_eof_received", "eof_received\x00"},
+    .{"protocol_connection_lost", "connection_lost\x00"},
+    .{"protocol_pause_writing", "pause_writing\x00"},
+    .{"protocol_resume_writing", "resume_writing\x00"},
+};
+
+const StreamingProtocolMethods = .{
+    .{"protocol_data_received", "data_received\x00"},
+};
+
+const BufferedProtocolMethods = .{
+    .{"protocol_get_buffer", "get_buffer\x00"},
+    .{"protocol_buffer_updated", "buffer_updated\x00"},
+};
+
+fn get_protocol_methods(py_protocol: PyObject, comptime methods: anytype) ![methods.len]PyObject {
+    var py_methods: [methods.len]PyObject = undefined;
+    inline for (methods, 0..) |method, index| {
+        py_methods[index] = python_c.PyObject_GetAttrString(py_protocol, method[1]) orelse {
+            for (py_methods[0..index]) |py_method| python_c.py_decref(py_method);
+            return error.PythonError;
+        };
+    }
+    return py_methods;
+}
+
+fn is_buffered_protocol(self: *StreamTransportObject, py_protocol: PyObject) !bool {
+    const buffered_protocol_class: PyObject = python_c.PyObject_GetAttrString(
+        self.py_loop.?.asyncio_module.?, "BufferedProtocol\x00"
+    ) orelse return error.PythonError;
+    defer python_c.py_decref(buffered_protocol_class);
+
+    return switch (python_c.PyObject_IsInstance(py_protocol, buffered_protocol_class)) {
+        0 => false,
+        1 => true,
+        else => error.PythonError
+    };
+}
+
+pub fn set_protocol(self: *StreamTransportObject, py_protocol: PyObject) !void {
+    const buffered = try is_buffered_protocol(self, py_protocol);
+
+    const methods = try get_protocol_methods(py_protocol, ProtocolMethods);
+    errdefer for (methods) |py_method| python_c.py_decref(py_method);
+
+    if (buffered) {
+        const buffered_methods = try get_protocol_methods(py_protocol, BufferedProtocolMethods);
+        clear_protocol(self);
+        inline for (BufferedProtocolMethods, buffered_methods) |method, py_method| {
+            @field(self, method[0]) = py_method;
+        }
+    }else{
+        const streaming_methods = try get_protocol_methods(py_protocol, StreamingProtocolMethods);
+        clear_protocol(self);
+        inline for (StreamingProtocolMethods, streaming_methods) |method, py_method| {
+            @field(self, method[0]) = py_method;
+        }
+    }
+
+    self.protocol = python_c.py_newref(py_protocol);
+    inline for (ProtocolMethods, methods) |method, py_method| {
+        @field(self, method[0]) = py_method;
+    }
+
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    transport_data.buffered_protocol = buffered;
+    if (transport_data.protocol_buffer_acquired) {
+        transport_data.protocol_buffer_orphaned = true;
+    }
+
+    // The next recv goes straight into the buffer of the new protocol
+    if (buffered) {
+        try Read.cancel_multishot_read(self);
+    }
+}
+
+pub fn clear_protocol(self: *StreamTransportObject) void {
+    python_c.py_decref_and_set_null(&self.protocol);
+    inline for (ProtocolMethods ++ StreamingProtocolMethods ++ BufferedProtocolMethods) |method| {
+        python_c.py_decref_and_set_null(&@field(self, method[0]));
+    }
+}
+
+pub fn call_protocol_method(
+    self: *StreamTransportObject, py_method: PyObject, args: []const ?PyObject,
+    comptime enter_context: bool
+) !PyObject {
+    // The protocol could be replaced while its method is running
+    const py_callback = python_c.py_newref(py_method);
+    defer python_c.py_decref(py_callback);
+
+    const py_context = self.py_handle.?.contextvars.?;
+    if (enter_context) {
+        if (python_c.PyContext_Enter(py_context) < 0) {
+            return error.PythonError;
+        }
+    }
+
+    const result: ?PyObject = python_c.PyObject_Vectorcall(py_callback, args.ptr, args.len, null);
+
+    if (enter_context) {
+        if (python_c.PyContext_Exit(py_context) < 0) {
+            python_c.py_xdecref(result);
+            return error.PythonError;
+        }
+    }
+
+    return result orelse error.PythonError;
+}
+
+pub fn call_exception_handler(self: *StreamTransportObject, exception: PyObject, message: [:0]const u8) !void {
+    const exc_message: PyObject = python_c.PyUnicode_FromString(message)
+        orelse return error.PythonError;
+    defer python_c.py_decref(exc_message);
+
+    var args: [4]?PyObject = undefined;
+    args[0] = exception;
+    args[1] = exc_message;
+    args[2] = self.protocol orelse python_c.get_py_none();
+    args[3] = @ptrCast(self);
+
+    const knames: PyObject = python_c.Py_BuildValue("(sss)\x00", "message\x00", "protocol\x00", "transport\x00")
+        orelse return error.PythonError;
+    defer python_c.py_decref(knames);
+
+    const exc_handler_ret: PyObject = python_c.PyObject_Vectorcall(
+        self.py_loop.?.exception_handler.?, &args, 1, knames
+    ) orelse return error.PythonError;
+    python_c.py_decref(exc_handler_ret);
+}
+
+pub fn fatal_error(self: *StreamTransportObject, exception: PyObject, message: [:0]const u8) !void {
+    // Same as asyncio, connection errors aren't worth logging
+    if (python_c.PyErr_GivenExceptionMatches(exception, python_c.PyExc_OSError) == 0) {
+        try call_exception_handler(self, exception, message);
+    }
+
+    try force_close(self, exception);
+}
+
+pub fn handle_error(
+    self: *StreamTransportObject, err: anyerror, message: [:0]const u8
+) CallbackManager.ExecuteCallbacksReturn {
+    if (err != error.PythonError) {
+        const err_trace = @errorReturnTrace();
+        utils.print_error_traces(err_trace, err);
+
+        utils.put_python_runtime_error_message(@errorName(err));
+    }
+
+    if (
+        python_c.PyErr_ExceptionMatches(python_c.PyExc_SystemExit) > 0 or
+        python_c.PyErr_ExceptionMatches(python_c.PyExc_KeyboardInterrupt) > 0
+    ) {
+        return .Exception;
+    }
+
+    const exception: PyObject = python_c.PyErr_GetRaisedException()
+        orelse return .Exception;
+    defer python_c.py_decref(exception);
+
+    fatal_error(self, exception, message) catch return .Exception;
+    return .Continue;
+}
+
+pub fn handle_errno(
+    self: *StreamTransportObject, errno: std.posix.E, message: [:0]const u8
+) CallbackManager.ExecuteCallbacksReturn {
+    const exception: PyObject = utils.create_python_os_error(errno)
+        orelse return handle_error(self, error.PythonError, message);
+    defer python_c.py_decref(exception);
+
+    fatal_error(self, exception, message) catch |err| {
+        return handle_error(self, err, message);
+    };
+    return .Continue;
+}
+
+pub fn cancel_operations(self: *StreamTransportObject) !void {
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    const loop = transport_data.loop;
+
+    const mutex = &loop.mutex;
+    mutex.lock();
+    defer mutex.unlock();
+
+    if (!loop.initialized) return;
+
+    if (transport_data.read_task_id) |task_id| {
+        try IO.cancel(loop, task_id);
+    }
+
+    if (transport_data.closed) {
+        if (transport_data.write_task_id) |task_id| {
+            try IO.cancel(loop, task_id);
+        }
+    }
+}
+
+fn connection_lost_callback(
+    data: ?*anyopaque, status: CallbackManager.ExecuteCallbacksReturn
+) CallbackManager.ExecuteCallbacksReturn {
+    const self: *StreamTransportObject = @alignCast(@ptrCast(data.?));
+    defer python_c.py_decref(@ptrCast(self));
+
+    var ret: CallbackManager.ExecuteCallbacksReturn = status;
+    if (status == .Continue) {
+        const py_handle = self.py_handle.?;
+        var args: [1]PyObject = .{self.exception orelse python_c.get_py_none()};
+        ret = CallbackManager.run_callback(utils.get_data_ptr(StreamTransport, self).loop.allocator, .{
+            .PythonGeneric = .{
+                .args = &args,
+                .exception_handler = self.py_loop.?.exception_handler.?,
+                .py_callback = self.protocol_connection_lost.?,
+                .py_context = py_handle.contextvars.?,
+                .py_handle = py_handle,
+                .cancelled = &py_handle.cancelled,
+                .can_release = false
+            }
+        }, .Continue);
+    }
+
+    if (self.py_socket) |py_socket| {
+        if (python_c.PyObject_CallMethod(py_socket, "close\x00", null)) |close_ret| {
+            python_c.py_decref(close_ret);
+        }else{
+            return .Exception;
+        }
+    }
+
+    if (self.py_server) |py_server| {
+        if (python_c.PyObject_CallMethod(py_server, "_detach\x00", "O\x00", self)) |detach_ret| {
+            python_c.py_decref(detach_ret);
+        }else{
+            return .Exception;
+        }
+    }
+
+    Write.fail_empty_waiter(self) catch return .Exception;
+
+    // An in-flight recv releases the buffer once it completes
+    if (utils.get_data_ptr(StreamTransport, self).read_task_id == null) {
+        Read.release_protocol_buffer(self);
+    }
+
+    // Protocols usually keep a reference to their transport
+    python_c.py_decref_and_set_null(&self.py_server);
+    python_c.py_decref_and_set_null(&self.exception);
+    clear_protocol(self);
+
+    return ret;
+}
+
+fn schedule_connection_lost(self: *StreamTransportObject, exception: ?PyObject) !void {
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    transport_data.closed = true;
+
+    self.exception = if (exception) |exc| python_c.py_newref(exc) else null;
+    try Loop.Scheduling.Soon.dispatch(transport_data.loop, .{
+        .ZigGeneric = .{
+            .callback = &connection_lost_callback,
+            .data = self
+        }
+    });
+    python_c.py_incref(@ptrCast(self));
+}
+
+pub fn force_close(self: *StreamTransportObject, exception: ?PyObject) !void {
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    if (transport_data.closed) return;
+
+    transport_data.closing = true;
+    transport_data.clear_write_buffers();
+
+    try schedule_connection_lost(self, exception);
+    try cancel_operations(self);
+}
+
+pub fn close(self: *StreamTransportObject) !void {
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    if (transport_data.closing) return;
+
+    transport_data.closing = true;
+    if (transport_data.write_task_id == null) {
+        try schedule_connection_lost(self, null);
+    }
+    try cancel_operations(self);
+}
+
+// Called once all the buffered data has been written
+pub inline fn finish_closing(self: *StreamTransportObject) !void {
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    if (transport_data.closing and !transport_data.closed) {
+        try schedule_connection_lost(self, null);
+    }
+}
+
+inline fn z_transport_close(self: *StreamTransportObject) !PyObject {
+    try close(self);
+    return python_c.get_py_none();
+}
+
+pub fn transport_close(self: ?*StreamTransportObject) callconv(.C) ?PyObject {
+    return utils.execute_zig_function(z_transport_close, .{self.?});
+}
+
+inline fn z_transport_abort(self: *StreamTransportObject) !PyObject {
+    try force_close(self, null);
+    return python_c.get_py_none();
+}
+
+pub fn transport_abort(self: ?*StreamTransportObject) callconv(.C) ?PyObject {
+    return utils.execute_zig_function(z_transport_abort, .{self.?});
+}
+
+pub fn transport_is_closing(self: ?*StreamTransportObject) callconv(.C) ?PyObject {
+    const transport_data = utils.get_data_ptr(StreamTransport, self.?);
+    return python_c.PyBool_FromLong(@intCast(@intFromBool(transport_data.closing)));
+}
+
+inline fn z_transport_get_extra_info(self: *StreamTransportObject, args: []?PyObject) !PyObject {
+    if (args.len < 1 or args.len > 2) {
+        utils.put_python_runtime_error_message("Invalid number of arguments\x00");
+        return error.PythonError;
+    }
+
+    const default_value: PyObject = if (args.len == 2) args[1].? else python_c.get_py_none();
+    const py_extra = self.py_extra orelse return python_c.py_newref(default_value);
+
+    var value: ?PyObject = null;
+    if (python_c.PyDict_GetItemRef(py_extra, args[0].?, &value) < 0) {
+        return error.PythonError;
+    }
+
+    return value orelse python_c.py_newref(default_value);
+}
+
+pub fn transport_get_extra_info(
+    self: ?*StreamTransportObject, args: ?[*]?PyObject, nargs: isize
+) callconv(.C) ?PyObject {
+    return utils.execute_zig_function(z_transport_get_extra_info, .{
+        self.?, args.?[0..@as(usize, @intCast(nargs))]
+    });
+}
+
+pub fn transport_get_protocol(self: ?*StreamTransportObject) callconv(.C) ?PyObject {
+    return python_c.py_newref(self.?.protocol orelse python_c.get_py_none());
+}
+
+inline fn z_transport_set_protocol(self: *StreamTransportObject, py_protocol: PyObject) !PyObject {
+    try set_protocol(self, py_protocol);
+    return python_c.get_py_none();
+}
+
+pub fn transport_set_protocol(self: ?*StreamTransportObject, py_protocol: ?PyObject) callconv(.C) ?PyObject {
+    return utils.execute_zig_function(z_transport_set_protocol, .{self.?, py_protocol.?});
+}
@@ -0,0 +1,179 @@
+const python_c = @import("python_c");
+const PyObject = *python_c.PyObject;
+
+const StreamTransport = @import("../main.zig");
+const Handle = @import("../../../handle.zig");
+const Loop = @import("../../../loop/main.zig");
+const Future = @import("../../../future/main.zig");
+
+pub const Constructors = @import("constructors.zig");
+pub const Control = @import("control.zig");
+pub const Read = @import("read.zig");
+pub const Write = @import("write.zig");
+
+const PythonStreamTransportMethods: []const python_c.PyMethodDef = &[_]python_c.PyMethodDef{
+    // --------------------- Control ---------------------
+    python_c.PyMethodDef{
+        .ml_name = "close\x00",
+        .ml_meth = @ptrCast(&Control.transport_close),
+        .ml_doc = "Close the transport. Buffered data is flushed asynchronously.\x00",
+        .ml_flags = python_c.METH_NOARGS
+    },
+    python_c.PyMethodDef{
+        .ml_name = "abort\x00",
+        .ml_meth = @ptrCast(&Control.transport_abort),
+        .ml_doc = "Close the transport immediately, without waiting for pending operations to complete.\x00",
+        .ml_flags = python_c.METH_NOARGS
+    },
+    python_c.PyMethodDef{
+        .ml_name = "is_closing\x00",
+        .ml_meth = @ptrCast(&Control.transport_is_closing),
+        .ml_doc = "Return True if the transport is closing or is closed.\x00",
+        .ml_flags = python_c.METH_NOARGS
+    },
+    python_c.PyMethodDef{
+        .ml_name = "get_extra_info\x00",
+        .ml_meth = @ptrCast(&Control.transport_get_extra_info),
+        .ml_doc = "Return information about the transport or underlying resources it uses.\x00",
+        .ml_flags = python_c.METH_FASTCALL
+    },
+    python_c.PyMethodDef{
+        .ml_name = "get_protocol\x00",
+        .ml_meth = @ptrCast(&Control.transport_get_protocol),
+        .ml_doc = "Return the current protocol.\x00",
+        .ml_flags = python_c.METH_NOARGS
+    },
+    python_c.PyMethodDef{
+        .ml_name = "set_protocol\x00",
+        .ml_meth = @ptrCast(&Control.transport_set_protocol),
+        .ml_doc = "Set a new protocol.\x00",
+        .ml_flags = python_c.METH_O
+    },
+
+    // --------------------- Read ---------------------
+    python_c.PyMethodDef{
+        .ml_name = "is_reading\x00",
+        .ml_meth = @ptrCast(&Read.transport_is_reading),
+        .ml_doc = "Return True if the transport is receiving new data.\x00",
+        .ml_flags = python_c.METH_NOARGS
+    },
+    python_c.PyMethodDef{
+        .ml_name = "pause_reading\x00",
+        .ml_meth = @ptrCast(&Read.transport_pause_reading),
+        .ml_doc = "Pause the receiving end of the transport.\x00",
+        .ml_flags = python_c.METH_NOARGS
+    },
+    python_c.PyMethodDef{
+        .ml_name = "resume_reading\x00",
+        .ml_meth = @ptrCast(&Read.transport_resume_reading),
+        .ml_doc = "Resume the receiving end.\x00",
+        .ml_flags = python_c.METH_NOARGS
+    },
+
+    // --------------------- Write ---------------------
+    python_c.PyMethodDef{
+        .ml_name = "write\x00",
+        .ml_meth = @ptrCast(&Write.transport_write),
+        .ml_doc = "Write some data bytes to the transport.\x00",
+        .ml_flags = python_c.METH_O
+    },
+    python_c.PyMethodDef{
+        .ml_name = "writelines\x00",
+        .ml_meth = @ptrCast(&Write.transport_writelines),
+        .ml_doc = "Write a list (or any iterable) of data bytes to the transport.\x00",
+        .ml_flags = python_c.METH_O
+    },
+    python_c.PyMethodDef{
+        .ml_name = "write_eof\x00",
+        .ml_meth = @ptrCast(&Write.transport_write_eof),
+        .ml_doc = "Close the write end of the transport after flushing all buffered data.\x00",
+        .ml_flags = python_c.METH_NOARGS
+    },
+    python_c.PyMethodDef{
+        .ml_name = "can_write_eof\x00",
+        .ml_meth = @ptrCast(&Write.transport_can_write_eof),
+        .ml_doc = "Return True if the transport supports write_eof().\x00",
+        .ml_flags = python_c.METH_NOARGS
+    },
+    python_c.PyMethodDef{
+        .ml_name = "get_write_buffer_size\x00",
+        .ml_meth = @ptrCast(&Write.transport_get_write_buffer_size),
+        .ml_doc = "Return the current size of the output buffer used by the transport.\x00",
+        .ml_flags = python_c.METH_NOARGS
+    },
+    python_c.PyMethodDef{
+        .ml_name = "get_write_buffer_limits\x00",
+        .ml_meth = @ptrCast(&Write.transport_get_write_buffer_limits),
+        .ml_doc = "Get the high and low watermarks for write flow control.\x00",
+        .ml_flags = python_c.METH_NOARGS
+    },
+    python_c.PyMethodDef{
+        .ml_name = "set_write_buffer_limits\x00",
+        .ml_meth = @ptrCast(&Write.transport_set_write_buffer_limits),
+        .ml_doc = "Set the high and low watermarks for write flow control.\x00",
+        .ml_flags = python_c.METH_FASTCALL | python_c.METH_KEYWORDS
+    },
+    python_c.PyMethodDef{
+        .ml_name = "_make_empty_waiter\x00",
+        .ml_meth = @ptrCast(&Write.transport_make_empty_waiter),
+        .ml_doc = "Return a future resolved once the write buffers are empty, writing is refused until it's reset.\x00",
+        .ml_flags = python_c.METH_NOARGS
+    },
+    python_c.PyMethodDef{
+        .ml_name = "_reset_empty_waiter\x00",
+        .ml_meth = @ptrCast(&Write.transport_reset_empty_waiter),
+        .ml_doc = "Drop the future returned by _make_empty_waiter() and allow writing again.\x00",
+        .ml_flags = python_c.METH_NOARGS
+    },
+
+    // --------------------- Sentinel ---------------------
+    python_c.PyMethodDef{
+        .ml_name = null, .ml_meth = null, .ml_doc = null, .ml_flags = 0
+    }
+};
+
+pub const StreamTransportObject = extern struct {
+    ob_base: python_c.PyObject,
+    data: [@sizeOf(StreamTransport)]u8,
+
+    py_loop: ?*Loop.Python.LoopObject,
+    py_socket: ?PyObject,
+    py_extra: ?PyObject,
+    py_server: ?PyObject,
+
+    // Keeps the context where the transport was created, protocol callbacks are executed inside it
+    py_handle: ?*Handle.PythonHandleObject,
+    exception: ?PyObject,
+
+    protocol: ?PyObject,
+    protocol_data_received: ?PyObject,
+    protocol_get_buffer: ?PyObject,
+    protocol_buffer_updated: ?PyObject,
+    protocol_eof_received: ?PyObject,
+    protocol_connection_lost: ?PyObject,
+    protocol_pause_writing: ?PyObject,
+    protocol_resume_writing: ?PyObject,
+
+    // Memory returned by get_buffer(), exported until the recv completes and the data is delivered
+    protocol_buffer: python_c.Py_buffer,
+
+    // Set by sendfile(), it's resolved once everything buffered has been written. Writes are refused meanwhile
+    py_empty_waiter: ?*Future.Python.FutureObject,
+
+    weakref_list: ?PyObject,
+};
+
+pub var StreamTransportType = python_c.PyTypeObject{
+    .tp_name = "leviathan.StreamTransport\x00",
+    .tp_doc = "Leviathan's stream transport class\x00",
+    .tp_basicsize = @sizeOf(StreamTransportObject),
+    .tp_itemsize = 0,
+    .tp_flags = python_c.Py_TPFLAGS_DEFAULT | python_c.Py_TPFLAGS_BASETYPE | python_c.Py_TPFLAGS_HAVE_GC,
+    .tp_new = &python_c.PyType_GenericNew,
+    .tp_init = @ptrCast(&Constructors.transport_init),
+    .tp_traverse = @ptrCast(&Constructors.transport_traverse),
+    .tp_clear = @ptrCast(&Constructors.transport_clear),
+    .tp_dealloc = @ptrCast(&Constructors.transport_dealloc),
+    .tp_methods = @constCast(PythonStreamTransportMethods.ptr),
+    .tp_weaklistoffset = @offsetOf(StreamTransportObject, "weakref_list"),
+};
@@ -0,0 +1,471 @@
+const python_c = @import("python_c");
+const PyObject = *python_c.PyObject;
+
+const utils = @import("../../../utils/utils.zig");
+
+const CallbackManager = @import("../../../callback_manager.zig");
+const StreamTransport = @import("../main.zig");
+const Loop = @import("../../../loop/main.zig");
+
+const Control = @import("control.zig");
+
+const StreamTransportObject = StreamTransport.Python.StreamTransportObject;
+
+const IO = Loop.Scheduling.IO;
+
+const std = @import("std");
+
+const ReadErrorMessage = "Fatal read error on socket transport\x00";
+const GetBufferErrorMessage = "Fatal error: protocol.get_buffer() call failed.\x00";
+const BufferUpdatedErrorMessage = "Fatal error: protocol.buffer_updated() call failed.\x00";
+
+fn get_protocol_buffer(self: *StreamTransportObject, sizehint: isize, buffer: *python_c.Py_buffer) !void {
+    const py_sizehint: PyObject = python_c.PyLong_FromSsize_t(sizehint)
+        orelse return error.PythonError;
+    defer python_c.py_decref(py_sizehint);
+
+    const py_buffer: PyObject = try Control.call_protocol_method(
+        self, self.protocol_get_buffer.?, &.{py_sizehint}, true
+    );
+    defer python_c.py_decref(py_buffer);
+
+    if (python_c.PyObject_GetBuffer(py_buffer, buffer, python_c.PyBUF_WRITABLE) < 0) {
+        return error.PythonError;
+    }
+
+    if (buffer.len == 0) {
+        python_c.PyBuffer_Release(buffer);
+        utils.put_python_runtime_error_message("get_buffer() returned an empty buffer\x00");
+        return error.PythonError;
+    }
+}
+
+pub fn release_protocol_buffer(self: *StreamTransportObject) void {
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    if (!transport_data.protocol_buffer_acquired) return;
+
+    python_c.PyBuffer_Release(&self.protocol_buffer);
+    transport_data.protocol_buffer_acquired = false;
+    transport_data.protocol_buffer_orphaned = false;
+}
+
+inline fn get_protocol_buffer_data(self: *StreamTransportObject) []u8 {
+    const buffer = &self.protocol_buffer;
+    const ptr: [*]u8 = @ptrCast(buffer.buf.?);
+    return ptr[0..@intCast(buffer.len)];
+}
+
+// Without a buffer, a multishot recv is queued and the data is received into buffers provided by the loop
+fn queue_read(self: *StreamTransportObject, buffer: ?[]u8) !void {
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    const loop = transport_data.loop;
+
+    const mutex = &loop.mutex;
+    mutex.lock();
+    defer mutex.unlock();
+
+    if (!loop.initialized) {
+        utils.put_python_runtime_error_message("Loop is closed\x00");
+        return error.PythonError;
+    }
+
+    const fd = transport_data.fd;
+    if (buffer) |data| {
+        transport_data.read_task_id = try IO.queue(loop, .{
+            .PerformRecv = .{
+                .fd = fd,
+                .callback = .{
+                    .ZigGenericIO = .{
+                        .callback = &read_completed,
+                        .data = self
+                    }
+                },
+                .data = data
+            }
+        });
+    }else{
+        transport_data.read_task_id = try IO.queue(loop, .{
+            .PerformRecvMultishot = .{
+                .fd = fd,
+                .callback = .{
+                    .ZigGenericIO = .{
+                        .callback = &multishot_read_completed,
+                        .data = self
+                    }
+                }
+            }
+        });
+    }
+    transport_data.read_multishot = (buffer == null);
+    python_c.py_incref(@ptrCast(self));
+}
+
+pub fn cancel_multishot_read(self: *StreamTransportObject) !void {
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    if (!transport_data.read_multishot) return;
+
+    const loop = transport_data.loop;
+    const mutex = &loop.mutex;
+    mutex.lock();
+    defer mutex.unlock();
+
+    if (!loop.initialized) return;
+
+    if (transport_data.read_task_id) |task_id| {
+        try IO.cancel(loop, task_id);
+    }
+}
+
+fn release_selected_buffer(self: *StreamTransportObject, buffer_id: u16) void {
+    const loop = utils.get_data_ptr(StreamTransport, self).loop;
+    const mutex = &loop.mutex;
+    mutex.lock();
+    defer mutex.unlock();
+
+    IO.release_selected_buffer(loop, buffer_id);
+}
+
+fn read_next(self: *StreamTransportObject) CallbackManager.ExecuteCallbacksReturn {
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+
+    // Buffered protocols receive straight into their own memory, no intermediate copy is made
+    var buffer: ?[]u8 = null;
+    if (transport_data.buffered_protocol) {
+        get_protocol_buffer(self, -1, &self.protocol_buffer) catch |err| {
+            return Control.handle_error(self, err, GetBufferErrorMessage);
+        };
+        transport_data.protocol_buffer_acquired = true;
+        buffer = get_protocol_buffer_data(self);
+    }
+
+    queue_read(self, buffer) catch |err| {
+        release_protocol_buffer(self);
+        return Control.handle_error(self, err, ReadErrorMessage);
+    };
+
+    return .Continue;
+}
+
+pub fn schedule_reading(self: *StreamTransportObject) !void {
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+
+    // Same as asyncio, the protocol isn't called until the next loop iteration
+    try Loop.Scheduling.Soon.dispatch(transport_data.loop, .{
+        .ZigGeneric = .{
+            .callback = &start_reading_callback,
+            .data = self
+        }
+    });
+    python_c.py_incref(@ptrCast(self));
+}
+
+fn data_received(self: *StreamTransportObject, data: []const u8) CallbackManager.ExecuteCallbacksReturn {
+    const py_bytes: PyObject = python_c.PyBytes_FromStringAndSize(data.ptr, @intCast(data.len))
+        orelse return Control.handle_error(self, error.PythonError, ReadErrorMessage);
+    defer python_c.py_decref(py_bytes);
+
+    const py_handle = self.py_handle.?;
+    const py_callback = python_c.py_newref(self.protocol_data_received.?);
+    defer python_c.py_decref(py_callback);
+
+    var args: [1]PyObject = .{py_bytes};
+    return CallbackManager.run_callback(utils.get_data_ptr(StreamTransport, self).loop.allocator, .{
+        .PythonGeneric = .{
+            .args = &args,
+            .exception_handler = self.py_loop.?.exception_handler.?,
+            .py_callback = py_callback,
+            .py_context = py_handle.contextvars.?,
+            .py_handle = py_handle,
+            .cancelled = &py_handle.cancelled,
+            .can_release = false
+        }
+    }, .Continue);
+}
+
+fn buffer_updated(self: *StreamTransportObject, nbytes: usize) CallbackManager.ExecuteCallbacksReturn {
+    const py_nbytes: PyObject = python_c.PyLong_FromSize_t(nbytes)
+        orelse return Control.handle_error(self, error.PythonError, BufferUpdatedErrorMessage);
+    defer python_c.py_decref(py_nbytes);
+
+    const ret: PyObject = Control.call_protocol_method(
+        self, self.protocol_buffer_updated.?, &.{py_nbytes}, true
+    ) catch |err| {
+        return Control.handle_error(self, err, BufferUpdatedErrorMessage);
+    };
+    python_c.py_decref(ret);
+
+    return .Continue;
+}
+
+// Data that wasn't received into the buffer of the current protocol is copied into it
+fn feed_buffered_protocol(self: *StreamTransportObject, data: []const u8) CallbackManager.ExecuteCallbacksReturn {
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+
+    var remaining = data;
+    while (remaining.len > 0 and !transport_data.closed) {
+        var buffer: python_c.Py_buffer = undefined;
+        get_protocol_buffer(self, @intCast(remaining.len), &buffer) catch |err| {
+            return Control.handle_error(self, err, GetBufferErrorMessage);
+        };
+
+        const ptr: [*]u8 = @ptrCast(buffer.buf.?);
+        const nbytes = @min(remaining.len, @as(usize, @intCast(buffer.len)));
+        @memcpy(ptr[0..nbytes], remaining[0..nbytes]);
+        python_c.PyBuffer_Release(&buffer);
+        remaining = remaining[nbytes..];
+
+        const ret = buffer_updated(self, nbytes);
+        if (ret != .Continue) return ret;
+    }
+
+    return .Continue;
+}
+
+fn deliver_bytes(self: *StreamTransportObject, data: []const u8) CallbackManager.ExecuteCallbacksReturn {
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    if (transport_data.buffered_protocol) {
+        return feed_buffered_protocol(self, data);
+    }
+    return data_received(self, data);
+}
+
+inline fn can_read_next(transport_data: *const StreamTransport) bool {
+    return (
+        transport_data.reading and !transport_data.closing and transport_data.read_task_id == null and
+        !transport_data.has_pending_data()
+    );
+}
+
+fn deliver_data(self: *StreamTransportObject) CallbackManager.ExecuteCallbacksReturn {
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    const nbytes = transport_data.protocol_buffer_len;
+    transport_data.protocol_buffer_len = 0;
+
+    const ret = blk: {
+        if (nbytes == 0) {
+            const held_data = &transport_data.held_data;
+            if (held_data.items.len == 0) break :blk .Continue;
+
+            // Nothing else is appended to the held data while the protocol is running
+            defer held_data.clearRetainingCapacity();
+            break :blk deliver_bytes(self, held_data.items);
+        }
+
+        if (transport_data.buffered_protocol and !transport_data.protocol_buffer_orphaned) {
+            // The protocol must be able to resize its buffer from buffer_updated()
+            release_protocol_buffer(self);
+            break :blk buffer_updated(self, nbytes);
+        }
+
+        defer release_protocol_buffer(self);
+        break :blk deliver_bytes(self, get_protocol_buffer_data(self)[0..nbytes]);
+    };
+
+    if (ret != .Continue) {
+        return ret;
+    }
+
+    if (transport_data.held_eof and transport_data.reading and !transport_data.closing) {
+        transport_data.held_eof = false;
+        return eof_received(self);
+    }
+
+    if (can_read_next(transport_data)) {
+        return read_next(self);
+    }
+
+    return ret;
+}
+
+fn eof_received(self: *StreamTransportObject) CallbackManager.ExecuteCallbacksReturn {
+    const keep_open: PyObject = Control.call_protocol_method(
+        self, self.protocol_eof_received.?, &.{}, true
+    ) catch |err| {
+        return Control.handle_error(self, err, "Fatal error: protocol.eof_received() call failed.\x00");
+    };
+    defer python_c.py_decref(keep_open);
+
+    const must_close = switch (python_c.PyObject_IsTrue(keep_open)) {
+        0 => true,
+        1 => false,
+        else => return Control.handle_error(
+            self, error.PythonError, "Fatal error: protocol.eof_received() call failed.\x00"
+        )
+    };
+
+    // Nothing else can be read, the transport stays open only for writing
+    if (must_close) {
+        Control.close(self) catch |err| {
+            return Control.handle_error(self, err, "Fatal error on socket transport\x00");
+        };
+    }
+
+    return .Continue;
+}
+
+fn read_completed(
+    data: ?*anyopaque, io_uring_res: i32, _: u32, status: CallbackManager.ExecuteCallbacksReturn
+) CallbackManager.ExecuteCallbacksReturn {
+    const self: *StreamTransportObject = @alignCast(@ptrCast(data.?));
+    defer python_c.py_decref(@ptrCast(self));
+
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    transport_data.read_task_id = null;
+
+    if (status != .Continue or transport_data.closing or io_uring_res <= 0) {
+        release_protocol_buffer(self);
+    }
+
+    if (status != .Continue or transport_data.closing) {
+        return status;
+    }
+
+    if (io_uring_res < 0) {
+        switch (@as(std.posix.E, @enumFromInt(-io_uring_res))) {
+            .INTR, .AGAIN => return read_next(self),
+            else => |errno| return Control.handle_errno(self, errno, ReadErrorMessage)
+        }
+    }
+
+    if (io_uring_res == 0) {
+        return eof_received(self);
+    }
+
+    transport_data.protocol_buffer_len = @intCast(io_uring_res);
+    if (!transport_data.reading) {
+        // Kept until the protocol resumes reading
+        return .Continue;
+    }
+
+    return deliver_data(self);
+}
+
+fn multishot_read_completed(
+    data: ?*anyopaque, io_uring_res: i32, io_uring_flags: u32, status: CallbackManager.ExecuteCallbacksReturn
+) CallbackManager.ExecuteCallbacksReturn {
+    const self: *StreamTransportObject = @alignCast(@ptrCast(data.?));
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+
+    // Only the last completion releases the reference taken when the recv was queued
+    const more = (io_uring_flags & std.os.linux.IORING_CQE_F_MORE) != 0;
+    defer {
+        if (!more) python_c.py_decref(@ptrCast(self));
+    }
+
+    // The provided buffers can't be touched while the loop is being released
+    if (status != .Continue) {
+        return status;
+    }
+
+    if (!more) {
+        transport_data.read_task_id = null;
+        transport_data.read_multishot = false;
+    }
+
+    const buffer = IO.get_selected_buffer(transport_data.loop, io_uring_flags);
+    defer {
+        if (buffer) |b| release_selected_buffer(self, b.id);
+    }
+
+    if (transport_data.closing) {
+        return .Continue;
+    }
+
+    if (io_uring_res < 0) {
+        switch (@as(std.posix.E, @enumFromInt(-io_uring_res))) {
+            // Cancelled by pause_reading() or when a buffered protocol is set
+            .INTR, .AGAIN, .NOBUFS, .CANCELED => {
+                if (!more and can_read_next(transport_data)) {
+                    return read_next(self);
+                }
+                return .Continue;
+            },
+            else => |errno| return Control.handle_errno(self, errno, ReadErrorMessage)
+        }
+    }
+
+    if (io_uring_res == 0) {
+        if (!transport_data.reading or transport_data.held_data.items.len > 0) {
+            // Same as the data, the protocol is notified once reading is resumed
+            transport_data.held_eof = true;
+            return .Continue;
+        }
+        return eof_received(self);
+    }
+
+    const received = buffer.?.data[0..@intCast(io_uring_res)];
+    if (!transport_data.reading or transport_data.held_data.items.len > 0) {
+        // Kept until the protocol resumes reading, the order of the data is preserved
+        transport_data.hold_data(received) catch |err| {
+            return Control.handle_error(self, err, ReadErrorMessage);
+        };
+        return .Continue;
+    }
+
+    const ret = deliver_bytes(self, received);
+    if (ret == .Continue and !more and can_read_next(transport_data)) {
+        return read_next(self);
+    }
+    return ret;
+}
+
+fn start_reading_callback(
+    data: ?*anyopaque, status: CallbackManager.ExecuteCallbacksReturn
+) CallbackManager.ExecuteCallbacksReturn {
+    const self: *StreamTransportObject = @alignCast(@ptrCast(data.?));
+    defer python_c.py_decref(@ptrCast(self));
+
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    if (status != .Continue or transport_data.closing or !transport_data.reading) {
+        return status;
+    }
+
+    if (transport_data.has_pending_data()) {
+        return deliver_data(self);
+    }else if (transport_data.read_task_id == null) {
+        return read_next(self);
+    }
+
+    return .Continue;
+}
+
+pub fn transport_is_reading(self: ?*StreamTransportObject) callconv(.C) ?PyObject {
+    const transport_data = utils.get_data_ptr(StreamTransport, self.?);
+    const is_reading = transport_data.reading and !transport_data.closing;
+    return python_c.PyBool_FromLong(@intCast(@intFromBool(is_reading)));
+}
+
+inline fn z_transport_pause_reading(self: *StreamTransportObject) !PyObject {
+    // A one-shot recv isn't cancelled, the data received in the meantime is held until reading is resumed
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    if (transport_data.closing or !transport_data.reading) {
+        return python_c.get_py_none();
+    }
+
+    transport_data.reading = false;
+    try cancel_multishot_read(self);
+    return python_c.get_py_none();
+}
+
+pub fn transport_pause_reading(self: ?*StreamTransportObject) callconv(.C) ?PyObject {
+    return utils.execute_zig_function(z_transport_pause_reading, .{self.?});
+}
+
+inline fn z_transport_resume_reading(self: *StreamTransportObject) !PyObject {
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    if (transport_data.closing or transport_data.reading) {
+        return python_c.get_py_none();
+    }
+    transport_data.reading = true;
+
+    // Same as asyncio, the protocol doesn't receive data from inside resume_reading
+    if (transport_data.has_pending_data() or transport_data.read_task_id == null) {
+        try schedule_reading(self);
+    }
+
+    return python_c.get_py_none();
+}
+
+pub fn transport_resume_reading(self: ?*StreamTransportObject) callconv(.C) ?PyObject {
+    return utils.execute_zig_function(z_transport_resume_reading, .{self.?});
+}
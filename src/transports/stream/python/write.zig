@@ -0,0 +1,437 @@
+const python_c = @import("python_c");
+const PyObject = *python_c.PyObject;
+
+const utils = @import("../../../utils/utils.zig");
+
+const CallbackManager = @import("../../../callback_manager.zig");
+const StreamTransport = @import("../main.zig");
+const Loop = @import("../../../loop/main.zig");
+const Future = @import("../../../future/main.zig");
+
+const Control = @import("control.zig");
+
+const StreamTransportObject = StreamTransport.Python.StreamTransportObject;
+
+const IO = Loop.Scheduling.IO;
+
+const std = @import("std");
+
+fn queue_write(self: *StreamTransportObject, data: []const u8) !void {
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    const loop = transport_data.loop;
+
+    const mutex = &loop.mutex;
+    mutex.lock();
+    defer mutex.unlock();
+
+    if (!loop.initialized) {
+        utils.put_python_runtime_error_message("Loop is closed\x00");
+        return error.PythonError;
+    }
+
+    transport_data.write_task_id = try IO.queue(loop, .{
+        .PerformSend = .{
+            .fd = transport_data.fd,
+            .callback = .{
+                .ZigGenericIO = .{
+                    .callback = &write_completed,
+                    .data = self
+                }
+            },
+            .data = data
+        }
+    });
+    python_c.py_incref(@ptrCast(self));
+}
+
+// Tries to write without going through the ring, returns how many bytes were written
+fn send_now(self: *StreamTransportObject, data: []const u8) !usize {
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    while (true) {
+        const rc = std.os.linux.sendto(
+            transport_data.fd, data.ptr, data.len, std.posix.MSG.NOSIGNAL | std.posix.MSG.DONTWAIT, null, 0
+        );
+        switch (std.os.linux.E.init(rc)) {
+            .SUCCESS => return rc,
+            .INTR => continue,
+            .AGAIN => return 0,
+            else => |errno| {
+                const exception: PyObject = utils.create_python_os_error(errno)
+                    orelse return error.PythonError;
+                defer python_c.py_decref(exception);
+
+                try Control.fatal_error(self, exception, "Fatal write error on socket transport\x00");
+                return error.TransportClosed;
+            }
+        }
+    }
+}
+
+fn flush(self: *StreamTransportObject) !void {
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    if (transport_data.get_data_to_send()) |data| {
+        try queue_write(self, data);
+    }
+}
+
+fn maybe_pause_protocol(self: *StreamTransportObject) !void {
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    if (transport_data.protocol_paused or transport_data.get_write_buffer_size() <= transport_data.high_water_mark) {
+        return;
+    }
+    transport_data.protocol_paused = true;
+
+    const ret = Control.call_protocol_method(self, self.protocol_pause_writing.?, &.{}, false) catch |err| {
+        if (err != error.PythonError) return err;
+
+        const exception: PyObject = python_c.PyErr_GetRaisedException()
+            orelse return error.PythonError;
+        defer python_c.py_decref(exception);
+
+        try Control.call_exception_handler(self, exception, "protocol.pause_writing() failed\x00");
+        return;
+    };
+    python_c.py_decref(ret);
+}
+
+fn maybe_resume_protocol(self: *StreamTransportObject) !void {
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    if (!transport_data.protocol_paused or transport_data.get_write_buffer_size() > transport_data.low_water_mark) {
+        return;
+    }
+    transport_data.protocol_paused = false;
+
+    const ret = Control.call_protocol_method(self, self.protocol_resume_writing.?, &.{}, true) catch |err| {
+        if (err != error.PythonError) return err;
+
+        const exception: PyObject = python_c.PyErr_GetRaisedException()
+            orelse return error.PythonError;
+        defer python_c.py_decref(exception);
+
+        try Control.call_exception_handler(self, exception, "protocol.resume_writing() failed\x00");
+        return;
+    };
+    python_c.py_decref(ret);
+}
+
+fn shutdown_write(self: *StreamTransportObject) !void {
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    switch (std.os.linux.E.init(std.os.linux.shutdown(transport_data.fd, std.posix.SHUT.WR))) {
+        .SUCCESS, .NOTCONN => {},
+        else => |errno| {
+            utils.put_python_os_error(errno);
+            return error.PythonError;
+        }
+    }
+}
+
+fn write_completed(
+    data: ?*anyopaque, io_uring_res: i32, _: u32, status: CallbackManager.ExecuteCallbacksReturn
+) CallbackManager.ExecuteCallbacksReturn {
+    const self: *StreamTransportObject = @alignCast(@ptrCast(data.?));
+    defer python_c.py_decref(@ptrCast(self));
+
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    transport_data.write_task_id = null;
+
+    if (status != .Continue or transport_data.closed) {
+        return status;
+    }
+
+    if (io_uring_res < 0) {
+        switch (@as(std.posix.E, @enumFromInt(-io_uring_res))) {
+            .INTR, .AGAIN => {},
+            else => |errno| return Control.handle_errno(self, errno, "Fatal write error on socket transport\x00")
+        }
+    }else{
+        transport_data.sent += @intCast(io_uring_res);
+    }
+
+    after_write(self) catch |err| {
+        return Control.handle_error(self, err, "Fatal write error on socket transport\x00");
+    };
+    return .Continue;
+}
+
+fn after_write(self: *StreamTransportObject) !void {
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+
+    // Everything written while the previous send was in flight goes out in a single operation
+    try flush(self);
+    try maybe_resume_protocol(self);
+
+    if (transport_data.write_task_id != null or transport_data.closed) {
+        return;
+    }
+
+    try wake_up_empty_waiter(self);
+    if (transport_data.eof_requested) {
+        try shutdown_write(self);
+    }
+    try Control.finish_closing(self);
+}
+
+inline fn check_no_sendfile(self: *StreamTransportObject) !void {
+    if (self.py_empty_waiter != null) {
+        utils.put_python_runtime_error_message("unable to write; sendfile is in progress\x00");
+        return error.PythonError;
+    }
+}
+
+fn write_data(self: *StreamTransportObject, data: []const u8) !void {
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    if (transport_data.eof_requested) {
+        utils.put_python_runtime_error_message("Cannot call write() after write_eof()\x00");
+        return error.PythonError;
+    }
+    try check_no_sendfile(self);
+
+    if (transport_data.closed or data.len == 0) {
+        return;
+    }
+
+    var pending_data = data;
+    if (transport_data.write_task_id == null) {
+        const nbytes = send_now(self, data) catch |err| switch (err) {
+            error.TransportClosed => return,
+            else => return err
+        };
+        if (nbytes == data.len) return;
+
+        pending_data = data[nbytes..];
+    }
+
+    try transport_data.append_write_data(pending_data);
+    if (transport_data.write_task_id == null) {
+        try flush(self);
+    }
+
+    try maybe_pause_protocol(self);
+}
+
+inline fn z_transport_write(self: *StreamTransportObject, py_data: PyObject) !PyObject {
+    var buffer: python_c.Py_buffer = undefined;
+    if (python_c.PyObject_GetBuffer(py_data, &buffer, python_c.PyBUF_SIMPLE) < 0) {
+        return error.PythonError;
+    }
+    defer python_c.PyBuffer_Release(&buffer);
+
+    const buf: [*]const u8 = @ptrCast(buffer.buf orelse return python_c.get_py_none());
+    try write_data(self, buf[0..@intCast(buffer.len)]);
+
+    return python_c.get_py_none();
+}
+
+pub fn transport_write(self: ?*StreamTransportObject, py_data: ?PyObject) callconv(.C) ?PyObject {
+    return utils.execute_zig_function(z_transport_write, .{self.?, py_data.?});
+}
+
+inline fn z_transport_writelines(self: *StreamTransportObject, py_list_of_data: PyObject) !PyObject {
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    if (transport_data.eof_requested) {
+        utils.put_python_runtime_error_message("Cannot call writelines() after write_eof()\x00");
+        return error.PythonError;
+    }
+    try check_no_sendfile(self);
+
+    const iterator: PyObject = python_c.PyObject_GetIter(py_list_of_data)
+        orelse return error.PythonError;
+    defer python_c.py_decref(iterator);
+
+    // Every chunk is coalesced in the write buffer and flushed together
+    while (python_c.PyIter_Next(iterator)) |py_data| {
+        defer python_c.py_decref(py_data);
+
+        var buffer: python_c.Py_buffer = undefined;
+        if (python_c.PyObject_GetBuffer(py_data, &buffer, python_c.PyBUF_SIMPLE) < 0) {
+            return error.PythonError;
+        }
+        defer python_c.PyBuffer_Release(&buffer);
+
+        if (transport_data.closed) continue;
+
+        const buf: [*]const u8 = @ptrCast(buffer.buf orelse continue);
+        try transport_data.append_write_data(buf[0..@intCast(buffer.len)]);
+    }
+
+    if (python_c.PyErr_Occurred() != null) {
+        return error.PythonError;
+    }
+
+    if (transport_data.closed) {
+        return python_c.get_py_none();
+    }
+
+    if (transport_data.write_task_id == null and transport_data.write_buffer.items.len > 0) {
+        const nbytes = send_now(self, transport_data.write_buffer.items) catch |err| switch (err) {
+            error.TransportClosed => return python_c.get_py_none(),
+            else => return err
+        };
+        transport_data.discard_written_data(nbytes);
+        try flush(self);
+    }
+
+    try maybe_pause_protocol(self);
+    return python_c.get_py_none();
+}
+
+pub fn transport_writelines(self: ?*StreamTransportObject, py_list_of_data: ?PyObject) callconv(.C) ?PyObject {
+    return utils.execute_zig_function(z_transport_writelines, .{self.?, py_list_of_data.?});
+}
+
+inline fn z_transport_write_eof(self: *StreamTransportObject) !PyObject {
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    if (transport_data.closing or transport_data.eof_requested) {
+        return python_c.get_py_none();
+    }
+
+    transport_data.eof_requested = true;
+    if (transport_data.write_task_id == null) {
+        try shutdown_write(self);
+    }
+
+    return python_c.get_py_none();
+}
+
+pub fn transport_write_eof(self: ?*StreamTransportObject) callconv(.C) ?PyObject {
+    return utils.execute_zig_function(z_transport_write_eof, .{self.?});
+}
+
+pub fn transport_can_write_eof(_: ?*StreamTransportObject) callconv(.C) ?PyObject {
+    return python_c.get_py_true();
+}
+
+pub fn transport_get_write_buffer_size(self: ?*StreamTransportObject) callconv(.C) ?PyObject {
+    const transport_data = utils.get_data_ptr(StreamTransport, self.?);
+    return python_c.PyLong_FromSize_t(transport_data.get_write_buffer_size());
+}
+
+pub fn transport_get_write_buffer_limits(self: ?*StreamTransportObject) callconv(.C) ?PyObject {
+    const transport_data = utils.get_data_ptr(StreamTransport, self.?);
+    return python_c.Py_BuildValue(
+        "(nn)\x00", @as(python_c.Py_ssize_t, @intCast(transport_data.low_water_mark)),
+        @as(python_c.Py_ssize_t, @intCast(transport_data.high_water_mark))
+    );
+}
+
+inline fn z_transport_set_write_buffer_limits(
+    self: *StreamTransportObject, args: []?PyObject, knames: ?PyObject
+) !PyObject {
+    if (args.len > 2) {
+        utils.put_python_runtime_error_message("Invalid number of arguments\x00");
+        return error.PythonError;
+    }
+
+    var py_high: ?PyObject = null;
+    var py_low: ?PyObject = null;
+    try python_c.parse_vector_call_kwargs(
+        knames, args.ptr + args.len,
+        &.{"high\x00", "low\x00"},
+        &.{&py_high, &py_low},
+    );
+    defer {
+        python_c.py_xdecref(py_high);
+        python_c.py_xdecref(py_low);
+    }
+
+    inline for (.{&py_high, &py_low}, 0..) |value, index| {
+        if (args.len > index) {
+            python_c.py_xdecref(value.*);
+            value.* = python_c.py_newref(args[index].?);
+        }
+    }
+
+    var high: ?isize = null;
+    var low: ?isize = null;
+    inline for (.{&high, &low}, .{py_high, py_low}) |value, py_value| {
+        if (py_value) |v| {
+            if (!python_c.is_none(v)) {
+                value.* = python_c.PyLong_AsSsize_t(v);
+                if (value.*.? == -1 and python_c.PyErr_Occurred() != null) {
+                    return error.PythonError;
+                }
+            }
+        }
+    }
+
+    const high_value: isize = high orelse if (low) |l| 4 * l else StreamTransport.DefaultHighWaterMark;
+    const low_value: isize = low orelse @divTrunc(high_value, 4);
+    if (!(high_value >= low_value and low_value >= 0)) {
+        _ = python_c.PyErr_Format(
+            python_c.PyExc_ValueError, "high (%zd) must be >= low (%zd) must be >= 0\x00", high_value, low_value
+        );
+        return error.PythonError;
+    }
+
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    transport_data.high_water_mark = @intCast(high_value);
+    transport_data.low_water_mark = @intCast(low_value);
+
+    try maybe_pause_protocol(self);
+    return python_c.get_py_none();
+}
+
+pub fn transport_set_write_buffer_limits(
+    self: ?*StreamTransportObject, args: ?[*]?PyObject, nargs: isize, knames: ?PyObject
+) callconv(.C) ?PyObject {
+    return utils.execute_zig_function(z_transport_set_write_buffer_limits, .{
+        self.?, args.?[0..@as(usize, @intCast(nargs))], knames
+    });
+}
+
+fn wake_up_empty_waiter(self: *StreamTransportObject) !void {
+    const py_waiter = self.py_empty_waiter orelse return;
+    const future_data = utils.get_data_ptr(Future, py_waiter);
+    const mutex = &future_data.mutex;
+    mutex.lock();
+    defer mutex.unlock();
+
+    if (future_data.status == .PENDING) {
+        try Future.Python.Result.future_fast_set_result(future_data, python_c.get_py_none());
+    }
+}
+
+pub fn fail_empty_waiter(self: *StreamTransportObject) !void {
+    const py_waiter = self.py_empty_waiter orelse return;
+    const future_data = utils.get_data_ptr(Future, py_waiter);
+    const mutex = &future_data.mutex;
+    mutex.lock();
+    defer mutex.unlock();
+
+    if (future_data.status != .PENDING) return;
+
+    const exception: PyObject = python_c.PyObject_CallFunction(
+        python_c.PyExc_ConnectionError, "s\x00", "Connection is closed by peer\x00"
+    ) orelse return error.PythonError;
+    defer python_c.py_decref(exception);
+
+    _ = try Future.Python.Result.future_fast_set_exception(py_waiter, future_data, exception);
+}
+
+inline fn z_transport_make_empty_waiter(self: *StreamTransportObject) !PyObject {
+    if (self.py_empty_waiter != null) {
+        utils.put_python_runtime_error_message("Empty waiter is already set\x00");
+        return error.PythonError;
+    }
+
+    const py_waiter = try Future.Python.Constructors.fast_new_future(self.py_loop.?);
+    self.py_empty_waiter = py_waiter;
+
+    const transport_data = utils.get_data_ptr(StreamTransport, self);
+    if (transport_data.closed) {
+        try fail_empty_waiter(self);
+    }else if (transport_data.write_task_id == null) {
+        try wake_up_empty_waiter(self);
+    }
+
+    return python_c.py_newref(@as(PyObject, @ptrCast(py_waiter)));
+}
+
+pub fn transport_make_empty_waiter(self: ?*StreamTransportObject) callconv(.C) ?PyObject {
+    return utils.execute_zig_function(z_transport_make_empty_waiter, .{self.?});
+}
+
+pub fn transport_reset_empty_waiter(self: ?*StreamTransportObject) callconv(.C) ?PyObject {
+    python_c.py_decref_and_set_null(@ptrCast(&self.?.py_empty_waiter));
+    return python_c.get_py_none();
+}
@@ -106,6 +106,26 @@ pub fn init(comptime T: type) type {
             self.appendleft_node(new_node);
         }
 
+        pub fn insert_after_node(self: *@This(), node: ?Node, new_node: Node) void {
+            const prev_node = node orelse {
+                self.appendleft_node(new_node);
+                return;
+            };
+
+            const next_node = prev_node.next orelse {
+                self.append_node(new_node);
+                return;
+            };
+
+            new_node.prev = prev_node;
+            new_node.next = next_node;
+
+            prev_node.next = new_node;
+            next_node.prev = new_node;
+
+            self.len += 1;
+        }
+
         pub fn pop_node(self: *@This()) !Node {
             const last_node = self.last orelse return errors.LinkedListEmpty;
 
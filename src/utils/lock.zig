@@ -1,38 +1,72 @@
 const std = @import("std");
 const builtin = @import("builtin");
 
-const _Lock = enum {
-    unlocked,
-    locked,
+const Futex = std.Thread.Futex;
 
-    pub inline fn tryLock(self: *_Lock) bool {
+// Spins for a short while, for the usual case of a critical section that is about to end, and then parks
+// the thread on a futex. Pure spinning starves the owner of the lock when there are more threads than CPUs.
+pub const AdaptiveLock = struct {
+    state: std.atomic.Value(u32) = std.atomic.Value(u32).init(unlocked),
+
+    const unlocked: u32 = 0;
+    const locked: u32 = 1;
+    // Locked and at least one thread could be sleeping on the futex
+    const contended: u32 = 2;
+
+    const SpinLimit = 100;
+
+    pub inline fn tryLock(self: *AdaptiveLock) bool {
         if (builtin.single_threaded) return true;
-        return @cmpxchgStrong(_Lock, self, .unlocked, .locked, .acquire, .monotonic) == null;
+        return self.state.cmpxchgStrong(unlocked, locked, .acquire, .monotonic) == null;
     }
 
-    pub inline fn lock(self: *_Lock) void {
+    pub inline fn lock(self: *AdaptiveLock) void {
         if (builtin.single_threaded) return;
 
-        while (@cmpxchgWeak(_Lock, self, .unlocked, .locked, .acquire, .monotonic) != null) {
+        if (self.state.cmpxchgWeak(unlocked, locked, .acquire, .monotonic) != null) {
+            self.lock_slow();
+        }
+    }
+
+    fn lock_slow(self: *AdaptiveLock) void {
+        @branchHint(.cold);
+
+        var spins: usize = 0;
+        while (spins < SpinLimit) : (spins += 1) {
+            // Once there are sleeping threads, spinning would only jump the queue
+            const state = self.state.load(.monotonic);
+            if (state == contended) break;
+
+            if (state == unlocked) {
+                if (self.state.cmpxchgWeak(unlocked, locked, .acquire, .monotonic) == null) return;
+            }
             std.atomic.spinLoopHint();
         }
+
+        // Whoever gets the lock from here on has to assume that there are other sleeping threads,
+        // so it wakes one of them up when it unlocks
+        while (self.state.swap(contended, .acquire) != unlocked) {
+            Futex.wait(&self.state, contended);
+        }
     }
 
-    pub inline fn unlock(self: *_Lock) void {
+    pub inline fn unlock(self: *AdaptiveLock) void {
         if (builtin.single_threaded) return;
 
-        @atomicStore(_Lock, self, .unlocked, .release);
+        if (self.state.swap(unlocked, .release) == contended) {
+            Futex.wake(&self.state, 1);
+        }
     }
 };
 
 pub const Mutex = switch (builtin.mode) {
     .Debug => std.Thread.Mutex,
-    else => _Lock,
+    else => AdaptiveLock,
 };
 
 pub inline fn init() Mutex {
     return switch (builtin.mode) {
         .Debug => std.Thread.Mutex{},
-        else => _Lock.unlocked,
+        else => AdaptiveLock{},
     };
 }
@@ -1,3 +1,4 @@
 pub const LinkedList = @import("linked_list.zig");
+pub const Lock = @import("lock.zig");
 // pub const BTree = @import("btree/btree.zig");
 pub const utils = @import("utils.zig");
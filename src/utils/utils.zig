@@ -19,6 +19,19 @@ pub inline fn put_python_runtime_error_message(msg: [:0]const u8) void {
     );
 }
 
+pub inline fn create_python_os_error(errno: std.posix.E) ?*python_c.PyObject {
+    const code: c_int = @intCast(@intFromEnum(errno));
+    return python_c.PyObject_CallFunction(
+        python_c.PyExc_OSError, "is\x00", code, python_c.strerror(code)
+    );
+}
+
+pub inline fn put_python_os_error(errno: std.posix.E) void {
+    const exception = create_python_os_error(errno) orelse return;
+    python_c.PyErr_SetObject(python_c.PyExc_OSError, exception);
+    python_c.py_decref(exception);
+}
+
 pub inline fn get_data_ptr(comptime T: type, leviathan_pyobject: anytype) *T {
     const type_info = @typeInfo(@TypeOf(leviathan_pyobject));
     if (type_info != .pointer) {
@@ -1,7 +1,7 @@
 from leviathan import Future, ThreadSafeFuture, Loop, ThreadSafeLoop
 from unittest.mock import MagicMock
 from typing import Type, Any
-import pytest, asyncio
+import pytest, asyncio, sys
 
 
 @pytest.mark.parametrize("fut_obj, loop_obj", [
@@ -253,6 +253,33 @@ def test_adding_several_callbacks_and_removing(
         loop.close()
 
 
+@pytest.mark.parametrize("fut_obj, loop_obj", [
+    (Future, Loop),
+    (ThreadSafeFuture, ThreadSafeLoop),
+])
+def test_callbacks_order(
+    fut_obj: Type[asyncio.Future[Any]], loop_obj: Type[asyncio.AbstractEventLoop]
+) -> None:
+    loop = loop_obj()
+    try:
+        future = fut_obj(loop=loop)
+        calls: list[int] = []
+        callbacks = [lambda _, i=i: calls.append(i) for i in range(20)]
+        for callback in callbacks:
+            future.add_done_callback(callback)
+
+        # The first ones are stored inline in the future and the rest in its callbacks queue
+        assert future.remove_done_callback(callbacks[0]) == 1
+        assert future.remove_done_callback(callbacks[10]) == 1
+
+        future.set_result(42)
+        loop.call_soon(loop.stop)
+        loop.run_forever()
+        assert calls == [i for i in range(20) if i not in (0, 10)]
+    finally:
+        loop.close()
+
+
 @pytest.mark.parametrize("fut_obj, loop_obj", [
     (Future, Loop),
     (ThreadSafeFuture, ThreadSafeLoop),
@@ -310,3 +337,47 @@ def test_future_await(
         assert result == 42
     finally:
         loop.close()
+
+
+@pytest.mark.parametrize("fut_obj, loop_obj", [
+    (Future, Loop),
+    (ThreadSafeFuture, ThreadSafeLoop),
+])
+def test_future_await_tuple_result(
+    fut_obj: Type[asyncio.Future[Any]], loop_obj: Type[asyncio.AbstractEventLoop]
+) -> None:
+    async def test_func(value: Any) -> Any:
+        fut = fut_obj(loop=asyncio.get_running_loop())
+        fut.set_result(value)
+        return await fut
+
+    loop = loop_obj()
+    try:
+        # Tuples aren't unpacked as StopIteration arguments
+        for value in ((1, 2), (), (None,), ((3,),)):
+            assert loop.run_until_complete(test_func(value)) == value
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("fut_obj, loop_obj", [
+    (Future, Loop),
+    (ThreadSafeFuture, ThreadSafeLoop),
+])
+def test_cancelled_result_keeps_cancelled_error_reference(
+    fut_obj: Type[asyncio.Future[Any]], loop_obj: Type[asyncio.AbstractEventLoop]
+) -> None:
+    loop = loop_obj()
+    try:
+        future = fut_obj(loop=loop)
+        future.cancel()
+
+        refcount = sys.getrefcount(asyncio.CancelledError)
+        for _ in range(100):
+            try:
+                future.result()
+            except asyncio.CancelledError:
+                pass
+        assert sys.getrefcount(asyncio.CancelledError) == refcount
+    finally:
+        loop.close()
@@ -0,0 +1,102 @@
+const std = @import("std");
+
+const leviathan = @import("leviathan");
+
+const CallbackManager = leviathan.CallbackManager;
+const LinkedList = CallbackManager.LinkedList;
+const Later = leviathan.Loop.Scheduling.Later;
+
+fn callback_test(data: ?*anyopaque, status: CallbackManager.ExecuteCallbacksReturn) CallbackManager.ExecuteCallbacksReturn {
+    std.testing.expectEqual(CallbackManager.ExecuteCallbacksReturn.Continue, status) catch unreachable;
+
+    const number: *usize = @alignCast(@ptrCast(data.?));
+    number.* += 1;
+
+    return .Continue;
+}
+
+fn release_ready_tasks(allocator: std.mem.Allocator, ready_tasks: *CallbackManager.CallbacksSetsQueue) void {
+    for (0..ready_tasks.queue.len) |_| {
+        const set: CallbackManager.CallbacksSet = ready_tasks.queue.pop() catch unreachable;
+        CallbackManager.release_set(allocator, set);
+    }
+}
+
+test "Expiring timers in order" {
+    const allocator = std.testing.allocator;
+
+    var ready_tasks = CallbackManager.CallbacksSetsQueue{
+        .queue = LinkedList.init(allocator),
+    };
+    defer release_ready_tasks(allocator, &ready_tasks);
+
+    var timer_wheel = Later.TimerWheel.init(allocator, 1000);
+    defer timer_wheel.deinit();
+
+    var numbers: [4]usize = .{0} ** 4;
+    const deadlines = [_]u64{ 1010, 1100, 5000, 1000 + 300_000 };
+    for (&numbers, deadlines) |*number, deadline| {
+        _ = try timer_wheel.add(.{
+            .ZigGeneric = .{
+                .data = number,
+                .callback = &callback_test
+            }
+        }, deadline * Later.TickDuration, null);
+    }
+
+    try std.testing.expectEqual(4, timer_wheel.len);
+    try std.testing.expectEqual(1010, timer_wheel.next_event_tick().?);
+
+    const expected_calls = [_][4]usize{
+        .{ 0, 0, 0, 0 },
+        .{ 1, 0, 0, 0 },
+        .{ 1, 1, 0, 0 },
+        .{ 1, 1, 1, 0 },
+        .{ 1, 1, 1, 1 },
+    };
+    const now_ticks = [_]u64{ 1009, 1099, 4999, 1000 + 299_999, 1000 + 300_000 };
+    for (now_ticks, expected_calls) |now_tick, expected| {
+        try timer_wheel.expire(allocator, now_tick, &ready_tasks, 8);
+        _ = CallbackManager.execute_callbacks(allocator, &ready_tasks, .Continue, true);
+        try std.testing.expectEqualSlices(usize, &expected, &numbers);
+    }
+
+    try std.testing.expectEqual(0, timer_wheel.len);
+    try std.testing.expectEqual(null, timer_wheel.next_event_tick());
+}
+
+test "Removing timers" {
+    const allocator = std.testing.allocator;
+
+    var ready_tasks = CallbackManager.CallbacksSetsQueue{
+        .queue = LinkedList.init(allocator),
+    };
+    defer release_ready_tasks(allocator, &ready_tasks);
+
+    var timer_wheel = Later.TimerWheel.init(allocator, 0);
+    defer timer_wheel.deinit();
+
+    var number: usize = 0;
+    var nodes: [100]Later.TimersLinkedList.Node = undefined;
+    for (&nodes, 0..) |*node, i| {
+        node.* = try timer_wheel.add(.{
+            .ZigGeneric = .{
+                .data = &number,
+                .callback = &callback_test
+            }
+        }, (10 + i * 97) * Later.TickDuration, null);
+    }
+
+    for (nodes, 0..) |node, i| {
+        if (i % 2 == 0) {
+            _ = timer_wheel.remove(node);
+        }
+    }
+    try std.testing.expectEqual(50, timer_wheel.len);
+
+    try timer_wheel.expire(allocator, 100 * 97, &ready_tasks, 8);
+    _ = CallbackManager.execute_callbacks(allocator, &ready_tasks, .Continue, true);
+
+    try std.testing.expectEqual(50, number);
+    try std.testing.expectEqual(0, timer_wheel.len);
+}
@@ -1,4 +1,5 @@
 pub const runner = @import("runner.zig");
+pub const later = @import("later.zig");
 
 test {
     const std = @import("std");
@@ -158,3 +158,26 @@ test "Running callbaks and prune" {
     try std.testing.expectEqual(ret, CallbackManager.ExecuteCallbacksReturn.Continue);
     try std.testing.expect(ready_tasks.queue.len <= max_number_of_callbacks_set);
 }
+
+test "Busy poll window follows the observed waits" {
+    var busy_poll = Loop.Runner.BusyPoll.init(100 * std.time.ns_per_us);
+
+    // A single wait close to the maximum doesn't pin the window there
+    busy_poll.record_wait(95 * std.time.ns_per_us);
+    for (0..64) |_| {
+        busy_poll.record_wait(2 * std.time.ns_per_us);
+    }
+    try std.testing.expect(busy_poll.window_ns < 10 * std.time.ns_per_us);
+    try std.testing.expect(busy_poll.window_ns >= 2 * std.time.ns_per_us);
+
+    // Waits that spinning can't catch close the window
+    for (0..64) |_| {
+        busy_poll.record_wait(std.time.ns_per_s);
+    }
+    try std.testing.expect(busy_poll.window_ns < std.time.ns_per_us);
+
+    for (0..64) |_| {
+        busy_poll.record_wait(80 * std.time.ns_per_us);
+    }
+    try std.testing.expectEqual(busy_poll.max_ns, busy_poll.window_ns);
+}
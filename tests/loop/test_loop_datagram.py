@@ -0,0 +1,195 @@
+from leviathan import Loop, ThreadSafeLoop
+
+from typing import Any, Type
+from pathlib import Path
+
+import pytest, asyncio, socket, errno
+
+
+class EchoProtocol(asyncio.DatagramProtocol):
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport: asyncio.DatagramTransport = transport  # type: ignore
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        self.transport.sendto(data, addr)
+
+
+class CollectorProtocol(asyncio.DatagramProtocol):
+    def __init__(self, loop: asyncio.AbstractEventLoop, expected: int) -> None:
+        self.datagrams: list[tuple[bytes, Any]] = []
+        self.errors: list[Exception] = []
+        self.expected = expected
+        self.done = loop.create_future()
+        self.lost = loop.create_future()
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        self.datagrams.append((data, addr))
+        if len(self.datagrams) == self.expected and not self.done.done():
+            self.done.set_result(None)
+
+    def error_received(self, exc: Exception) -> None:
+        self.errors.append(exc)
+        if not self.done.done():
+            self.done.set_result(None)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self.lost.set_result(exc)
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_datagram_echo(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    try:
+        # More datagrams than a single recvmmsg or sendmmsg batch takes
+        count = 200
+
+        async def main() -> tuple[list[tuple[bytes, Any]], Any, Any]:
+            server, _ = await loop.create_datagram_endpoint(EchoProtocol, local_addr=("127.0.0.1", 0))
+            server_address = server.get_extra_info("sockname")
+            server.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+
+            client, protocol = await loop.create_datagram_endpoint(
+                lambda: CollectorProtocol(loop, count), remote_addr=server_address
+            )
+            client.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+            for index in range(count):
+                client.sendto(index.to_bytes(4, "big"))
+            assert client.get_write_buffer_size() == count * 4
+
+            await asyncio.wait_for(protocol.done, 5)
+            assert client.get_write_buffer_size() == 0
+
+            with pytest.raises(ValueError):
+                client.sendto(b"data", ("127.0.0.1", 1))
+
+            client.close()
+            server.close()
+            assert await protocol.lost is None
+            return protocol.datagrams, server_address, client.get_extra_info("peername")
+
+        datagrams, server_address, peername = loop.run_until_complete(main())
+        assert peername == server_address
+        assert sorted(int.from_bytes(data, "big") for data, _ in datagrams) == list(range(count))
+        assert all(address == server_address for _, address in datagrams)
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_datagram_unconnected(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    peers = [socket.socket(socket.AF_INET, socket.SOCK_DGRAM) for _ in range(2)]
+    try:
+        for peer in peers:
+            peer.bind(("127.0.0.1", 0))
+
+        async def main() -> tuple[list[tuple[bytes, Any]], list[bytes]]:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.bind(("127.0.0.1", 0))
+            transport, protocol = await loop.create_datagram_endpoint(
+                lambda: CollectorProtocol(loop, 4), sock=sock
+            )
+
+            # Datagrams to different peers still go out in the same batch
+            for index, peer in enumerate(peers * 2):
+                transport.sendto(b"to %d" % index, peer.getsockname())
+            for index, peer in enumerate(peers * 2):
+                peer.sendto(b"from %d" % index, sock.getsockname())
+
+            await asyncio.wait_for(protocol.done, 5)
+            received = [peer.recv(100) for peer in peers for _ in range(2)]
+
+            transport.abort()
+            await protocol.lost
+            return protocol.datagrams, received
+
+        datagrams, received = loop.run_until_complete(main())
+        assert sorted(datagrams) == sorted(
+            (b"from %d" % index, peer.getsockname()) for index, peer in enumerate(peers * 2)
+        )
+        assert received == [b"to 0", b"to 2", b"to 1", b"to 3"]
+    finally:
+        for peer in peers:
+            peer.close()
+        loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_datagram_errors(loop_obj: Type[asyncio.AbstractEventLoop], tmp_path: Path) -> None:
+    loop = loop_obj()
+    closed = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    closed.bind(("127.0.0.1", 0))
+    closed_address = closed.getsockname()
+    closed.close()
+    try:
+        async def main() -> None:
+            transport, protocol = await loop.create_datagram_endpoint(
+                lambda: CollectorProtocol(loop, 1), remote_addr=closed_address
+            )
+            transport.sendto(b"nobody is listening")
+            await asyncio.wait_for(protocol.done, 5)
+            assert isinstance(protocol.errors[0], ConnectionRefusedError)
+            assert not transport.is_closing()
+            transport.close()
+            await protocol.lost
+
+            with pytest.raises(ValueError):
+                await loop.create_datagram_endpoint(asyncio.DatagramProtocol)
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock, pytest.raises(ValueError):
+                await loop.create_datagram_endpoint(
+                    asyncio.DatagramProtocol, local_addr=("127.0.0.1", 0), sock=sock
+                )
+
+            path = str(tmp_path / "datagram.sock")
+            server, _ = await loop.create_datagram_endpoint(
+                EchoProtocol, local_addr=path, family=socket.AF_UNIX
+            )
+            client, protocol = await loop.create_datagram_endpoint(
+                lambda: CollectorProtocol(loop, 1), local_addr=path + ".client",
+                remote_addr=path, family=socket.AF_UNIX
+            )
+            client.sendto(b"unix")
+            await asyncio.wait_for(protocol.done, 5)
+            assert protocol.datagrams == [(b"unix", path)]
+            client.close()
+            server.close()
+            await protocol.lost
+
+        loop.run_until_complete(main())
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_datagram_max_size(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    try:
+        async def main() -> None:
+            server, protocol = await loop.create_datagram_endpoint(
+                lambda: CollectorProtocol(loop, 2), local_addr=("127.0.0.1", 0), max_datagram_size=16
+            )
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+                sender.sendto(b"x" * 17, server.get_extra_info("sockname"))
+                await asyncio.wait_for(protocol.done, 5)
+                assert protocol.datagrams == []
+                assert isinstance(protocol.errors[0], OSError)
+                assert protocol.errors[0].errno == errno.EMSGSIZE
+
+                protocol.done = loop.create_future()
+                sender.sendto(b"y" * 16, server.get_extra_info("sockname"))
+                sender.sendto(b"z", server.get_extra_info("sockname"))
+                await asyncio.wait_for(protocol.done, 5)
+                assert [data for data, _ in protocol.datagrams] == [b"y" * 16, b"z"]
+                assert not server.is_closing()
+
+            server.close()
+            await protocol.lost
+
+            with pytest.raises(ValueError):
+                await loop.create_datagram_endpoint(
+                    asyncio.DatagramProtocol, local_addr=("127.0.0.1", 0), max_datagram_size=0
+                )
+
+        loop.run_until_complete(main())
+    finally:
+        loop.close()
@@ -0,0 +1,108 @@
+from leviathan import ThreadSafeLoop
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest, asyncio, hashlib, threading, time
+
+
+def test_run_in_executor() -> None:
+    loop = ThreadSafeLoop()
+    try:
+        async def main() -> tuple[int, int]:
+            return await loop.run_in_executor(None, sum, [1, 2, 3]), await asyncio.to_thread(
+                threading.get_ident
+            )
+
+        result, thread_id = loop.run_until_complete(main())
+        assert result == 6
+        assert thread_id != threading.get_ident()
+    finally:
+        loop.close()
+
+
+def test_run_in_executor_exception() -> None:
+    loop = ThreadSafeLoop()
+    try:
+        with pytest.raises(ValueError):
+            loop.run_until_complete(loop.run_in_executor(None, int, "not a number"))
+    finally:
+        loop.close()
+
+
+def test_run_in_executor_many_jobs() -> None:
+    loop = ThreadSafeLoop()
+    try:
+        # More jobs than the submission queue can hold at once
+        payloads = [str(i).encode() for i in range(5000)]
+
+        async def main() -> list[bytes]:
+            futures = [
+                loop.run_in_executor(None, lambda data: hashlib.sha256(data).digest(), payload)
+                for payload in payloads
+            ]
+            return await asyncio.gather(*futures)
+
+        assert loop.run_until_complete(main()) == [
+            hashlib.sha256(payload).digest() for payload in payloads
+        ]
+    finally:
+        loop.close()
+
+
+def test_run_in_executor_cancelled() -> None:
+    loop = ThreadSafeLoop()
+    try:
+        calls: list[int] = []
+
+        async def main() -> None:
+            blocker = loop.run_in_executor(None, time.sleep, 0.05)
+            futures = [loop.run_in_executor(None, calls.append, i) for i in range(100)]
+            for future in futures:
+                future.cancel()
+            await blocker
+            await asyncio.sleep(0.05)
+
+        loop.run_until_complete(main())
+        # The jobs were cancelled before they were picked, unless a worker was faster
+        assert len(calls) < 100
+    finally:
+        loop.close()
+
+
+def test_close_with_pending_jobs() -> None:
+    loop = ThreadSafeLoop()
+    future = loop.run_in_executor(None, time.sleep, 0.01)
+    loop.close()
+    assert not future.done()
+
+
+def test_default_executor() -> None:
+    loop = ThreadSafeLoop()
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="custom")
+    try:
+        with pytest.raises(TypeError):
+            loop.set_default_executor(object())  # type: ignore[arg-type]
+
+        loop.set_default_executor(executor)
+
+        async def main() -> str:
+            name = await loop.run_in_executor(None, lambda: threading.current_thread().name)
+            await loop.shutdown_default_executor()
+            return name
+
+        assert loop.run_until_complete(main()).startswith("custom")
+    finally:
+        loop.close()
+        executor.shutdown()
+
+
+def test_run_in_executor_rejects_coroutines() -> None:
+    loop = ThreadSafeLoop()
+    try:
+        async def coro() -> None:
+            pass
+
+        with pytest.raises(TypeError):
+            loop.run_in_executor(None, coro)  # type: ignore[arg-type]
+    finally:
+        loop.close()
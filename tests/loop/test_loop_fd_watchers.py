@@ -0,0 +1,180 @@
+from leviathan import Loop, ThreadSafeLoop
+
+from unittest.mock import MagicMock
+from typing import Any, Type
+
+import pytest, asyncio, errno, socket, os
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_add_reader(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    rsock, wsock = socket.socketpair()
+    try:
+        rsock.setblocking(False)
+        messages: list[bytes] = []
+
+        def reader(sock: socket.socket) -> None:
+            messages.append(sock.recv(1024))
+            if len(messages) == 3:
+                loop.stop()
+            else:
+                loop.call_soon(wsock.send, b"ping")
+
+        loop.add_reader(rsock, reader, rsock)
+        wsock.send(b"ping")
+        loop.run_forever()
+
+        assert messages == [b"ping"] * 3
+        assert loop.remove_reader(rsock)
+        assert not loop.remove_reader(rsock)
+    finally:
+        loop.close()
+        rsock.close()
+        wsock.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_add_reader_is_level_triggered(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    rsock, wsock = socket.socketpair()
+    try:
+        rsock.setblocking(False)
+        chunks: list[bytes] = []
+
+        def reader() -> None:
+            chunks.append(rsock.recv(2))
+            if len(chunks) == 3:
+                loop.remove_reader(rsock)
+                loop.stop()
+
+        loop.add_reader(rsock.fileno(), reader)
+        wsock.send(b"abcdef")
+        loop.run_forever()
+
+        assert chunks == [b"ab", b"cd", b"ef"]
+    finally:
+        loop.close()
+        rsock.close()
+        wsock.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_add_writer(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    rsock, wsock = socket.socketpair()
+    try:
+        def writer() -> None:
+            wsock.send(b"pong")
+            assert loop.remove_writer(wsock)
+            loop.stop()
+
+        loop.add_writer(wsock, writer)
+        loop.run_forever()
+
+        assert rsock.recv(1024) == b"pong"
+        assert not loop.remove_writer(wsock)
+    finally:
+        loop.close()
+        rsock.close()
+        wsock.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_add_reader_replaces_callback(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    rsock, wsock = socket.socketpair()
+    try:
+        rsock.setblocking(False)
+        old_callback = MagicMock()
+
+        def new_callback() -> None:
+            rsock.recv(1024)
+            loop.remove_reader(rsock)
+            loop.stop()
+
+        loop.add_reader(rsock, old_callback)
+        loop.add_reader(rsock, new_callback)
+        wsock.send(b"ping")
+        loop.run_forever()
+
+        old_callback.assert_not_called()
+    finally:
+        loop.close()
+        rsock.close()
+        wsock.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_add_reader_invalid_fd(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    try:
+        rfd, wfd = os.pipe()
+        os.close(rfd)
+        os.close(wfd)
+
+        with pytest.raises(OSError):
+            loop.add_reader(rfd, print)
+
+        with pytest.raises(ValueError):
+            loop.add_writer(-1, print)
+
+        rsock, wsock = socket.socketpair()
+        with rsock, wsock:
+            with pytest.raises(TypeError):
+                loop.add_reader(rsock, None)
+            with pytest.raises(TypeError):
+                loop.add_writer(wsock, 1)
+            assert not loop.remove_reader(rsock)
+            assert not loop.remove_writer(wsock)
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_reader_fd_closed_without_remove(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    rsock, wsock = socket.socketpair()
+    try:
+        contexts: list[dict[str, Any]] = []
+        loop._exception_handler = contexts.append  # type: ignore
+        fd = rsock.fileno()
+        calls: list[bytes] = []
+
+        def reader() -> None:
+            calls.append(os.read(fd, 1024))
+            # Closed without remove_reader, the next poll fails
+            rsock.close()
+
+        loop.add_reader(fd, reader)
+        wsock.send(b"ping")
+        loop.call_later(0.1, loop.stop)
+        loop.run_forever()
+
+        assert calls == [b"ping"]
+        assert len(contexts) == 1
+        exception = contexts[0]["exception"]
+        assert isinstance(exception, OSError) and exception.errno == errno.EBADF
+        assert contexts[0]["callback"] is reader
+        # The failed watcher is dropped instead of being re-armed
+        assert not loop.remove_reader(fd)
+    finally:
+        loop.close()
+        rsock.close()
+        wsock.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_close_with_watchers(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    rsock, wsock = socket.socketpair()
+    try:
+        callback = MagicMock()
+        loop.add_reader(rsock, callback)
+        loop.add_writer(wsock, callback)
+    finally:
+        loop.close()
+        rsock.close()
+        wsock.close()
+
+    callback.assert_not_called()
@@ -0,0 +1,80 @@
+from leviathan import Loop, ThreadSafeLoop
+
+from typing import Type
+from pathlib import Path
+
+import pytest, asyncio, os
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_file_read_and_readinto(loop_obj: Type[asyncio.AbstractEventLoop], tmp_path: Path) -> None:
+    path = tmp_path / "data"
+    path.write_bytes(b"hello world")
+
+    loop = loop_obj()
+    try:
+        with open(path, "rb") as file:
+            async def main() -> tuple[bytes, bytes, int, bytearray, bytes]:
+                head = await loop.file_read(file, 5)
+                # Reading at an offset doesn't move the file position
+                tail = await loop.file_read(file.fileno(), 100, 6)
+                buffer = bytearray(8)
+                nbytes = await loop.file_readinto(file, memoryview(buffer)[2:], 0)
+                rest = await loop.file_read(file, 100)
+                return head, tail, nbytes, buffer, rest
+
+            head, tail, nbytes, buffer, rest = loop.run_until_complete(main())
+            assert head == b"hello"
+            assert tail == b"world"
+            assert nbytes == 6
+            assert buffer == b"\x00\x00hello "
+            assert rest == b" world"
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_file_write(loop_obj: Type[asyncio.AbstractEventLoop], tmp_path: Path) -> None:
+    path = tmp_path / "data"
+    data = os.urandom(1024 * 1024)
+
+    loop = loop_obj()
+    try:
+        with open(path, "wb") as file:
+            async def main() -> tuple[int, int, int]:
+                written = await loop.file_write(file, data)
+                appended = await loop.file_write(file, b"tail")
+                patched = await loop.file_write(file, memoryview(b"HEAD"), 0)
+                return written, appended, patched
+
+            assert loop.run_until_complete(main()) == (len(data), 4, 4)
+
+        assert path.read_bytes() == b"HEAD" + data[4:] + b"tail"
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_file_read_errors(loop_obj: Type[asyncio.AbstractEventLoop], tmp_path: Path) -> None:
+    path = tmp_path / "data"
+    path.write_bytes(b"data")
+
+    loop = loop_obj()
+    try:
+        with open(path, "rb") as file:
+            with pytest.raises(ValueError):
+                loop.file_read(file, 4, -2)
+
+            with pytest.raises(ValueError):
+                loop.file_read(file, -1)
+
+            with pytest.raises(OSError):
+                loop.run_until_complete(loop.file_write(file, b"data"))
+
+        read_fd, write_fd = os.pipe()
+        os.close(write_fd)
+        os.close(read_fd)
+        with pytest.raises(OSError):
+            loop.run_until_complete(loop.file_read(read_fd, 4))
+    finally:
+        loop.close()
@@ -0,0 +1,288 @@
+from leviathan import Loop, ThreadSafeLoop, Resolver
+
+from typing import Any, Type
+from pathlib import Path
+
+import pytest, asyncio, socket, struct, threading
+
+
+def encode_name(name: str) -> bytes:
+    return b"".join(
+        bytes([len(label)]) + label.encode() for label in name.rstrip(".").split(".")
+    ) + b"\x00"
+
+
+class FakeDNSServer:
+    # Answers A, AAAA and PTR queries from a table, over UDP and TCP on the same port
+    def __init__(self, records: dict[tuple[str, int], tuple[list[Any], int]]) -> None:
+        self.records = records
+        self.truncated: set[str] = set()
+        self.queries: list[tuple[str, int, str]] = []
+        self.query_ids: list[int] = []
+
+        self.udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udp.bind(("127.0.0.1", 0))
+        self.address = self.udp.getsockname()
+        self.tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.tcp.bind(self.address)
+        self.tcp.listen()
+
+        self.threads = [
+            threading.Thread(target=self.serve_udp, daemon=True),
+            threading.Thread(target=self.serve_tcp, daemon=True),
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def close(self) -> None:
+        for sock in (self.udp, self.tcp):
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+    def answer(self, query: bytes, transport: str) -> bytes:
+        query_id, _ = struct.unpack_from("!HH", query)
+        self.query_ids.append(query_id)
+        offset = 12
+        labels = []
+        while query[offset]:
+            length = query[offset]
+            labels.append(query[offset + 1:offset + 1 + length].decode())
+            offset += length + 1
+        name = ".".join(labels)
+        qtype, _ = struct.unpack_from("!HH", query, offset + 1)
+        question = query[12:offset + 5]
+        self.queries.append((name, qtype, transport))
+
+        flags = 0x8180
+        if transport == "udp" and name in self.truncated:
+            return struct.pack("!HHHHHH", query_id, flags | 0x0200, 1, 0, 0, 0) + question
+
+        entry = self.records.get((name, qtype))
+        if entry is None:
+            known = any(record_name == name for record_name, _ in self.records)
+            rcode = 0 if known else 3
+            return struct.pack("!HHHHHH", query_id, flags | rcode, 1, 0, 0, 0) + question
+
+        values, ttl = entry
+        answers = b""
+        for value in values:
+            if qtype == 1:
+                rdata = socket.inet_pton(socket.AF_INET, value)
+            elif qtype == 28:
+                rdata = socket.inet_pton(socket.AF_INET6, value)
+            else:
+                rdata = encode_name(value)
+            # The owner name points to the question
+            answers += struct.pack("!HHHIH", 0xC00C, qtype, 1, ttl, len(rdata)) + rdata
+
+        return struct.pack("!HHHHHH", query_id, flags, 1, len(values), 0, 0) + question + answers
+
+    def serve_udp(self) -> None:
+        while True:
+            try:
+                query, address = self.udp.recvfrom(4096)
+                if not query:
+                    return
+                self.udp.sendto(self.answer(query, "udp"), address)
+            except OSError:
+                return
+
+    def serve_tcp(self) -> None:
+        while True:
+            try:
+                conn, _ = self.tcp.accept()
+            except OSError:
+                return
+
+            with conn:
+                (length,) = struct.unpack("!H", conn.recv(2))
+                query = b""
+                while len(query) < length:
+                    query += conn.recv(length - len(query))
+                response = self.answer(query, "tcp")
+                conn.sendall(struct.pack("!H", len(response)) + response)
+
+
+@pytest.fixture
+def dns_server() -> Any:
+    server = FakeDNSServer({
+        ("upstream.test", 1): (["127.0.0.1"], 300),
+        ("upstream.test", 28): (["::1"], 300),
+        ("short.test", 1): (["127.0.0.2"], 0),
+        ("big.test", 1): (["127.0.0.3", "127.0.0.4"], 300),
+        ("host.corp.test", 1): (["127.0.0.5"], 300),
+        ("1.0.0.127.in-addr.arpa", 12): (["upstream.test"], 300),
+    })
+    server.truncated.add("big.test")
+    try:
+        yield server
+    finally:
+        server.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_getaddrinfo_is_cached(loop_obj: Type[asyncio.AbstractEventLoop], dns_server: FakeDNSServer) -> None:
+    loop = loop_obj()
+    try:
+        resolver = Resolver(loop, nameservers=[dns_server.address], hosts_path=None)  # type: ignore
+        loop.set_resolver(resolver)  # type: ignore
+
+        async def main() -> list[list[tuple[Any, ...]]]:
+            results = await asyncio.gather(*[
+                loop.getaddrinfo("upstream.test", 80, type=socket.SOCK_STREAM) for _ in range(5)
+            ])
+            results.append(
+                await loop.getaddrinfo("upstream.test", 80, family=socket.AF_INET, type=socket.SOCK_STREAM)
+            )
+            return results
+
+        results = loop.run_until_complete(main())
+        assert results[0] == [
+            (socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", ("127.0.0.1", 80)),
+            (socket.AF_INET6, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", ("::1", 80, 0, 0)),
+        ]
+        assert all(result == results[0] for result in results[1:5])
+        assert results[5] == results[0][:1]
+        # Concurrent lookups shared their queries, the last one was answered from the cache
+        assert sorted(dns_server.queries) == [("upstream.test", 1, "udp"), ("upstream.test", 28, "udp")]
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_getaddrinfo_ttl_and_lru(loop_obj: Type[asyncio.AbstractEventLoop], dns_server: FakeDNSServer) -> None:
+    loop = loop_obj()
+    try:
+        resolver = Resolver(
+            loop, nameservers=[dns_server.address], hosts_path=None, cache_size=1  # type: ignore
+        )
+
+        async def main() -> None:
+            for _ in range(2):
+                # A zero TTL isn't cached
+                assert (await resolver.resolve("short.test", socket.AF_INET))[0] == ["127.0.0.2"]
+
+            await resolver.resolve("upstream.test", socket.AF_INET)
+            await resolver.resolve("host.corp.test", socket.AF_INET)
+            # Evicted by the previous lookup
+            await resolver.resolve("upstream.test", socket.AF_INET)
+
+        loop.run_until_complete(main())
+        assert [name for name, _, _ in dns_server.queries] == [
+            "short.test", "short.test", "upstream.test", "host.corp.test", "upstream.test"
+        ]
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_query_ids_are_random(loop_obj: Type[asyncio.AbstractEventLoop], dns_server: FakeDNSServer) -> None:
+    loop = loop_obj()
+    try:
+        resolver = Resolver(loop, nameservers=[dns_server.address], hosts_path=None)  # type: ignore
+
+        async def main() -> None:
+            for _ in range(8):
+                resolver.clear_cache()
+                await resolver.resolve("upstream.test", socket.AF_INET)
+
+        loop.run_until_complete(main())
+        query_ids = dns_server.query_ids
+        assert len(query_ids) == 8
+        # Consecutive IDs would let anyone who saw one query predict the next
+        assert any((b - a) & 0xFFFF != 1 for a, b in zip(query_ids, query_ids[1:]))
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_getaddrinfo_lookups(
+    loop_obj: Type[asyncio.AbstractEventLoop], dns_server: FakeDNSServer, tmp_path: Path
+) -> None:
+    hosts_path = tmp_path / "hosts"
+    hosts_path.write_text("# comment\n10.1.2.3 pinned.test pinned # inline comment\n")
+
+    loop = loop_obj()
+    try:
+        resolver = Resolver(
+            loop, nameservers=[dns_server.address], search=["corp.test"],  # type: ignore
+            hosts_path=str(hosts_path)
+        )
+        loop.set_resolver(resolver)  # type: ignore
+
+        async def main() -> None:
+            # Numeric hosts and names from the hosts file never reach the nameserver
+            infos = await loop.getaddrinfo("127.0.0.9", "80", type=socket.SOCK_DGRAM)
+            assert infos == [(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP, "", ("127.0.0.9", 80))]
+            infos = await loop.getaddrinfo("pinned", 443, type=socket.SOCK_STREAM)
+            assert [info[4] for info in infos] == [("10.1.2.3", 443)]
+            assert dns_server.queries == []
+
+            # Search domains, truncated answers retried over TCP and canonical names
+            infos = await loop.getaddrinfo("host", 1, family=socket.AF_INET, type=socket.SOCK_STREAM)
+            assert [info[4] for info in infos] == [("127.0.0.5", 1)]
+            infos = await loop.getaddrinfo(
+                "big.test", 1, family=socket.AF_INET, type=socket.SOCK_STREAM, flags=socket.AI_CANONNAME
+            )
+            assert [info[4] for info in infos] == [("127.0.0.3", 1), ("127.0.0.4", 1)]
+            assert infos[0][3] == "big.test"
+
+            with pytest.raises(socket.gaierror) as exc_info:
+                await loop.getaddrinfo("missing.test", 80)
+            assert exc_info.value.errno == socket.EAI_NONAME
+
+            assert await loop.getnameinfo(("127.0.0.1", 80)) == ("upstream.test", "http")
+            assert await loop.getnameinfo(("10.1.2.3", 80), socket.NI_NUMERICSERV) == ("pinned.test", "80")
+            assert await loop.getnameinfo(("127.0.0.8", 80), socket.NI_NUMERICSERV) == ("127.0.0.8", "80")
+            with pytest.raises(socket.gaierror):
+                await loop.getnameinfo(("127.0.0.8", 80), socket.NI_NAMEREQD)
+
+        loop.run_until_complete(main())
+        assert ("big.test", 1, "tcp") in dns_server.queries
+        assert dns_server.queries[0] == ("host.corp.test", 1, "udp")
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_create_connection_uses_resolver(
+    loop_obj: Type[asyncio.AbstractEventLoop], dns_server: FakeDNSServer
+) -> None:
+    loop = loop_obj()
+    try:
+        loop.set_resolver(Resolver(loop, nameservers=[dns_server.address], hosts_path=None))  # type: ignore
+
+        async def main() -> None:
+            server = await loop.create_server(asyncio.Protocol, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            for _ in range(3):
+                _, writer = await asyncio.open_connection("upstream.test", port, family=socket.AF_INET)
+                writer.close()
+                await writer.wait_closed()
+            server.close()
+            await server.wait_closed()
+
+        loop.run_until_complete(main())
+        assert dns_server.queries == [("upstream.test", 1, "udp")]
+    finally:
+        loop.close()
+
+
+def test_unreachable_nameserver() -> None:
+    loop = Loop()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    try:
+        resolver = Resolver(
+            loop, nameservers=[sock.getsockname()], hosts_path=None, timeout=0.05, attempts=2  # type: ignore
+        )
+
+        with pytest.raises(socket.gaierror) as exc_info:
+            loop.run_until_complete(resolver.getaddrinfo("nowhere.test", 80))
+        assert exc_info.value.errno == socket.EAI_AGAIN
+    finally:
+        loop.close()
+        sock.close()
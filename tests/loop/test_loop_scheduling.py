@@ -4,7 +4,7 @@ from contextvars import copy_context
 from unittest.mock import MagicMock
 from typing import Type
 
-import pytest, asyncio, random
+import pytest, asyncio, random, threading, weakref
 
 DELAY_TIME = 0.01
 
@@ -65,6 +65,54 @@ def test_call_soon_with_context(loop_obj: Type[asyncio.AbstractEventLoop]) -> No
         loop.close()
 
 
+def test_call_soon_threadsafe_wakes_up_loop() -> None:
+    loop = ThreadSafeLoop()
+    try:
+        mock_func = MagicMock()
+
+        def call_from_thread() -> None:
+            loop.call_soon_threadsafe(mock_func, 1)
+            loop.call_soon_threadsafe(loop.stop)
+
+        # The loop is already waiting for events when the thread dispatches the callbacks
+        loop.call_later(DELAY_TIME, threading.Thread(target=call_from_thread).start)
+        loop.run_forever()
+        mock_func.assert_called_once_with(1)
+    finally:
+        loop.close()
+
+
+def test_call_soon_threadsafe_many_producers() -> None:
+    loop = ThreadSafeLoop()
+    try:
+        producers_num = 16
+        calls_num = 2000
+        received: list[list[int]] = [[] for _ in range(producers_num)]
+
+        def produce(index: int) -> None:
+            for value in range(calls_num):
+                loop.call_soon_threadsafe(received[index].append, value)
+
+        async def main() -> None:
+            threads = [threading.Thread(target=produce, args=(index,)) for index in range(producers_num)]
+            for thread in threads:
+                thread.start()
+            while any(thread.is_alive() for thread in threads):
+                await asyncio.sleep(0.001)
+            for thread in threads:
+                thread.join()
+
+            # Callbacks pushed by the end of the threads run within the next iterations
+            for _ in range(2):
+                await asyncio.sleep(0)
+
+        loop.run_until_complete(main())
+        # Callbacks from the same thread keep their order
+        assert received == [list(range(calls_num))] * producers_num
+    finally:
+        loop.close()
+
+
 @pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
 def test_call_later(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
     loop = loop_obj()
@@ -113,6 +161,29 @@ def test_call_later_with_cancel(loop_obj: Type[asyncio.AbstractEventLoop]) -> No
         loop.close()
 
 
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_call_later_cancel_releases_callback(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    class Argument:
+        pass
+
+    loop = loop_obj()
+    try:
+        argument = Argument()
+        argument_ref = weakref.ref(argument)
+
+        h = loop.call_later(3600, print, argument)
+        del argument
+        assert argument_ref() is not None
+
+        h.cancel()
+        assert argument_ref() is None
+        assert h.cancelled()
+
+        h.cancel()
+    finally:
+        loop.close()
+
+
 @pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
 def test_call_later_with_context(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
     loop = loop_obj()
@@ -137,6 +208,29 @@ def test_call_later_with_context(loop_obj: Type[asyncio.AbstractEventLoop]) -> N
         loop.close()
 
 
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_call_at_many_timers(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    try:
+        calls_num = 5000
+        delays = list(range(calls_num))
+        random.shuffle(delays)
+
+        calls: list[int] = []
+        start_time = loop.time()
+        for delay in delays:
+            loop.call_at(start_time + DELAY_TIME * 5 * delay / calls_num, calls.append, delay)
+
+        far_handle = loop.call_later(3600, calls.append, -1)
+        loop.call_later(DELAY_TIME * 6, loop.stop)
+        loop.run_forever()
+
+        assert calls == sorted(delays)
+        assert not far_handle.cancelled()
+    finally:
+        loop.close()
+
+
 @pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
 def test_call_at(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
     loop = loop_obj()
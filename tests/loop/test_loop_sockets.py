@@ -0,0 +1,296 @@
+from leviathan import Loop, ThreadSafeLoop
+
+from typing import Type
+from pathlib import Path
+
+import pytest, asyncio, io, os, socket
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_sock_accept_connect_and_echo(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        server.setblocking(False)
+        client.setblocking(False)
+
+        async def serve() -> None:
+            conn, address = await loop.sock_accept(server)
+            with conn:
+                assert address == client.getsockname()
+                assert not conn.getblocking()
+
+                data = await loop.sock_recv(conn, 1024)
+                await loop.sock_sendall(conn, data.upper())
+
+        async def main() -> bytes:
+            server_task = loop.create_task(serve())
+            await loop.sock_connect(client, server.getsockname())
+            await loop.sock_sendall(client, b"ping")
+            data = await loop.sock_recv(client, 1024)
+            await server_task
+            return data
+
+        assert loop.run_until_complete(main()) == b"PING"
+    finally:
+        loop.close()
+        server.close()
+        client.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_sock_recv_into_and_eof(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    rsock, wsock = socket.socketpair()
+    try:
+        rsock.setblocking(False)
+
+        async def main() -> tuple[int, bytearray, bytes]:
+            buffer = bytearray(16)
+            await loop.sock_sendall(wsock, b"hello")
+            nbytes = await loop.sock_recv_into(rsock, memoryview(buffer)[4:])
+            wsock.close()
+            return nbytes, buffer, await loop.sock_recv(rsock, 1024)
+
+        nbytes, buffer, eof = loop.run_until_complete(main())
+        assert nbytes == 5
+        assert buffer[4:9] == b"hello"
+        assert eof == b""
+    finally:
+        loop.close()
+        rsock.close()
+        wsock.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_sock_sendall_large_payload(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    rsock, wsock = socket.socketpair()
+    try:
+        rsock.setblocking(False)
+        wsock.setblocking(False)
+        payload = bytes(range(256)) * 16384
+
+        async def reader() -> bytes:
+            chunks: list[bytes] = []
+            while chunk := await loop.sock_recv(rsock, 65536):
+                chunks.append(chunk)
+            return b"".join(chunks)
+
+        async def main() -> bytes:
+            reader_task = loop.create_task(reader())
+            await loop.sock_sendall(wsock, payload)
+            wsock.shutdown(socket.SHUT_WR)
+            return await reader_task
+
+        assert loop.run_until_complete(main()) == payload
+    finally:
+        loop.close()
+        rsock.close()
+        wsock.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_sock_recv_cancelled(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    rsock, wsock = socket.socketpair()
+    try:
+        rsock.setblocking(False)
+
+        async def main() -> bytes:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(loop.sock_recv(rsock, 1024), 0.01)
+
+            # The cancelled recv must not consume the data
+            await asyncio.sleep(0.01)
+            wsock.send(b"ping")
+            return await loop.sock_recv(rsock, 1024)
+
+        assert loop.run_until_complete(main()) == b"ping"
+    finally:
+        loop.close()
+        rsock.close()
+        wsock.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_sock_recv_many_in_flight(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    rsock, wsock = socket.socketpair()
+    try:
+        rsock.setblocking(False)
+        # More operations than the ring has submission entries
+        recvs_num = 3000
+
+        async def main() -> list[bytes]:
+            tasks = [asyncio.ensure_future(loop.sock_recv(rsock, 1)) for _ in range(recvs_num)]
+            await asyncio.sleep(0.01)
+            wsock.sendall(b"x" * recvs_num)
+            return await asyncio.gather(*tasks)
+
+        assert loop.run_until_complete(main()) == [b"x"] * recvs_num
+    finally:
+        loop.close()
+        rsock.close()
+        wsock.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_sock_connect_refused(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        server.bind(("127.0.0.1", 0))
+        address = server.getsockname()
+        server.close()
+        client.setblocking(False)
+
+        with pytest.raises(ConnectionRefusedError):
+            loop.run_until_complete(loop.sock_connect(client, address))
+    finally:
+        loop.close()
+        client.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_sock_accept_multishot(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    clients = [socket.socket(socket.AF_INET, socket.SOCK_STREAM) for _ in range(32)]
+    try:
+        server.bind(("127.0.0.1", 0))
+        server.listen(len(clients))
+        server.setblocking(False)
+
+        async def main() -> list[socket.socket]:
+            accepted: list[socket.socket] = []
+            fut = loop._sock_accept_multishot(server, accepted.append)  # type: ignore
+
+            for client in clients:
+                client.setblocking(False)
+                await loop.sock_connect(client, server.getsockname())
+
+            while len(accepted) < len(clients):
+                await asyncio.sleep(0.01)
+
+            assert not fut.done()
+            fut.cancel()
+            await asyncio.sleep(0.01)
+            return accepted
+
+        accepted = loop.run_until_complete(main())
+        try:
+            assert sorted(conn.getpeername() for conn in accepted) == sorted(
+                client.getsockname() for client in clients
+            )
+            assert all(not conn.getblocking() for conn in accepted)
+        finally:
+            for conn in accepted:
+                conn.close()
+    finally:
+        loop.close()
+        server.close()
+        for client in clients:
+            client.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_sock_recv_with_busy_poll(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj(busy_poll_us=500)
+    rsock, wsock = socket.socketpair()
+    try:
+        rsock.setblocking(False)
+
+        async def main() -> list[bytes]:
+            received = []
+            for i in range(20):
+                # Alternate between completions inside and outside the spinning window
+                loop.call_later(0.002 * (i % 2), wsock.send, b"x")
+                received.append(await loop.sock_recv(rsock, 1))
+            return received
+
+        assert loop.run_until_complete(main()) == [b"x"] * 20
+    finally:
+        loop.close()
+        rsock.close()
+        wsock.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_negative_busy_poll(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    with pytest.raises(ValueError):
+        loop_obj(busy_poll_us=-1)
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_sock_sendfile(loop_obj: Type[asyncio.AbstractEventLoop], tmp_path: Path) -> None:
+    payload = os.urandom(8 * 1024 * 1024)
+    path = tmp_path / "payload"
+    path.write_bytes(payload)
+
+    loop = loop_obj()
+    rsock, wsock = socket.socketpair()
+    try:
+        rsock.setblocking(False)
+        wsock.setblocking(False)
+
+        async def receive(nbytes: int) -> bytes:
+            data = bytearray()
+            while len(data) < nbytes:
+                chunk = await loop.sock_recv(rsock, 256 * 1024)
+                assert chunk
+                data.extend(chunk)
+            return bytes(data)
+
+        async def main() -> tuple[int, int, bytes, bytes]:
+            with open(path, "rb") as file:
+                # The socket buffer fills up long before the whole file is sent
+                receiver = loop.create_task(receive(len(payload) - 10))
+                sent = await loop.sock_sendfile(wsock, file, 10)
+                received = await receiver
+
+                receiver = loop.create_task(receive(1000))
+                partial_sent = await loop.sock_sendfile(wsock, file, 5, 1000)
+                assert file.tell() == 1005
+                return sent, partial_sent, received, await receiver
+
+        sent, partial_sent, received, partial = loop.run_until_complete(main())
+        assert sent == len(payload) - 10
+        assert received == payload[10:]
+        assert partial_sent == 1000
+        assert partial == payload[5:1005]
+    finally:
+        loop.close()
+        rsock.close()
+        wsock.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_sock_sendfile_fallback(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    rsock, wsock = socket.socketpair()
+    try:
+        rsock.setblocking(False)
+        wsock.setblocking(False)
+
+        async def main() -> tuple[int, bytes]:
+            file = io.BytesIO(b"in memory data")
+            with pytest.raises(asyncio.SendfileNotAvailableError):
+                await loop.sock_sendfile(wsock, file, fallback=False)
+
+            with pytest.raises(ValueError):
+                await loop.sock_sendfile(wsock, file, -1)
+
+            sent = await loop.sock_sendfile(wsock, file, 3, 6)
+            assert file.tell() == 9
+            return sent, await loop.sock_recv(rsock, 1024)
+
+        assert loop.run_until_complete(main()) == (6, b"memory")
+    finally:
+        loop.close()
+        rsock.close()
+        wsock.close()
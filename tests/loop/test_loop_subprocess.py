@@ -0,0 +1,86 @@
+from leviathan import Loop, ThreadSafeLoop
+
+from typing import Type
+
+import pytest, asyncio, os, signal, subprocess, sys
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_subprocess_exec(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    try:
+        data = os.urandom(512 * 1024)
+
+        async def main() -> tuple[bytes, bytes, int | None]:
+            proc = await asyncio.create_subprocess_exec(
+                sys.executable, "-c",
+                "import sys; sys.stdout.buffer.write(sys.stdin.buffer.read()); sys.stderr.write('err'); sys.exit(3)",
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            )
+            stdout, stderr = await proc.communicate(data)
+            return stdout, stderr, proc.returncode
+
+        stdout, stderr, returncode = loop.run_until_complete(main())
+        assert stdout == data
+        assert stderr == b"err"
+        assert returncode == 3
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_subprocess_shell(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    try:
+        async def main() -> tuple[bytes, int]:
+            proc = await asyncio.create_subprocess_shell(
+                "echo hello; echo world 1>&2", stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+            )
+            assert proc.stdout is not None
+            output = await proc.stdout.read()
+            return output, await proc.wait()
+
+        assert loop.run_until_complete(main()) == (b"hello\nworld\n", 0)
+
+        with pytest.raises(ValueError):
+            loop.run_until_complete(loop.subprocess_shell(asyncio.SubprocessProtocol, ["echo"]))  # type: ignore
+        with pytest.raises(ValueError):
+            loop.run_until_complete(
+                loop.subprocess_exec(asyncio.SubprocessProtocol, "echo", universal_newlines=True)
+            )
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_subprocess_signals(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    try:
+        async def main() -> tuple[int, int]:
+            terminated = await asyncio.create_subprocess_exec("sleep", "30")
+            killed = await asyncio.create_subprocess_exec("sleep", "30", stdout=subprocess.PIPE)
+            terminated.terminate()
+            killed.kill()
+            return await terminated.wait(), await killed.wait()
+
+        assert loop.run_until_complete(main()) == (-signal.SIGTERM, -signal.SIGKILL)
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_subprocess_many(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    try:
+        async def run(index: int) -> tuple[bytes, int]:
+            proc = await asyncio.create_subprocess_exec("echo", str(index), stdout=subprocess.PIPE)
+            stdout, _ = await proc.communicate()
+            return stdout, await proc.wait()
+
+        async def main() -> list[tuple[bytes, int]]:
+            return await asyncio.gather(*[run(index) for index in range(50)])
+
+        results = loop.run_until_complete(main())
+        assert results == [(f"{index}\n".encode(), 0) for index in range(50)]
+    finally:
+        loop.close()
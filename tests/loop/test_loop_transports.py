@@ -0,0 +1,458 @@
+from leviathan import Loop, ThreadSafeLoop
+
+from typing import Any, Type
+
+import pytest, asyncio, socket, os, tempfile
+
+
+class RecordingProtocol(asyncio.Protocol):
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.events: list[str] = []
+        self.data = bytearray()
+        self.transport: asyncio.Transport | None = None
+        self.lost: asyncio.Future[Exception | None] = loop.create_future()
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore
+        self.events.append("made")
+
+    def data_received(self, data: bytes) -> None:
+        self.data.extend(data)
+        if not self.events or self.events[-1] != "data":
+            self.events.append("data")
+
+    def eof_received(self) -> bool | None:
+        self.events.append("eof")
+        return None
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self.events.append("lost")
+        self.lost.set_result(exc)
+
+
+class EchoProtocol(asyncio.Protocol):
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport: asyncio.Transport = transport  # type: ignore
+
+    def data_received(self, data: bytes) -> None:
+        self.transport.write(data)
+
+    def eof_received(self) -> bool | None:
+        # Closing flushes the echoed data first
+        return None
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_create_server_and_connection(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    try:
+        async def main() -> RecordingProtocol:
+            server = await loop.create_server(EchoProtocol, "127.0.0.1", 0)
+            address = server.sockets[0].getsockname()
+
+            transport, protocol = await loop.create_connection(
+                lambda: RecordingProtocol(loop), *address
+            )
+            assert isinstance(protocol, RecordingProtocol)
+            assert transport.get_extra_info("peername") == address
+            assert transport.get_extra_info("missing", 42) == 42
+            assert isinstance(transport.get_extra_info("socket"), socket.socket)
+
+            transport.write(b"hello ")
+            transport.writelines([b"from ", bytearray(b"leviathan"), memoryview(b"!")])
+            transport.write_eof()
+            assert await protocol.lost is None
+
+            server.close()
+            await server.wait_closed()
+            return protocol
+
+        protocol = loop.run_until_complete(main())
+        assert protocol.events == ["made", "data", "eof", "lost"]
+        assert protocol.data == b"hello from leviathan!"
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_streams_large_payload(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    payload = os.urandom(4 * 1024 * 1024)
+    try:
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            while data := await reader.read(65536):
+                writer.write(data)
+                await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+
+        async def main() -> bytes:
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname())
+
+            async def send() -> None:
+                writer.write(payload)
+                await writer.drain()
+                writer.write_eof()
+
+            send_task = loop.create_task(send())
+            data = await reader.read()
+            await send_task
+
+            writer.close()
+            await writer.wait_closed()
+            server.close()
+            await server.wait_closed()
+            return data
+
+        assert loop.run_until_complete(main()) == payload
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_pause_and_resume_reading(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    rsock, wsock = socket.socketpair()
+    try:
+        async def main() -> RecordingProtocol:
+            transport, protocol = await loop.create_connection(
+                lambda: RecordingProtocol(loop), sock=rsock
+            )
+            assert isinstance(protocol, RecordingProtocol)
+
+            transport.pause_reading()
+            assert not transport.is_reading()
+
+            wsock.send(b"ping")
+            await asyncio.sleep(0.05)
+            assert protocol.data == b""
+
+            transport.resume_reading()
+            assert transport.is_reading()
+            await asyncio.sleep(0.05)
+            assert protocol.data == b"ping"
+
+            transport.close()
+            assert transport.is_closing()
+            await protocol.lost
+            return protocol
+
+        protocol = loop.run_until_complete(main())
+        assert protocol.events == ["made", "data", "lost"]
+        assert rsock.fileno() == -1
+    finally:
+        loop.close()
+        rsock.close()
+        wsock.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_write_flow_control(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    rsock, wsock = socket.socketpair()
+    try:
+        rsock.setblocking(False)
+        events: list[str] = []
+
+        class WriterProtocol(RecordingProtocol):
+            def pause_writing(self) -> None:
+                events.append("pause")
+
+            def resume_writing(self) -> None:
+                events.append("resume")
+
+        async def main() -> bytes:
+            transport, protocol = await loop.create_connection(
+                lambda: WriterProtocol(loop), sock=wsock
+            )
+            assert isinstance(protocol, WriterProtocol)
+
+            transport.set_write_buffer_limits(high=1024)
+            assert transport.get_write_buffer_limits() == (256, 1024)
+            with pytest.raises(ValueError):
+                transport.set_write_buffer_limits(high=1, low=2)
+
+            payload = b"x" * (8 * 1024 * 1024)
+            transport.write(payload)
+            assert transport.get_write_buffer_size() > 1024
+            assert events == ["pause"]
+
+            received = bytearray()
+            while len(received) < len(payload):
+                received.extend(await loop.sock_recv(rsock, 1024 * 1024))
+
+            await asyncio.sleep(0.01)
+            assert events == ["pause", "resume"]
+            assert transport.get_write_buffer_size() == 0
+
+            transport.abort()
+            await protocol.lost
+            return bytes(received)
+
+        assert loop.run_until_complete(main()) == b"x" * (8 * 1024 * 1024)
+    finally:
+        loop.close()
+        rsock.close()
+        wsock.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_connection_reset(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    try:
+        async def main() -> Any:
+            server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server_sock.bind(("127.0.0.1", 0))
+            server_sock.listen()
+            server_sock.setblocking(False)
+
+            connect_task = loop.create_task(
+                loop.create_connection(lambda: RecordingProtocol(loop), *server_sock.getsockname())
+            )
+            conn, _ = await loop.sock_accept(server_sock)
+            _, protocol = await connect_task
+            assert isinstance(protocol, RecordingProtocol)
+
+            # Closing with unread data makes the kernel send a RST
+            conn.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, b"\x01\x00\x00\x00\x00\x00\x00\x00")
+            conn.close()
+            server_sock.close()
+            return await protocol.lost
+
+        assert isinstance(loop.run_until_complete(main()), ConnectionResetError)
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_unix_server_and_connection(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "leviathan.sock")
+
+            async def main() -> bytes:
+                server = await loop.create_unix_server(EchoProtocol, path)
+                transport, protocol = await loop.create_unix_connection(
+                    lambda: RecordingProtocol(loop), path
+                )
+                assert isinstance(protocol, RecordingProtocol)
+
+                transport.write(b"unix")
+                transport.write_eof()
+                await protocol.lost
+
+                server.close()
+                await server.wait_closed()
+                assert not os.path.exists(path)
+                return bytes(protocol.data)
+
+            assert loop.run_until_complete(main()) == b"unix"
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_server_wait_closed_waits_for_clients(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    try:
+        async def main() -> None:
+            server = await loop.create_server(EchoProtocol, "127.0.0.1", 0)
+            assert server.is_serving()
+
+            transport, protocol = await loop.create_connection(
+                lambda: RecordingProtocol(loop), *server.sockets[0].getsockname()
+            )
+            assert isinstance(protocol, RecordingProtocol)
+            transport.write(b"x")
+            while not protocol.data:
+                await asyncio.sleep(0.01)
+
+            server.close()
+            assert not server.is_serving()
+            waiter = loop.create_task(server.wait_closed())
+            await asyncio.sleep(0.01)
+            assert not waiter.done()
+
+            server.close_clients()
+            await waiter
+            await protocol.lost
+
+        loop.run_until_complete(main())
+    finally:
+        loop.close()
+
+
+class RecordingBufferedProtocol(asyncio.BufferedProtocol):
+    def __init__(self, loop: asyncio.AbstractEventLoop, buffer_size: int = 16) -> None:
+        self.buffer = bytearray(buffer_size)
+        self.sizehints: list[int] = []
+        self.data = bytearray()
+        self.lost: asyncio.Future[Exception | None] = loop.create_future()
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        self.sizehints.append(sizehint)
+        return memoryview(self.buffer)
+
+    def buffer_updated(self, nbytes: int) -> None:
+        self.data.extend(self.buffer[:nbytes])
+        # Nothing must be exporting the buffer anymore
+        self.buffer.extend(b"\x00")
+        del self.buffer[-1]
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self.lost.set_result(exc)
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_buffered_protocol(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    payload = os.urandom(256 * 1024)
+    try:
+        async def main() -> RecordingBufferedProtocol:
+            server = await loop.create_server(EchoProtocol, "127.0.0.1", 0)
+            transport, protocol = await loop.create_connection(
+                lambda: RecordingBufferedProtocol(loop, 4096), *server.sockets[0].getsockname()
+            )
+            assert isinstance(protocol, RecordingBufferedProtocol)
+
+            transport.pause_reading()
+            transport.write(payload)
+            await asyncio.sleep(0.05)
+            assert len(protocol.data) <= 4096
+            transport.resume_reading()
+
+            transport.write_eof()
+            await protocol.lost
+
+            server.close()
+            await server.wait_closed()
+            return protocol
+
+        protocol = loop.run_until_complete(main())
+        assert protocol.data == payload
+        assert set(protocol.sizehints) == {-1}
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_switch_between_streaming_and_buffered_protocols(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    rsock, wsock = socket.socketpair()
+    try:
+        async def main() -> tuple[RecordingProtocol, RecordingBufferedProtocol]:
+            transport, streaming = await loop.create_connection(
+                lambda: RecordingProtocol(loop), sock=rsock
+            )
+            assert isinstance(streaming, RecordingProtocol)
+
+            wsock.send(b"streaming")
+            while not streaming.data:
+                await asyncio.sleep(0.01)
+
+            # The data is copied into the new protocol buffer, 4 bytes at a time
+            transport.pause_reading()
+            wsock.send(b"buffered")
+            await asyncio.sleep(0.05)
+
+            buffered = RecordingBufferedProtocol(loop, 4)
+            transport.set_protocol(buffered)
+            assert transport.get_protocol() is buffered
+            transport.resume_reading()
+
+            while len(buffered.data) < 8:
+                await asyncio.sleep(0.01)
+
+            wsock.close()
+            await buffered.lost
+            return streaming, buffered
+
+        streaming, buffered = loop.run_until_complete(main())
+        assert streaming.data == b"streaming"
+        assert buffered.data == b"buffered"
+        assert buffered.sizehints[:2] == [8, 4]
+    finally:
+        loop.close()
+        rsock.close()
+        wsock.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_many_connections_with_pauses(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    payloads = [os.urandom(128 * 1024) for _ in range(16)]
+    try:
+        class PausingProtocol(RecordingProtocol):
+            def data_received(self, data: bytes) -> None:
+                super().data_received(data)
+                # The data received while paused must be delivered in order
+                assert self.transport is not None
+                self.transport.pause_reading()
+                loop.call_soon(self.transport.resume_reading)
+
+        async def main() -> list[bytes]:
+            server = await loop.create_server(EchoProtocol, "127.0.0.1", 0)
+            address = server.sockets[0].getsockname()
+
+            async def run(payload: bytes) -> bytes:
+                transport, protocol = await loop.create_connection(
+                    lambda: PausingProtocol(loop), *address
+                )
+                assert isinstance(protocol, PausingProtocol)
+                transport.write(payload)
+                transport.write_eof()
+                await protocol.lost
+                return bytes(protocol.data)
+
+            results = await asyncio.gather(*(run(payload) for payload in payloads))
+            server.close()
+            await server.wait_closed()
+            return results
+
+        assert loop.run_until_complete(main()) == payloads
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_sendfile(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    payload = os.urandom(4 * 1024 * 1024)
+    loop = loop_obj()
+    try:
+        async def main() -> RecordingProtocol:
+            server_protocol = RecordingProtocol(loop)
+            server = await loop.create_server(lambda: server_protocol, "127.0.0.1", 0)
+            address = server.sockets[0].getsockname()
+
+            transport, _ = await loop.create_connection(
+                lambda: RecordingProtocol(loop), *address
+            )
+
+            with tempfile.TemporaryFile() as file:
+                file.write(payload)
+                file.seek(0)
+
+                # Data written before the file is sent first
+                transport.write(b"header")
+                sendfile_task = loop.create_task(loop.sendfile(transport, file))
+                await asyncio.sleep(0)
+                with pytest.raises(RuntimeError):
+                    transport.write(b"too early")
+
+                assert await sendfile_task == len(payload)
+                assert file.tell() == len(payload)
+
+            transport.write(b"trailer")
+            transport.close()
+            assert await server_protocol.lost is None
+
+            server.close()
+            await server.wait_closed()
+            return server_protocol
+
+        protocol = loop.run_until_complete(main())
+        assert protocol.data == b"header" + payload + b"trailer"
+    finally:
+        loop.close()
@@ -89,3 +89,48 @@ def test_time(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
         assert abs(py_monotonic - loop_monotonic) < 0.1
     finally:
         loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_freelists_reuse_futures_and_handles(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj(freelist_size=4)
+    try:
+        for _ in range(3):
+            future = loop.create_future()
+            future.set_result(None)
+            del future
+
+            loop.call_soon(loop.stop)
+            loop.run_forever()
+
+        stats = loop.get_freelist_stats()  # type: ignore
+        assert stats["futures"]["capacity"] == 4
+        assert stats["futures"]["hits"] == 2
+        assert stats["futures"]["misses"] == 1
+        assert stats["handles"]["hits"] >= 2
+        assert stats["timer_handles"]["size"] == 0
+    finally:
+        loop.close()
+
+    with pytest.raises(RuntimeError):
+        loop.get_freelist_stats()  # type: ignore
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_freelists_disabled(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj(freelist_size=0)
+    try:
+        for _ in range(3):
+            loop.run_until_complete(asyncio.sleep(0))
+
+        stats = loop.get_freelist_stats()  # type: ignore
+        assert all(freelist["size"] == 0 for freelist in stats.values())
+        assert all(freelist["hits"] == 0 for freelist in stats.values())
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_negative_freelist_size(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    with pytest.raises(ValueError):
+        loop_obj(freelist_size=-1)
@@ -0,0 +1,120 @@
+import os, signal, socket, subprocess, sys, time
+
+SERVER_SCRIPT = """
+import asyncio, os, sys
+from leviathan import serve_multiprocess
+
+class PidProtocol(asyncio.Protocol):
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        self.transport.write(str(os.getpid()).encode())
+        if data == b"bye":
+            self.transport.close()
+
+serve_multiprocess(PidProtocol, "127.0.0.1", int(sys.argv[1]), workers=2, shutdown_timeout=5)
+"""
+
+
+def ask_pid(port: int, deadline: float) -> int:
+    while True:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1) as sock:
+                sock.sendall(b"bye")
+                return int(sock.recv(100))
+        except (ConnectionError, ValueError):
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def test_serve_multiprocess() -> None:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    supervisor = subprocess.Popen([sys.executable, "-c", SERVER_SCRIPT, str(port)])
+    try:
+        deadline = time.monotonic() + 10
+        pids = set()
+        # Connections are spread among the workers
+        while len(pids) < 2:
+            pids.add(ask_pid(port, deadline))
+            assert time.monotonic() < deadline
+        assert supervisor.pid not in pids
+
+        # A crashed worker is replaced
+        crashed = pids.pop()
+        os.kill(crashed, signal.SIGKILL)
+        while True:
+            pid = ask_pid(port, deadline)
+            if pid not in pids and pid != crashed:
+                break
+            assert time.monotonic() < deadline
+
+        # Connections that are already open are served until they are done
+        with socket.create_connection(("127.0.0.1", port), timeout=5) as client:
+            client.sendall(b"hello")
+            assert int(client.recv(100)) in (pid, *pids)
+
+            supervisor.send_signal(signal.SIGTERM)
+            time.sleep(0.2)
+            assert supervisor.poll() is None
+
+            client.sendall(b"bye")
+            assert client.recv(100)
+
+        assert supervisor.wait(10) == 0
+    finally:
+        if supervisor.poll() is None:
+            supervisor.kill()
+            supervisor.wait()
+
+
+def ask_pid_once(port: int) -> int:
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        sock.sendall(b"bye")
+        return int(sock.recv(100))
+
+
+def is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def test_serve_multiprocess_rolling_restart() -> None:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    supervisor = subprocess.Popen([sys.executable, "-c", SERVER_SCRIPT, str(port)])
+    try:
+        deadline = time.monotonic() + 10
+        old_pids = set()
+        while len(old_pids) < 2:
+            old_pids.add(ask_pid(port, deadline))
+            assert time.monotonic() < deadline
+
+        # Every connection made during the restart is served, the port is never left without a listener
+        supervisor.send_signal(signal.SIGHUP)
+        deadline = time.monotonic() + 15
+        new_pids = set()
+        while len(new_pids) < 2 or any(is_alive(pid) for pid in old_pids):
+            pid = ask_pid_once(port)
+            if pid not in old_pids:
+                new_pids.add(pid)
+            assert time.monotonic() < deadline
+
+        assert supervisor.pid not in new_pids
+        assert supervisor.poll() is None
+
+        supervisor.send_signal(signal.SIGTERM)
+        assert supervisor.wait(10) == 0
+    finally:
+        if supervisor.poll() is None:
+            supervisor.kill()
+            supervisor.wait()
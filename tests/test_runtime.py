@@ -0,0 +1,83 @@
+from leviathan import Runtime, ThreadSafeLoop
+
+import pytest, asyncio, threading
+
+
+def test_runtime_spawn() -> None:
+    async def where(value: int) -> tuple[int, asyncio.AbstractEventLoop, threading.Thread]:
+        await asyncio.sleep(0)
+        return value, asyncio.get_running_loop(), threading.current_thread()
+
+    with Runtime(4) as runtime:
+        assert len(runtime) == 4
+        loops = runtime.loops
+        assert all(isinstance(loop, ThreadSafeLoop) and loop.is_running() for loop in loops)
+
+        value, loop, thread = runtime.spawn_on(2, where(1)).result(5)
+        assert (value, loop) == (1, loops[2])
+        assert thread is not threading.current_thread()
+
+        futures = [runtime.spawn(where(index)) for index in range(8)]
+        results = [future.result(5) for future in futures]
+        assert [value for value, _, _ in results] == list(range(8))
+        # Round-robin, every loop gets two of them
+        assert sorted(loops.index(loop) for _, loop, _ in results) == [0, 0, 1, 1, 2, 2, 3, 3]
+        assert len({thread for _, _, thread in results}) == 4
+
+    assert all(loop.is_closed() for loop in loops)
+    coro = where(0)
+    with pytest.raises(RuntimeError):
+        runtime.spawn_on(0, coro)
+    coro.close()
+
+
+def test_runtime_run_on() -> None:
+    async def bounce(runtime: Runtime, hops: int) -> int:
+        if hops == 0:
+            return 0
+        # Every hop goes to another loop and the result comes back through all of them
+        index = (runtime.loops.index(asyncio.get_running_loop()) + 1) % len(runtime)  # type: ignore
+        return 1 + await runtime.run_on(index, bounce(runtime, hops - 1))
+
+    async def fail() -> None:
+        raise ValueError("remote")
+
+    async def many(runtime: Runtime) -> list[int]:
+        return list(await asyncio.gather(*(runtime.run(bounce(runtime, 3)) for _ in range(100))))
+
+    with Runtime(3) as runtime:
+        assert runtime.spawn_on(0, bounce(runtime, 10)).result(5) == 10
+        assert runtime.spawn_on(1, many(runtime)).result(10) == [3] * 100
+
+        with pytest.raises(ValueError, match="remote"):
+            runtime.spawn_on(0, runtime.run_on(1, fail())).result(5)
+
+
+def test_runtime_cancellation() -> None:
+    remote_cancelled = threading.Event()
+
+    async def forever() -> None:
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            remote_cancelled.set()
+            raise
+
+    async def caller(runtime: Runtime) -> None:
+        task = asyncio.create_task(runtime.run_on(1, forever()))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    with Runtime(2, pin_threads=True) as runtime:
+        runtime.spawn_on(0, caller(runtime)).result(5)
+        assert remote_cancelled.wait(5)
+
+        # Tasks still pending when the runtime is closed are cancelled
+        future = runtime.spawn_on(1, asyncio.sleep(3600))
+
+    assert future.cancelled()
+
+    with pytest.raises(ValueError):
+        Runtime(0)
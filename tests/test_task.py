@@ -1,9 +1,9 @@
-from leviathan import Task, ThreadSafeTask, Loop, ThreadSafeLoop
+from leviathan import Task, ThreadSafeTask, TaskGroup, Loop, ThreadSafeLoop, gather, wait
 from unittest.mock import AsyncMock
 
 from contextvars import copy_context, Context
 from typing import Type, Any
-import pytest, asyncio, io
+import pytest, asyncio, io, sys
 
 
 @pytest.mark.parametrize("task_obj, loop_obj", [
@@ -160,3 +160,421 @@ def test_current_task(
         assert task.result() == task
     finally:
         loop.close()
+
+
+@pytest.mark.parametrize("task_obj, loop_obj", [
+    (Task, Loop),
+    (ThreadSafeTask, ThreadSafeLoop)
+])
+def test_cancel_awaited_future(
+    task_obj: Type[asyncio.Task[Any]], loop_obj: Type[asyncio.AbstractEventLoop]
+) -> None:
+    loop = loop_obj()
+    try:
+        future = loop.create_future()
+
+        async def test_func() -> None:
+            await future
+
+        task = task_obj(test_func(), loop=loop)
+        loop.call_soon(task.cancel, "stopped")
+        with pytest.raises(asyncio.CancelledError):
+            loop.run_until_complete(task)
+
+        assert future.cancelled()
+        assert task.cancelled()
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("task_obj, loop_obj", [
+    (Task, Loop),
+    (ThreadSafeTask, ThreadSafeLoop)
+])
+def test_await_after_caught_exception(
+    task_obj: Type[asyncio.Task[Any]], loop_obj: Type[asyncio.AbstractEventLoop]
+) -> None:
+    loop = loop_obj()
+    try:
+        async def test_func() -> int:
+            future = loop.create_future()
+            loop.call_soon(future.set_exception, ValueError("failed"))
+            try:
+                await future
+            except ValueError:
+                pass
+
+            future = loop.create_future()
+            loop.call_soon(future.set_result, 42)
+            return await future
+
+        async def return_from_handler() -> int:
+            future = loop.create_future()
+            loop.call_soon(future.set_exception, ValueError("failed"))
+            try:
+                await future
+            except ValueError:
+                return 7
+            return 0
+
+        async def raise_from_handler() -> None:
+            future = loop.create_future()
+            loop.call_soon(future.set_exception, ValueError("failed"))
+            try:
+                await future
+            except ValueError as e:
+                raise KeyError("handler") from e
+
+        assert loop.run_until_complete(task_obj(test_func(), loop=loop)) == 42
+        assert loop.run_until_complete(task_obj(return_from_handler(), loop=loop)) == 7
+
+        task = task_obj(raise_from_handler(), loop=loop)
+        with pytest.raises(KeyError, match="handler"):
+            loop.run_until_complete(task)
+        assert isinstance(task.exception().__cause__, ValueError)
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("task_obj, loop_obj", [
+    (Task, Loop),
+    (ThreadSafeTask, ThreadSafeLoop)
+])
+def test_eager_start(
+    task_obj: Type[asyncio.Task[Any]], loop_obj: Type[asyncio.AbstractEventLoop]
+) -> None:
+    loop = loop_obj()
+    try:
+        steps: list[str] = []
+        current_tasks: list[asyncio.Task[Any] | None] = []
+
+        async def finishes_right_away(value: int) -> int:
+            steps.append("eager")
+            current_tasks.append(asyncio.current_task())
+            return value
+
+        async def suspends() -> None:
+            steps.append("first step")
+            await asyncio.sleep(0)
+            steps.append("second step")
+            current_tasks.append(asyncio.current_task())
+
+        async def fails() -> None:
+            raise ValueError("eager")
+
+        async def main() -> None:
+            creator = asyncio.current_task()
+
+            # The first step runs inside the constructor, without going through the ready queue
+            task = task_obj(finishes_right_away(1), loop=loop, eager_start=True)
+            assert steps == ["eager"]
+            assert task.done()
+            assert task.result() == 1
+            assert current_tasks.pop() is task
+            # The task that created it is the current one again
+            assert asyncio.current_task() is creator
+
+            steps.clear()
+            task = loop.create_task(suspends(), eager_start=True)  # type: ignore
+            assert steps == ["first step"]
+            assert not task.done()
+            assert asyncio.current_task() is creator
+            await task
+            assert current_tasks.pop() is task
+            assert steps == ["first step", "second step"]
+
+            task = loop.create_task(fails(), eager_start=True)  # type: ignore
+            assert task.done()
+            with pytest.raises(ValueError, match="eager"):
+                task.result()
+
+        loop.run_until_complete(main())
+
+        # Without a running loop the task is scheduled as usual
+        steps.clear()
+        task = task_obj(finishes_right_away(2), loop=loop, eager_start=True)
+        assert steps == [] and not task.done()
+        assert loop.run_until_complete(task) == 2
+        assert current_tasks.pop() is task
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("task_obj, loop_obj", [
+    (Task, Loop),
+    (ThreadSafeTask, ThreadSafeLoop)
+])
+def test_task_factory(
+    task_obj: Type[asyncio.Task[Any]], loop_obj: Type[asyncio.AbstractEventLoop]
+) -> None:
+    loop = loop_obj()
+    try:
+        calls: list[tuple[Any, dict[str, Any]]] = []
+
+        def factory(factory_loop: asyncio.AbstractEventLoop, coro: Any, **kwargs: Any) -> asyncio.Task[Any]:
+            calls.append((factory_loop, kwargs))
+            return task_obj(coro, loop=factory_loop, **kwargs)
+
+        async def finishes_right_away() -> int:
+            return 1
+
+        assert loop.get_task_factory() is None
+        with pytest.raises(TypeError):
+            loop.set_task_factory(1)  # type: ignore
+
+        loop.set_task_factory(factory)
+        assert loop.get_task_factory() is factory
+        task = loop.create_task(finishes_right_away(), name="factory")
+        assert calls == [(loop, {"name": "factory"})]
+        assert task.get_name() == "factory"
+        assert loop.run_until_complete(task) == 1
+
+        async def main() -> None:
+            task = loop.create_task(finishes_right_away())
+            assert not task.done()
+            assert await task == 1
+
+            loop.set_task_factory(asyncio.eager_task_factory)
+            task = loop.create_task(finishes_right_away())
+            assert task.done()
+            assert task.result() == 1
+
+        loop.run_until_complete(main())
+        assert len(calls) == 3
+
+        loop.set_task_factory(None)
+        assert loop.get_task_factory() is None
+        assert isinstance(loop.create_task(finishes_right_away()), task_obj)
+        loop.run_until_complete(asyncio.sleep(0))
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("task_obj, loop_obj", [
+    (Task, Loop),
+    (ThreadSafeTask, ThreadSafeLoop)
+])
+def test_await_asyncio_future(
+    task_obj: Type[asyncio.Task[Any]], loop_obj: Type[asyncio.AbstractEventLoop]
+) -> None:
+    class ThirdPartyFuture(asyncio.Future[Any]):
+        pass
+
+    loop = loop_obj()
+    try:
+        async def await_futures(future_type: Type[asyncio.Future[Any]]) -> None:
+            # The same task is woken up over and over again by futures it doesn't own
+            for value in range(100):
+                future = future_type(loop=loop)
+                loop.call_soon(future.set_result, value)
+                assert (await future) == value
+
+            future = future_type(loop=loop)
+            loop.call_soon(future.set_exception, ValueError("foreign"))
+            with pytest.raises(ValueError, match="foreign"):
+                await future
+
+            future = future_type(loop=loop)
+            loop.call_soon(future.cancel)
+            with pytest.raises(asyncio.CancelledError):
+                await future
+
+        for future_type in (asyncio.Future, ThirdPartyFuture):
+            task = task_obj(await_futures(future_type), loop=loop)
+            loop.run_until_complete(task)
+            assert task.result() is None
+
+        # Cancelling the task cancels the foreign future it's waiting for
+        future = asyncio.Future(loop=loop)
+        task = task_obj(asyncio.wait_for(future, None), loop=loop)
+        loop.call_soon(task.cancel)
+        with pytest.raises(asyncio.CancelledError):
+            loop.run_until_complete(task)
+        assert future.cancelled()
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_gather(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    try:
+        async def value_after(value: int, delay: float) -> int:
+            await asyncio.sleep(delay)
+            return value
+
+        async def fail() -> None:
+            raise ValueError("gathered")
+
+        async def main() -> None:
+            done = loop.create_future()
+            done.set_result(-1)
+
+            coro = value_after(1, 0.01)
+            results = await gather(value_after(0, 0.02), coro, done, coro)
+            assert results == [0, 1, -1, 1]
+
+            assert (await gather()) == []
+
+            with pytest.raises(ValueError, match="gathered"):
+                await gather(value_after(0, 0.01), fail())
+
+            results = await gather(value_after(0, 0.01), fail(), return_exceptions=True)
+            assert results[0] == 0
+            assert isinstance(results[1], ValueError)
+
+            # Foreign futures go through asyncio.gather
+            foreign = asyncio.Future(loop=loop)
+            loop.call_soon(foreign.set_result, 2)
+            assert (await gather(value_after(0, 0), foreign)) == [0, 2]
+
+            child = loop.create_future()
+            outer = gather(child)
+            outer.cancel()
+            await asyncio.sleep(0)
+            assert child.cancelled()
+
+        loop.run_until_complete(main())
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_gather_cancel_waits_for_children(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    try:
+        finished: list[int] = []
+
+        async def child(index: int) -> None:
+            try:
+                await asyncio.sleep(10)
+            finally:
+                # Cleanup that takes a few iterations
+                await asyncio.sleep(0.01 * index)
+                finished.append(index)
+
+        async def await_outer(outer: asyncio.Future[list[Any]]) -> None:
+            await outer
+
+        async def main() -> None:
+            children = [loop.create_task(child(index)) for index in range(3)]
+            outer = gather(*children)
+            await asyncio.sleep(0)
+
+            assert outer.cancel(msg="stop")
+            assert not outer.done()
+            with pytest.raises(asyncio.CancelledError, match="stop"):
+                await outer
+            assert sorted(finished) == [0, 1, 2]
+            assert all(child.cancelled() for child in children)
+
+            # Cancelling a task awaiting the gather goes through the same path
+            finished.clear()
+            children = [loop.create_task(child(index)) for index in range(3)]
+            task = loop.create_task(await_outer(gather(*children)))
+            await asyncio.sleep(0)
+
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert sorted(finished) == [0, 1, 2]
+
+        loop.run_until_complete(main())
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_wait(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    try:
+        async def main() -> None:
+            fast = loop.create_task(asyncio.sleep(0.01))
+            slow = loop.create_task(asyncio.sleep(10))
+            failing = loop.create_future()
+            loop.call_soon(failing.set_exception, ValueError("waited"))
+
+            done, pending = await wait([fast, slow], return_when=asyncio.FIRST_COMPLETED)
+            assert done == {fast}
+            assert pending == {slow}
+
+            done, pending = await wait([failing, slow], return_when=asyncio.FIRST_EXCEPTION)
+            assert done == {failing}
+            assert pending == {slow}
+
+            done, pending = await wait([slow], timeout=0.01)
+            assert not done
+            assert pending == {slow}
+
+            # Waits that time out don't keep the futures they were waiting for
+            refcount = sys.getrefcount(slow)
+            for _ in range(10):
+                await wait([slow], timeout=0)
+            assert sys.getrefcount(slow) == refcount
+
+            slow.cancel()
+            done, pending = await wait([fast, slow, failing])
+            assert done == {fast, slow, failing}
+            assert not pending
+
+            with pytest.raises(ValueError):
+                await wait([])
+            with pytest.raises(ValueError):
+                await wait([fast], return_when="NEVER")
+
+        loop.run_until_complete(main())
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("loop_obj", [Loop, ThreadSafeLoop])
+def test_task_group(loop_obj: Type[asyncio.AbstractEventLoop]) -> None:
+    loop = loop_obj()
+    try:
+        async def value_after(value: int, delay: float) -> int:
+            await asyncio.sleep(delay)
+            return value
+
+        async def fail_after(delay: float) -> None:
+            await asyncio.sleep(delay)
+            raise ValueError("grouped")
+
+        async def finishes_right_away() -> int:
+            return 3
+
+        async def main() -> None:
+            async with TaskGroup() as group:
+                tasks = [group.create_task(value_after(index, 0.01 * (index % 3))) for index in range(20)]
+                assert len(group._tasks) == 20  # type: ignore
+            assert [task.result() for task in tasks] == list(range(20))
+            assert not group._tasks  # type: ignore
+
+            slow = None
+            with pytest.raises(ExceptionGroup) as exc_info:
+                async with TaskGroup() as group:
+                    slow = group.create_task(value_after(0, 10))
+                    group.create_task(fail_after(0.01))
+                    # The failing child cancels the body too
+                    await asyncio.sleep(10)
+            assert slow is not None and slow.cancelled()
+            assert len(exc_info.value.exceptions) == 1
+            assert isinstance(exc_info.value.exceptions[0], ValueError)
+
+            loop.set_task_factory(asyncio.eager_task_factory)  # type: ignore
+            try:
+                async with TaskGroup() as group:
+                    eager = group.create_task(finishes_right_away())
+                    assert eager.done() and not group._tasks  # type: ignore
+                    lazy = group.create_task(value_after(4, 0.01))
+            finally:
+                loop.set_task_factory(None)  # type: ignore
+            assert lazy.result() == 4
+
+            # Foreign tasks keep asyncio's done callback
+            foreign = asyncio.Task(value_after(5, 0), loop=loop)
+            assert not loop._task_group_add(TaskGroup(), foreign)  # type: ignore
+            assert await foreign == 5
+
+        loop.run_until_complete(main())
+    finally:
+        loop.close()
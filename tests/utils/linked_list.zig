@@ -66,6 +66,35 @@ test "appendleft" {
     try std.testing.expect(elements_total == elements.len);
 }
 
+test "insert_after_node" {
+    var list = LinkedList.init(test_allocator);
+
+    const elements = [_]usize{10, 20, 30, 40};
+    try list.append(@ptrFromInt(elements[1]));
+
+    list.insert_after_node(null, try list.create_new_node(@ptrFromInt(elements[0])));
+    list.insert_after_node(list.last, try list.create_new_node(@ptrFromInt(elements[3])));
+    list.insert_after_node(list.first.?.next, try list.create_new_node(@ptrFromInt(elements[2])));
+
+    try std.testing.expect(list.len == elements.len);
+
+    var node = list.first;
+    var elements_total: usize = 0;
+    while (node != null) {
+        try std.testing.expect(@intFromPtr(node.?.data) == elements[elements_total]);
+        elements_total += 1;
+
+        const next_node = node.?.next;
+        test_allocator.destroy(node.?);
+
+        node = next_node;
+    }
+    list.first = null;
+    list.last = null;
+
+    try std.testing.expect(elements_total == elements.len);
+}
+
 test "pop and popleft" {
     var list = LinkedList.init(test_allocator);
 
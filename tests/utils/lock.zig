@@ -0,0 +1,46 @@
+const AdaptiveLock = @import("leviathan").utils.Lock.AdaptiveLock;
+
+const std = @import("std");
+
+test "lock and unlock" {
+    var lock: AdaptiveLock = .{};
+
+    lock.lock();
+    try std.testing.expect(!lock.tryLock());
+    lock.unlock();
+
+    try std.testing.expect(lock.tryLock());
+    lock.unlock();
+}
+
+test "contended lock" {
+    const threads_num = 8;
+    const increments = 10000;
+
+    const Counter = struct {
+        lock: AdaptiveLock = .{},
+        value: usize = 0,
+
+        fn increment(self: *@This()) void {
+            for (0..increments) |_| {
+                self.lock.lock();
+                defer self.lock.unlock();
+
+                // Keeps the lock for a while, so that other threads end up sleeping on it
+                const value = self.value;
+                std.atomic.spinLoopHint();
+                self.value = value + 1;
+            }
+        }
+    };
+
+    var counter: Counter = .{};
+    var threads: [threads_num]std.Thread = undefined;
+    for (&threads) |*thread| {
+        thread.* = try std.Thread.spawn(.{}, Counter.increment, .{&counter});
+    }
+    for (threads) |thread| thread.join();
+
+    try std.testing.expectEqual(threads_num * increments, counter.value);
+    try std.testing.expect(counter.lock.tryLock());
+}
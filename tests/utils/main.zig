@@ -1,4 +1,5 @@
 pub const linked_list  = @import("linked_list.zig");
+pub const lock = @import("lock.zig");
 // pub const btree = @import("btree.zig");
 
 test {